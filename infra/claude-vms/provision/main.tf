@@ -1,5 +1,6 @@
 locals {
-  use_dhcp = var.ip_address == "dhcp"
+  # Per-VM address (static from the harness IPAM allocator, or the shared default)
+  vm_addresses = { for name, vm in var.vms : name => coalesce(vm.ip_address, var.ip_address) }
 }
 
 resource "proxmox_virtual_environment_vm" "vm" {
@@ -36,8 +37,8 @@ resource "proxmox_virtual_environment_vm" "vm" {
 
     ip_config {
       ipv4 {
-        address = coalesce(each.value.ip_address, var.ip_address)
-        gateway = local.use_dhcp ? null : var.gateway
+        address = local.vm_addresses[each.key]
+        gateway = local.vm_addresses[each.key] == "dhcp" ? null : var.gateway
       }
     }
 
@@ -58,8 +59,11 @@ resource "proxmox_virtual_environment_vm" "vm" {
   stop_on_destroy = true
 
   lifecycle {
+    # Changing the template (e.g. a new baked image) applies to new VMs only
     ignore_changes = [
       initialization,
+      clone,
+      description,
     ]
   }
 }
\ No newline at end of file
@@ -1,15 +1,25 @@
-output "vm_ips" {
-  description = "Map of VM names to their IP addresses"
-  value = {
+locals {
+  # Address reported by the guest agent (index 0 is loopback), once it is known
+  agent_ips = {
+    for name, vm in proxmox_virtual_environment_vm.vm :
+    name => try(vm.ipv4_addresses[1][0], null)
+  }
+
+  # The agent address wins: VMs created before static addressing keep their DHCP
+  # address (initialization changes are ignored), so the configured one would be wrong
+  vm_ips = {
     for name, vm in proxmox_virtual_environment_vm.vm :
-    name => vm.ipv4_addresses != null ? (
-      length(vm.ipv4_addresses) > 1 ? (
-        length(vm.ipv4_addresses[1]) > 0 ? vm.ipv4_addresses[1][0] : null
-      ) : null
-    ) : null
+    name => local.agent_ips[name] != null ? local.agent_ips[name] : (
+      local.vm_addresses[name] != "dhcp" ? split("/", local.vm_addresses[name])[0] : null
+    )
   }
 }
 
+output "vm_ips" {
+  description = "Map of VM names to their IP addresses"
+  value       = local.vm_ips
+}
+
 output "vm_info" {
   description = "Detailed VM information for inventory generation"
   value = {
@@ -17,11 +27,7 @@ output "vm_info" {
     name => {
       vm_id        = vm.vm_id
       node         = vm.node_name
-      ipv4_address = vm.ipv4_addresses != null ? (
-        length(vm.ipv4_addresses) > 1 ? (
-          length(vm.ipv4_addresses[1]) > 0 ? vm.ipv4_addresses[1][0] : null
-        ) : null
-      ) : null
+      ipv4_address = local.vm_ips[name]
       mac_address = try(vm.network_device[0].mac_address, null)
       status      = "running"
     }
@@ -35,11 +41,7 @@ output "ansible_inventory" {
       hosts = {
         for name, vm in proxmox_virtual_environment_vm.vm :
         name => {
-          ansible_host = vm.ipv4_addresses != null ? (
-            length(vm.ipv4_addresses) > 1 ? (
-              length(vm.ipv4_addresses[1]) > 0 ? vm.ipv4_addresses[1][0] : null
-            ) : null
-          ) : null
+          ansible_host            = local.vm_ips[name]
           ansible_user            = var.cloud_init_user
           ansible_ssh_common_args = "-o StrictHostKeyChecking=accept-new"
           vm_id                   = vm.vm_id
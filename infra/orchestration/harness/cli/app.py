@@ -2,14 +2,32 @@
 
 from __future__ import annotations
 
+from functools import partial
+from pathlib import Path
 from typing import Annotated, Optional
 
 import typer
 
 from harness import __version__
-from harness.cli.commands import all_cmd, core_services, neo4j, status, vms
+from harness.cli.commands import (
+    all_cmd,
+    core_services,
+    image_bake,
+    neo4j,
+    perf_tasks,
+    pool_claim,
+    pool_fill,
+    pool_release,
+    pool_status,
+    status,
+    vms,
+    vms_reset,
+    vms_scale,
+)
 from harness.core.context import AppContext
 from harness.core.exitcodes import ExitCode
+from harness.core.runner import forward_interrupts, usage_log
+from harness.core.trace import finish_tracing, start_tracing
 
 # Create main app with common settings
 app = typer.Typer(
@@ -57,6 +75,13 @@ def main(
             help="Output results as JSON (for scripting).",
         ),
     ] = False,
+    trace: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--trace",
+            help="Write a timeline of phases and commands (Chrome trace JSON, open in Perfetto).",
+        ),
+    ] = None,
 ) -> None:
     """Claude Code Harness - Infrastructure orchestration CLI.
 
@@ -68,6 +93,7 @@ def main(
         $ harness all -c 2       # Deploy Neo4j + Core Services + 2 Claude VMs
         $ harness status         # Check what's deployed
         $ harness vms --destroy  # Tear down Claude VMs only
+        $ harness --trace all.json all  # Record a timeline for ui.perfetto.dev
 
     \b
     For more information on a command:
@@ -84,11 +110,69 @@ def main(
         typer.secho(f"Configuration error: {e}", fg=typer.colors.RED, err=True)
         raise typer.Exit(code=ExitCode.CONFIG)
 
+    # Resource totals in --json results cover this invocation only
+    usage_log.clear()
+    # Commands streamed from worker threads (harness all, batched configure)
+    # run in their own process groups and need Ctrl-C passed on
+    forward_interrupts()
+    if trace is not None:
+        start_tracing()
+        ctx.call_on_close(partial(_write_trace, trace))
+
+
+def _write_trace(path: Path) -> None:
+    """Write the recorded trace when the command finishes."""
+    finish_tracing(path)
+    typer.secho(f"Trace written to {path} (open in https://ui.perfetto.dev)", err=True)
+
+
+# `harness vms` deploys on its own and also groups fleet subcommands
+vms_app = typer.Typer(
+    invoke_without_command=True,
+    rich_markup_mode="rich",
+    context_settings={"help_option_names": ["-h", "--help"]},
+)
+vms_app.callback()(vms)
+vms_app.command("scale")(vms_scale)
+vms_app.command("reset")(vms_reset)
+
+# `harness image` groups golden image commands
+image_app = typer.Typer(
+    help="Build golden Claude VM templates.",
+    no_args_is_help=True,
+    rich_markup_mode="rich",
+    context_settings={"help_option_names": ["-h", "--help"]},
+)
+image_app.command("bake")(image_bake)
+
+# `harness pool` manages the warm pool of ready-to-claim Claude VMs
+pool_app = typer.Typer(
+    help="Hand out pre-configured Claude VMs from a warm pool.",
+    no_args_is_help=True,
+    rich_markup_mode="rich",
+    context_settings={"help_option_names": ["-h", "--help"]},
+)
+pool_app.command("fill")(pool_fill)
+pool_app.command("status")(pool_status)
+pool_app.command("claim")(pool_claim)
+pool_app.command("release")(pool_release)
+
+# `harness perf` analyzes timings recorded by earlier runs
+perf_app = typer.Typer(
+    help="Analyze recorded deployment performance.",
+    no_args_is_help=True,
+    rich_markup_mode="rich",
+    context_settings={"help_option_names": ["-h", "--help"]},
+)
+perf_app.command("tasks")(perf_tasks)
 
 # Register commands directly (preserves docstrings for help text)
 app.command("neo4j")(neo4j)
 app.command("core-services")(core_services)
-app.command("vms")(vms)
+app.add_typer(vms_app, name="vms")
+app.add_typer(image_app, name="image")
+app.add_typer(pool_app, name="pool")
+app.add_typer(perf_app, name="perf")
 app.command("all")(all_cmd)
 app.command("status")(status)
 
@@ -2,8 +2,25 @@
 
 from harness.cli.commands.all_cmd import all_cmd
 from harness.cli.commands.core_services import core_services
+from harness.cli.commands.image import image_bake
 from harness.cli.commands.neo4j import neo4j
+from harness.cli.commands.perf import perf_tasks
+from harness.cli.commands.pool import pool_claim, pool_fill, pool_release, pool_status
 from harness.cli.commands.status import status
-from harness.cli.commands.vms import vms
+from harness.cli.commands.vms import vms, vms_reset, vms_scale
 
-__all__ = ["all_cmd", "core_services", "neo4j", "status", "vms"]
+__all__ = [
+    "all_cmd",
+    "core_services",
+    "image_bake",
+    "neo4j",
+    "perf_tasks",
+    "pool_claim",
+    "pool_fill",
+    "pool_release",
+    "pool_status",
+    "status",
+    "vms",
+    "vms_reset",
+    "vms_scale",
+]
@@ -2,14 +2,31 @@
 
 from __future__ import annotations
 
+from functools import partial
 from typing import Annotated, Optional
 
 import typer
 
 from harness.core.context import AppContext
+from harness.core.dag import DagExecutor, DagResult
 from harness.core.exitcodes import ExitCode
-from harness.core.runner import MissingDependencyError
-from harness.deployers import ClaudeVMsDeployer, CoreServicesDeployer, Neo4jDeployer
+from harness.core.runner import MissingDependencyError, usage_log
+from harness.deployers import (
+    BaseDeployer,
+    ClaudeVMsDeployer,
+    CoreServicesDeployer,
+    Neo4jDeployer,
+)
+
+# Cross-component phase dependencies for `harness all`. Provisioning only needs
+# values from config.yaml (e.g. the Neo4j IP), so all components provision at
+# once; only configuration that talks to another running service waits for it
+# (the Claude VM playbook fetches the Caddy root CA from Core Services). Within
+# a component, each phase follows the previous one.
+PHASE_DEPENDENCIES: dict[str, list[str]] = {
+    "core-services.configure": ["neo4j.configure"],
+    "claude-vms.configure": ["neo4j.configure", "core-services.configure"],
+}
 
 
 def all_cmd(
@@ -67,14 +84,36 @@ def all_cmd(
             help="Skip OS hardening roles (Claude VMs only).",
         ),
     ] = False,
+    upgrade: Annotated[
+        bool,
+        typer.Option(
+            "--upgrade",
+            help="Upgrade OpenTofu providers (tofu init -upgrade).",
+        ),
+    ] = False,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume",
+            help="Skip phases that already completed with unchanged inputs.",
+        ),
+    ] = False,
+    sequential: Annotated[
+        bool,
+        typer.Option(
+            "--sequential",
+            help="Run one phase at a time instead of overlapping independent components.",
+        ),
+    ] = False,
 ) -> None:
     """Deploy or destroy the complete infrastructure.
 
     This command manages Neo4j, Core Services (Plane + Rewind), and Claude VMs together.
 
     \b
-    Deploy order:  Neo4j → Core Services → Claude VMs
-    Destroy order: Claude VMs → Core Services → Neo4j
+    Deploy: all components provision concurrently; Core Services is
+            configured once Neo4j is, and Claude VMs once both are.
+    Destroy: all components are destroyed concurrently.
 
     \b
     Environment Variables:
@@ -96,6 +135,15 @@ def all_cmd(
 
         # Deploy without OS hardening
         $ harness all --skip-hardening
+
+        # Deploy one phase at a time (Neo4j → Core Services → Claude VMs)
+        $ harness all --sequential
+
+        # Destroy one component at a time (Claude VMs → Core Services → Neo4j)
+        $ harness all --destroy --sequential
+
+        # Retry after a failure, skipping phases that already completed
+        $ harness all --resume
     """
     app_ctx: AppContext = ctx.obj
     log = app_ctx.logger
@@ -103,9 +151,9 @@ def all_cmd(
 
     try:
         if destroy:
-            _destroy_all(app_ctx, count, prefix, start_id)
+            graph = _destroy_all(app_ctx, count, prefix, start_id, upgrade, sequential)
         else:
-            _deploy_all(
+            graph = _deploy_all(
                 app_ctx,
                 count,
                 prefix,
@@ -113,16 +161,24 @@ def all_cmd(
                 skip_provision,
                 skip_configure,
                 skip_hardening,
+                upgrade,
+                sequential,
+                resume,
             )
 
         if app_ctx.json_output:
             log.set_result({
-                "success": True,
+                "success": graph.success,
                 "action": "destroy" if destroy else "deploy",
                 "components": ["neo4j", "core-services", "claude-vms"],
+                "phases": graph.to_dict(),
+                "resources": usage_log.summary(),
             })
             log.flush_json()
 
+        if not graph.success:
+            raise typer.Exit(code=ExitCode.FAILURE)
+
     except MissingDependencyError as e:
         log.error(f"Missing dependencies: {', '.join(e.dependencies)}")
         raise typer.Exit(code=ExitCode.CONFIG)
@@ -133,39 +189,61 @@ def _destroy_all(
     count: int | None,
     prefix: str | None,
     start_id: int | None,
-) -> None:
-    """Destroy all infrastructure (Claude VMs → Core Services → Neo4j)."""
+    upgrade: bool,
+    sequential: bool = False,
+) -> DagResult:
+    """Destroy all infrastructure.
+
+    The components do not depend on each other at the Proxmox level, so they
+    are destroyed concurrently and a failure in one does not stop the others.
+    Sequential mode keeps the order Claude VMs → Core Services → Neo4j.
+
+    Returns:
+        DagResult with one node per component.
+    """
     log = app_ctx.logger
     config = app_ctx.config
 
-    # Destroy Claude VMs first
-    log.header("Destroying Claude VMs")
-    vms_deployer = ClaudeVMsDeployer(
-        config,
-        verbose=app_ctx.verbose,
-        count=count,
-        prefix=prefix,
-        start_id=start_id,
-    )
-    vms_result = vms_deployer.destroy()
-    if not vms_result.success:
-        log.warn(f"Claude VMs destruction may have failed: {vms_result.message}")
-
-    # Then destroy Core Services
-    log.header("Destroying Core Services")
-    core_services_deployer = CoreServicesDeployer(config, verbose=app_ctx.verbose)
-    core_services_result = core_services_deployer.destroy()
-    if not core_services_result.success:
-        log.warn(f"Core Services destruction may have failed: {core_services_result.message}")
-
-    # Finally destroy Neo4j
-    log.header("Destroying Neo4j")
-    neo4j_deployer = Neo4jDeployer(config, verbose=app_ctx.verbose)
-    neo4j_result = neo4j_deployer.destroy()
-    if not neo4j_result.success:
-        log.warn(f"Neo4j destruction may have failed: {neo4j_result.message}")
-
-    log.success("All components destroyed")
+    deployers = {
+        "claude-vms": ClaudeVMsDeployer(
+            config,
+            verbose=app_ctx.verbose,
+            count=count,
+            prefix=prefix,
+            start_id=start_id,
+            upgrade=upgrade,
+        ),
+        "core-services": CoreServicesDeployer(config, verbose=app_ctx.verbose, upgrade=upgrade),
+        "neo4j": Neo4jDeployer(config, verbose=app_ctx.verbose, upgrade=upgrade),
+    }
+
+    executor = DagExecutor(max_workers=1 if sequential else None, logger=log)
+    for name, deployer in deployers.items():
+        executor.add(f"{name}.destroy", partial(_destroy_component, deployer))
+
+    log.header("Destroying all components" + (" (sequential)" if sequential else ""))
+    result = executor.run()
+
+    log.header("Destroy Summary")
+    for node in result.nodes.values():
+        if node.ok:
+            log.success(f"{node.name}: destroyed in {node.duration:.1f}s")
+        else:
+            log.error(f"{node.name}: {node.error}")
+    log.info(f"Total: {result.elapsed:.1f}s")
+
+    if result.success:
+        log.success("All components destroyed")
+    else:
+        log.error(f"{len(result.failed)} component(s) failed to destroy")
+    return result
+
+
+def _destroy_component(deployer: BaseDeployer) -> None:
+    """Destroy one component, raising if it did not succeed."""
+    result = deployer.destroy()
+    if not result.success:
+        raise RuntimeError(f"{deployer.component_name} destruction failed: {result.message}")
 
 
 def _deploy_all(
@@ -176,53 +254,83 @@ def _deploy_all(
     skip_provision: bool,
     skip_configure: bool,
     skip_hardening: bool,
-) -> None:
-    """Deploy all infrastructure (Neo4j → Core Services → Claude VMs)."""
+    upgrade: bool,
+    sequential: bool = False,
+    resume: bool = False,
+) -> DagResult:
+    """Deploy all infrastructure as a dependency graph of component phases.
+
+    Returns:
+        DagResult with per-phase timings.
+    """
     log = app_ctx.logger
     config = app_ctx.config
 
-    # Deploy Neo4j first
-    neo4j_deployer = Neo4jDeployer(config, verbose=app_ctx.verbose)
-    neo4j_result = neo4j_deployer.deploy(
-        skip_provision=skip_provision,
-        skip_configure=skip_configure,
-    )
-    if not neo4j_result.success:
-        log.error(f"Neo4j deployment failed: {neo4j_result.message}")
-        raise typer.Exit(code=ExitCode.FAILURE)
-
-    # Then deploy Core Services (Plane + Rewind)
-    core_services_deployer = CoreServicesDeployer(config, verbose=app_ctx.verbose)
-    core_services_result = core_services_deployer.deploy(
-        skip_provision=skip_provision,
-        skip_configure=skip_configure,
-    )
-    if not core_services_result.success:
-        log.error(f"Core Services deployment failed: {core_services_result.message}")
-        raise typer.Exit(code=ExitCode.FAILURE)
-
-    # Finally deploy Claude VMs
-    vms_deployer = ClaudeVMsDeployer(
-        config,
-        verbose=app_ctx.verbose,
-        count=count,
-        prefix=prefix,
-        start_id=start_id,
-    )
-    vms_result = vms_deployer.deploy(
-        skip_provision=skip_provision,
-        skip_configure=skip_configure,
-        skip_hardening=skip_hardening,
-    )
-    if not vms_result.success:
-        log.error(f"Claude VMs deployment failed: {vms_result.message}")
-        raise typer.Exit(code=ExitCode.FAILURE)
+    components = {
+        "neo4j": (Neo4jDeployer(config, verbose=app_ctx.verbose, upgrade=upgrade), {}),
+        "core-services": (
+            CoreServicesDeployer(config, verbose=app_ctx.verbose, upgrade=upgrade),
+            {},
+        ),
+        "claude-vms": (
+            ClaudeVMsDeployer(
+                config,
+                verbose=app_ctx.verbose,
+                count=count,
+                prefix=prefix,
+                start_id=start_id,
+                upgrade=upgrade,
+            ),
+            {"skip_hardening": skip_hardening},
+        ),
+    }
+
+    executor = DagExecutor(max_workers=1 if sequential else None, logger=log)
+    for name, (deployer, kwargs) in components.items():
+        log.header(f"Deploying {deployer.component_name}")
+        deployer.log_configuration(**kwargs)
+
+        previous = None
+        phases = deployer.phases(
+            skip_provision=skip_provision,
+            skip_configure=skip_configure,
+            resume=resume,
+            **kwargs,
+        )
+        for phase, fn in phases.items():
+            node = f"{name}.{phase}"
+            deps = [previous] if previous else []
+            deps += PHASE_DEPENDENCIES.get(node, [])
+            executor.add(node, fn, deps=[d for d in deps if d in executor])
+            previous = node
+
+    log.header("Running deployment phases" + (" (sequential)" if sequential else ""))
+    result = executor.run()
+    _log_critical_path(app_ctx, result)
+
+    if not result.success:
+        failed = ", ".join(r.name for r in result.failed)
+        log.error(f"Deployment failed in: {failed}")
+        for skipped in result.skipped:
+            log.bullet(f"{skipped.name}: skipped")
+        return result
 
     # Summary
     log.header("Deployment Summary")
-    log.info(f"Neo4j: {config.neo4j.bolt_uri}")
-    log.info(f"Neo4j Browser: {config.neo4j.http_uri}")
-    log.info(f"Core Services (Plane): {config.core_services.https_uri}")
-    log.info(f"Rewind API: {config.core_services.rewind_api_uri}")
-    log.info(f"Rewind UI: {config.core_services.rewind_web_uri}")
+    for deployer, kwargs in components.values():
+        deployer.log_summary(**kwargs)
     log.success("All components deployed successfully")
+    return result
+
+
+def _log_critical_path(app_ctx: AppContext, result: DagResult) -> None:
+    """Log the chain of phases that determined the total deployment time."""
+    log = app_ctx.logger
+    path = result.critical_path()
+    if not path:
+        return
+
+    log.header("Critical Path")
+    for node in path:
+        log.bullet(f"{node.name}: {node.duration:.1f}s (started at +{node.started:.1f}s)")
+    log.info(f"Total: {result.elapsed:.1f}s", critical_path=[r.name for r in path])
@@ -8,7 +8,7 @@ import typer
 
 from harness.core.context import AppContext
 from harness.core.exitcodes import ExitCode
-from harness.core.runner import MissingDependencyError
+from harness.core.runner import MissingDependencyError, usage_log
 from harness.deployers import CoreServicesDeployer
 
 
@@ -36,6 +36,20 @@ def core_services(
             help="Skip Ansible configuration (provision only).",
         ),
     ] = False,
+    upgrade: Annotated[
+        bool,
+        typer.Option(
+            "--upgrade",
+            help="Upgrade OpenTofu providers (tofu init -upgrade).",
+        ),
+    ] = False,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume",
+            help="Skip phases that already completed with unchanged inputs.",
+        ),
+    ] = False,
 ) -> None:
     """Deploy or destroy Core Services (Plane + Rewind).
 
@@ -69,12 +83,15 @@ def core_services(
 
         # Only provision infrastructure (skip Ansible)
         $ harness core-services --skip-configure
+
+        # Retry after a failure, skipping phases that already completed
+        $ harness core-services --resume
     """
     app_ctx: AppContext = ctx.obj
     log = app_ctx.logger
 
     try:
-        deployer = CoreServicesDeployer(app_ctx.config, verbose=app_ctx.verbose)
+        deployer = CoreServicesDeployer(app_ctx.config, verbose=app_ctx.verbose, upgrade=upgrade)
 
         if destroy:
             result = deployer.destroy()
@@ -82,6 +99,7 @@ def core_services(
             result = deployer.deploy(
                 skip_provision=skip_provision,
                 skip_configure=skip_configure,
+                resume=resume,
             )
 
         if app_ctx.json_output:
@@ -90,6 +108,7 @@ def core_services(
                 "message": result.message,
                 "component": "core-services",
                 "action": "destroy" if destroy else "deploy",
+                "resources": usage_log.summary(),
             })
             log.flush_json()
 
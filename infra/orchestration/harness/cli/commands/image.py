@@ -0,0 +1,77 @@
+"""Golden image commands."""
+
+from __future__ import annotations
+
+from typing import Annotated, Optional
+
+import typer
+
+from harness.core.context import AppContext
+from harness.core.exitcodes import ExitCode
+from harness.core.runner import MissingDependencyError, usage_log
+from harness.deployers import ImageBaker
+
+
+def image_bake(
+    ctx: typer.Context,
+    source: Annotated[
+        Optional[int],
+        typer.Option(
+            "--from",
+            help="Template ID to bake from (default: proxmox.template_id).",
+        ),
+    ] = None,
+    keep_on_failure: Annotated[
+        bool,
+        typer.Option(
+            "--keep-on-failure",
+            help="Keep the VM if baking fails (for debugging).",
+        ),
+    ] = False,
+) -> None:
+    """Bake a golden Claude VM template.
+
+    Clones the base template, runs the host-independent playbook steps
+    (tag: bake; system upgrade, hardening, Docker, Go, packages, user
+    toolchains) and converts the result into a new versioned template.
+    Claude VMs then clone the latest image and only run the host-specific
+    tasks (tag: host), unless the playbook has changed since the bake.
+
+    \b
+    Environment Variables:
+        TF_VAR_proxmox_api_token  Proxmox API token (required)
+
+    \b
+    Examples:
+        # Bake a new image version from proxmox.template_id
+        $ harness image bake
+
+        # Deploy VMs from it
+        $ harness vms -c 3
+    """
+    app_ctx: AppContext = ctx.obj
+    log = app_ctx.logger
+
+    try:
+        baker = ImageBaker(app_ctx.config, verbose=app_ctx.verbose)
+        result = baker.bake(source_template_id=source, keep_on_failure=keep_on_failure)
+
+        if app_ctx.json_output:
+            log.set_result(
+                {
+                    "success": result.success,
+                    "message": result.message,
+                    "action": "bake",
+                    **(result.details or {}),
+                    "resources": usage_log.summary(),
+                }
+            )
+            log.flush_json()
+
+        if not result.success:
+            log.error(result.message)
+            raise typer.Exit(code=ExitCode.FAILURE)
+
+    except MissingDependencyError as e:
+        log.error(f"Missing dependencies: {', '.join(e.dependencies)}")
+        raise typer.Exit(code=ExitCode.CONFIG) from e
@@ -8,7 +8,7 @@ import typer
 
 from harness.core.context import AppContext
 from harness.core.exitcodes import ExitCode
-from harness.core.runner import MissingDependencyError
+from harness.core.runner import MissingDependencyError, usage_log
 from harness.deployers import Neo4jDeployer
 
 
@@ -36,6 +36,20 @@ def neo4j(
             help="Skip Ansible configuration (provision only).",
         ),
     ] = False,
+    upgrade: Annotated[
+        bool,
+        typer.Option(
+            "--upgrade",
+            help="Upgrade OpenTofu providers (tofu init -upgrade).",
+        ),
+    ] = False,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume",
+            help="Skip phases that already completed with unchanged inputs.",
+        ),
+    ] = False,
 ) -> None:
     """Deploy or destroy the Neo4j database server.
 
@@ -59,12 +73,15 @@ def neo4j(
 
         # Only provision infrastructure (skip Ansible)
         $ harness neo4j --skip-configure
+
+        # Retry after a failure, skipping phases that already completed
+        $ harness neo4j --resume
     """
     app_ctx: AppContext = ctx.obj
     log = app_ctx.logger
 
     try:
-        deployer = Neo4jDeployer(app_ctx.config, verbose=app_ctx.verbose)
+        deployer = Neo4jDeployer(app_ctx.config, verbose=app_ctx.verbose, upgrade=upgrade)
 
         if destroy:
             result = deployer.destroy()
@@ -72,6 +89,7 @@ def neo4j(
             result = deployer.deploy(
                 skip_provision=skip_provision,
                 skip_configure=skip_configure,
+                resume=resume,
             )
 
         if app_ctx.json_output:
@@ -80,6 +98,7 @@ def neo4j(
                 "message": result.message,
                 "component": "neo4j",
                 "action": "destroy" if destroy else "deploy",
+                "resources": usage_log.summary(),
             })
             log.flush_json()
 
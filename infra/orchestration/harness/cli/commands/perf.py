@@ -0,0 +1,128 @@
+"""Performance analysis commands."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import asdict
+from typing import Annotated, Optional
+
+import typer
+
+from harness.core.context import AppContext
+from harness.core.logger import print_json
+from harness.infra.task_history import TaskHistory, find_regressions, task_stats
+
+
+def perf_tasks(
+    ctx: typer.Context,
+    component: Annotated[
+        Optional[str],
+        typer.Option(
+            "--component",
+            "-c",
+            help="Only this component (neo4j, core-services, claude-vms).",
+        ),
+    ] = None,
+    top: Annotated[
+        int,
+        typer.Option(
+            "--top",
+            "-n",
+            help="Number of slowest tasks and roles to show.",
+        ),
+    ] = 15,
+    runs: Annotated[
+        int,
+        typer.Option(
+            "--runs",
+            help="Latest playbook runs per component to analyze.",
+        ),
+    ] = 50,
+    recent: Annotated[
+        int,
+        typer.Option(
+            "--recent",
+            help="Latest runs per component checked for regressions.",
+        ),
+    ] = 1,
+    threshold: Annotated[
+        float,
+        typer.Option(
+            "--threshold",
+            help="Relative slowdown that counts as a regression (0.5 = 50%).",
+        ),
+    ] = 0.5,
+    min_delta: Annotated[
+        float,
+        typer.Option(
+            "--min-delta",
+            help="Minimum slowdown in seconds that counts as a regression.",
+        ),
+    ] = 5.0,
+) -> None:
+    """Rank slow Ansible tasks and flag regressions across playbook runs.
+
+    Reads the per-host task results saved for every playbook run in
+    .harness/ansible-runs. Shows the tasks and roles with the most
+    host-seconds, with p50/p95 across hosts. Tasks whose median in the
+    latest run(s) is slower than in earlier runs are flagged.
+
+    \b
+    Examples:
+        $ harness perf tasks
+        $ harness perf tasks -c claude-vms --top 30
+        $ harness --json perf tasks --threshold 0.25
+    """
+    app_ctx: AppContext = ctx.obj
+    log = app_ctx.logger
+
+    history = TaskHistory.from_config(app_ctx.config)
+    loaded = history.runs(component=component, limit=runs)
+    stats = task_stats(loaded)
+    regressions = find_regressions(loaded, recent=recent, threshold=threshold, min_delta=min_delta)
+
+    roles: dict[str, float] = defaultdict(float)
+    for s in stats:
+        roles[f"{s.component}: {s.role}"] += s.total
+    slowest_roles = sorted(roles.items(), key=lambda item: item[1], reverse=True)[:top]
+
+    if app_ctx.json_output:
+        print_json(
+            {
+                "runs": len(loaded),
+                "tasks": [asdict(s) for s in stats[:top]],
+                "roles": [
+                    {"role": name, "total": round(total, 3)} for name, total in slowest_roles
+                ],
+                "regressions": [{**asdict(r), "change": round(r.change, 3)} for r in regressions],
+            }
+        )
+        return
+
+    log.header("Ansible Task Timings")
+    if not loaded:
+        log.bullet(f"No playbook runs recorded in {history.runs_dir}")
+        return
+    samples = sum(len(run.records) for run in loaded)
+    log.info(f"{len(loaded)} run(s), {samples} host task result(s)")
+
+    log.info("Slowest tasks (host-seconds; p50/p95 across hosts):")
+    for s in stats[:top]:
+        log.bullet(
+            f"{s.component} › {s.role} › {s.task}: {s.total:.0f}s total, "
+            f"p50 {s.p50:.1f}s, p95 {s.p95:.1f}s ({s.samples} results, {s.runs} runs)"
+        )
+
+    log.info("Slowest roles (host-seconds):")
+    for name, total in slowest_roles:
+        log.bullet(f"{name}: {total:.0f}s")
+
+    if regressions:
+        log.warn(f"{len(regressions)} task(s) regressed in the latest {recent} run(s):")
+        for r in regressions:
+            log.bullet(
+                f"{r.component} › {r.role} › {r.task}: "
+                f"{r.baseline:.1f}s → {r.current:.1f}s (+{r.change:.0%})"
+            )
+    else:
+        log.success("No task regressions")
@@ -0,0 +1,167 @@
+"""Warm Claude VM pool commands."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import asdict
+from typing import Annotated, Optional
+
+import typer
+
+from harness.core.context import AppContext
+from harness.core.exitcodes import ExitCode
+from harness.core.logger import print_json
+from harness.core.runner import MissingDependencyError, usage_log
+from harness.deployers import PoolManager
+from harness.deployers.base import DeploymentResult
+
+
+def _finish(app_ctx: AppContext, result: DeploymentResult, action: str) -> None:
+    """Report a pool command's result and exit non-zero on failure."""
+    log = app_ctx.logger
+    if app_ctx.json_output:
+        log.set_result(
+            {
+                "success": result.success,
+                "message": result.message,
+                "action": action,
+                **(result.details or {}),
+                "resources": usage_log.summary(),
+            }
+        )
+        log.flush_json()
+
+    if not result.success:
+        log.error(result.message)
+        raise typer.Exit(code=ExitCode.FAILURE)
+
+
+def pool_fill(
+    ctx: typer.Context,
+    size: Annotated[
+        Optional[int],
+        typer.Option(
+            "--size",
+            "-n",
+            help="Number of unclaimed VMs to keep (default: pool.size).",
+        ),
+    ] = None,
+) -> None:
+    """Build pool VMs until the pool has its target size.
+
+    Each VM is cloned from the fleet's template, configured with every
+    playbook task except the host-specific ones, and shut down.
+
+    \b
+    Examples:
+        $ harness pool fill
+        $ harness pool fill --size 5
+    """
+    app_ctx: AppContext = ctx.obj
+    try:
+        manager = PoolManager(app_ctx.config, verbose=app_ctx.verbose)
+        _finish(app_ctx, manager.fill(size=size), "fill")
+    except MissingDependencyError as e:
+        app_ctx.logger.error(f"Missing dependencies: {', '.join(e.dependencies)}")
+        raise typer.Exit(code=ExitCode.CONFIG) from e
+
+
+def pool_status(ctx: typer.Context) -> None:
+    """Show the VMs in the pool.
+
+    \b
+    Examples:
+        $ harness pool status
+        $ harness --json pool status
+    """
+    app_ctx: AppContext = ctx.obj
+    log = app_ctx.logger
+    try:
+        vms = PoolManager(app_ctx.config, verbose=app_ctx.verbose).status()
+    except MissingDependencyError as e:
+        log.error(f"Missing dependencies: {', '.join(e.dependencies)}")
+        raise typer.Exit(code=ExitCode.CONFIG) from e
+
+    if app_ctx.json_output:
+        print_json({"vms": [asdict(vm) for vm in vms]})
+        return
+
+    log.header("Claude VM Pool")
+    if not vms:
+        log.bullet("Empty (run: harness pool fill)")
+        return
+    now = time.time()
+    for vm in vms:
+        since = f"{(now - vm.updated_at) / 60:.0f} min" if vm.updated_at else "?"
+        owner = f" by {vm.claimed_by}" if vm.claimed_by else ""
+        log.bullet(f"{vm.name} (ID: {vm.vm_id}): {vm.state}{owner}, {vm.ip or '-'} ({since})")
+
+
+def pool_claim(
+    ctx: typer.Context,
+    neo4j_ip: Annotated[
+        Optional[str],
+        typer.Option(
+            "--neo4j-ip",
+            help="Override Neo4j server IP address.",
+        ),
+    ] = None,
+    no_refill: Annotated[
+        bool,
+        typer.Option(
+            "--no-refill",
+            help="Do not start a background fill to replace the VM.",
+        ),
+    ] = False,
+) -> None:
+    """Claim a ready VM from the pool.
+
+    Starts the VM, applies the host-specific settings (GitHub token, Neo4j
+    password, Claude settings, MCP servers) and prints its address.
+
+    \b
+    Environment Variables:
+        NEO4J_PASSWORD    Password for Neo4j MCP connection
+        ANSIBLE_GH_TOKEN  GitHub token for gh CLI authentication
+
+    \b
+    Examples:
+        $ harness pool claim
+        $ harness --json pool claim
+    """
+    app_ctx: AppContext = ctx.obj
+    try:
+        manager = PoolManager(app_ctx.config, verbose=app_ctx.verbose, neo4j_ip=neo4j_ip)
+        _finish(app_ctx, manager.claim(refill=not no_refill), "claim")
+    except MissingDependencyError as e:
+        app_ctx.logger.error(f"Missing dependencies: {', '.join(e.dependencies)}")
+        raise typer.Exit(code=ExitCode.CONFIG) from e
+
+
+def pool_release(
+    ctx: typer.Context,
+    names: Annotated[
+        list[str],
+        typer.Argument(help="Pool VMs to delete."),
+    ],
+    no_refill: Annotated[
+        bool,
+        typer.Option(
+            "--no-refill",
+            help="Do not start a background fill afterwards.",
+        ),
+    ] = False,
+) -> None:
+    """Delete claimed pool VMs that are no longer needed.
+
+    \b
+    Examples:
+        $ harness pool release claude-pool-1
+    """
+    app_ctx: AppContext = ctx.obj
+    try:
+        manager = PoolManager(app_ctx.config, verbose=app_ctx.verbose)
+        _finish(app_ctx, manager.release(names, refill=not no_refill), "release")
+    except MissingDependencyError as e:
+        app_ctx.logger.error(f"Missing dependencies: {', '.join(e.dependencies)}")
+        raise typer.Exit(code=ExitCode.CONFIG) from e
@@ -8,7 +8,7 @@ import typer
 
 from harness.core.context import AppContext
 from harness.core.exitcodes import ExitCode
-from harness.core.runner import MissingDependencyError
+from harness.core.runner import MissingDependencyError, usage_log
 from harness.deployers import ClaudeVMsDeployer
 
 
@@ -81,6 +81,20 @@ def vms(
             help="Show Terraform plan without applying changes.",
         ),
     ] = False,
+    upgrade: Annotated[
+        bool,
+        typer.Option(
+            "--upgrade",
+            help="Upgrade OpenTofu providers (tofu init -upgrade).",
+        ),
+    ] = False,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume",
+            help="Skip phases that already completed with unchanged inputs.",
+        ),
+    ] = False,
 ) -> None:
     """Deploy or destroy Claude development VMs.
 
@@ -109,7 +123,16 @@ def vms(
 
         # Deploy without OS hardening (faster, less secure)
         $ harness vms --skip-hardening
+
+        # Grow or shrink an existing fleet (see: harness vms scale --help)
+        $ harness vms scale --to 5
+
+        # Retry after a failure, skipping phases that already completed
+        $ harness vms --resume
     """
+    if ctx.invoked_subcommand is not None:
+        return
+
     app_ctx: AppContext = ctx.obj
     log = app_ctx.logger
 
@@ -121,6 +144,7 @@ def vms(
             prefix=prefix,
             start_id=start_id,
             neo4j_ip=neo4j_ip,
+            upgrade=upgrade,
         )
 
         if destroy:
@@ -132,6 +156,7 @@ def vms(
                 skip_provision=skip_provision,
                 skip_configure=skip_configure,
                 skip_hardening=skip_hardening,
+                resume=resume,
             )
 
         action = "destroy" if destroy else ("plan" if plan_only else "deploy")
@@ -142,6 +167,7 @@ def vms(
                 "component": "claude-vms",
                 "action": action,
                 "count": count or app_ctx.config.claude_vms.default_count,
+                "resources": usage_log.summary(),
             })
             log.flush_json()
 
@@ -152,3 +178,175 @@ def vms(
     except MissingDependencyError as e:
         log.error(f"Missing dependencies: {', '.join(e.dependencies)}")
         raise typer.Exit(code=ExitCode.CONFIG)
+
+
+def vms_scale(
+    ctx: typer.Context,
+    to: Annotated[
+        Optional[int],
+        typer.Option(
+            "--to",
+            "-t",
+            help="Desired number of VMs.",
+        ),
+    ] = None,
+    remove: Annotated[
+        Optional[list[str]],
+        typer.Option(
+            "--remove",
+            "-r",
+            help="Name of a VM to remove (repeatable).",
+        ),
+    ] = None,
+    prefix: Annotated[
+        Optional[str],
+        typer.Option(
+            "--prefix",
+            "-p",
+            help="VM name prefix.",
+        ),
+    ] = None,
+    start_id: Annotated[
+        Optional[int],
+        typer.Option(
+            "--start-id",
+            "-s",
+            help="Starting VM ID.",
+        ),
+    ] = None,
+    neo4j_ip: Annotated[
+        Optional[str],
+        typer.Option(
+            "--neo4j-ip",
+            help="Override Neo4j server IP address.",
+        ),
+    ] = None,
+    skip_configure: Annotated[
+        bool,
+        typer.Option(
+            "--skip-configure",
+            help="Skip Ansible configuration of new VMs.",
+        ),
+    ] = False,
+    skip_hardening: Annotated[
+        bool,
+        typer.Option(
+            "--skip-hardening",
+            help="Skip OS hardening roles.",
+        ),
+    ] = False,
+) -> None:
+    """Add or remove Claude VMs without touching the rest of the fleet.
+
+    The change is computed against the current OpenTofu state. Only the
+    added or removed VMs are planned and applied, and only new VMs are
+    configured with Ansible.
+
+    \b
+    Examples:
+        # Grow (or shrink) the fleet to 5 VMs
+        $ harness vms scale --to 5
+
+        # Remove a specific VM
+        $ harness vms scale --remove claude-dev-3
+    """
+    app_ctx: AppContext = ctx.obj
+    log = app_ctx.logger
+
+    if to is None and not remove:
+        log.error("Specify --to and/or --remove")
+        raise typer.Exit(code=ExitCode.FAILURE)
+
+    try:
+        deployer = ClaudeVMsDeployer(
+            app_ctx.config,
+            verbose=app_ctx.verbose,
+            prefix=prefix,
+            start_id=start_id,
+            neo4j_ip=neo4j_ip,
+        )
+        result = deployer.scale(
+            to=to,
+            remove=remove,
+            skip_configure=skip_configure,
+            skip_hardening=skip_hardening,
+        )
+
+        if app_ctx.json_output:
+            log.set_result({
+                "success": result.success,
+                "message": result.message,
+                "component": "claude-vms",
+                "action": "scale",
+                **(result.details or {}),
+                "resources": usage_log.summary(),
+            })
+            log.flush_json()
+
+        if not result.success:
+            log.error(result.message)
+            raise typer.Exit(code=ExitCode.FAILURE)
+
+    except MissingDependencyError as e:
+        log.error(f"Missing dependencies: {', '.join(e.dependencies)}")
+        raise typer.Exit(code=ExitCode.CONFIG) from e
+
+
+def vms_reset(
+    ctx: typer.Context,
+    names: Annotated[
+        Optional[list[str]],
+        typer.Argument(help="VMs to reset (default: all in the inventory)."),
+    ] = None,
+    no_wait: Annotated[
+        bool,
+        typer.Option(
+            "--no-wait",
+            help="Don't wait for the VMs to accept SSH again.",
+        ),
+    ] = False,
+) -> None:
+    """Roll Claude VMs back to their freshly configured state.
+
+    Each VM is snapshotted (claude_vms.snapshot) right after Ansible
+    configures it. Reset rolls the VMs back to that snapshot in parallel
+    and starts them, which takes seconds instead of a destroy and full
+    redeploy.
+
+    \b
+    Environment Variables:
+        TF_VAR_proxmox_api_token  Proxmox API token (required)
+
+    \b
+    Examples:
+        # Reset the whole fleet
+        $ harness vms reset
+
+        # Reset specific VMs
+        $ harness vms reset claude-dev-2 claude-dev-3
+    """
+    app_ctx: AppContext = ctx.obj
+    log = app_ctx.logger
+
+    try:
+        deployer = ClaudeVMsDeployer(app_ctx.config, verbose=app_ctx.verbose)
+        result = deployer.reset(names=names, wait=not no_wait)
+
+        if app_ctx.json_output:
+            log.set_result({
+                "success": result.success,
+                "message": result.message,
+                "component": "claude-vms",
+                "action": "reset",
+                **(result.details or {}),
+                "resources": usage_log.summary(),
+            })
+            log.flush_json()
+
+        if not result.success:
+            log.error(result.message)
+            raise typer.Exit(code=ExitCode.FAILURE)
+
+    except MissingDependencyError as e:
+        log.error(f"Missing dependencies: {', '.join(e.dependencies)}")
+        raise typer.Exit(code=ExitCode.CONFIG) from e
@@ -12,9 +12,16 @@ from harness.core.exitcodes import (
     UsageError,
 )
 from harness.core.logger import console, log
-from harness.core.runner import CommandRunner, run_command
+from harness.core.runner import (
+    AsyncCommandRunner,
+    CommandRunner,
+    ResourceUsage,
+    run_command,
+    usage_log,
+)
 
 __all__ = [
+    "AsyncCommandRunner",
     "CLIError",
     "CommandRunner",
     "Config",
@@ -22,6 +29,7 @@ __all__ = [
     "DataError",
     "ExitCode",
     "PermissionError",
+    "ResourceUsage",
     "ServiceUnavailableError",
     "TemporaryError",
     "UsageError",
@@ -29,4 +37,5 @@ __all__ = [
     "load_config",
     "log",
     "run_command",
+    "usage_log",
 ]
@@ -5,10 +5,15 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import yaml
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from harness.core.ipam import IPAllocator
+
 
 def get_project_root() -> Path:
     """Get the project root directory (claude-code-harness)."""
@@ -120,19 +125,35 @@ class ClaudeVMsConfig:
     start_id: int
     default_count: int
     prefix: str
+    # Concurrent ansible-playbook runs while VMs come up, and seconds a run
+    # queued behind busy ones waits for more ready VMs to join it
+    configure_concurrency: int = 4
+    configure_batch_window: float = 5.0
+    # Template to clone; None uses the latest baked image, then terraform.tfvars
+    template_id: int | None = None
+    # Snapshot taken after configuration, for `harness vms reset`; None disables it
+    snapshot: str | None = "harness-configured"
 
     def generate_vms(
         self,
         count: int | None = None,
         prefix: str | None = None,
         start_id: int | None = None,
-    ) -> dict[str, dict[str, int]]:
+        allocator: IPAllocator | None = None,
+        indices: Iterable[int] | None = None,
+        reserve: bool = True,
+    ) -> dict[str, dict[str, Any]]:
         """Generate VM configuration dictionary for OpenTofu.
 
         Args:
             count: Number of VMs. Defaults to default_count.
             prefix: VM name prefix. Defaults to configured prefix.
             start_id: Starting VM ID. Defaults to configured start_id.
+            allocator: Static IP allocator. If None, VMs use DHCP.
+            indices: Explicit 1-based VM numbers (e.g. after removing a VM
+                from the middle of the fleet). Overrides count.
+            reserve: Lease the static addresses. When False, addresses are
+                only previewed and no lease is written.
 
         Returns:
             Dictionary mapping VM names to their configurations.
@@ -141,10 +162,17 @@ class ClaudeVMsConfig:
         prefix = prefix or self.prefix
         start_id = start_id or self.start_id
 
-        return {
-            f"{prefix}-{i}": {"vm_id": start_id + i - 1} for i in range(1, count + 1)
+        numbers = sorted(set(indices)) if indices is not None else range(1, count + 1)
+        vms: dict[str, dict[str, Any]] = {
+            f"{prefix}-{i}": {"vm_id": start_id + i - 1} for i in numbers
         }
 
+        if allocator is not None:
+            for name, ip_address in allocator.allocate(vms, reserve=reserve).items():
+                vms[name]["ip_address"] = ip_address
+
+        return vms
+
 
 @dataclass
 class NetworkConfig:
@@ -153,6 +181,8 @@ class NetworkConfig:
     subnet: str
     gateway: str
     bridge: str
+    # Inclusive 'first-last' range for static Claude VM addresses; None uses DHCP
+    static_range: str | None = None
 
 
 @dataclass
@@ -162,6 +192,30 @@ class ProxmoxConfig:
     node: str
     template_id: int
     datastore_id: str
+    # API URL for direct calls; defaults to TF_VAR_proxmox_endpoint / terraform.tfvars
+    endpoint: str | None = None
+
+
+@dataclass
+class ImageConfig:
+    """Golden image baking configuration."""
+
+    # Baked templates get the first free VM ID at or above this
+    template_id_start: int = 9000
+    name_prefix: str = "claude-golden"
+    # Address for the VM being baked; None uses DHCP and the guest agent
+    ip_address: str | None = None
+
+
+@dataclass
+class PoolConfig:
+    """Warm pool of configured, stopped Claude VMs."""
+
+    size: int = 2
+    prefix: str = "claude-pool"
+    # Pool VMs use IDs start_id .. start_id + max_size - 1
+    start_id: int = 500
+    max_size: int = 20
 
 
 @dataclass
@@ -172,6 +226,24 @@ class SSHConfig:
     timeout: int
     retry_interval: int
     cloud_init_user: str = "dmg"
+    max_concurrency: int = 20
+    initial_interval: float = 1.0
+    backoff_factor: float = 1.5
+
+
+@dataclass
+class TofuConfig:
+    """OpenTofu configuration."""
+
+    # Parallel resource operations for apply/destroy: a fixed number or "adaptive"
+    parallelism: int | str = "adaptive"
+    min_parallelism: int = 1
+    max_parallelism: int = 8
+
+    @property
+    def adaptive(self) -> bool:
+        """Whether parallelism is learned from previous runs."""
+        return self.parallelism == "adaptive"
 
 
 @dataclass
@@ -184,6 +256,9 @@ class Config:
     network: NetworkConfig
     proxmox: ProxmoxConfig
     ssh: SSHConfig
+    tofu: TofuConfig = field(default_factory=TofuConfig)
+    image: ImageConfig = field(default_factory=ImageConfig)
+    pool: PoolConfig = field(default_factory=PoolConfig)
     _raw: dict[str, Any] = field(default_factory=dict, repr=False)
 
     @classmethod
@@ -205,6 +280,9 @@ class Config:
             network=NetworkConfig(**raw["network"]),
             proxmox=ProxmoxConfig(**raw["proxmox"]),
             ssh=SSHConfig(**raw["ssh"]),
+            tofu=TofuConfig(**raw.get("tofu", {})),
+            image=ImageConfig(**raw.get("image", {})),
+            pool=PoolConfig(**raw.get("pool", {})),
             _raw=raw,
         )
 
@@ -218,6 +296,23 @@ class Config:
         """Get orchestration directory."""
         return get_orchestration_dir()
 
+    @property
+    def state_dir(self) -> Path:
+        """Get the directory for harness state (leases, caches, journals)."""
+        return self.orchestration_dir / ".harness"
+
+    @property
+    def cache_dir(self) -> Path:
+        """Get the per-user cache directory shared across checkouts.
+
+        Uses ``HARNESS_CACHE_DIR`` if set, otherwise ``$XDG_CACHE_HOME/harness``
+        (defaulting to ~/.cache/harness).
+        """
+        if override := os.environ.get("HARNESS_CACHE_DIR"):
+            return Path(override).expanduser()
+        xdg = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+        return Path(xdg).expanduser() / "harness"
+
     @property
     def neo4j_dir(self) -> Path:
         """Get Neo4j component directory."""
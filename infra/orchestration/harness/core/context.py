@@ -45,11 +45,11 @@ class AppContext:
             Configured AppContext instance.
         """
         config = Config.from_yaml()
-        logger = Logger(json_mode=json_output)
 
+        # The shared logger, so runner and deployer output follows --json too
         return cls(
             config=config,
-            logger=logger,
+            logger=log,
             verbose=verbose,
             json_output=json_output,
         )
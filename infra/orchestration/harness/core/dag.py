@@ -0,0 +1,205 @@
+"""Dependency-graph execution of deployment phases."""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from harness.core.logger import Logger, log
+
+# Node outcomes
+OK = "ok"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+@dataclass
+class DagNode:
+    """A unit of work and the nodes it waits for."""
+
+    name: str
+    fn: Callable[[], None]
+    deps: tuple[str, ...] = ()
+
+
+@dataclass
+class NodeResult:
+    """Outcome and timing of one node (times are seconds since the run started)."""
+
+    name: str
+    status: str
+    deps: tuple[str, ...] = ()
+    started: float = 0.0
+    finished: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the node completed successfully."""
+        return self.status == OK
+
+    @property
+    def duration(self) -> float:
+        """Seconds the node ran for."""
+        return self.finished - self.started
+
+
+@dataclass
+class DagResult:
+    """Results of a graph run."""
+
+    nodes: dict[str, NodeResult] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        """Whether every node completed successfully."""
+        return all(r.ok for r in self.nodes.values())
+
+    @property
+    def failed(self) -> list[NodeResult]:
+        """Nodes that raised."""
+        return [r for r in self.nodes.values() if r.status == FAILED]
+
+    @property
+    def skipped(self) -> list[NodeResult]:
+        """Nodes not run because a dependency failed."""
+        return [r for r in self.nodes.values() if r.status == SKIPPED]
+
+    def critical_path(self) -> list[NodeResult]:
+        """Get the chain of nodes that determined the total run time.
+
+        Starts from the node that finished last and repeatedly steps to the
+        dependency that finished last, i.e. the one it was actually waiting on.
+
+        Returns:
+            Nodes on the critical path, first to last.
+        """
+        ran = {name: r for name, r in self.nodes.items() if r.status != SKIPPED}
+        if not ran:
+            return []
+
+        node = max(ran.values(), key=lambda r: r.finished)
+        path = [node]
+        while True:
+            deps = [ran[d] for d in node.deps if d in ran]
+            if not deps:
+                break
+            node = max(deps, key=lambda r: r.finished)
+            path.append(node)
+        return list(reversed(path))
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "success": self.success,
+            "elapsed": round(self.elapsed, 3),
+            "critical_path": [r.name for r in self.critical_path()],
+            "nodes": {
+                name: {
+                    "status": r.status,
+                    "started": round(r.started, 3),
+                    "duration": round(r.duration, 3),
+                    "error": r.error,
+                }
+                for name, r in self.nodes.items()
+            },
+        }
+
+
+class DagExecutor:
+    """Runs callables on a thread pool as soon as their dependencies finish.
+
+    Nodes must be added after their dependencies, which keeps the graph
+    acyclic. When several nodes are ready at once they start in the order
+    they were added, so with ``max_workers=1`` the run is sequential in
+    insertion order. A failed node does not stop independent branches;
+    everything downstream of it is skipped.
+    """
+
+    def __init__(self, max_workers: int | None = None, logger: Logger | None = None):
+        """Initialize the executor.
+
+        Args:
+            max_workers: Maximum nodes running at once (default: no limit).
+            logger: Logger for node progress. Defaults to the global logger.
+        """
+        self.max_workers = max_workers
+        self.log = logger or log
+        self._nodes: dict[str, DagNode] = {}
+
+    def __contains__(self, name: str) -> bool:
+        """Whether a node with this name has been added."""
+        return name in self._nodes
+
+    def add(self, name: str, fn: Callable[[], None], deps: Iterable[str] = ()) -> None:
+        """Add a node.
+
+        Args:
+            name: Unique node name.
+            fn: Work to run.
+            deps: Names of nodes that must succeed first.
+
+        Raises:
+            ValueError: If the name is taken or a dependency is unknown.
+        """
+        if name in self._nodes:
+            raise ValueError(f"Duplicate node: {name}")
+        deps = tuple(deps)
+        unknown = [d for d in deps if d not in self._nodes]
+        if unknown:
+            raise ValueError(f"Node {name} depends on unknown node(s): {', '.join(unknown)}")
+        self._nodes[name] = DagNode(name, fn, deps)
+
+    def run(self) -> DagResult:
+        """Run all nodes.
+
+        Returns:
+            DagResult with the outcome and timing of each node.
+        """
+        result = DagResult()
+        pending = dict(self._nodes)
+        running: dict[Future[NodeResult], str] = {}
+        limit = self.max_workers or max(1, len(self._nodes))
+        t0 = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=limit) as pool:
+            while pending or running:
+                for name, node in list(pending.items()):
+                    deps = [result.nodes.get(d) for d in node.deps]
+                    if any(d is not None and not d.ok for d in deps):
+                        del pending[name]
+                        now = time.monotonic() - t0
+                        result.nodes[name] = NodeResult(name, SKIPPED, node.deps, now, now)
+                        self.log.warn(f"[{name}] skipped: a dependency failed")
+                    elif len(running) < limit and all(d is not None for d in deps):
+                        del pending[name]
+                        context = contextvars.copy_context()
+                        running[pool.submit(context.run, self._run_node, node, t0)] = name
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node_result = future.result()
+                    result.nodes[running.pop(future)] = node_result
+
+        result.elapsed = time.monotonic() - t0
+        return result
+
+    def _run_node(self, node: DagNode, t0: float) -> NodeResult:
+        """Run one node and capture its outcome."""
+        started = time.monotonic() - t0
+        self.log.info(f"[{node.name}] started")
+        try:
+            node.fn()
+        except Exception as e:
+            finished = time.monotonic() - t0
+            self.log.error(f"[{node.name}] failed after {finished - started:.1f}s: {e}")
+            return NodeResult(node.name, FAILED, node.deps, started, finished, str(e))
+        finished = time.monotonic() - t0
+        self.log.success(f"[{node.name}] done in {finished - started:.1f}s")
+        return NodeResult(node.name, OK, node.deps, started, finished)
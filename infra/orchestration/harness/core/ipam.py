@@ -0,0 +1,269 @@
+"""Static IP address allocation for Claude VMs."""
+
+from __future__ import annotations
+
+import fcntl
+import ipaddress
+import json
+import os
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+# Lease namespace of the OpenTofu-managed fleet (and of lease files without namespaces)
+DEFAULT_NAMESPACE = "claude-vms"
+
+Leases = dict[str, dict[str, ipaddress.IPv4Address]]
+
+
+class IPAllocator:
+    """Allocates static addresses from a range and keeps leases on disk.
+
+    Leases are keyed by VM name, so a VM that is destroyed and recreated gets
+    the same address back. Addresses in ``reserved`` (gateway, Neo4j, Core
+    Services) are never handed out.
+
+    Callers sharing a lease file (the fleet and the warm pool) each use their
+    own namespace: every lease blocks its address for everyone, but only the
+    owning namespace can reclaim it.
+    """
+
+    def __init__(
+        self,
+        subnet: str,
+        address_range: str,
+        lease_file: Path,
+        reserved: Iterable[str] = (),
+        namespace: str = DEFAULT_NAMESPACE,
+    ):
+        """Initialize the allocator.
+
+        Args:
+            subnet: Network in CIDR notation (e.g. '10.0.70.0/24').
+            address_range: Inclusive range to allocate from (e.g. '10.0.70.100-10.0.70.199').
+            lease_file: JSON file where leases are persisted.
+            reserved: Addresses that must never be allocated.
+            namespace: Owner of the leases this allocator hands out and reclaims.
+
+        Raises:
+            ValueError: If the range is malformed or outside the subnet.
+        """
+        self.network = ipaddress.IPv4Network(subnet, strict=False)
+        self.lease_file = lease_file
+        self.reserved = {ipaddress.IPv4Address(ip) for ip in reserved}
+        self.namespace = namespace
+        self.first, self.last = self._parse_range(address_range)
+
+    @classmethod
+    def from_config(cls, config: Any, namespace: str = DEFAULT_NAMESPACE) -> IPAllocator | None:
+        """Build an allocator from the harness configuration.
+
+        Args:
+            config: Application configuration.
+            namespace: Lease namespace (e.g. 'pool' for warm pool VMs).
+
+        Returns:
+            IPAllocator, or None when no static range is configured (DHCP).
+        """
+        network = config.network
+        if not network.static_range:
+            return None
+        return cls(
+            subnet=network.subnet,
+            address_range=network.static_range,
+            lease_file=config.state_dir / "ipam-leases.json",
+            reserved=[network.gateway, config.neo4j.ip, config.core_services.ip],
+            namespace=namespace,
+        )
+
+    @property
+    def prefixlen(self) -> int:
+        """Prefix length of the subnet."""
+        return self.network.prefixlen
+
+    def allocate(self, names: Iterable[str], reserve: bool = True) -> dict[str, str]:
+        """Assign an address to each VM name, reusing existing leases.
+
+        Leases held by names not in ``names`` are kept so that scaling back up
+        restores the same addresses; they are only reclaimed when the range is
+        exhausted, and only within this allocator's namespace.
+
+        Args:
+            names: VM names that need addresses.
+            reserve: Record the leases. When False, only report the addresses
+                an allocation would assign (e.g. for a plan).
+
+        Returns:
+            Mapping of VM name to address in CIDR notation (e.g. '10.0.70.100/24').
+
+        Raises:
+            ValueError: If the range has no free addresses left.
+        """
+        wanted = list(dict.fromkeys(names))
+
+        with self._locked():
+            all_leases = self._load()
+            leases = all_leases.setdefault(self.namespace, {})
+            foreign = {
+                ip
+                for namespace, held in all_leases.items()
+                if namespace != self.namespace
+                for ip in held.values()
+            }
+            assigned: dict[str, ipaddress.IPv4Address] = {}
+
+            for name in wanted:
+                ip = leases.get(name)
+                if (
+                    ip is not None
+                    and self._allocatable(ip)
+                    and ip not in foreign
+                    and ip not in assigned.values()
+                ):
+                    assigned[name] = ip
+
+            leased = set(leases.values()) | foreign
+            free = (ip for ip in self._candidates() if ip not in leased)
+            stale = [n for n in leases if n not in wanted]
+
+            for name in wanted:
+                if name in assigned:
+                    continue
+                ip = next(free, None)
+                while ip is None and stale:
+                    reclaimed = leases.pop(stale.pop(0))
+                    if (
+                        self._allocatable(reclaimed)
+                        and reclaimed not in foreign
+                        and reclaimed not in assigned.values()
+                    ):
+                        ip = reclaimed
+                if ip is None:
+                    raise ValueError(
+                        f"Static IP range {self.first}-{self.last} is exhausted "
+                        f"({len(wanted)} addresses requested)"
+                    )
+                assigned[name] = ip
+
+            if reserve:
+                leases.update(assigned)
+                self._save(all_leases)
+
+        return {name: f"{assigned[name]}/{self.prefixlen}" for name in wanted}
+
+    def release(self, names: Iterable[str]) -> None:
+        """Drop the leases held by the given VM names.
+
+        Args:
+            names: VM names whose addresses can be reused.
+        """
+        with self._locked():
+            all_leases = self._load()
+            leases = all_leases.get(self.namespace, {})
+            for name in names:
+                leases.pop(name, None)
+            self._save(all_leases)
+
+    def adopt(self, names: Iterable[str]) -> None:
+        """Move the leases of the given VM names from other namespaces into this one.
+
+        Lease files written before namespaces existed hold every lease in the
+        fleet's namespace, including those of warm pool VMs.
+
+        Args:
+            names: VM names owned by this namespace.
+        """
+        names = set(names)
+        with self._locked():
+            all_leases = self._load()
+            moved = {
+                name: held.pop(name)
+                for namespace, held in all_leases.items()
+                if namespace != self.namespace
+                for name in names & set(held)
+            }
+            if moved:
+                all_leases.setdefault(self.namespace, {}).update(moved)
+                self._save(all_leases)
+
+    def leases(self) -> dict[str, str]:
+        """Get this namespace's leases as plain address strings."""
+        return {name: str(ip) for name, ip in self._load().get(self.namespace, {}).items()}
+
+    def _parse_range(
+        self, address_range: str
+    ) -> tuple[ipaddress.IPv4Address, ipaddress.IPv4Address]:
+        """Parse and validate an inclusive 'first-last' address range."""
+        try:
+            first_str, last_str = (part.strip() for part in address_range.split("-", 1))
+            first = ipaddress.IPv4Address(first_str)
+            last = ipaddress.IPv4Address(last_str)
+        except ValueError as e:
+            raise ValueError(f"Invalid static IP range '{address_range}': {e}") from e
+
+        if first > last:
+            raise ValueError(f"Invalid static IP range '{address_range}': first > last")
+        if first not in self.network or last not in self.network:
+            raise ValueError(f"Static IP range '{address_range}' is outside {self.network}")
+        return first, last
+
+    def _allocatable(self, ip: ipaddress.IPv4Address) -> bool:
+        """Whether an address may be handed out."""
+        return (
+            self.first <= ip <= self.last
+            and ip not in self.reserved
+            and ip not in (self.network.network_address, self.network.broadcast_address)
+        )
+
+    def _candidates(self) -> Iterator[ipaddress.IPv4Address]:
+        """Iterate over allocatable addresses in ascending order."""
+        for value in range(int(self.first), int(self.last) + 1):
+            ip = ipaddress.IPv4Address(value)
+            if self._allocatable(ip):
+                yield ip
+
+    def _load(self) -> Leases:
+        """Load leases by namespace, discarding them if they belong to another subnet."""
+        if not self.lease_file.exists():
+            return {}
+        with open(self.lease_file) as f:
+            data = json.load(f)
+        if data.get("subnet") != str(self.network):
+            return {}
+        leases: Leases = {}
+        for key, value in data.get("leases", {}).items():
+            if isinstance(value, str):
+                # Flat lease file from before namespaces: all leases were the fleet's
+                leases.setdefault(DEFAULT_NAMESPACE, {})[key] = ipaddress.IPv4Address(value)
+            else:
+                held = leases.setdefault(key, {})
+                held.update({name: ipaddress.IPv4Address(ip) for name, ip in value.items()})
+        return leases
+
+    def _save(self, leases: Leases) -> None:
+        """Atomically write leases to disk."""
+        data = {
+            "subnet": str(self.network),
+            "leases": {
+                namespace: {name: str(ip) for name, ip in sorted(held.items(), key=lambda i: i[1])}
+                for namespace, held in sorted(leases.items())
+                if held
+            },
+        }
+        tmp = self.lease_file.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.lease_file)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold an exclusive lock on the lease file for read-modify-write."""
+        self.lease_file.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = self.lease_file.with_suffix(".lock")
+        with open(lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
@@ -0,0 +1,158 @@
+"""Deployment journal: completed phases and the inputs they ran with."""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+# Generated or runtime files that are not inputs to a phase
+IGNORED_NAMES = {".terraform", ".harness", "tfplan", ".gitkeep"}
+IGNORED_SUFFIXES = (".tfstate", ".tfstate.backup", ".retry", ".tmp", ".lock")
+
+
+def fingerprint(*inputs: Any) -> str:
+    """Hash the inputs of a phase.
+
+    Paths are hashed by content (directories recursively, skipping
+    generated files such as ``.terraform/`` and state); everything else is
+    hashed as sorted-key JSON.
+
+    Args:
+        *inputs: Files, directories or JSON-serializable values.
+
+    Returns:
+        Hex digest.
+    """
+    digest = hashlib.sha256()
+    for item in inputs:
+        if isinstance(item, Path):
+            _hash_path(digest, item)
+        else:
+            digest.update(json.dumps(item, sort_keys=True, default=str).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _hash_path(digest: Any, path: Path) -> None:
+    """Add a file or directory tree to a digest."""
+    if not path.exists():
+        digest.update(f"missing:{path.name}".encode())
+        return
+    if path.is_file():
+        digest.update(path.read_bytes())
+        return
+
+    for child in sorted(path.rglob("*")):
+        rel = child.relative_to(path)
+        if any(part in IGNORED_NAMES for part in rel.parts) or child.name.endswith(
+            IGNORED_SUFFIXES
+        ):
+            continue
+        if child.is_file():
+            digest.update(f"{rel}\0".encode())
+            digest.update(child.read_bytes())
+
+
+class Journal:
+    """Per-component record of completed deployment phases.
+
+    Each entry stores the fingerprint of the phase's inputs, so a later
+    ``--resume`` run can skip phases that completed with the same inputs.
+    Entries are kept in completion order; starting a phase forgets it and
+    everything recorded after it, since later phases built on its result.
+    Updates are serialized across threads and harness processes with a
+    lock file next to the journal.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize the journal.
+
+        Args:
+            path: JSON file holding the entries.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def completed(self, phase: str, digest: str) -> bool:
+        """Check whether a phase completed with the given input fingerprint.
+
+        Args:
+            phase: Phase name.
+            digest: Current fingerprint of the phase's inputs.
+
+        Returns:
+            True if the phase can be skipped.
+        """
+        entry = self._load().get(phase)
+        return entry is not None and entry.get("fingerprint") == digest
+
+    def begin(self, phase: str) -> None:
+        """Forget a phase and every phase completed after it.
+
+        Args:
+            phase: Phase about to run.
+        """
+        with self._locked():
+            entries = self._load()
+            if phase not in entries:
+                return
+            names = list(entries)
+            self._save({name: entries[name] for name in names[: names.index(phase)]})
+
+    def complete(self, phase: str, digest: str) -> None:
+        """Record a completed phase.
+
+        Args:
+            phase: Phase name.
+            digest: Fingerprint of the inputs it ran with.
+        """
+        with self._locked():
+            entries = self._load()
+            entries.pop(phase, None)
+            entries[phase] = {"fingerprint": digest, "completed_at": round(time.time(), 3)}
+            self._save(entries)
+
+    def reset(self) -> None:
+        """Forget all phases."""
+        with self._locked():
+            self.path.unlink(missing_ok=True)
+
+    def entries(self) -> dict[str, dict[str, Any]]:
+        """Get all entries in completion order."""
+        return self._load()
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        """Load the journal."""
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries: dict[str, dict[str, Any]]) -> None:
+        """Atomically write the journal through a temporary file of its own."""
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.path.parent, prefix=f"{self.path.name}.", suffix=".tmp", delete=False
+        ) as f:
+            json.dump(entries, f, indent=2)
+        os.replace(f.name, self.path)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the journal exclusively for a read-modify-write."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
@@ -137,6 +137,23 @@ class Logger:
             padding = " " * indent
             self._console.print(f"{padding}• {message}")
 
+    def output(self, line: str, stderr: bool = False) -> None:
+        """Echo a line of command output as-is.
+
+        In JSON mode every line goes to stderr so stdout stays valid JSON.
+        """
+        stream = sys.stderr if stderr or self._json_mode else sys.stdout
+        stream.write(line + "\n")
+        stream.flush()
+
+    def event(self, name: str, **data: Any) -> None:
+        """Record a structured event (e.g. a per-host task result).
+
+        Events are only collected in JSON mode; the console shows summaries.
+        """
+        if self._json_mode:
+            self._buffer.add_event("event", name, **data)
+
     def set_result(self, data: dict[str, Any]) -> None:
         """Set structured result data (only used in JSON mode)."""
         self._buffer.set_result(data)
@@ -151,6 +168,11 @@ class Logger:
         """Get the current output buffer."""
         return self._buffer
 
+    def reset(self) -> None:
+        """Return to console mode and drop any buffered JSON output."""
+        self._json_mode = False
+        self._buffer = OutputBuffer()
+
 
 def print_json(data: Any, indent: int | None = 2) -> None:
     """Print data as formatted JSON to stdout.
@@ -2,17 +2,38 @@
 
 from __future__ import annotations
 
+import asyncio
+import codecs
+import contextlib
 import os
+import resource
 import shutil
+import signal
 import subprocess
 import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import IO, TYPE_CHECKING, Any
 
 from harness.core.logger import log
+from harness.core.trace import command_name, span
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import AsyncIterator, Callable, Iterable, Sequence
+    from types import FrameType
+
+# Output kept in memory per stream by streamed commands (see run_command)
+TAIL_BYTES = 64 * 1024
+
+# AsyncCommandRunner reads pipes in chunks and splits lines longer than this
+READ_CHUNK = 64 * 1024
+MAX_LINE_CHARS = 64 * 1024
+
+# Seconds a stopped async command gets to exit after SIGTERM before SIGKILL
+KILL_GRACE = 5.0
 
 
 class CommandError(Exception):
@@ -24,11 +45,13 @@ class CommandError(Exception):
         returncode: int,
         stdout: str | None = None,
         stderr: str | None = None,
+        usage: ResourceUsage | None = None,
     ):
         self.command = command
         self.returncode = returncode
         self.stdout = stdout
         self.stderr = stderr
+        self.usage = usage
         super().__init__(f"Command failed with exit code {returncode}: {command}")
 
 
@@ -54,6 +77,169 @@ def check_dependencies(dependencies: Sequence[str]) -> None:
         raise MissingDependencyError(missing)
 
 
+@dataclass
+class ResourceUsage:
+    """CPU, memory and block I/O used by one child process (from wait4)."""
+
+    user: float
+    system: float
+    max_rss_kb: int
+    block_in: int
+    block_out: int
+
+    @classmethod
+    def from_rusage(cls, rusage: resource.struct_rusage) -> ResourceUsage:
+        """Build from a struct_rusage; max RSS is normalized to KiB (bytes on macOS)."""
+        max_rss = rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+        return cls(
+            user=round(rusage.ru_utime, 3),
+            system=round(rusage.ru_stime, 3),
+            max_rss_kb=max_rss,
+            block_in=rusage.ru_inblock,
+            block_out=rusage.ru_oublock,
+        )
+
+    @property
+    def cpu(self) -> float:
+        """User plus system CPU seconds."""
+        return round(self.user + self.system, 3)
+
+
+class CommandResult(subprocess.CompletedProcess[str]):
+    """CompletedProcess with the child's resource usage, if it was collected."""
+
+    def __init__(
+        self,
+        args: list[str],
+        returncode: int,
+        stdout: str | None = None,
+        stderr: str | None = None,
+        usage: ResourceUsage | None = None,
+    ):
+        super().__init__(args, returncode, stdout=stdout, stderr=stderr)
+        self.usage = usage
+
+
+@dataclass
+class CommandUsage:
+    """One finished command and what it cost."""
+
+    command: str
+    returncode: int
+    elapsed: float
+    usage: ResourceUsage | None
+
+
+class UsageLog:
+    """Resource usage of the commands run by this process, for sizing the control host."""
+
+    def __init__(self) -> None:
+        """Initialize an empty log."""
+        self.commands: list[CommandUsage] = []
+        self._lock = threading.Lock()
+
+    def record(self, entry: CommandUsage) -> None:
+        """Add a finished command."""
+        with self._lock:
+            self.commands.append(entry)
+
+    def summary(self, top: int = 5) -> dict[str, Any]:
+        """Summarize usage: totals, peak RSS and the most CPU-hungry commands.
+
+        Commands run through AsyncCommandRunner (the SSH fan-out) have no
+        rusage; they count towards ``commands`` and ``elapsed`` only, and
+        ``unmeasured`` says how many of them the totals leave out.
+
+        Args:
+            top: Number of commands listed by CPU time.
+
+        Returns:
+            JSON-serializable summary.
+        """
+        with self._lock:
+            entries = list(self.commands)
+        measured = [e for e in entries if e.usage is not None]
+        usages = [e.usage for e in measured if e.usage is not None]
+        heaviest = sorted(measured, key=lambda e: e.usage.cpu if e.usage else 0, reverse=True)
+        return {
+            "commands": len(entries),
+            "unmeasured": len(entries) - len(measured),
+            "elapsed": round(sum(e.elapsed for e in entries), 3),
+            "user": round(sum(u.user for u in usages), 3),
+            "system": round(sum(u.system for u in usages), 3),
+            "max_rss_kb": max((u.max_rss_kb for u in usages), default=0),
+            "block_in": sum(u.block_in for u in usages),
+            "block_out": sum(u.block_out for u in usages),
+            "top_cpu": [
+                {"command": e.command, "elapsed": e.elapsed, **asdict(e.usage)}
+                for e in heaviest[:top]
+                if e.usage is not None
+            ],
+        }
+
+    def clear(self) -> None:
+        """Forget recorded commands."""
+        with self._lock:
+            self.commands.clear()
+
+
+# Every command run through run_command or AsyncCommandRunner in this process
+usage_log = UsageLog()
+
+
+def _record_usage(
+    cmd: Sequence[str], returncode: int, started: float, usage: ResourceUsage | None
+) -> None:
+    """Add a finished command to the usage log and the logger's events."""
+    entry = CommandUsage(
+        command=" ".join(cmd),
+        returncode=returncode,
+        elapsed=round(time.monotonic() - started, 3),
+        usage=usage,
+    )
+    usage_log.record(entry)
+    log.event(
+        "command",
+        command=entry.command,
+        returncode=returncode,
+        elapsed=entry.elapsed,
+        **(asdict(usage) if usage is not None else {}),
+    )
+
+
+# CPython's POSIX Popen reaps children in the private _try_wait; where it
+# doesn't (or there is no wait4), _Process is plain Popen and reports no usage
+_HOOK_TRY_WAIT = hasattr(os, "wait4") and callable(getattr(subprocess.Popen, "_try_wait", None))
+
+
+class _Process(subprocess.Popen[str]):
+    """Popen that keeps the child's resource usage when it is reaped.
+
+    Popen reaps the child in _try_wait; doing that with os.wait4 instead of
+    os.waitpid returns the child's own rusage, which getrusage(RUSAGE_CHILDREN)
+    can't give while other threads run commands too.
+    """
+
+    rusage: resource.struct_rusage | None = None
+
+    if _HOOK_TRY_WAIT:
+
+        def _try_wait(self, wait_flags: int) -> tuple[int, int]:
+            try:
+                pid, status, rusage = os.wait4(self.pid, wait_flags)
+            except ChildProcessError:
+                # Same as Popen: the child was reaped elsewhere (e.g. SIGCHLD ignored)
+                return self.pid, 0
+            if pid == self.pid:
+                self.rusage = rusage
+            return pid, status
+
+    @property
+    def usage(self) -> ResourceUsage | None:
+        """Resource usage once the child has exited."""
+        return ResourceUsage.from_rusage(self.rusage) if self.rusage is not None else None
+
+
 def run_command(
     cmd: Sequence[str],
     cwd: Path | None = None,
@@ -62,9 +248,18 @@ def run_command(
     env: dict[str, str] | None = None,
     quiet: bool = False,
     timeout: int | None = None,
+    on_line: Callable[[str], None] | None = None,
+    stream: bool = False,
+    log_file: Path | None = None,
+    tail_bytes: int = TAIL_BYTES,
 ) -> subprocess.CompletedProcess[str]:
     """Run a command with proper error handling.
 
+    Without capture_output the command inherits the terminal, unless it is
+    streamed: then stdout and stderr are read concurrently, echoed line by
+    line through the logger and written to log_file, and only the last
+    tail_bytes of each are kept in memory.
+
     Args:
         cmd: Command and arguments as a sequence.
         cwd: Working directory for the command.
@@ -73,42 +268,307 @@ def run_command(
         env: Additional environment variables (merged with current env).
         quiet: If True, suppress error logging on failure.
         timeout: Maximum seconds to wait for command completion.
+        on_line: Called with each line of combined stdout/stderr. Implies
+            stream. Ignored with capture_output.
+        stream: Stream the output instead of inheriting the terminal.
+            Ignored with capture_output.
+        log_file: File that receives the full streamed output (overwritten).
+            Implies stream. Ignored with capture_output.
+        tail_bytes: Output kept per stream when streaming, returned in the
+            CompletedProcess and CommandError stdout/stderr.
 
     Returns:
-        CompletedProcess instance with command results.
+        CommandResult (a CompletedProcess) with the command's results and
+        resource usage. Each command is also added to usage_log and logged
+        as a 'command' event.
 
     Raises:
         CommandError: If check=True and command fails.
         subprocess.TimeoutExpired: If command exceeds timeout.
     """
+    started = time.monotonic()
+    with span(
+        command_name(cmd), cat="command", command=" ".join(cmd), cwd=str(cwd or Path.cwd())
+    ) as attrs:
+        try:
+            result = _run_command(
+                cmd,
+                cwd,
+                check,
+                capture_output,
+                env,
+                quiet,
+                timeout,
+                on_line,
+                stream,
+                log_file,
+                tail_bytes,
+            )
+        except CommandError as e:
+            _record_usage(cmd, e.returncode, started, e.usage)
+            if e.usage is not None:
+                attrs.update(asdict(e.usage))
+            raise
+        _record_usage(cmd, result.returncode, started, result.usage)
+        attrs["exit_code"] = result.returncode
+        if result.usage is not None:
+            attrs.update(asdict(result.usage))
+        return result
+
+
+def _run_command(
+    cmd: Sequence[str],
+    cwd: Path | None,
+    check: bool,
+    capture_output: bool,
+    env: dict[str, str] | None,
+    quiet: bool,
+    timeout: int | None,
+    on_line: Callable[[str], None] | None,
+    stream: bool,
+    log_file: Path | None,
+    tail_bytes: int,
+) -> CommandResult:
+    """Run a command (see run_command)."""
     run_env = os.environ.copy()
     if env:
         run_env.update(env)
 
-    try:
-        result = subprocess.run(
-            list(cmd),
-            cwd=cwd,
-            check=check,
-            capture_output=capture_output,
-            text=True,
-            env=run_env,
-            timeout=timeout,
-        )
-        return result
-    except subprocess.CalledProcessError as e:
+    if not capture_output and (stream or on_line is not None or log_file is not None):
+        return _run_stream(cmd, cwd, check, run_env, quiet, timeout, on_line, log_file, tail_bytes)
+
+    pipe = subprocess.PIPE if capture_output else None
+    with _Process(list(cmd), cwd=cwd, stdout=pipe, stderr=pipe, text=True, env=run_env) as process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            raise
+
+    if check and process.returncode != 0 and not quiet:
+        log.error(f"Command failed: {' '.join(cmd)}")
+        if stdout:
+            print(stdout)
+        if stderr:
+            print(stderr, file=sys.stderr)
+    return _completed(cmd, process.returncode, check, True, stdout, stderr, usage=process.usage)
+
+
+class OutputTail:
+    """The last lines of a stream, bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes: int = TAIL_BYTES):
+        """Initialize the tail.
+
+        Args:
+            max_bytes: Maximum size of the kept lines.
+        """
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._lines: deque[tuple[str, int]] = deque()
+        self._size = 0
+
+    def append(self, line: str) -> None:
+        """Add a line (including its newline), dropping the oldest lines to fit."""
+        data = line.encode(errors="replace")
+        if len(data) > self.max_bytes:
+            line = data[-self.max_bytes :].decode(errors="ignore")
+            data = line.encode()
+        self._lines.append((line, len(data)))
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, size = self._lines.popleft()
+            self._size -= size
+            self.dropped += 1
+
+    @property
+    def size(self) -> int:
+        """Bytes currently kept."""
+        return self._size
+
+    def text(self) -> str:
+        """Kept output as one string."""
+        return "".join(line for line, _ in self._lines)
+
+
+class _OutputSink:
+    """Hands streamed output lines to the logger, a log file, a callback and tails."""
+
+    def __init__(
+        self,
+        on_line: Callable[[str], None] | None,
+        log_file: Path | None,
+        tail_bytes: int,
+    ):
+        self.on_line = on_line
+        self.log_file = log_file
+        self.tails = {"stdout": OutputTail(tail_bytes), "stderr": OutputTail(tail_bytes)}
+        self._handle: IO[str] | None = None
+
+    def __enter__(self) -> _OutputSink:
+        if self.log_file is not None:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.log_file, "w", buffering=1)  # noqa: SIM115
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def write(self, line: str, name: str) -> None:
+        """Handle one line (without its newline) from 'stdout' or 'stderr'."""
+        self.tails[name].append(line + "\n")
+        log.output(line, stderr=name == "stderr")
+        if self._handle is not None:
+            self._handle.write(line + "\n")
+        if self.on_line is not None:
+            try:
+                self.on_line(line)
+            except Exception as e:
+                log.warn(f"Output handler failed on {line!r}: {e}")
+
+
+def _completed(
+    cmd: Sequence[str],
+    returncode: int,
+    check: bool,
+    quiet: bool,
+    stdout: str | None,
+    stderr: str | None,
+    log_file: Path | None = None,
+    usage: ResourceUsage | None = None,
+) -> CommandResult:
+    """Build the result of a finished command, raising CommandError on failure."""
+    if check and returncode != 0:
         if not quiet:
             log.error(f"Command failed: {' '.join(cmd)}")
-            if e.stdout:
-                print(e.stdout)
-            if e.stderr:
-                print(e.stderr, file=sys.stderr)
+            if log_file is not None:
+                log.bullet(f"Full output: {log_file}")
         raise CommandError(
             command=" ".join(cmd),
-            returncode=e.returncode,
-            stdout=e.stdout if capture_output else None,
-            stderr=e.stderr if capture_output else None,
-        ) from e
+            returncode=returncode,
+            stdout=stdout,
+            stderr=stderr,
+            usage=usage,
+        )
+    return CommandResult(list(cmd), returncode, stdout=stdout, stderr=stderr, usage=usage)
+
+
+# Process groups of streamed commands still running. They are outside the
+# terminal's foreground group, so Ctrl-C reaches them only by forwarding.
+_live_groups: set[int] = set()
+_live_groups_lock = threading.Lock()
+
+
+def interrupt_commands(sig: signal.Signals = signal.SIGINT) -> None:
+    """Signal the process group of every streamed command still running, in any thread.
+
+    Args:
+        sig: Signal to send.
+    """
+    with _live_groups_lock:
+        groups = list(_live_groups)
+    for pgid in groups:
+        with contextlib.suppress(ProcessLookupError, PermissionError):
+            os.killpg(pgid, sig)
+
+
+def forward_interrupts() -> None:
+    """Pass Ctrl-C on to streamed commands started from any thread.
+
+    Installs a SIGINT handler that signals every running command's process
+    group, then raises KeyboardInterrupt in the main thread as usual. Must be
+    called from the main thread.
+    """
+    signal.signal(signal.SIGINT, _forward_interrupt)
+
+
+def _forward_interrupt(signum: int, frame: FrameType | None) -> None:
+    """SIGINT handler installed by forward_interrupts."""
+    interrupt_commands()
+    signal.default_int_handler(signum, frame)
+
+
+def _run_stream(
+    cmd: Sequence[str],
+    cwd: Path | None,
+    check: bool,
+    env: dict[str, str],
+    quiet: bool,
+    timeout: int | None,
+    on_line: Callable[[str], None] | None,
+    log_file: Path | None,
+    tail_bytes: int,
+) -> CommandResult:
+    """Run a command, streaming both pipes to the logger, a log file and a callback.
+
+    The command runs in its own session so a timeout can kill the whole
+    process group: forked children (e.g. Ansible workers) holding the pipes
+    open would otherwise keep the readers waiting long after the timeout.
+    The terminal's Ctrl-C is forwarded to it from the calling thread, or by
+    the handler of ``forward_interrupts`` when it runs in a worker thread.
+    """
+    lock = threading.Lock()
+    timer: threading.Timer | None = None
+    timed_out = threading.Event()
+
+    with _OutputSink(on_line, log_file, tail_bytes) as sink:
+
+        def pump(pipe: IO[str], name: str) -> None:
+            for line in pipe:
+                with lock:
+                    sink.write(line.rstrip("\n"), name)
+            pipe.close()
+
+        process = _Process(
+            list(cmd),
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+            bufsize=1,
+            env=env,
+            start_new_session=True,
+        )
+
+        with _live_groups_lock:
+            _live_groups.add(process.pid)
+
+        def expire() -> None:
+            timed_out.set()
+            _signal_group(process, signal.SIGKILL)
+
+        readers = [
+            threading.Thread(target=pump, args=(pipe, name), daemon=True)
+            for pipe, name in ((process.stdout, "stdout"), (process.stderr, "stderr"))
+        ]
+        timer = threading.Timer(timeout, expire) if timeout else None
+        for thread in readers:
+            thread.start()
+        if timer is not None:
+            timer.start()
+        try:
+            for thread in readers:
+                thread.join()
+            returncode = process.wait()
+        except KeyboardInterrupt:
+            # Outside the terminal's process group, so pass Ctrl-C on (once)
+            if signal.getsignal(signal.SIGINT) is not _forward_interrupt:
+                _signal_group(process, signal.SIGINT)
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+            with _live_groups_lock:
+                _live_groups.discard(process.pid)
+
+    stdout, stderr = sink.tails["stdout"].text(), sink.tails["stderr"].text()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(list(cmd), timeout or 0, output=stdout, stderr=stderr)
+    return _completed(cmd, returncode, check, quiet, stdout, stderr, log_file, process.usage)
 
 
 class CommandRunner:
@@ -140,6 +600,9 @@ class CommandRunner:
         env: dict[str, str] | None = None,
         quiet: bool = False,
         timeout: int | None = None,
+        on_line: Callable[[str], None] | None = None,
+        stream: bool = False,
+        log_file: Path | None = None,
     ) -> subprocess.CompletedProcess[str]:
         """Run a command.
 
@@ -151,6 +614,9 @@ class CommandRunner:
             env: Additional environment variables (merged with base_env).
             quiet: Suppress error logging.
             timeout: Maximum seconds to wait for command completion.
+            on_line: Callback for each output line (see run_command).
+            stream: Stream output through the logger (see run_command).
+            log_file: File that receives the full streamed output.
 
         Returns:
             CompletedProcess with results.
@@ -164,6 +630,9 @@ class CommandRunner:
             env=merged_env if merged_env else None,
             quiet=quiet,
             timeout=timeout,
+            on_line=on_line,
+            stream=stream,
+            log_file=log_file,
         )
 
     def run_or_none(
@@ -186,3 +655,246 @@ class CommandRunner:
             return self.run(cmd, cwd=cwd, capture_output=capture_output, quiet=True)
         except CommandError:
             return None
+
+
+class AsyncCommandRunner:
+    """Runs commands on an asyncio event loop with the semantics of CommandRunner.
+
+    Each command gets its own process group, so a timeout or a cancelled task
+    stops the command together with everything it spawned (tofu providers,
+    ansible-playbook forks, ssh connections).
+    """
+
+    def __init__(
+        self,
+        cwd: Path | None = None,
+        env: dict[str, str] | None = None,
+        verbose: bool = False,
+        kill_grace: float = KILL_GRACE,
+    ):
+        """Initialize the async command runner.
+
+        Args:
+            cwd: Default working directory for commands.
+            env: Additional environment variables for all commands.
+            verbose: Whether to enable verbose output.
+            kill_grace: Seconds between SIGTERM and SIGKILL when stopping a command.
+        """
+        self.cwd = cwd
+        self.base_env = env or {}
+        self.verbose = verbose
+        self.kill_grace = kill_grace
+
+    async def run(
+        self,
+        cmd: Sequence[str],
+        cwd: Path | None = None,
+        check: bool = True,
+        capture_output: bool = False,
+        env: dict[str, str] | None = None,
+        quiet: bool = False,
+        timeout: float | None = None,
+        on_line: Callable[[str], None] | None = None,
+        stream: bool = False,
+        log_file: Path | None = None,
+        tail_bytes: int = TAIL_BYTES,
+    ) -> subprocess.CompletedProcess[str]:
+        """Run a command.
+
+        The arguments and output modes are the same as for run_command.
+
+        Args:
+            cmd: Command and arguments.
+            cwd: Working directory (overrides default).
+            check: Whether to raise on non-zero exit.
+            capture_output: Whether to capture output.
+            env: Additional environment variables (merged with base_env).
+            quiet: Suppress error logging.
+            timeout: Maximum seconds to wait for command completion.
+            on_line: Callback for each output line (see run_command).
+            stream: Stream output through the logger (see run_command).
+            log_file: File that receives the full streamed output.
+            tail_bytes: Output kept per stream when streaming.
+
+        Returns:
+            CompletedProcess with results.
+
+        Raises:
+            CommandError: If check=True and command fails.
+            subprocess.TimeoutExpired: If command exceeds timeout.
+        """
+        run_cwd = cwd or self.cwd
+        started = time.monotonic()
+        with span(
+            command_name(cmd), cat="command", command=" ".join(cmd), cwd=str(run_cwd or Path.cwd())
+        ) as attrs:
+            try:
+                result = await self._run(
+                    cmd,
+                    run_cwd,
+                    check,
+                    capture_output,
+                    env,
+                    quiet,
+                    timeout,
+                    on_line,
+                    stream,
+                    log_file,
+                    tail_bytes,
+                )
+            except CommandError as e:
+                _record_usage(cmd, e.returncode, started, None)
+                raise
+            _record_usage(cmd, result.returncode, started, None)
+            attrs["exit_code"] = result.returncode
+            return result
+
+    async def _run(
+        self,
+        cmd: Sequence[str],
+        cwd: Path | None,
+        check: bool,
+        capture_output: bool,
+        env: dict[str, str] | None,
+        quiet: bool,
+        timeout: float | None,
+        on_line: Callable[[str], None] | None,
+        stream: bool,
+        log_file: Path | None,
+        tail_bytes: int,
+    ) -> subprocess.CompletedProcess[str]:
+        """Run a command (see run)."""
+        streamed = not capture_output and (stream or on_line is not None or log_file is not None)
+        pipe = asyncio.subprocess.PIPE if capture_output or streamed else None
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=cwd,
+            env={**os.environ, **self.base_env, **(env or {})},
+            stdout=pipe,
+            stderr=pipe,
+            start_new_session=True,
+        )
+
+        with _OutputSink(on_line, log_file, tail_bytes) as sink:
+            # Resolves to (None, None, returncode), (stdout, stderr) or returncode
+            waiter: asyncio.Future[Any]
+            if streamed:
+                assert process.stdout is not None and process.stderr is not None
+                waiter = asyncio.gather(
+                    _pump_lines(process.stdout, "stdout", sink),
+                    _pump_lines(process.stderr, "stderr", sink),
+                    process.wait(),
+                )
+            elif capture_output:
+                waiter = asyncio.ensure_future(process.communicate())
+            else:
+                waiter = asyncio.ensure_future(process.wait())
+
+            try:
+                output = await asyncio.wait_for(waiter, timeout)
+            except TimeoutError:
+                await self._stop(process)
+                raise subprocess.TimeoutExpired(
+                    list(cmd),
+                    timeout or 0,
+                    output=sink.tails["stdout"].text() if streamed else None,
+                    stderr=sink.tails["stderr"].text() if streamed else None,
+                ) from None
+            except asyncio.CancelledError:
+                await self._stop(process)
+                raise
+
+        assert process.returncode is not None
+        stdout = stderr = None
+        if streamed:
+            stdout, stderr = sink.tails["stdout"].text(), sink.tails["stderr"].text()
+        elif capture_output:
+            out, err = output
+            stdout, stderr = out.decode(errors="replace"), err.decode(errors="replace")
+        return _completed(cmd, process.returncode, check, quiet, stdout, stderr, log_file)
+
+    async def run_many(
+        self,
+        cmds: Iterable[Sequence[str]],
+        limit: int = 4,
+        check: bool = True,
+        capture_output: bool = False,
+        quiet: bool = False,
+        timeout: float | None = None,
+    ) -> AsyncIterator[subprocess.CompletedProcess[str]]:
+        """Run commands, at most ``limit`` at a time, yielding results as they finish.
+
+        With check=True the first failure is raised from the iteration and the
+        commands still running are stopped. With check=False every result is
+        yielded; ``result.args`` tells which command it belongs to. Iterate to
+        the end or close the iterator (contextlib.aclosing) to stop leftovers.
+
+        Args:
+            cmds: Commands to run.
+            limit: Maximum number of commands running at once.
+            check: Whether a failed command raises CommandError.
+            capture_output: Whether to capture output.
+            quiet: Suppress error logging.
+            timeout: Maximum seconds per command.
+
+        Yields:
+            CompletedProcess of each command, in completion order.
+
+        Raises:
+            ValueError: If limit is less than 1.
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be at least 1, got {limit}")
+        semaphore = asyncio.Semaphore(limit)
+
+        async def run_one(cmd: Sequence[str]) -> subprocess.CompletedProcess[str]:
+            async with semaphore:
+                return await self.run(
+                    cmd,
+                    check=check,
+                    capture_output=capture_output,
+                    quiet=quiet,
+                    timeout=timeout,
+                )
+
+        tasks = [asyncio.ensure_future(run_one(cmd)) for cmd in cmds]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _stop(self, process: asyncio.subprocess.Process) -> None:
+        """Stop a command's process group: SIGTERM, then SIGKILL after the grace period."""
+        _signal_group(process, signal.SIGTERM)
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(asyncio.shield(process.wait()), self.kill_grace)
+        # Also reaches children that ignored SIGTERM after the command exited
+        _signal_group(process, signal.SIGKILL)
+        await process.wait()
+
+
+def _signal_group(
+    process: asyncio.subprocess.Process | subprocess.Popen[str], sig: signal.Signals
+) -> None:
+    """Signal a command's process group, ignoring a group that is already gone."""
+    with contextlib.suppress(ProcessLookupError, PermissionError):
+        os.killpg(process.pid, sig)
+
+
+async def _pump_lines(reader: asyncio.StreamReader, name: str, sink: _OutputSink) -> None:
+    """Pass a pipe's lines to the sink, splitting lines longer than MAX_LINE_CHARS."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    partial = ""
+    while chunk := await reader.read(READ_CHUNK):
+        *lines, partial = (partial + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            sink.write(line, name)
+        if len(partial) > MAX_LINE_CHARS:
+            sink.write(partial, name)
+            partial = ""
+    partial += decoder.decode(b"", final=True)
+    if partial:
+        sink.write(partial, name)
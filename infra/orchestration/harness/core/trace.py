@@ -0,0 +1,224 @@
+"""Timeline of commands and deployment phases as a Chrome trace-event file.
+
+``harness --trace out.json <command>`` records a span for every tofu,
+ansible and ssh invocation, nested under the deployment phase that ran it.
+Open the file in Perfetto (https://ui.perfetto.dev) or chrome://tracing.
+Spans run on one track per thread; concurrent async work such as the
+per-host SSH waits gets a named track of its own.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+
+@dataclass(frozen=True)
+class TraceScope:
+    """Attributes that nested spans inherit."""
+
+    component: str | None = None
+    phase: str | None = None
+    track: str | None = None
+    # Thread that opened the track; spans on other threads use their own
+    track_thread: int | None = None
+
+
+_scope: ContextVar[TraceScope | None] = ContextVar("harness_trace_scope", default=None)
+
+
+class Tracer:
+    """Collects spans as Chrome trace 'complete' events."""
+
+    def __init__(self) -> None:
+        """Initialize the tracer; span times are relative to now."""
+        self.events: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._tids: dict[tuple[str, Any], int] = {}
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        cat: str = "harness",
+        component: str | None = None,
+        phase: str | None = None,
+        track: str | None = None,
+        **args: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """Record a span around a block.
+
+        Args:
+            name: Span name shown on the timeline.
+            cat: Category (e.g. 'command', 'phase').
+            component: Component, inherited by nested spans.
+            phase: Deployment phase, inherited by nested spans.
+            track: Named track for concurrent work on one thread, inherited
+                by nested spans on the same thread.
+            **args: Attributes stored with the span.
+
+        Yields:
+            The span's attributes, for adding results such as an exit code.
+        """
+        parent = _scope.get() or TraceScope()
+        thread = threading.get_ident()
+        if track is None and parent.track_thread == thread:
+            track = parent.track
+        scope = TraceScope(
+            component=component or parent.component,
+            phase=phase or parent.phase,
+            track=track,
+            track_thread=thread,
+        )
+        attrs: dict[str, Any] = {}
+        if scope.component:
+            attrs["component"] = scope.component
+        if scope.phase:
+            attrs["phase"] = scope.phase
+        attrs.update(args)
+
+        token = _scope.set(scope)
+        start = time.perf_counter_ns()
+        try:
+            yield attrs
+        except BaseException as e:
+            attrs["error"] = str(e) or type(e).__name__
+            returncode = getattr(e, "returncode", None)
+            if returncode is not None:
+                attrs.setdefault("exit_code", returncode)
+            raise
+        finally:
+            end = time.perf_counter_ns()
+            _scope.reset(token)
+            self._add(name, cat, start, end, track, attrs)
+
+    def to_dict(self, **metadata: Any) -> dict[str, Any]:
+        """Get the trace in the Chrome trace-event JSON object format.
+
+        Args:
+            **metadata: Extra values stored under ``otherData``.
+        """
+        process = {
+            "name": "process_name",
+            "ph": "M",
+            "pid": self._pid,
+            "args": {"name": "harness"},
+        }
+        with self._lock:
+            events = [process, *self.events]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": metadata}
+
+    def write(self, path: Path, **metadata: Any) -> None:
+        """Write the trace file atomically.
+
+        Args:
+            path: Output file.
+            **metadata: Extra values stored under ``otherData``.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict(**metadata), default=str))
+        os.replace(tmp, path)
+
+    def _add(
+        self, name: str, cat: str, start: int, end: int, track: str | None, args: dict[str, Any]
+    ) -> None:
+        """Store a finished span."""
+        with self._lock:
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": cat,
+                    "ph": "X",
+                    "ts": (start - self._origin) / 1000,
+                    "dur": (end - start) / 1000,
+                    "pid": self._pid,
+                    "tid": self._tid(track),
+                    "args": args,
+                }
+            )
+
+    def _tid(self, track: str | None) -> int:
+        """Get the trace thread ID of a track or the current thread, naming new ones."""
+        thread = threading.current_thread()
+        key = ("track", track) if track else ("thread", (thread.ident, thread.name))
+        if key not in self._tids:
+            self._tids[key] = len(self._tids) + 1
+            self.events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "tid": self._tids[key],
+                    "args": {"name": track or thread.name},
+                }
+            )
+        return self._tids[key]
+
+
+# Tracer of the current CLI invocation, if --trace was given
+_active: Tracer | None = None
+
+
+def start_tracing() -> Tracer:
+    """Start recording spans for this process."""
+    global _active
+    _active = Tracer()
+    return _active
+
+
+def finish_tracing(path: Path) -> None:
+    """Stop recording and write the trace.
+
+    Args:
+        path: Output file.
+    """
+    global _active
+    tracer, _active = _active, None
+    if tracer is not None:
+        tracer.write(path, argv=sys.argv)
+
+
+@contextmanager
+def span(
+    name: str,
+    cat: str = "harness",
+    component: str | None = None,
+    phase: str | None = None,
+    track: str | None = None,
+    **args: Any,
+) -> Iterator[dict[str, Any]]:
+    """Record a span with the active tracer; does nothing without one.
+
+    See Tracer.span for the arguments.
+
+    Yields:
+        The span's attributes, for adding results such as an exit code.
+    """
+    tracer = _active
+    if tracer is None:
+        yield args
+        return
+    with tracer.span(name, cat, component=component, phase=phase, track=track, **args) as attrs:
+        yield attrs
+
+
+def command_name(cmd: Sequence[str]) -> str:
+    """Short span name for a command, e.g. 'tofu apply' or 'ansible-playbook playbook.yml'."""
+    if not cmd:
+        return ""
+    name = Path(cmd[0]).name
+    if len(cmd) > 1 and not cmd[1].startswith("-"):
+        name += f" {cmd[1]}"
+    return name
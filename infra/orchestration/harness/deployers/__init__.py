@@ -3,6 +3,15 @@
 from harness.deployers.base import BaseDeployer
 from harness.deployers.claude_vms import ClaudeVMsDeployer
 from harness.deployers.core_services import CoreServicesDeployer
+from harness.deployers.image import ImageBaker
 from harness.deployers.neo4j import Neo4jDeployer
+from harness.deployers.pool import PoolManager
 
-__all__ = ["BaseDeployer", "ClaudeVMsDeployer", "CoreServicesDeployer", "Neo4jDeployer"]
+__all__ = [
+    "BaseDeployer",
+    "ClaudeVMsDeployer",
+    "CoreServicesDeployer",
+    "ImageBaker",
+    "Neo4jDeployer",
+    "PoolManager",
+]
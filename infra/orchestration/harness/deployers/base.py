@@ -2,14 +2,21 @@
 
 from __future__ import annotations
 
-import time
+import os
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from functools import cached_property, partial
+from typing import TYPE_CHECKING, Any
 
+from harness.core.journal import Journal, fingerprint
 from harness.core.logger import log
 from harness.core.runner import CommandError, check_dependencies
+from harness.core.trace import span
 from harness.infra import AnsibleManager, OpenTofuManager, SSHWaiter
+from harness.infra.galaxy_cache import GalaxyCache
+from harness.infra.parallelism import ParallelismScheduler
+from harness.infra.plugin_cache import ProviderCache
 
 if TYPE_CHECKING:
     from harness.core.config import Config
@@ -30,15 +37,18 @@ class BaseDeployer(ABC):
     # Dependencies required for this deployer
     REQUIRED_DEPENDENCIES: list[str] = ["tofu", "ansible-playbook", "ansible-galaxy", "ssh"]
 
-    def __init__(self, config: Config, verbose: bool = False):
+    def __init__(self, config: Config, verbose: bool = False, upgrade: bool = False):
         """Initialize the deployer.
 
         Args:
             config: Application configuration.
             verbose: Enable verbose output.
+            upgrade: Upgrade OpenTofu providers on init.
         """
         self.config = config
         self.verbose = verbose
+        self.upgrade = upgrade
+        self.resume = False
         self._validate_dependencies()
 
     def _validate_dependencies(self) -> None:
@@ -65,30 +75,44 @@ class BaseDeployer(ABC):
     def inventory_file(self):
         """Path to the Ansible inventory file."""
 
+    @property
+    def component_id(self) -> str:
+        """Short component name used for state files and traces (e.g. 'claude-vms')."""
+        return self.provision_dir.parent.name
+
+    @cached_property
+    def journal(self) -> Journal:
+        """Journal of completed phases for this component, shared by its threads."""
+        return Journal(self.config.state_dir / "journal" / f"{self.component_id}.json")
+
     def get_tofu_manager(self) -> OpenTofuManager:
         """Get an OpenTofu manager instance."""
         return OpenTofuManager(
             provision_dir=self.provision_dir,
             inventory_file=self.inventory_file,
             verbose=self.verbose,
+            upgrade=self.upgrade,
+            plugin_cache=ProviderCache(self.config.cache_dir / "tofu-plugins"),
+            scheduler=ParallelismScheduler.from_config(self.config),
         )
 
     def get_ansible_manager(self) -> AnsibleManager:
         """Get an Ansible manager instance."""
-        return AnsibleManager(config_dir=self.config_dir)
+        return AnsibleManager(
+            config_dir=self.config_dir,
+            galaxy_cache=GalaxyCache.from_config(self.config),
+            runs_dir=self.config.state_dir / "ansible-runs",
+        )
 
     def get_ssh_waiter(self) -> SSHWaiter:
         """Get an SSH waiter instance."""
-        return SSHWaiter(
-            user=self.config.ssh.user,
-            timeout=self.config.ssh.timeout,
-            retry_interval=self.config.ssh.retry_interval,
-        )
+        return SSHWaiter.from_config(self.config)
 
     def deploy(
         self,
         skip_provision: bool = False,
         skip_configure: bool = False,
+        resume: bool = False,
         **kwargs,
     ) -> DeploymentResult:
         """Run the full deployment.
@@ -96,32 +120,41 @@ class BaseDeployer(ABC):
         Args:
             skip_provision: Skip OpenTofu provisioning.
             skip_configure: Skip Ansible configuration.
+            resume: Skip phases the journal shows completed with unchanged inputs.
             **kwargs: Additional arguments for subclass implementations.
 
         Returns:
             DeploymentResult indicating success/failure.
         """
+        with span(f"deploy {self.component_id}", cat="deploy", component=self.component_id):
+            return self._deploy(skip_provision, skip_configure, resume, **kwargs)
+
+    def _deploy(
+        self,
+        skip_provision: bool,
+        skip_configure: bool,
+        resume: bool,
+        **kwargs,
+    ) -> DeploymentResult:
+        """Run the full deployment (see deploy)."""
         log.header(f"Deploying {self.component_name}")
         self._log_configuration(**kwargs)
+        self._start_journal(resume)
 
         try:
             # Phase 1: Provision
             if not skip_provision:
                 log.header("Phase 1: Provisioning")
-                self._provision(**kwargs)
+                self._checkpoint(
+                    "provision", partial(self._provision, **kwargs), self._provision_inputs()
+                )
             else:
                 log.warn("Skipping provisioning phase")
                 self._ensure_inventory(**kwargs)
 
-            # Phase 2: Wait for VMs
-            if not skip_configure:
-                log.header("Phase 2: Waiting for VMs")
-                self._wait_for_vms(**kwargs)
-
-            # Phase 3: Configure
+            # Phases 2 and 3: Wait for VMs, configure
             if not skip_configure:
-                log.header("Phase 3: Configuration")
-                self._configure(**kwargs)
+                self._wait_and_configure(**kwargs)
             else:
                 log.warn("Skipping configuration phase")
 
@@ -146,6 +179,70 @@ class BaseDeployer(ABC):
                 message=str(e),
             )
 
+    def phases(
+        self,
+        skip_provision: bool = False,
+        skip_configure: bool = False,
+        resume: bool = False,
+        **kwargs,
+    ) -> dict[str, Callable[[], None]]:
+        """Get the deployment phases as separate steps, in order.
+
+        Lets a caller schedule the phases of several components in one
+        dependency graph instead of running each component end to end with
+        ``deploy``. Phases raise on failure.
+
+        Args:
+            skip_provision: Export the inventory from existing state instead of provisioning.
+            skip_configure: Leave out the wait and configure phases.
+            resume: Skip phases the journal shows completed with unchanged inputs.
+            **kwargs: Additional arguments for subclass implementations.
+
+        Returns:
+            Mapping of phase name ('provision', 'wait', 'configure') to callable.
+        """
+        self._start_journal(resume)
+        phases: dict[str, Callable[[], None]] = {}
+        if skip_provision:
+            phases["provision"] = partial(self._ensure_inventory, **kwargs)
+        else:
+            phases["provision"] = partial(
+                self._checkpoint,
+                "provision",
+                partial(self._provision, **kwargs),
+                self._provision_inputs(),
+            )
+        if not skip_configure:
+            phases["wait"] = partial(
+                self._checkpoint,
+                "wait",
+                partial(self._wait_for_vms, **kwargs),
+                [self.inventory_file],
+            )
+            phases["configure"] = partial(
+                self._checkpoint,
+                "configure",
+                partial(self._configure, **kwargs),
+                self._configure_inputs(**kwargs),
+            )
+        return phases
+
+    def log_configuration(self, **kwargs) -> None:
+        """Log the deployment configuration, for callers running ``phases`` themselves.
+
+        Args:
+            **kwargs: The arguments passed to ``phases``.
+        """
+        self._log_configuration(**kwargs)
+
+    def log_summary(self, **kwargs) -> None:
+        """Log the deployment summary, for callers running ``phases`` themselves.
+
+        Args:
+            **kwargs: The arguments passed to ``phases``.
+        """
+        self._log_summary(**kwargs)
+
     def plan(self, **kwargs) -> DeploymentResult:
         """Show the deployment plan without applying changes.
 
@@ -185,9 +282,11 @@ class BaseDeployer(ABC):
         log.header(f"Destroying {self.component_name}")
 
         try:
-            tofu = self.get_tofu_manager()
-            tofu.init()
-            self._destroy(tofu, **kwargs)
+            with span(f"destroy {self.component_id}", cat="deploy", component=self.component_id):
+                tofu = self.get_tofu_manager()
+                tofu.init()
+                self._destroy(tofu, **kwargs)
+            self.journal.reset()
 
             return DeploymentResult(
                 success=True,
@@ -218,7 +317,7 @@ class BaseDeployer(ABC):
         tofu = self.get_tofu_manager()
         tofu.init()
         # Subclasses should override to pass their variables
-        tofu.plan()
+        tofu.plan(reuse=False)
 
     def _ensure_inventory(self, **kwargs) -> None:
         """Ensure inventory exists when skipping provision."""
@@ -227,16 +326,15 @@ class BaseDeployer(ABC):
             tofu = self.get_tofu_manager()
             tofu.export_inventory()
 
-    def _wait_for_vms(self, boot_delay: int = 30, **kwargs) -> None:
+    def _wait_for_vms(self, **kwargs) -> None:
         """Wait for VMs to become accessible.
 
+        Polling starts immediately with backoff, so VMs that are already
+        running (e.g. with --skip-provision) are detected on the first attempt.
+
         Args:
-            boot_delay: Seconds to wait for VMs to boot.
             **kwargs: Additional arguments (unused).
         """
-        log.info(f"Waiting {boot_delay} seconds for VM(s) to boot...")
-        time.sleep(boot_delay)
-
         ssh_waiter = self.get_ssh_waiter()
         successful, failed = ssh_waiter.wait_for_inventory(self.inventory_file)
 
@@ -245,6 +343,78 @@ class BaseDeployer(ABC):
 
         log.success(f"All {len(successful)} VM(s) are accessible")
 
+    def _wait_and_configure(self, **kwargs) -> None:
+        """Wait for VMs, then configure them. Override to overlap the two.
+
+        Args:
+            **kwargs: Additional arguments for subclass implementations.
+        """
+        log.header("Phase 2: Waiting for VMs")
+        self._checkpoint("wait", partial(self._wait_for_vms, **kwargs), [self.inventory_file])
+
+        log.header("Phase 3: Configuration")
+        self._checkpoint(
+            "configure", partial(self._configure, **kwargs), self._configure_inputs(**kwargs)
+        )
+
+    def _start_journal(self, resume: bool) -> None:
+        """Enable resuming, or start a fresh journal for a full run."""
+        self.resume = resume
+        if resume:
+            done = list(self.journal.entries())
+            if done:
+                log.info(f"Resuming; journal has completed: {', '.join(done)}")
+        else:
+            self.journal.reset()
+
+    def _checkpoint(self, phase: str, fn: Callable[[], None], inputs: list[Any]) -> None:
+        """Run a phase and record it in the journal.
+
+        When resuming, the phase is skipped if it completed before with the
+        same input fingerprint. Running a phase forgets every phase recorded
+        after it.
+
+        Args:
+            phase: Phase name.
+            fn: Phase implementation.
+            inputs: Files, directories and values the phase depends on.
+        """
+        digest = fingerprint(*inputs)
+        with span(phase, cat="phase", component=self.component_id, phase=phase) as attrs:
+            if self.resume and self.journal.completed(phase, digest):
+                log.info(f"Skipping {phase}: already completed with unchanged inputs")
+                attrs["skipped"] = True
+                return
+            self.journal.begin(phase)
+            fn()
+            self.journal.complete(phase, digest)
+
+    def _provision_inputs(self) -> list[Any]:
+        """Inputs that determine the provisioning result.
+
+        Returns:
+            The provision directory (*.tf, tfvars, lock file) and TF_VAR_* values.
+        """
+        return [self.provision_dir, _env_values("TF_VAR_")]
+
+    def _configure_inputs(self, **kwargs) -> list[Any]:
+        """Inputs that determine the configuration result.
+
+        Args:
+            **kwargs: Phase options (e.g. skip_hardening).
+
+        Returns:
+            The Ansible directory (playbook, vars, files, inventory), the
+            options and the environment variables passed to playbooks.
+        """
+        return [self.config_dir, kwargs, _env_values("ANSIBLE_", "NEO4J_", "PLANE_")]
+
+    def _install_requirements(self, ansible: AnsibleManager) -> None:
+        """Install Ansible requirements, skipped on resume if requirements.yml is unchanged."""
+        self._checkpoint(
+            "requirements", ansible.install_requirements, [self.config_dir / "requirements.yml"]
+        )
+
     def _log_configuration(self, **kwargs) -> None:
         """Log the deployment configuration. Override in subclasses."""
         pass
@@ -252,3 +422,8 @@ class BaseDeployer(ABC):
     def _log_summary(self, **kwargs) -> None:
         """Log the deployment summary. Override in subclasses."""
         pass
+
+
+def _env_values(*prefixes: str) -> dict[str, str]:
+    """Get environment variables with the given prefixes (for fingerprints only)."""
+    return {k: v for k, v in sorted(os.environ.items()) if k.startswith(prefixes)}
@@ -2,17 +2,46 @@
 
 from __future__ import annotations
 
+import http.client
 import json
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from harness.core.ipam import IPAllocator
+from harness.core.journal import fingerprint
 from harness.core.logger import log
-from harness.deployers.base import BaseDeployer
+from harness.core.runner import CommandError
+from harness.core.trace import span
+from harness.deployers.base import BaseDeployer, DeploymentResult
+from harness.infra.image import BakedImage, ImageCatalog, playbook_fingerprint
+from harness.infra.pipeline import HostPipeline
+from harness.infra.proxmox import ProxmoxAPIError, ProxmoxClient, ProxmoxTaskError
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from harness.infra import OpenTofuManager
 
+# Seconds to wait for DHCP addresses to be reported by the guest agents
+IP_WAIT_TIMEOUT = 120
+
+# Largest supported fleet
+MAX_VMS = 50
+
+# Seconds between guest-agent polls (each poll is one cheap API call per pending VM)
+AGENT_POLL_INTERVAL = 2
+
+
+def vm_address(name: str) -> str:
+    """Get the OpenTofu resource address of a Claude VM."""
+    return f'proxmox_virtual_environment_vm.vm["{name}"]'
+
 
 class ClaudeVMsDeployer(BaseDeployer):
     """Handles Claude development VMs deployment."""
@@ -25,6 +54,7 @@ class ClaudeVMsDeployer(BaseDeployer):
         prefix: str | None = None,
         start_id: int | None = None,
         neo4j_ip: str | None = None,
+        upgrade: bool = False,
     ):
         """Initialize the Claude VMs deployer.
 
@@ -35,8 +65,9 @@ class ClaudeVMsDeployer(BaseDeployer):
             prefix: VM name prefix.
             start_id: Starting VM ID.
             neo4j_ip: Override Neo4j IP address.
+            upgrade: Upgrade OpenTofu providers on init.
         """
-        super().__init__(config, verbose)
+        super().__init__(config, verbose, upgrade)
 
         # VM configuration
         self.count = count or config.claude_vms.default_count
@@ -46,9 +77,23 @@ class ClaudeVMsDeployer(BaseDeployer):
         # Neo4j IP (priority: parameter > env var > config)
         self._neo4j_ip_override = neo4j_ip
 
+        # Static addressing (None when the network uses DHCP)
+        self.ip_allocator = IPAllocator.from_config(config)
+        self._vms_config: dict[str, dict[str, Any]] | None = None
+
+        # Template to clone: pinned in config, else the latest baked image
+        catalog = ImageCatalog.from_config(config)
+        self.template_id: int | None = config.claude_vms.template_id
+        self.image: BakedImage | None
+        if self.template_id is not None:
+            self.image = catalog.find(self.template_id)
+        else:
+            self.image = catalog.latest()
+            self.template_id = self.image.template_id if self.image else None
+
         # Validate inputs
-        if self.count < 1 or self.count > 50:
-            raise ValueError(f"VM count must be between 1 and 50, got {self.count}")
+        if self.count < 1 or self.count > MAX_VMS:
+            raise ValueError(f"VM count must be between 1 and {MAX_VMS}, got {self.count}")
         if len(self.prefix) < 1 or len(self.prefix) > 20:
             raise ValueError(f"VM prefix must be 1-20 characters, got '{self.prefix}'")
         if self.start_id < 100 or self.start_id > 999999999:
@@ -78,12 +123,48 @@ class ClaudeVMsDeployer(BaseDeployer):
         return os.environ.get("NEO4J_IP", self.config.neo4j.ip)
 
     @property
-    def vms_config(self) -> dict[str, dict[str, int]]:
-        """Generate VM configuration for OpenTofu."""
-        return self.config.claude_vms.generate_vms(
+    def static_ips(self) -> bool:
+        """Whether VM addresses are assigned statically instead of via DHCP."""
+        return self.ip_allocator is not None
+
+    @property
+    def image_is_current(self) -> bool:
+        """Whether the VMs clone a baked image built from the current playbook.
+
+        Only then can the tasks tagged ``bake`` be skipped.
+        """
+        return (
+            self.image is not None
+            and self.image.cloud_init_user == self.config.ssh.cloud_init_user
+            and self.image.playbook == playbook_fingerprint(self.config_dir)
+        )
+
+    @property
+    def vms_config(self) -> dict[str, dict[str, Any]]:
+        """Generate VM configuration for OpenTofu.
+
+        Static addresses are previewed here; they are leased only when
+        provisioning applies (see _reserve_addresses).
+        """
+        if self._vms_config is None:
+            self._vms_config = self.config.claude_vms.generate_vms(
+                count=self.count,
+                prefix=self.prefix,
+                start_id=self.start_id,
+                allocator=self.ip_allocator,
+                reserve=False,
+            )
+        return self._vms_config
+
+    def _reserve_addresses(self) -> None:
+        """Lease the static addresses of the VMs about to be applied."""
+        if self.ip_allocator is None:
+            return
+        self._vms_config = self.config.claude_vms.generate_vms(
             count=self.count,
             prefix=self.prefix,
             start_id=self.start_id,
+            allocator=self.ip_allocator,
         )
 
     def _log_configuration(self, **kwargs) -> None:
@@ -93,94 +174,470 @@ class ClaudeVMsDeployer(BaseDeployer):
         log.bullet(f"VM Prefix: {self.prefix}")
         log.bullet(f"Start ID: {self.start_id}")
         log.bullet(f"Neo4j IP: {self.neo4j_ip}")
+        if self.image is not None:
+            log.bullet(f"Template: {self.image.name} (ID: {self.image.template_id})")
+        elif self.template_id is not None:
+            log.bullet(f"Template: {self.template_id}")
         log.info("VMs to create:")
         for vm_name, vm_config in self.vms_config.items():
-            log.bullet(f"{vm_name} (ID: {vm_config['vm_id']})")
+            ip = vm_config.get("ip_address", "DHCP")
+            log.bullet(f"{vm_name} (ID: {vm_config['vm_id']}, IP: {ip})")
 
     @property
     def _tofu_variables(self) -> dict:
         """Get variables to pass to OpenTofu."""
-        return {
+        variables: dict[str, Any] = {
             "vms": self.vms_config,
             "cloud_init_user": self.config.ssh.cloud_init_user,
         }
+        if self.static_ips:
+            variables["gateway"] = self.config.network.gateway
+        if self.template_id is not None:
+            variables["template_id"] = self.template_id
+        return variables
 
     def _provision(self, **kwargs) -> None:
         """Provision the Claude VMs."""
         tofu = self.get_tofu_manager()
         tofu.init()
-        tofu.plan(variables=self._tofu_variables)
-        tofu.apply(variables=self._tofu_variables)
+        self._reserve_addresses()
+        if tofu.plan(variables=self._tofu_variables):
+            tofu.apply(variables=self._tofu_variables)
         tofu.export_inventory()
+        self._warn_unmigrated()
 
-    def _wait_for_vms(self, skip_provision: bool = False, **kwargs) -> None:
+    def _warn_unmigrated(self) -> None:
+        """Warn about VMs that run on another address than their static lease.
+
+        Cloud-init changes are ignored for existing VMs, so VMs created before
+        static addressing keep their DHCP address (which the inventory reports)
+        until they are recreated.
+        """
+        if self.ip_allocator is None or not self.inventory_file.exists():
+            return
+        leases = self.ip_allocator.leases()
+        for name, host in self._inventory_hosts().items():
+            lease = leases.get(name)
+            if lease is not None and host.get("ansible_host") not in (None, lease):
+                log.warn(
+                    f"{name} still uses {host['ansible_host']} instead of its static address "
+                    f"{lease}; recreate it to move it (harness vms scale --remove {name}, "
+                    f"then scale back up)"
+                )
+
+    def phases(
+        self,
+        skip_provision: bool = False,
+        skip_configure: bool = False,
+        resume: bool = False,
+        **kwargs,
+    ) -> dict[str, Callable[[], None]]:
+        """Get the deployment phases, with configuration pipelined behind SSH readiness.
+
+        The 'wait' phase only waits for addresses; 'configure' starts Ansible
+        on each VM as soon as it accepts SSH.
+
+        Args:
+            skip_provision: Export the inventory from existing state instead of provisioning.
+            skip_configure: Leave out the wait and configure phases.
+            resume: Skip phases (and VMs) the journal shows completed with unchanged inputs.
+            **kwargs: Additional arguments (e.g. skip_hardening).
+
+        Returns:
+            Mapping of phase name to callable.
+        """
+        phases = super().phases(
+            skip_provision=skip_provision, skip_configure=skip_configure, resume=resume, **kwargs
+        )
+        if not skip_configure:
+            phases["wait"] = partial(
+                self._checkpoint,
+                "ips",
+                partial(self._wait_for_ips, skip_provision=skip_provision),
+                [self.vms_config],
+            )
+            phases["configure"] = partial(self._configure_as_ready, **kwargs)
+        return phases
+
+    def _wait_for_vms(
+        self,
+        skip_provision: bool = False,
+        hosts: list[str] | None = None,
+        **kwargs,
+    ) -> None:
         """Wait for VMs to acquire IPs and become SSH accessible.
 
         Args:
             skip_provision: Whether provisioning was skipped.
+            hosts: Only wait for these VMs. Defaults to the whole inventory.
             **kwargs: Additional arguments.
         """
-        import time
-
-        if skip_provision:
-            # Just wait for SSH if skipping provision
-            ssh_waiter = self.get_ssh_waiter()
-            successful, failed = ssh_waiter.wait_for_inventory(self.inventory_file)
-            if failed:
-                raise RuntimeError(f"{len(failed)} VM(s) failed to become accessible: {failed}")
-            log.success(f"All {len(successful)} VM(s) are accessible")
+        self._wait_for_ips(skip_provision=skip_provision)
+
+        ssh_waiter = self.get_ssh_waiter()
+        successful, failed = ssh_waiter.wait_for_inventory(self.inventory_file, names=hosts)
+        if failed:
+            raise RuntimeError(f"{len(failed)} VM(s) failed to become accessible: {failed}")
+        log.success(f"All {len(successful)} VM(s) are accessible")
+
+    def _wait_for_ips(self, skip_provision: bool = False) -> None:
+        """Wait for VMs to acquire IP addresses and write them to the inventory.
+
+        Args:
+            skip_provision: Whether provisioning was skipped.
+        """
+        # Addresses are already known when skipping provision or using static IPs
+        if skip_provision or self.static_ips:
             return
 
+        log.info("Waiting for VMs to acquire IP addresses...")
+        client = ProxmoxClient.from_config(self.config, self.provision_dir)
+        if client is not None:
+            with client:
+                self._poll_agent_ips(client)
+        else:
+            log.warn("Proxmox API endpoint not configured, polling via tofu refresh")
+            self._poll_refresh_ips()
+
+    def _wait_and_configure(
+        self,
+        skip_provision: bool = False,
+        skip_hardening: bool = False,
+        hosts: list[str] | None = None,
+        **kwargs,
+    ) -> None:
+        """Wait for VMs and configure each one as soon as it is SSH-ready.
+
+        Args:
+            skip_provision: Whether provisioning was skipped.
+            skip_hardening: Skip hardening roles.
+            hosts: Only wait for and configure these VMs. Defaults to the whole inventory.
+            **kwargs: Additional arguments.
+        """
+        log.header("Phase 2: Waiting for VMs and configuring them as they come up")
+        self._checkpoint(
+            "ips", partial(self._wait_for_ips, skip_provision=skip_provision), [self.vms_config]
+        )
+        with span("configure", cat="phase", component=self.component_id, phase="configure"):
+            self._configure_as_ready(skip_hardening=skip_hardening, hosts=hosts)
+
+    def _inventory_names(self) -> list[str]:
+        """Get the VM names in the inventory file."""
+        return list(self._inventory_hosts())
+
+    def _inventory_hosts(self) -> dict[str, dict[str, Any]]:
+        """Get the hosts in the inventory file, by VM name."""
+        with open(self.inventory_file) as f:
+            return json.load(f).get("all", {}).get("hosts", {})
+
+    def _provision_inputs(self) -> list[Any]:
+        """Inputs that determine the provisioning result, including the VM set."""
+        return [*super()._provision_inputs(), self._tofu_variables]
+
+    def _configure_inputs(self, **kwargs) -> list[Any]:
+        """Inputs that determine the configuration result, including playbook vars."""
+        return [
+            *super()._configure_inputs(**kwargs),
+            {
+                "neo4j_ip": self.neo4j_ip,
+                "cloud_init_user": self.config.ssh.cloud_init_user,
+                "baked": self.image_is_current,
+            },
+        ]
+
+    def _configure_as_ready(
+        self,
+        skip_hardening: bool = False,
+        hosts: list[str] | None = None,
+        **kwargs,
+    ) -> None:
+        """Run the playbook on batches of VMs as they become SSH-ready.
+
+        The SSH waiter hands each ready VM to a HostPipeline, which starts
+        ``ansible-playbook --limit`` runs within the configured concurrency,
+        so early VMs are configured while slower ones are still booting.
+
+        Args:
+            skip_hardening: Skip hardening roles.
+            hosts: Only configure these VMs. Defaults to the whole inventory.
+            **kwargs: Additional arguments.
+
+        Raises:
+            RuntimeError: If any VM was unreachable or failed configuration.
+        """
+        # Each VM is journaled on its own, so a resumed run configures only the rest
+        digest = fingerprint(*self._configure_inputs(skip_hardening=skip_hardening))
+        names = hosts if hosts is not None else self._inventory_names()
+        if self.resume:
+            done = [n for n in names if self.journal.completed(f"configure:{n}", digest)]
+            if done:
+                log.info(f"Skipping {len(done)} VM(s) already configured: {', '.join(done)}")
+            names = [n for n in names if n not in done]
+            if not names:
+                return
+
+        ansible = self.get_ansible_manager()
+        self._install_requirements(ansible)
+        extra_vars, skip_tags = self._playbook_options(skip_hardening)
+        client = self._snapshot_client()
+        vm_ids = {name: int(info["vm_id"]) for name, info in self._inventory_hosts().items()}
+
+        def configure_batch(batch: list[str]) -> None:
+            ansible.run_playbook(extra_vars=extra_vars, skip_tags=skip_tags, limit=batch)
+            for name in batch:
+                self.journal.complete(f"configure:{name}", digest)
+            if client is not None:
+                self._snapshot(client, {name: vm_ids[name] for name in batch})
+
+        pipeline = HostPipeline(
+            configure_batch,
+            max_concurrency=self.config.claude_vms.configure_concurrency,
+            batch_window=self.config.claude_vms.configure_batch_window,
+        )
+        with client or nullcontext():
+            try:
+                _, unreachable = self.get_ssh_waiter().wait_for_inventory(
+                    self.inventory_file, names=names, on_ready=pipeline.submit
+                )
+            except BaseException:
+                pipeline.cancel()
+                raise
+            result = pipeline.close()
+
+        for batch in result.batches:
+            status = "configured" if batch.ok else "failed"
+            log.bullet(
+                f"{', '.join(batch.hosts)}: ready at +{batch.ready_at:.0f}s, "
+                f"{status} at +{batch.finished_at:.0f}s"
+            )
+
+        errors = []
+        if unreachable:
+            errors.append(f"{len(unreachable)} VM(s) failed to become accessible: {unreachable}")
+        if result.failed:
+            errors.append(f"configuration failed on {len(result.failed)} VM(s): {result.failed}")
+        if errors:
+            raise RuntimeError("; ".join(errors))
+        log.success(f"All {len(result.succeeded)} VM(s) configured")
+
+    def _snapshot_client(self) -> ProxmoxClient | None:
+        """Get a Proxmox API client for post-configuration snapshots.
+
+        Returns:
+            Client, or None if snapshots are disabled or the API is not configured.
+        """
+        if not self.config.claude_vms.snapshot:
+            return None
+        client = ProxmoxClient.from_config(self.config, self.provision_dir)
+        if client is None:
+            log.warn("Proxmox API endpoint not configured, skipping snapshots (no vms reset)")
+        return client
+
+    def _snapshot(self, client: ProxmoxClient, vm_ids: dict[str, int]) -> None:
+        """Snapshot freshly configured VMs so `harness vms reset` can roll back to them.
+
+        A failed snapshot only disables reset for that VM, so it is logged
+        rather than failing the configuration.
+
+        Args:
+            client: Proxmox API client.
+            vm_ids: VM name to ID.
+        """
+        snapshot = self.config.claude_vms.snapshot or ""
+        description = f"Configured by harness at {time.strftime('%Y-%m-%d %H:%M:%S')}"
+        for name, vm_id in vm_ids.items():
+            try:
+                client.create_snapshot(
+                    self.config.proxmox.node, vm_id, snapshot, description=description
+                )
+                log.success(f"{name}: snapshot '{snapshot}' taken")
+            except (ProxmoxAPIError, ProxmoxTaskError, OSError, http.client.HTTPException) as e:
+                log.warn(f"{name}: snapshot failed, vms reset will not work for it: {e}")
+
+    def reset(self, names: list[str] | None = None, wait: bool = True) -> DeploymentResult:
+        """Roll VMs back to their post-configuration snapshot in parallel.
+
+        Args:
+            names: VMs to reset. Defaults to the whole inventory.
+            wait: Wait until the reset VMs accept SSH again.
+
+        Returns:
+            DeploymentResult with the reset and failed VM names in details.
+        """
+        log.header(f"Resetting {self.component_name}")
+        snapshot = self.config.claude_vms.snapshot
+        if not snapshot:
+            return DeploymentResult(
+                success=False, message="Snapshots are disabled (claude_vms.snapshot)"
+            )
+        started = time.monotonic()
+
+        try:
+            hosts = self._inventory_hosts()
+            names = names or list(hosts)
+            if not names:
+                log.success("The inventory has no VMs, nothing to reset")
+                return DeploymentResult(
+                    success=True,
+                    message="No VMs to reset",
+                    details={"reset": [], "failed": [], "elapsed": 0.0},
+                )
+            unknown = [name for name in names if name not in hosts]
+            if unknown:
+                raise ValueError(f"Not in the inventory: {', '.join(unknown)}")
+            client = ProxmoxClient.from_config(self.config, self.provision_dir)
+            if client is None:
+                raise RuntimeError(
+                    "Reset needs the Proxmox API: set proxmox.endpoint (or "
+                    "TF_VAR_proxmox_endpoint) and TF_VAR_proxmox_api_token"
+                )
+
+            log.info(f"Rolling back {len(names)} VM(s) to '{snapshot}'")
+            node = self.config.proxmox.node
+            failed: list[str] = []
+
+            def rollback(vm_id: int) -> None:
+                client.rollback_snapshot(node, vm_id, snapshot)
+                client.start_vm(node, vm_id)
+
+            with client, ThreadPoolExecutor(max_workers=min(len(names), client.pool_size)) as ex:
+                futures = {ex.submit(rollback, int(hosts[n]["vm_id"])): n for n in names}
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        future.result()
+                        log.success(f"{name} rolled back")
+                    except (
+                        ProxmoxAPIError,
+                        ProxmoxTaskError,
+                        OSError,
+                        http.client.HTTPException,
+                    ) as e:
+                        log.error(f"{name}: rollback failed: {e}")
+                        failed.append(name)
+
+            reset = [name for name in names if name not in failed]
+            if wait and reset:
+                _, unreachable = self.get_ssh_waiter().wait_for_inventory(
+                    self.inventory_file, names=reset
+                )
+                failed += unreachable
+                reset = [name for name in reset if name not in unreachable]
+
+        except (ValueError, RuntimeError, OSError) as e:
+            log.error(f"Reset failed: {e}")
+            return DeploymentResult(success=False, message=str(e))
+
+        elapsed = time.monotonic() - started
+        details = {"reset": reset, "failed": sorted(failed), "elapsed": round(elapsed, 1)}
+        if failed:
+            return DeploymentResult(
+                success=False,
+                message=f"{len(failed)} VM(s) failed to reset: {sorted(failed)}",
+                details=details,
+            )
+        log.success(f"{len(reset)} VM(s) reset in {elapsed:.0f}s")
+        return DeploymentResult(success=True, message=f"{len(reset)} VM(s) reset", details=details)
+
+    def _poll_agent_ips(self, client: ProxmoxClient) -> None:
+        """Poll the QEMU guest agents directly and fill in the inventory.
+
+        All pending VMs are queried concurrently over pooled keep-alive
+        connections, and the inventory file is updated as each address
+        appears.
+
+        Args:
+            client: Proxmox API client.
+
+        Raises:
+            RuntimeError: If some VMs have no address after IP_WAIT_TIMEOUT.
+        """
+        with open(self.inventory_file) as f:
+            inventory = json.load(f)
+        hosts = inventory.get("all", {}).get("hosts", {})
+
+        pending = {
+            int(info["vm_id"]): name
+            for name, info in hosts.items()
+            if info.get("ansible_host") is None
+        }
+        node = self.config.proxmox.node
+        deadline = time.monotonic() + IP_WAIT_TIMEOUT
+
+        while pending:
+            ips = client.get_vm_ips(node, pending, subnet=self.config.network.subnet)
+            found = {vm_id: ip for vm_id, ip in ips.items() if ip}
+            for vm_id, ip in found.items():
+                name = pending.pop(vm_id)
+                hosts[name]["ansible_host"] = ip
+                log.success(f"{name} acquired {ip}")
+            if found:
+                self._write_inventory(inventory)
+
+            if not pending:
+                break
+            if time.monotonic() >= deadline:
+                raise RuntimeError(
+                    f"VMs did not acquire IPs within {IP_WAIT_TIMEOUT} seconds: "
+                    f"{sorted(pending.values())}"
+                )
+            time.sleep(AGENT_POLL_INTERVAL)
+
+        log.success("All VMs have acquired IP addresses")
+
+    def _poll_refresh_ips(self) -> None:
+        """Poll for IPs by refreshing OpenTofu state and re-exporting the inventory."""
         tofu = self.get_tofu_manager()
-        max_wait = 120  # seconds
         poll_interval = 10
         elapsed = 0
 
-        log.info("Waiting for VMs to acquire IP addresses...")
-
-        while elapsed < max_wait:
+        while elapsed < IP_WAIT_TIMEOUT:
             tofu.refresh(variables=self._tofu_variables)
             tofu.export_inventory()
 
-            if self._all_vms_have_ips():
+            ips = tofu.get_vm_ips()
+            if ips and all(ips.values()):
                 log.success("All VMs have acquired IP addresses")
-                break
+                return
 
             time.sleep(poll_interval)
             elapsed += poll_interval
             log.info(f"Still waiting for IPs... ({elapsed}s elapsed)")
-        else:
-            raise RuntimeError(f"VMs did not acquire IPs within {max_wait} seconds")
 
-        # Now wait for SSH
-        ssh_waiter = self.get_ssh_waiter()
-        successful, failed = ssh_waiter.wait_for_inventory(self.inventory_file)
-        if failed:
-            raise RuntimeError(f"{len(failed)} VM(s) failed to become accessible: {failed}")
-        log.success(f"All {len(successful)} VM(s) are accessible")
+        raise RuntimeError(f"VMs did not acquire IPs within {IP_WAIT_TIMEOUT} seconds")
 
-    def _all_vms_have_ips(self) -> bool:
-        """Check if all VMs in inventory have IP addresses."""
-        if not self.inventory_file.exists():
-            return False
-        with open(self.inventory_file) as f:
-            inventory = json.load(f)
-        hosts = inventory.get("all", {}).get("hosts", {})
-        if not hosts:
-            return False
-        return all(info.get("ansible_host") is not None for info in hosts.values())
+    def _write_inventory(self, inventory: dict[str, Any]) -> None:
+        """Write the inventory file atomically."""
+        tmp = self.inventory_file.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(inventory, f, indent=2)
+        os.replace(tmp, self.inventory_file)
 
-    def _configure(self, skip_hardening: bool = False, **kwargs) -> None:
+    def _configure(
+        self,
+        skip_hardening: bool = False,
+        limit: list[str] | None = None,
+        **kwargs,
+    ) -> None:
         """Configure VMs using Ansible.
 
         Args:
             skip_hardening: Skip hardening roles.
+            limit: Only configure these VMs. Defaults to the whole inventory.
             **kwargs: Additional arguments.
         """
         ansible = self.get_ansible_manager()
-        ansible.install_requirements()
+        self._install_requirements(ansible)
+        extra_vars, skip_tags = self._playbook_options(skip_hardening)
+        ansible.run_playbook(extra_vars=extra_vars, skip_tags=skip_tags, limit=limit)
 
-        # Build extra vars
+    def playbook_vars(self) -> dict[str, str]:
+        """Build the extra vars for the Claude VM playbook.
+
+        Returns:
+            Neo4j address, cloud-init user and, if set, the GitHub token and
+            Neo4j password.
+        """
         extra_vars = {
             "neo4j_ip": self.neo4j_ip,
             "cloud_init_user": self.config.ssh.cloud_init_user,
@@ -197,22 +654,174 @@ class ClaudeVMsDeployer(BaseDeployer):
         if neo4j_password:
             extra_vars["neo4j_password"] = neo4j_password
 
-        skip_tags = ["hardening"] if skip_hardening else None
+        return extra_vars
+
+    def _playbook_options(self, skip_hardening: bool) -> tuple[dict[str, str], list[str] | None]:
+        """Build the playbook extra vars and skipped tags.
+
+        Args:
+            skip_hardening: Skip hardening roles.
+
+        Returns:
+            Tuple of (extra_vars, skip_tags).
+        """
+        extra_vars = self.playbook_vars()
+
+        skip_tags = ["hardening"] if skip_hardening else []
         if skip_hardening:
             log.warn("Skipping hardening roles")
 
-        ansible.run_playbook(extra_vars=extra_vars, skip_tags=skip_tags)
+        # Steps tagged 'bake' are already in a current baked image
+        image = self.image
+        if image is not None and self.image_is_current:
+            skip_tags.append("bake")
+            log.info(f"Cloned from {image.name}; running host-specific tasks only")
+        elif image is not None:
+            log.warn(
+                f"{image.name} was baked from an older playbook; running all tasks "
+                "(run `harness image bake` to refresh it)"
+            )
+
+        return extra_vars, skip_tags or None
+
+    def scale(
+        self,
+        to: int | None = None,
+        remove: list[str] | None = None,
+        skip_configure: bool = False,
+        skip_hardening: bool = False,
+    ) -> DeploymentResult:
+        """Add or remove VMs without touching the rest of the fleet.
+
+        The delta is computed against the current state. Only the added or
+        removed VM resources are planned and applied (``-target``), and only
+        the new hosts are waited for and configured (``--limit``).
+
+        Args:
+            to: Desired number of VMs. Missing numbers are filled lowest
+                first; extra VMs are removed highest first.
+            remove: Names of VMs to remove.
+            skip_configure: Skip waiting for and configuring new VMs.
+            skip_hardening: Skip hardening roles.
+
+        Returns:
+            DeploymentResult with the added and removed VM names in details.
+        """
+        log.header(f"Scaling {self.component_name}")
+
+        try:
+            tofu = self.get_tofu_manager()
+            tofu.init()
+
+            current = self._deployed_indices(tofu)
+            desired = self._desired_indices(current, to, remove or [])
+            added = [self._vm_name(i) for i in sorted(desired - current)]
+            removed = [self._vm_name(i) for i in sorted(current - desired)]
+            details = {"added": added, "removed": removed, "count": len(desired)}
+
+            if not added and not removed:
+                log.success(f"Fleet already has {len(current)} VM(s), nothing to do")
+                return DeploymentResult(
+                    success=True,
+                    message=f"{self.component_name} unchanged",
+                    details=details,
+                )
+
+            log.info(f"Scaling from {len(current)} to {len(desired)} VM(s)")
+            for name in added:
+                log.bullet(f"+ {name}")
+            for name in removed:
+                log.bullet(f"- {name}")
+
+            self.count = len(desired)
+            self._vms_config = self.config.claude_vms.generate_vms(
+                prefix=self.prefix,
+                start_id=self.start_id,
+                allocator=self.ip_allocator,
+                indices=desired,
+            )
+
+            targets = [vm_address(name) for name in added + removed]
+            if tofu.plan(variables=self._tofu_variables, targets=targets):
+                tofu.apply(variables=self._tofu_variables, targets=targets)
+            if removed and self.ip_allocator is not None:
+                self.ip_allocator.release(removed)
+            tofu.export_inventory()
+
+            if added and not skip_configure:
+                self._wait_and_configure(skip_hardening=skip_hardening, hosts=added)
+
+            log.header("Scaling Complete")
+            return DeploymentResult(
+                success=True,
+                message=f"{self.component_name} scaled to {len(desired)} VM(s)",
+                details=details,
+            )
+
+        except CommandError as e:
+            log.error(f"Scaling failed: {e}")
+            return DeploymentResult(success=False, message=str(e))
+        except Exception as e:
+            log.error(f"Unexpected error: {e}")
+            return DeploymentResult(success=False, message=str(e))
+
+    def _vm_name(self, index: int) -> str:
+        """Get the name of the VM with the given 1-based number."""
+        return f"{self.prefix}-{index}"
+
+    def _deployed_indices(self, tofu: OpenTofuManager) -> set[int]:
+        """Get the numbers of the VMs with this prefix in the current state."""
+        pattern = re.compile(rf"^{re.escape(self.prefix)}-(\d+)$")
+        return {
+            int(match.group(1)) for name in tofu.snapshot().vms() if (match := pattern.match(name))
+        }
+
+    def _desired_indices(self, current: set[int], to: int | None, remove: list[str]) -> set[int]:
+        """Work out the VM numbers after a scale operation.
+
+        Args:
+            current: Deployed VM numbers.
+            to: Desired fleet size, if given.
+            remove: Names of VMs to remove.
+
+        Returns:
+            Desired VM numbers.
+
+        Raises:
+            ValueError: If a name is not deployed or the size is out of range.
+        """
+        desired = set(current)
+        removed: set[int] = set()
+        for name in remove:
+            index = next((i for i in current if self._vm_name(i) == name), None)
+            if index is None:
+                raise ValueError(f"{name} is not a deployed VM")
+            removed.add(index)
+        desired -= removed
+
+        if to is not None:
+            if to < 0 or to > MAX_VMS:
+                raise ValueError(f"VM count must be between 0 and {MAX_VMS}, got {to}")
+            while len(desired) > to:
+                desired.remove(max(desired))
+            candidates = (i for i in range(1, MAX_VMS * 2 + 1) if i not in desired | removed)
+            while len(desired) < to:
+                desired.add(next(candidates))
+        return desired
 
     def _destroy(self, tofu: OpenTofuManager, **kwargs) -> None:
-        """Destroy the Claude VMs."""
+        """Destroy the Claude VMs and release their static addresses."""
+        deployed = list(tofu.snapshot().vms()) if self.ip_allocator is not None else []
         tofu.destroy(variables=self._tofu_variables)
+        if self.ip_allocator is not None:
+            self.ip_allocator.release(deployed)
         log.success("All Claude VMs destroyed")
 
     def _plan(self, **kwargs) -> None:
         """Show the infrastructure plan without applying."""
         tofu = self.get_tofu_manager()
         tofu.init()
-        tofu.plan(variables=self._tofu_variables)
+        tofu.plan(variables=self._tofu_variables, reuse=False)
 
     def _log_summary(self, **kwargs) -> None:
         """Log VM IP addresses and connection info."""
@@ -238,14 +847,17 @@ class ClaudeVMsDeployer(BaseDeployer):
         self,
         skip_provision: bool = False,
         skip_configure: bool = False,
+        resume: bool = False,
+        *,
         skip_hardening: bool = False,
-        **kwargs,
-    ):
+        **kwargs: Any,
+    ) -> DeploymentResult:
         """Deploy Claude VMs.
 
         Args:
             skip_provision: Skip OpenTofu provisioning.
             skip_configure: Skip Ansible configuration.
+            resume: Skip phases (and VMs) the journal shows completed with unchanged inputs.
             skip_hardening: Skip hardening roles.
             **kwargs: Additional arguments.
 
@@ -255,6 +867,7 @@ class ClaudeVMsDeployer(BaseDeployer):
         return super().deploy(
             skip_provision=skip_provision,
             skip_configure=skip_configure,
+            resume=resume,
             skip_hardening=skip_hardening,
             **kwargs,
         )
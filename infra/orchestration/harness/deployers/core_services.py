@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from harness.core.logger import log
 from harness.deployers.base import BaseDeployer
@@ -46,20 +46,24 @@ class CoreServicesDeployer(BaseDeployer):
         """Provision the Core Services VM."""
         tofu = self.get_tofu_manager()
         tofu.init()
-        tofu.plan()
-        tofu.apply()
+        if tofu.plan():
+            tofu.apply()
         tofu.export_inventory()
 
     def _configure(self, **kwargs) -> None:
         """Configure Core Services using Ansible."""
         ansible = self.get_ansible_manager()
-        ansible.install_requirements()
+        self._install_requirements(ansible)
         # Pass Neo4j IP from central config to ensure consistency
         extra_vars = {
             "neo4j_ip": self.config.neo4j.ip,
         }
         ansible.run_playbook(extra_vars=extra_vars)
 
+    def _configure_inputs(self, **kwargs) -> list[Any]:
+        """Inputs that determine the configuration result, including the Neo4j IP."""
+        return [*super()._configure_inputs(**kwargs), {"neo4j_ip": self.config.neo4j.ip}]
+
     def _destroy(self, tofu: OpenTofuManager, **kwargs) -> None:
         """Destroy the Core Services VM."""
         tofu.destroy()
@@ -0,0 +1,226 @@
+"""Golden image baking for Claude VMs."""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from harness.core.logger import log
+from harness.core.runner import check_dependencies
+from harness.deployers.base import DeploymentResult
+from harness.deployers.claude_vms import AGENT_POLL_INTERVAL, IP_WAIT_TIMEOUT
+from harness.infra import AnsibleManager, SSHWaiter
+from harness.infra.galaxy_cache import GalaxyCache
+from harness.infra.image import BakedImage, ImageCatalog, playbook_fingerprint
+from harness.infra.proxmox import ProxmoxClient
+
+if TYPE_CHECKING:
+    from harness.core.config import Config
+
+# Playbook tags run while baking: host-independent steps, then the image cleanup
+BAKE_TAGS = ["bake", "seal"]
+
+
+class ImageBaker:
+    """Bakes the host-independent part of the Claude VM playbook into a template.
+
+    The source template (``proxmox.template_id``) is cloned, booted and
+    configured with only the tasks tagged ``bake`` (system upgrade, hardening,
+    Docker, Go, packages, user toolchains). The ``seal`` tasks then reset
+    cloud-init and host keys, and the VM is shut down and converted into a new
+    versioned template. Claude VMs clone the latest image and only run the
+    host-specific tasks.
+    """
+
+    REQUIRED_DEPENDENCIES: list[str] = ["ansible-playbook", "ansible-galaxy", "ssh"]
+
+    def __init__(self, config: Config, verbose: bool = False):
+        """Initialize the baker.
+
+        Args:
+            config: Application configuration.
+            verbose: Enable verbose output.
+        """
+        self.config = config
+        self.verbose = verbose
+        self.catalog = ImageCatalog.from_config(config)
+        check_dependencies(self.REQUIRED_DEPENDENCIES)
+
+    @property
+    def provision_dir(self) -> Path:
+        """Claude VMs provision directory (for the Proxmox endpoint in terraform.tfvars)."""
+        return self.config.claude_vms_dir / "provision"
+
+    @property
+    def config_dir(self) -> Path:
+        """Claude VMs Ansible directory."""
+        return self.config.claude_vms_dir / "configuration"
+
+    @property
+    def node(self) -> str:
+        """Proxmox node to bake on."""
+        return self.config.proxmox.node
+
+    def bake(
+        self, source_template_id: int | None = None, keep_on_failure: bool = False
+    ) -> DeploymentResult:
+        """Bake a new image version.
+
+        Args:
+            source_template_id: Template to start from. Defaults to proxmox.template_id.
+            keep_on_failure: Leave the half-baked VM in place for debugging.
+
+        Returns:
+            DeploymentResult with the new image in details.
+        """
+        log.header("Baking Claude VM image")
+        client = ProxmoxClient.from_config(self.config, self.provision_dir)
+        if client is None:
+            return DeploymentResult(
+                success=False,
+                message="Baking needs the Proxmox API: set proxmox.endpoint (or "
+                "TF_VAR_proxmox_endpoint) and TF_VAR_proxmox_api_token",
+            )
+
+        started = time.monotonic()
+        with client:
+            image = self._new_image(client, source_template_id)
+            log.info("Configuration:")
+            log.bullet(f"Source template: {image.source_template_id}")
+            log.bullet(f"Image: {image.name} (ID: {image.template_id})")
+
+            created = False
+            try:
+                log.info(f"Cloning template {image.source_template_id}...")
+                client.clone_vm(
+                    self.node,
+                    image.source_template_id,
+                    image.template_id,
+                    image.name,
+                    storage=self.config.proxmox.datastore_id,
+                )
+                created = True
+                client.set_vm_config(self.node, image.template_id, self._vm_options(image))
+                client.start_vm(self.node, image.template_id)
+
+                host = self._wait_for_host(client, image)
+                self._run_playbook(image, host)
+
+                log.info("Shutting down and converting to a template...")
+                client.shutdown_vm(self.node, image.template_id)
+                client.convert_to_template(self.node, image.template_id)
+
+            except Exception as e:
+                log.error(f"Bake failed: {e}")
+                if created and not keep_on_failure:
+                    log.info(f"Removing VM {image.template_id}")
+                    try:
+                        client.delete_vm(self.node, image.template_id)
+                    except Exception as cleanup_error:
+                        log.warn(f"Could not remove VM {image.template_id}: {cleanup_error}")
+                return DeploymentResult(success=False, message=str(e))
+
+        image.baked_at = round(time.time(), 3)
+        self.catalog.record(image)
+        elapsed = time.monotonic() - started
+
+        log.header("Bake Complete")
+        log.success(f"{image.name} (ID: {image.template_id}) baked in {elapsed / 60:.1f} min")
+        log.info("New Claude VMs will clone it and run only the host-specific tasks")
+        return DeploymentResult(
+            success=True,
+            message=f"Baked {image.name}",
+            details={**self._describe(image), "elapsed": round(elapsed, 1)},
+        )
+
+    def _new_image(self, client: ProxmoxClient, source_template_id: int | None) -> BakedImage:
+        """Pick the version, name and a free template ID for the next image."""
+        version = self.catalog.next_version()
+        latest = self.catalog.latest()
+        start = self.config.image.template_id_start
+        if latest is not None:
+            start = max(start, latest.template_id + 1)
+        used = client.vm_ids()
+        template_id = next(i for i in range(start, start + 10000) if i not in used)
+
+        return BakedImage(
+            version=version,
+            template_id=template_id,
+            name=f"{self.config.image.name_prefix}-v{version}",
+            source_template_id=source_template_id or self.config.proxmox.template_id,
+            cloud_init_user=self.config.ssh.cloud_init_user,
+            playbook=playbook_fingerprint(self.config_dir),
+        )
+
+    def _vm_options(self, image: BakedImage) -> dict[str, Any]:
+        """Cloud-init, network and labels for the VM being baked."""
+        address = self.config.image.ip_address
+        ipconfig = f"ip={address},gw={self.config.network.gateway}" if address else "ip=dhcp"
+        return {
+            "ciuser": image.cloud_init_user,
+            "ipconfig0": ipconfig,
+            "net0": f"virtio,bridge={self.config.network.bridge}",
+            "agent": 1,
+            "tags": f"harness;golden;v{image.version}",
+            "description": (
+                f"Claude VM golden image v{image.version}, baked from template "
+                f"{image.source_template_id} by harness image bake"
+            ),
+        }
+
+    def _wait_for_host(self, client: ProxmoxClient, image: BakedImage) -> str:
+        """Get the VM's address and wait until it accepts SSH.
+
+        Raises:
+            RuntimeError: If no address appears or SSH never comes up.
+        """
+        if self.config.image.ip_address:
+            host = self.config.image.ip_address.split("/")[0]
+        else:
+            log.info("Waiting for the guest agent to report an address...")
+            host = client.wait_for_vm_ipv4(
+                self.node,
+                image.template_id,
+                subnet=self.config.network.subnet,
+                timeout=IP_WAIT_TIMEOUT,
+                interval=AGENT_POLL_INTERVAL,
+            )
+            log.success(f"{image.name} acquired {host}")
+
+        if not SSHWaiter.from_config(self.config).wait_for_host(host):
+            raise RuntimeError(f"{image.name} ({host}) did not become accessible over SSH")
+        return host
+
+    def _run_playbook(self, image: BakedImage, host: str) -> None:
+        """Run the bake and seal tasks against the VM through its own inventory."""
+        inventory = self.config.state_dir / "images" / f"{image.name}.json"
+        inventory.parent.mkdir(parents=True, exist_ok=True)
+        with open(inventory, "w") as f:
+            json.dump({"all": {"hosts": {image.name: {"ansible_host": host}}}}, f, indent=2)
+
+        ansible = AnsibleManager(
+            config_dir=self.config_dir,
+            galaxy_cache=GalaxyCache.from_config(self.config),
+            runs_dir=self.config.state_dir / "ansible-runs",
+        )
+        ansible.install_requirements()
+        try:
+            ansible.run_playbook(
+                inventory=str(inventory),
+                extra_vars={"cloud_init_user": image.cloud_init_user},
+                tags=BAKE_TAGS,
+            )
+        finally:
+            inventory.unlink(missing_ok=True)
+
+    @staticmethod
+    def _describe(image: BakedImage) -> dict[str, Any]:
+        """Summarize an image for JSON output."""
+        return {
+            "version": image.version,
+            "template_id": image.template_id,
+            "name": image.name,
+            "source_template_id": image.source_template_id,
+        }
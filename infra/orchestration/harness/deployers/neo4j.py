@@ -44,14 +44,14 @@ class Neo4jDeployer(BaseDeployer):
         """Provision the Neo4j VM."""
         tofu = self.get_tofu_manager()
         tofu.init()
-        tofu.plan()
-        tofu.apply()
+        if tofu.plan():
+            tofu.apply()
         tofu.export_inventory()
 
     def _configure(self, **kwargs) -> None:
         """Configure Neo4j using Ansible."""
         ansible = self.get_ansible_manager()
-        ansible.install_requirements()
+        self._install_requirements(ansible)
         ansible.run_playbook()
 
     def _destroy(self, tofu: OpenTofuManager, **kwargs) -> None:
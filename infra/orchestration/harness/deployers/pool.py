@@ -0,0 +1,430 @@
+"""Warm pool of pre-configured Claude VMs."""
+
+from __future__ import annotations
+
+import getpass
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from harness.core.ipam import IPAllocator
+from harness.core.logger import log
+from harness.deployers.base import DeploymentResult
+from harness.deployers.claude_vms import AGENT_POLL_INTERVAL, IP_WAIT_TIMEOUT, ClaudeVMsDeployer
+from harness.infra.pipeline import HostPipeline
+from harness.infra.pool import CLAIMED, FILLING, READY, PoolState, PoolVM
+from harness.infra.proxmox import ProxmoxAPIError, ProxmoxClient
+
+if TYPE_CHECKING:
+    from harness.core.config import Config
+
+
+class PoolManager:
+    """Keeps configured, stopped Claude VMs ready to hand out.
+
+    Pool VMs are cloned from the fleet's template (the latest baked image,
+    if any) through the Proxmox API, under a reserved ID range and outside
+    the claude-vms OpenTofu state. ``fill`` runs every playbook task except
+    the host-specific ones (tag: host) and shuts the VMs down. ``claim``
+    starts one, runs only the host tasks (GitHub token, Neo4j password,
+    Claude settings, MCP servers) and returns its address, while the pool
+    is refilled by a background ``harness pool fill``.
+    """
+
+    def __init__(self, config: Config, verbose: bool = False, neo4j_ip: str | None = None):
+        """Initialize the pool manager.
+
+        Args:
+            config: Application configuration.
+            verbose: Enable verbose output.
+            neo4j_ip: Override Neo4j IP address for claimed VMs.
+        """
+        self.config = config
+        self.verbose = verbose
+        self.vms = ClaudeVMsDeployer(config, verbose=verbose, neo4j_ip=neo4j_ip)
+        self.state = PoolState.from_config(config)
+        # Pool leases are kept apart from the fleet's, so neither reclaims the other's
+        self.ip_allocator = IPAllocator.from_config(config, namespace="pool")
+        if self.ip_allocator is not None:
+            self.ip_allocator.adopt(self.state.vms())
+
+    @property
+    def node(self) -> str:
+        """Proxmox node the pool lives on."""
+        return self.config.proxmox.node
+
+    @property
+    def template_id(self) -> int:
+        """Template new pool VMs are cloned from."""
+        return self.vms.template_id or self.config.proxmox.template_id
+
+    def status(self) -> list[PoolVM]:
+        """Get the pool VMs in ID order."""
+        return sorted(self.state.vms().values(), key=lambda vm: vm.vm_id)
+
+    def fill(self, size: int | None = None) -> DeploymentResult:
+        """Build VMs until ``size`` are ready or being built.
+
+        VMs left half-built by a fill that crashed are deleted and rebuilt.
+
+        Args:
+            size: Target number of unclaimed VMs. Defaults to pool.size.
+
+        Returns:
+            DeploymentResult with the built and failed VM names in details.
+        """
+        size = self.config.pool.size if size is None else size
+        log.header("Filling Claude VM pool")
+
+        try:
+            with self._client() as client:
+                new, abandoned = self._reserve(size)
+                for vm in abandoned:
+                    log.warn(f"Removing {vm.name}, left behind by an interrupted fill")
+                    self._delete(client, vm)
+                if not new:
+                    log.success(f"Pool already has {size} VM(s) ready or filling")
+                    return DeploymentResult(
+                        success=True,
+                        message="Pool is full",
+                        details={"built": [], "failed": []},
+                    )
+
+                log.info(f"Building {len(new)} VM(s) from template {self.template_id}:")
+                for vm in new:
+                    log.bullet(f"{vm.name} (ID: {vm.vm_id})")
+                failed = self._build(client, new)
+
+                for vm in new:
+                    if vm.name in failed:
+                        self._discard(client, vm)
+        except Exception as e:
+            log.error(f"Pool fill failed: {e}")
+            return DeploymentResult(success=False, message=str(e))
+
+        built = [vm.name for vm in new if vm.name not in failed]
+        details = {"built": built, "failed": failed}
+        if failed:
+            return DeploymentResult(
+                success=False,
+                message=f"{len(failed)} pool VM(s) failed to build: {failed}",
+                details=details,
+            )
+        log.success(f"Pool filled: {len(built)} VM(s) added")
+        return DeploymentResult(success=True, message="Pool filled", details=details)
+
+    def claim(self, claimed_by: str | None = None, refill: bool = True) -> DeploymentResult:
+        """Hand out a ready VM.
+
+        Args:
+            claimed_by: Who the VM is for. Defaults to the current user.
+            refill: Start a background fill to replace the claimed VM.
+
+        Returns:
+            DeploymentResult with the VM name, ID and address in details.
+        """
+        log.header("Claiming a Claude VM")
+        started = time.monotonic()
+
+        with self.state.transaction() as vms:
+            ready = sorted((vm for vm in vms.values() if vm.state == READY), key=lambda v: v.vm_id)
+            vm = ready[0] if ready else None
+            if vm is not None:
+                vm.state = CLAIMED
+                vm.claimed_by = claimed_by or getpass.getuser()
+                vm.updated_at = round(time.time(), 3)
+
+        if refill:
+            self.refill_in_background()
+        if vm is None:
+            return DeploymentResult(
+                success=False, message="No ready VMs in the pool; run `harness pool fill`"
+            )
+
+        log.info(f"Starting {vm.name} (ID: {vm.vm_id})")
+        try:
+            with self._client() as client:
+                try:
+                    client.start_vm(self.node, vm.vm_id)
+                    vm.ip = self._wait_for_host(client, vm)
+                    self._run_playbook(
+                        {vm.name: vm.ip}, extra_vars=self.vms.playbook_vars(), tags=["host"]
+                    )
+                except Exception:
+                    self._discard(client, vm)
+                    raise
+        except Exception as e:
+            log.error(f"Claim failed: {e}")
+            return DeploymentResult(success=False, message=str(e))
+
+        with self.state.transaction() as vms:
+            if vm.name in vms:
+                vms[vm.name].ip = vm.ip
+
+        elapsed = time.monotonic() - started
+        log.success(f"{vm.name} is ready at {vm.ip} ({elapsed:.0f}s)")
+        return DeploymentResult(
+            success=True,
+            message=f"Claimed {vm.name}",
+            details={"name": vm.name, "vm_id": vm.vm_id, "ip": vm.ip, "elapsed": round(elapsed, 1)},
+        )
+
+    def release(self, names: list[str], refill: bool = True) -> DeploymentResult:
+        """Delete pool VMs (normally claimed ones that are no longer needed).
+
+        Args:
+            names: Pool VM names.
+            refill: Start a background fill afterwards.
+
+        Returns:
+            DeploymentResult with the released names in details.
+        """
+        log.header("Releasing pool VMs")
+        with self.state.transaction() as vms:
+            unknown = [name for name in names if name not in vms]
+            released = [vms[name] for name in names if name in vms]
+
+        if unknown:
+            return DeploymentResult(success=False, message=f"Not in the pool: {', '.join(unknown)}")
+
+        try:
+            with self._client() as client:
+                for vm in released:
+                    self._discard(client, vm)
+                    log.success(f"Released {vm.name}")
+        except Exception as e:
+            log.error(f"Release failed: {e}")
+            return DeploymentResult(success=False, message=str(e))
+
+        if refill:
+            self.refill_in_background()
+        return DeploymentResult(
+            success=True,
+            message=f"Released {len(released)} VM(s)",
+            details={"released": [vm.name for vm in released]},
+        )
+
+    def refill_in_background(self) -> None:
+        """Start ``harness pool fill`` as a detached process."""
+        log_file = self.config.state_dir / "pool" / "fill.log"
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_file, "a") as out:
+            subprocess.Popen(
+                [sys.executable, "-m", "harness", "pool", "fill"],
+                cwd=self.config.orchestration_dir,
+                stdin=subprocess.DEVNULL,
+                stdout=out,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        log.info(f"Refilling the pool in the background (log: {log_file})")
+
+    def _client(self) -> ProxmoxClient:
+        """Get a Proxmox API client.
+
+        Raises:
+            RuntimeError: If the endpoint or token is not configured.
+        """
+        client = ProxmoxClient.from_config(self.config, self.vms.provision_dir)
+        if client is None:
+            raise RuntimeError(
+                "The pool needs the Proxmox API: set proxmox.endpoint (or "
+                "TF_VAR_proxmox_endpoint) and TF_VAR_proxmox_api_token"
+            )
+        return client
+
+    def _reserve(self, size: int) -> tuple[list[PoolVM], list[PoolVM]]:
+        """Claim free pool slots for this fill.
+
+        Returns:
+            Tuple of (new VMs to build, abandoned VMs to delete).
+        """
+        pool = self.config.pool
+        with self.state.transaction() as vms:
+            abandoned = [vm for vm in vms.values() if vm.abandoned]
+            for vm in abandoned:
+                del vms[vm.name]
+
+            missing = size - sum(1 for vm in vms.values() if vm.state != CLAIMED)
+            new: list[PoolVM] = []
+            for i in range(1, pool.max_size + 1):
+                if len(new) >= missing:
+                    break
+                name = f"{pool.prefix}-{i}"
+                if name in vms:
+                    continue
+                vms[name] = PoolVM(
+                    name=name,
+                    vm_id=pool.start_id + i - 1,
+                    state=FILLING,
+                    template_id=self.template_id,
+                    pid=os.getpid(),
+                    updated_at=round(time.time(), 3),
+                )
+                new.append(vms[name])
+
+        if len(new) < missing:
+            log.warn(f"Pool is at max_size ({pool.max_size}); building {len(new)} of {missing}")
+        return new, abandoned
+
+    def _build(self, client: ProxmoxClient, new: list[PoolVM]) -> list[str]:
+        """Clone and boot VMs, configure each as it accepts SSH, and shut it down.
+
+        Returns:
+            Names of VMs that failed.
+        """
+        skip_tags = ["host"]
+        if self.vms.image_is_current:
+            skip_tags.append("bake")
+        by_name = {vm.name: vm for vm in new}
+        hosts: dict[str, str] = {}
+        lock = threading.Lock()
+
+        def configure_batch(batch: list[str]) -> None:
+            with lock:
+                batch_hosts = {name: hosts[name] for name in batch}
+            self._run_playbook(
+                batch_hosts,
+                extra_vars={"cloud_init_user": self.config.ssh.cloud_init_user},
+                skip_tags=skip_tags,
+            )
+            for name in batch:
+                client.shutdown_vm(self.node, by_name[name].vm_id)
+                self._mark_ready(by_name[name])
+
+        def boot(vm: PoolVM) -> None:
+            client.clone_vm(
+                self.node,
+                vm.template_id or self.template_id,
+                vm.vm_id,
+                vm.name,
+                storage=self.config.proxmox.datastore_id,
+            )
+            client.set_vm_config(self.node, vm.vm_id, self._vm_options(vm))
+            client.start_vm(self.node, vm.vm_id)
+            vm.ip = self._wait_for_host(client, vm)
+            with lock:
+                hosts[vm.name] = vm.ip
+            pipeline.submit(vm.name)
+
+        self.vms.get_ansible_manager().install_requirements()
+        pipeline = HostPipeline(
+            configure_batch,
+            max_concurrency=self.config.claude_vms.configure_concurrency,
+            batch_window=self.config.claude_vms.configure_batch_window,
+        )
+        failed: list[str] = []
+        try:
+            with ThreadPoolExecutor(max_workers=min(len(new), client.pool_size)) as executor:
+                futures = {executor.submit(boot, vm): vm for vm in new}
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        log.error(f"{futures[future].name} failed to boot: {e}")
+                        failed.append(futures[future].name)
+        except BaseException:
+            pipeline.cancel()
+            raise
+        result = pipeline.close()
+        return failed + result.failed
+
+    def _vm_options(self, vm: PoolVM) -> dict[str, Any]:
+        """Cloud-init, network and labels for a pool VM."""
+        if self.ip_allocator is not None:
+            address = self.ip_allocator.allocate([vm.name])[vm.name]
+            ipconfig = f"ip={address},gw={self.config.network.gateway}"
+        else:
+            ipconfig = "ip=dhcp"
+        return {
+            "ciuser": self.config.ssh.cloud_init_user,
+            "ipconfig0": ipconfig,
+            "net0": f"virtio,bridge={self.config.network.bridge}",
+            "agent": 1,
+            "tags": "harness;pool",
+            "description": f"Claude VM pool member, cloned from template {vm.template_id}",
+        }
+
+    def _wait_for_host(self, client: ProxmoxClient, vm: PoolVM) -> str:
+        """Get a started VM's address and wait until it accepts SSH.
+
+        Raises:
+            RuntimeError: If no address appears or SSH never comes up.
+        """
+        if self.ip_allocator is not None:
+            host = self.ip_allocator.leases()[vm.name]
+        else:
+            host = client.wait_for_vm_ipv4(
+                self.node,
+                vm.vm_id,
+                subnet=self.config.network.subnet,
+                timeout=IP_WAIT_TIMEOUT,
+                interval=AGENT_POLL_INTERVAL,
+            )
+        if not self.vms.get_ssh_waiter().wait_for_host(host):
+            raise RuntimeError(f"{vm.name} ({host}) did not become accessible over SSH")
+        return host
+
+    def _run_playbook(self, hosts: dict[str, str], **options: Any) -> None:
+        """Run the Claude VM playbook against pool VMs through a private inventory.
+
+        Args:
+            hosts: VM name to address.
+            **options: Tags, skipped tags and extra vars for run_playbook.
+        """
+        inventory = self._inventory_path(hosts)
+        user = self.config.ssh.cloud_init_user
+        with open(inventory, "w") as f:
+            json.dump(
+                {
+                    "all": {
+                        "hosts": {
+                            name: {"ansible_host": ip, "ansible_user": user}
+                            for name, ip in hosts.items()
+                        }
+                    }
+                },
+                f,
+                indent=2,
+            )
+        try:
+            self.vms.get_ansible_manager().run_playbook(
+                inventory=str(inventory), limit=list(hosts), **options
+            )
+        finally:
+            inventory.unlink(missing_ok=True)
+
+    def _inventory_path(self, hosts: dict[str, str]) -> Path:
+        """Get an inventory path unique to this process and batch."""
+        directory = self.config.state_dir / "pool"
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / f"hosts-{os.getpid()}-{min(hosts)}.json"
+
+    def _mark_ready(self, vm: PoolVM) -> None:
+        """Record a built and stopped VM as ready to claim."""
+        with self.state.transaction() as vms:
+            vm.state = READY
+            vm.pid = None
+            vm.updated_at = round(time.time(), 3)
+            vms[vm.name] = vm
+
+    def _discard(self, client: ProxmoxClient, vm: PoolVM) -> None:
+        """Delete a pool VM and forget it."""
+        self._delete(client, vm)
+        with self.state.transaction() as vms:
+            vms.pop(vm.name, None)
+
+    def _delete(self, client: ProxmoxClient, vm: PoolVM) -> None:
+        """Delete a pool VM in Proxmox and release its address."""
+        try:
+            client.delete_vm(self.node, vm.vm_id)
+        except ProxmoxAPIError as e:
+            log.warn(f"Could not delete {vm.name} (ID: {vm.vm_id}): {e}")
+        if self.ip_allocator is not None:
+            self.ip_allocator.release([vm.name])
@@ -2,50 +2,92 @@
 
 from __future__ import annotations
 
+import configparser
+import os
+import threading
+import time
+import uuid
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from harness.core.logger import log
 from harness.core.runner import CommandRunner
+from harness.infra.ansible_events import (
+    CALLBACK_NAME,
+    CALLBACK_PLUGINS_DIR,
+    EventTail,
+    PlaybookProgress,
+    role_durations,
+)
 
 if TYPE_CHECKING:
-    pass
+    from harness.infra.galaxy_cache import GalaxyCache
+
+# Without a Galaxy cache, ansible-galaxy installs into a shared collections/roles
+# path, so concurrent components must not install at the same time
+_GALAXY_LOCK = threading.Lock()
 
 
 class AnsibleManager:
     """Manages Ansible operations for configuration management."""
 
-    def __init__(self, config_dir: Path):
+    def __init__(
+        self,
+        config_dir: Path,
+        galaxy_cache: GalaxyCache | None = None,
+        runs_dir: Path | None = None,
+    ):
         """Initialize the Ansible manager.
 
         Args:
             config_dir: Directory containing Ansible files (playbook.yml, etc).
+            galaxy_cache: Shared cache for requirements.yml installs. If None,
+                collections and roles go to Ansible's default paths.
+            runs_dir: Directory for per-run playbook event logs. If None,
+                playbooks run without the harness_events callback.
         """
         self.config_dir = config_dir
-        self.runner = CommandRunner(cwd=config_dir)
-
-    def install_requirements(self, force: bool = True) -> None:
+        self.galaxy_cache = galaxy_cache
+        self.runs_dir = runs_dir
+        env = {}
+        if galaxy_cache is not None and self.requirements_file.exists():
+            env = galaxy_cache.env(self.requirements_file)
+        self.runner = CommandRunner(cwd=config_dir, env=env)
+
+    @property
+    def requirements_file(self) -> Path:
+        """Ansible Galaxy requirements file."""
+        return self.config_dir / "requirements.yml"
+
+    def install_requirements(self, force: bool = False) -> None:
         """Install Ansible collections and roles from requirements.yml.
 
+        With a Galaxy cache, the install is skipped when requirements.yml
+        is unchanged since it was last installed.
+
         Args:
-            force: Force reinstall even if already present.
+            force: Reinstall even if already present.
         """
-        requirements_file = self.config_dir / "requirements.yml"
-        if not requirements_file.exists():
+        if not self.requirements_file.exists():
             log.warn("No requirements.yml found, skipping dependency installation")
             return
 
-        log.info("Installing Ansible collections...")
-        cmd = ["ansible-galaxy", "collection", "install", "-r", "requirements.yml"]
-        if force:
-            cmd.append("--force")
-        self.runner.run(cmd)
+        if self.galaxy_cache is not None:
+            self.galaxy_cache.install(self.requirements_file, self.runner, force=force)
+            return
+
+        with _GALAXY_LOCK:
+            log.info("Installing Ansible collections...")
+            cmd = ["ansible-galaxy", "collection", "install", "-r", "requirements.yml"]
+            if force:
+                cmd.append("--force")
+            self.runner.run(cmd)
 
-        log.info("Installing Ansible roles...")
-        cmd = ["ansible-galaxy", "role", "install", "-r", "requirements.yml"]
-        if force:
-            cmd.append("--force")
-        self.runner.run(cmd)
+            log.info("Installing Ansible roles...")
+            cmd = ["ansible-galaxy", "role", "install", "-r", "requirements.yml"]
+            if force:
+                cmd.append("--force")
+            self.runner.run(cmd)
 
     def run_playbook(
         self,
@@ -56,9 +98,16 @@ class AnsibleManager:
         tags: list[str] | None = None,
         verbosity: int = 1,
         timeout: int = 3600,
-    ) -> None:
+        limit: list[str] | None = None,
+    ) -> Path | None:
         """Run an Ansible playbook.
 
+        With a runs directory, the harness_events callback records every
+        per-host task result in ``<runs_dir>/<run>.jsonl`` and the full
+        output is saved in ``<runs_dir>/<run>.log``. The results are
+        streamed to the logger while the playbook runs, with a progress
+        counter and a per-role timing summary at the end.
+
         Args:
             playbook: Name of the playbook file.
             inventory: Inventory file path (relative to config_dir). Auto-detected if None.
@@ -67,6 +116,10 @@ class AnsibleManager:
             tags: Tags to run (only these tags will be executed).
             verbosity: Verbosity level (number of -v flags).
             timeout: Maximum seconds to wait for playbook completion (default 1 hour).
+            limit: Only run against these inventory hosts (--limit).
+
+        Returns:
+            Path of the run's event log, or None without a runs directory.
         """
         log.info(f"Running Ansible playbook: {playbook}")
 
@@ -100,8 +153,79 @@ class AnsibleManager:
         if tags:
             cmd.extend(["--tags", ",".join(tags)])
 
-        self.runner.run(cmd, timeout=timeout)
+        # Limit to specific hosts
+        if limit:
+            cmd.extend(["--limit", ",".join(limit)])
+
+        if self.runs_dir is None:
+            self.runner.run(cmd, timeout=timeout)
+            log.success("Playbook completed successfully")
+            return None
+
+        component = self.config_dir.parent.name
+        events_file = self.runs_dir / (
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{component}-{uuid.uuid4().hex[:8]}.jsonl"
+        )
+        label = f"{component} [{','.join(limit)}]" if limit else component
+        progress = PlaybookProgress(label)
+        try:
+            with EventTail(events_file, progress.handle):
+                self.runner.run(
+                    cmd,
+                    timeout=timeout,
+                    env=self._events_env(events_file),
+                    log_file=events_file.with_suffix(".log"),
+                )
+        finally:
+            self._log_run(progress, events_file)
         log.success("Playbook completed successfully")
+        return events_file
+
+    def _events_env(self, events_file: Path) -> dict[str, str]:
+        """Environment that enables the harness_events callback for one run.
+
+        ANSIBLE_CALLBACKS_ENABLED replaces the ansible.cfg setting, so the
+        callbacks enabled there (e.g. profile_tasks) are carried over.
+        """
+        enabled = [CALLBACK_NAME]
+        parser = configparser.ConfigParser(interpolation=None)
+        parser.read(self.config_dir / "ansible.cfg")
+        for value in (
+            parser.get("defaults", "callbacks_enabled", fallback=""),
+            os.environ.get("ANSIBLE_CALLBACKS_ENABLED", ""),
+        ):
+            for name in value.split(","):
+                callback = name.strip()
+                if callback and callback not in enabled:
+                    enabled.append(callback)
+        plugin_dirs = [
+            str(CALLBACK_PLUGINS_DIR),
+            os.environ.get("ANSIBLE_CALLBACK_PLUGINS")
+            or "~/.ansible/plugins/callback:/usr/share/ansible/plugins/callback",
+        ]
+        return {
+            "ANSIBLE_CALLBACK_PLUGINS": os.pathsep.join(plugin_dirs),
+            "ANSIBLE_CALLBACKS_ENABLED": ",".join(enabled),
+            "HARNESS_ANSIBLE_EVENTS": str(events_file),
+        }
+
+    def _log_run(self, progress: PlaybookProgress, events_file: Path) -> None:
+        """Log where a run's events were saved and which roles took longest."""
+        roles = role_durations(progress.records)
+        log.event(
+            "ansible_run",
+            run=progress.label,
+            events=str(events_file),
+            hosts=len(progress.hosts),
+            results=progress.done,
+            failed=progress.failed,
+            roles={name: round(seconds, 1) for name, seconds in roles.items()},
+        )
+        if roles:
+            slowest = ", ".join(f"{name} {secs:.0f}s" for name, secs in list(roles.items())[:5])
+            log.info(f"{progress.label}: slowest roles (host-seconds): {slowest}")
+        log.bullet(f"{progress.done} task result(s) saved to {events_file}")
+        log.bullet(f"Output saved to {events_file.with_suffix('.log')}")
 
     def check_syntax(self, playbook: str = "playbook.yml") -> bool:
         """Check playbook syntax.
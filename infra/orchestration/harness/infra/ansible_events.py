@@ -0,0 +1,199 @@
+"""Structured Ansible playbook events written by the harness_events callback."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from harness.core.logger import log
+
+# Directory passed to Ansible in ANSIBLE_CALLBACK_PLUGINS
+CALLBACK_PLUGINS_DIR = Path(__file__).parent / "ansible_plugins" / "callback"
+CALLBACK_NAME = "harness_events"
+
+# Seconds between progress lines on the console
+PROGRESS_INTERVAL = 10.0
+
+
+@dataclass
+class TaskRecord:
+    """One task's result on one host."""
+
+    host: str
+    task: str
+    play: str
+    role: str | None
+    action: str
+    status: str
+    changed: bool
+    failed: bool
+    start: float
+    duration: float
+
+    @classmethod
+    def from_event(cls, event: dict[str, Any]) -> TaskRecord:
+        """Build a record from a ``task_result`` event."""
+        return cls(
+            host=event["host"],
+            task=event["task"],
+            play=event.get("play", ""),
+            role=event.get("role"),
+            action=event.get("action", ""),
+            status=event["status"],
+            changed=bool(event.get("changed")),
+            failed=bool(event.get("failed")),
+            start=float(event.get("start", 0.0)),
+            duration=float(event.get("duration", 0.0)),
+        )
+
+    @property
+    def group(self) -> str:
+        """Role the task belongs to, or its play for tasks outside roles."""
+        return self.role or f"play: {self.play}"
+
+
+def read_events(path: Path) -> Iterator[dict[str, Any]]:
+    """Read the events of a run, skipping a torn final line."""
+    with open(path) as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def load_records(path: Path) -> list[TaskRecord]:
+    """Load the per-host task records of a run."""
+    return [TaskRecord.from_event(e) for e in read_events(path) if e.get("event") == "task_result"]
+
+
+def role_durations(records: list[TaskRecord]) -> dict[str, float]:
+    """Sum host-seconds per role, slowest first."""
+    totals: dict[str, float] = defaultdict(float)
+    for record in records:
+        totals[record.group] += record.duration
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+class PlaybookProgress:
+    """Turns a run's events into logger records and a hosts × tasks counter.
+
+    The total grows as tasks start, because conditionals, includes and tags
+    decide which tasks run only while the playbook executes.
+    """
+
+    def __init__(self, label: str):
+        """Initialize the progress tracker.
+
+        Args:
+            label: Name of the run shown in progress lines.
+        """
+        self.label = label
+        self.hosts: set[str] = set()
+        self.expected = 0
+        self.records: list[TaskRecord] = []
+        self.current_task = ""
+        self._last_report = 0.0
+
+    @property
+    def done(self) -> int:
+        """Host-task results received."""
+        return len(self.records)
+
+    @property
+    def failed(self) -> int:
+        """Host-task results that failed."""
+        return sum(1 for r in self.records if r.failed)
+
+    def handle(self, event: dict[str, Any]) -> None:
+        """Process one event."""
+        kind = event.get("event")
+        if kind == "play_start":
+            self.hosts = set(event.get("hosts") or [])
+        elif kind == "task_start":
+            self.current_task = event.get("task", "")
+            self.expected += len(self.hosts)
+            self._report()
+        elif kind == "task_result":
+            record = TaskRecord.from_event(event)
+            self.hosts.add(record.host)
+            self.expected = max(self.expected, self.done + 1)
+            self.records.append(record)
+            log.event("ansible_task", run=self.label, **asdict(record))
+
+    def _report(self) -> None:
+        """Log a progress line, at most every PROGRESS_INTERVAL seconds."""
+        now = time.monotonic()
+        if now - self._last_report < PROGRESS_INTERVAL:
+            return
+        self._last_report = now
+        log.info(
+            f"{self.label}: {self.done}/{self.expected} host tasks on {len(self.hosts)} "
+            f"host(s), {self.failed} failed; now: {self.current_task}"
+        )
+
+
+class EventTail:
+    """Follows an events file in a background thread while Ansible writes it."""
+
+    def __init__(
+        self,
+        path: Path,
+        handler: Callable[[dict[str, Any]], None],
+        interval: float = 0.2,
+    ):
+        """Initialize the tail.
+
+        Args:
+            path: Events file (created if missing).
+            handler: Called with each parsed event, in order.
+            interval: Seconds between polls for new lines.
+        """
+        self.path = path
+        self.handler = handler
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._follow, daemon=True)
+
+    def __enter__(self) -> EventTail:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _follow(self) -> None:
+        """Hand complete lines to the handler until stopped, then drain the rest."""
+        partial = ""
+        with open(self.path) as f:
+            while True:
+                stopping = self._stop.is_set()
+                chunk = f.read()
+                if chunk:
+                    lines = (partial + chunk).split("\n")
+                    partial = lines.pop()
+                    for line in lines:
+                        self._dispatch(line)
+                if stopping:
+                    break
+                self._stop.wait(self.interval)
+        if partial:
+            self._dispatch(partial)
+
+    def _dispatch(self, line: str) -> None:
+        """Parse a line and pass it on; a bad line or handler error is skipped."""
+        if not line.strip():
+            return
+        try:
+            self.handler(json.loads(line))
+        except Exception as e:
+            log.warn(f"Ignoring Ansible event from {self.path.name}: {e}")
@@ -0,0 +1,114 @@
+"""Ansible callback that writes playbook events as JSON lines for the harness.
+
+Loaded by AnsibleManager through ANSIBLE_CALLBACK_PLUGINS; events go to the
+file named by HARNESS_ANSIBLE_EVENTS and the plugin is inactive without it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any
+
+from ansible.plugins.callback import CallbackBase
+
+DOCUMENTATION = """
+    name: harness_events
+    type: notification
+    short_description: Write per-host task results as JSON lines
+    description:
+      - Appends one JSON object per playbook event (play and task starts,
+        per-host task results with durations, final stats) to the file in
+        the HARNESS_ANSIBLE_EVENTS environment variable.
+    requirements:
+      - enable in configuration
+"""
+
+
+class CallbackModule(CallbackBase):
+    """Stream playbook events to a JSON lines file."""
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "notification"
+    CALLBACK_NAME = "harness_events"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        path = os.environ.get("HARNESS_ANSIBLE_EVENTS")
+        self._file = open(path, "a", buffering=1) if path else None  # noqa: SIM115
+        self._play = ""
+        self._started: dict[tuple[str, str], float] = {}
+
+    def _emit(self, event: str, **data: Any) -> None:
+        if self._file is None:
+            return
+        record = {"event": event, "time": round(time.time(), 3), **data}
+        self._file.write(json.dumps(record, default=str) + "\n")
+
+    def v2_playbook_on_start(self, playbook: Any) -> None:
+        self._emit("playbook_start", playbook=os.path.basename(playbook._file_name))
+
+    def v2_playbook_on_play_start(self, play: Any) -> None:
+        self._play = play.get_name()
+        try:
+            inventory = play.get_variable_manager()._inventory
+            hosts = [host.get_name() for host in inventory.get_hosts(play.hosts)]
+        except Exception:
+            hosts = []
+        self._emit("play_start", play=self._play, hosts=hosts)
+
+    def v2_playbook_on_task_start(self, task: Any, is_conditional: bool) -> None:  # noqa: ARG002
+        self._emit("task_start", **self._task_fields(task))
+
+    def v2_playbook_on_handler_task_start(self, task: Any) -> None:
+        self._emit("task_start", handler=True, **self._task_fields(task))
+
+    def v2_runner_on_start(self, host: Any, task: Any) -> None:
+        self._started[(task._uuid, host.get_name())] = time.time()
+
+    def v2_runner_on_ok(self, result: Any) -> None:
+        changed = bool(result._result.get("changed", False))
+        self._result(result, "changed" if changed else "ok")
+
+    def v2_runner_on_failed(self, result: Any, ignore_errors: bool = False) -> None:
+        self._result(result, "ignored" if ignore_errors else "failed")
+
+    def v2_runner_on_skipped(self, result: Any) -> None:
+        self._result(result, "skipped")
+
+    def v2_runner_on_unreachable(self, result: Any) -> None:
+        self._result(result, "unreachable")
+
+    def v2_playbook_on_stats(self, stats: Any) -> None:
+        hosts = {host: stats.summarize(host) for host in sorted(stats.processed)}
+        self._emit("playbook_stats", hosts=hosts)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _task_fields(self, task: Any) -> dict[str, Any]:
+        role = task._role.get_name() if task._role else None
+        return {
+            "play": self._play,
+            "task": task.get_name(),
+            "task_id": task._uuid,
+            "role": role,
+            "action": task.action,
+        }
+
+    def _result(self, result: Any, status: str) -> None:
+        host = result._host.get_name()
+        end = time.time()
+        start = self._started.pop((result._task._uuid, host), end)
+        self._emit(
+            "task_result",
+            host=host,
+            status=status,
+            changed=bool(result._result.get("changed", False)),
+            failed=status in ("failed", "unreachable"),
+            start=round(start, 3),
+            duration=round(end - start, 3),
+            **self._task_fields(result._task),
+        )
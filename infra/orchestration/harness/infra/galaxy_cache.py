@@ -0,0 +1,126 @@
+"""Shared Ansible Galaxy install cache."""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import os
+import shutil
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from harness.core.logger import log
+
+if TYPE_CHECKING:
+    from harness.core.config import Config
+    from harness.core.runner import CommandRunner
+
+
+class GalaxyCache:
+    """Collections and roles installed once per distinct requirements.yml.
+
+    Each entry lives under ``<root>/<sha256 of requirements.yml>/`` with
+    ``collections/`` and ``roles/`` subdirectories, so configuration
+    directories with identical requirements share one install. Entries are
+    built in a staging directory and renamed into place, so an entry that
+    exists is complete. Playbooks read the entry through
+    ``ANSIBLE_COLLECTIONS_PATH`` and ``ANSIBLE_ROLES_PATH``, and reusing an
+    entry needs no network access.
+    """
+
+    def __init__(self, root: Path):
+        """Initialize the Galaxy cache.
+
+        Args:
+            root: Cache root directory.
+        """
+        self.root = root
+
+    @classmethod
+    def from_config(cls, config: Config) -> GalaxyCache:
+        """Get the per-user Galaxy cache."""
+        return cls(config.cache_dir / "galaxy")
+
+    def key(self, requirements_file: Path) -> str:
+        """Get the cache key (content hash) of a requirements file."""
+        return hashlib.sha256(requirements_file.read_bytes()).hexdigest()
+
+    def entry(self, requirements_file: Path) -> Path:
+        """Get the cache entry directory for a requirements file."""
+        return self.root / self.key(requirements_file)
+
+    def env(self, requirements_file: Path) -> dict[str, str]:
+        """Environment variables that point Ansible at a requirements file's entry."""
+        entry = self.entry(requirements_file)
+        return {
+            "ANSIBLE_COLLECTIONS_PATH": str(entry / "collections"),
+            "ANSIBLE_ROLES_PATH": str(entry / "roles"),
+        }
+
+    def install(self, requirements_file: Path, runner: CommandRunner, force: bool = False) -> bool:
+        """Install a requirements file's collections and roles unless already cached.
+
+        The collection and role installs run concurrently. Concurrent
+        callers with the same requirements wait for a single install.
+
+        Args:
+            requirements_file: Ansible Galaxy requirements file.
+            runner: Runner for ``ansible-galaxy``.
+            force: Reinstall even if the entry exists.
+
+        Returns:
+            True if an install ran, False on a cache hit.
+        """
+        entry = self.entry(requirements_file)
+        if entry.is_dir() and not force:
+            log.info(f"Ansible requirements cached ({entry.name[:12]}), skipping install")
+            return False
+
+        with self._locked(entry.name):
+            # Another process may have filled the entry while we waited
+            if entry.is_dir() and not force:
+                log.info(f"Ansible requirements cached ({entry.name[:12]}), skipping install")
+                return False
+
+            staging = self.root / f"{entry.name}.{os.getpid()}.tmp"
+            shutil.rmtree(staging, ignore_errors=True)
+            staging.mkdir(parents=True)
+            try:
+                log.info("Installing Ansible collections and roles...")
+                installs = [
+                    ["collection", "install", "-p", str(staging / "collections")],
+                    ["role", "install", "-p", str(staging / "roles")],
+                ]
+                with ThreadPoolExecutor(max_workers=len(installs)) as executor:
+                    futures = [
+                        executor.submit(
+                            runner.run,
+                            ["ansible-galaxy", *args, "-r", str(requirements_file), "--force"],
+                        )
+                        for args in installs
+                    ]
+                    for future in futures:
+                        future.result()
+                shutil.copy2(requirements_file, staging / "requirements.yml")
+
+                shutil.rmtree(entry, ignore_errors=True)
+                os.rename(staging, entry)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+
+        log.success(f"Ansible requirements cached ({entry.name[:12]})")
+        return True
+
+    @contextmanager
+    def _locked(self, key: str) -> Iterator[None]:
+        """Hold an exclusive lock on one cache entry."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / f"{key}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
@@ -0,0 +1,98 @@
+"""Catalog of golden Claude VM images baked by ``harness image bake``."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from harness.core.journal import fingerprint
+
+if TYPE_CHECKING:
+    from harness.core.config import Config
+
+
+def playbook_fingerprint(config_dir: Path) -> str:
+    """Hash the Ansible inputs that a baked image was built from.
+
+    Args:
+        config_dir: Claude VMs configuration directory.
+
+    Returns:
+        Hex digest of the playbook, group vars and requirements.
+    """
+    return fingerprint(
+        config_dir / "playbook.yml",
+        config_dir / "group_vars",
+        config_dir / "requirements.yml",
+    )
+
+
+@dataclass
+class BakedImage:
+    """A versioned Proxmox template with the host-independent steps applied."""
+
+    version: int
+    template_id: int
+    name: str
+    source_template_id: int
+    cloud_init_user: str
+    playbook: str
+    baked_at: float = 0.0
+
+
+class ImageCatalog:
+    """Record of baked images, oldest first, kept in the harness state directory."""
+
+    def __init__(self, path: Path):
+        """Initialize the catalog.
+
+        Args:
+            path: JSON file holding the images.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Config) -> ImageCatalog:
+        """Get the catalog for a configuration."""
+        return cls(config.state_dir / "images.json")
+
+    def images(self) -> list[BakedImage]:
+        """Get all recorded images, oldest first."""
+        try:
+            with open(self.path) as f:
+                return [BakedImage(**entry) for entry in json.load(f)]
+        except (OSError, ValueError, TypeError):
+            return []
+
+    def latest(self) -> BakedImage | None:
+        """Get the most recently baked image."""
+        images = self.images()
+        return images[-1] if images else None
+
+    def find(self, template_id: int) -> BakedImage | None:
+        """Get the image with the given template ID, if it was baked here."""
+        return next((i for i in self.images() if i.template_id == template_id), None)
+
+    def next_version(self) -> int:
+        """Get the version number for the next bake."""
+        return max((i.version for i in self.images()), default=0) + 1
+
+    def record(self, image: BakedImage) -> None:
+        """Add a baked image as the latest.
+
+        Args:
+            image: Image to record.
+        """
+        with self._lock:
+            images = [i for i in self.images() if i.template_id != image.template_id]
+            images.append(image)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump([asdict(i) for i in images], f, indent=2)
+            os.replace(tmp, self.path)
@@ -0,0 +1,214 @@
+"""Adaptive parallelism for OpenTofu apply/destroy on Proxmox."""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import re
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Proxmox/provider messages that mean the node is saturated rather than broken
+CONTENTION_PATTERN = re.compile(
+    r"can't lock file|trying to acquire lock|got timeout|timeout while waiting"
+    r"|context deadline exceeded|Client\.Timeout",
+    re.IGNORECASE,
+)
+COMPLETE_PATTERN = re.compile(r"^(\S+): (Creation|Destruction) complete after")
+VM_RESOURCE = "proxmox_virtual_environment_vm."
+
+# Runs kept in the history file
+HISTORY_LIMIT = 50
+
+
+@dataclass
+class OperationStats:
+    """Outcome of one tofu apply/destroy, collected from its output."""
+
+    operation: str
+    parallelism: int
+    created: int = 0
+    destroyed: int = 0
+    contention: list[str] = field(default_factory=list)
+    elapsed: float = 0.0
+    success: bool = False
+
+    def observe(self, line: str) -> None:
+        """Update counters from one line of tofu output.
+
+        Args:
+            line: Output line (may contain ANSI colour codes).
+        """
+        text = re.sub(r"\x1b\[[0-9;]*m", "", line).strip()
+        match = COMPLETE_PATTERN.match(text)
+        if match and match.group(1).startswith(VM_RESOURCE):
+            if match.group(2) == "Creation":
+                self.created += 1
+            else:
+                self.destroyed += 1
+        elif CONTENTION_PATTERN.search(text):
+            self.contention.append(text)
+
+    @property
+    def vms(self) -> int:
+        """Number of VMs created or destroyed."""
+        return self.created + self.destroyed
+
+    @property
+    def vms_per_minute(self) -> float | None:
+        """Achieved VM throughput, or None if nothing completed."""
+        if not self.vms or self.elapsed <= 0:
+            return None
+        return round(self.vms / (self.elapsed / 60), 2)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "operation": self.operation,
+            "parallelism": self.parallelism,
+            "created": self.created,
+            "destroyed": self.destroyed,
+            "contention": len(self.contention),
+            "elapsed": round(self.elapsed, 3),
+            "vms_per_minute": self.vms_per_minute,
+            "success": self.success,
+        }
+
+
+class ParallelismScheduler:
+    """Chooses ``-parallelism`` for tofu and learns from each run.
+
+    In adaptive mode the level starts low, grows by one after every run that
+    kept all slots busy without contention, and halves when Proxmox reports
+    lock or timeout errors (additive increase, multiplicative decrease). The
+    learned level and per-run throughput are kept in a JSON file shared by
+    all components, since they contend for the same node.
+    """
+
+    def __init__(
+        self,
+        state_file: Path,
+        fixed: int | None = None,
+        minimum: int = 1,
+        maximum: int = 8,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            state_file: JSON file holding the learned level and run history.
+            fixed: Always use this level instead of adapting.
+            minimum: Lowest adaptive level.
+            maximum: Highest adaptive level.
+        """
+        self.state_file = state_file
+        self.fixed = fixed
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+
+    @classmethod
+    def from_config(cls, config: Any) -> ParallelismScheduler:
+        """Build a scheduler from the harness configuration.
+
+        Args:
+            config: Application configuration.
+
+        Returns:
+            ParallelismScheduler for the configured mode.
+
+        Raises:
+            ValueError: If ``tofu.parallelism`` is neither a number nor 'adaptive'.
+        """
+        tofu = config.tofu
+        fixed = None
+        if not tofu.adaptive:
+            try:
+                fixed = max(1, int(tofu.parallelism))
+            except ValueError as e:
+                raise ValueError(
+                    f"tofu.parallelism must be a number or 'adaptive', got {tofu.parallelism!r}"
+                ) from e
+        return cls(
+            state_file=config.state_dir / "parallelism.json",
+            fixed=fixed,
+            minimum=tofu.min_parallelism,
+            maximum=tofu.max_parallelism,
+        )
+
+    @property
+    def adaptive(self) -> bool:
+        """Whether the level is learned."""
+        return self.fixed is None
+
+    @property
+    def start(self) -> int:
+        """Level used before anything has been learned."""
+        return min(max(2, self.minimum), self.maximum)
+
+    def level(self) -> int:
+        """Get the parallelism to use for the next run."""
+        if self.fixed is not None:
+            return self.fixed
+        level = self._load().get("level", self.start)
+        return min(max(level, self.minimum), self.maximum)
+
+    def record(self, stats: OperationStats) -> int:
+        """Record a finished run and adjust the learned level.
+
+        Args:
+            stats: Statistics collected from the run.
+
+        Returns:
+            Level to use for the next run.
+        """
+        with self._locked():
+            state = self._load()
+            level = state.get("level", self.start) if self.fixed is None else self.fixed
+
+            if self.adaptive:
+                if stats.contention:
+                    level = max(self.minimum, stats.parallelism // 2)
+                elif stats.success and stats.vms >= stats.parallelism:
+                    level = min(self.maximum, max(level, stats.parallelism + 1))
+
+            history = state.get("history", [])
+            history.append({"at": round(time.time(), 3), **stats.to_dict()})
+            state["history"] = history[-HISTORY_LIMIT:]
+            if self.adaptive:
+                state["level"] = level
+            self._save(state)
+
+        return level
+
+    def history(self) -> list[dict[str, Any]]:
+        """Get recorded runs, oldest first."""
+        return self._load().get("history", [])
+
+    def _load(self) -> dict[str, Any]:
+        """Load scheduler state."""
+        if not self.state_file.exists():
+            return {}
+        with open(self.state_file) as f:
+            return json.load(f)
+
+    def _save(self, state: dict[str, Any]) -> None:
+        """Atomically write scheduler state."""
+        tmp = self.state_file.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, self.state_file)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold an exclusive lock on the state file for read-modify-write."""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_file.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
@@ -0,0 +1,196 @@
+"""Streaming host pipeline: run work on hosts in batches as they become ready."""
+
+from __future__ import annotations
+
+import contextvars
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from harness.core.logger import log
+from harness.core.trace import span
+
+
+@dataclass
+class BatchOutcome:
+    """Result of one batch."""
+
+    hosts: list[str]
+    ready_at: float
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the batch succeeded."""
+        return self.error is None
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of all batches, with times in seconds since the pipeline started."""
+
+    batches: list[BatchOutcome] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> list[str]:
+        """Hosts whose batch succeeded."""
+        return [host for batch in self.batches if batch.ok for host in batch.hosts]
+
+    @property
+    def failed(self) -> list[str]:
+        """Hosts whose batch failed."""
+        return [host for batch in self.batches if not batch.ok for host in batch.hosts]
+
+
+class HostPipeline:
+    """Runs a batch function over hosts that arrive one at a time.
+
+    Hosts are fed in with ``submit`` (for example from an SSH readiness
+    callback). A host that finds a run slot free starts a batch right away,
+    together with any hosts already waiting. Hosts that arrive while all
+    slots are busy are grouped into one run, which takes every host waiting
+    when a slot frees plus any that arrive within ``batch_window`` seconds of
+    its first host, up to ``max_batch`` hosts.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[list[str]], None],
+        max_concurrency: int = 4,
+        batch_window: float = 5.0,
+        max_batch: int = 10,
+    ):
+        """Initialize and start the pipeline.
+
+        Args:
+            run_batch: Work to run for a batch of hosts. Raises on failure.
+            max_concurrency: Maximum batches running at once.
+            batch_window: Seconds after its first host that a batch which had
+                to wait for a slot keeps collecting hosts.
+            max_batch: Maximum hosts per batch.
+        """
+        self.run_batch = run_batch
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_window = max(0.0, batch_window)
+        self.max_batch = max(1, max_batch)
+
+        # Ready hosts with their arrival time; None marks the end of the stream
+        self._queue: queue.Queue[tuple[str, float] | None] = queue.Queue()
+        self._slots = threading.Semaphore(self.max_concurrency)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        self._futures: list[Future[BatchOutcome]] = []
+        # Guards dispatching against cancel
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._start = time.monotonic()
+        # Batches run with the caller's context (e.g. the trace scope of its phase)
+        self._context = contextvars.copy_context()
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, host: str) -> None:
+        """Add a ready host.
+
+        Args:
+            host: Host name (as accepted by ``run_batch``).
+        """
+        self._queue.put((host, time.monotonic() - self._start))
+
+    def close(self) -> PipelineResult:
+        """Signal that no more hosts will arrive and wait for all batches.
+
+        Returns:
+            PipelineResult with one entry per batch.
+        """
+        self._queue.put(None)
+        self._dispatcher.join()
+        self._pool.shutdown(wait=True)
+        return PipelineResult(
+            batches=[f.result() for f in self._futures],
+            elapsed=time.monotonic() - self._start,
+        )
+
+    def cancel(self) -> None:
+        """Stop after an error: drop waiting hosts and wait only for running batches.
+
+        Use instead of ``close`` when the host stream ends with an exception
+        (e.g. Ctrl-C), so hosts still queued are not dispatched into new batches.
+        """
+        with self._lock:
+            self._cancelled = True
+        dropped = 0
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                dropped += 1
+        # Wakes the dispatcher if it is waiting for the next host
+        self._queue.put(None)
+        if dropped:
+            log.warn(f"Cancelled: {dropped} queued host(s) not started")
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _dispatch(self) -> None:
+        """Group queued hosts into batches and hand them to the pool."""
+        done = False
+        while not done:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+
+            # With a slot free the batch starts now; otherwise hosts that
+            # arrive while every slot is busy, or within the window, join it
+            deadline = time.monotonic()
+            if not self._slots.acquire(blocking=False):
+                deadline += self.batch_window
+                self._slots.acquire()
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    done = True
+                    break
+                batch.append(item)
+
+            with self._lock:
+                if self._cancelled:
+                    self._slots.release()
+                    break
+                self._futures.append(self._submit(batch))
+
+    def _submit(self, batch: list[tuple[str, float]]) -> Future[BatchOutcome]:
+        """Start a batch on the pool in the caller's context."""
+        context = self._context.copy()
+
+        def run() -> BatchOutcome:
+            return context.run(self._run, batch)
+
+        return self._pool.submit(run)
+
+    def _run(self, batch: list[tuple[str, float]]) -> BatchOutcome:
+        """Run one batch and release its slot."""
+        hosts = [host for host, _ in batch]
+        outcome = BatchOutcome(hosts=hosts, ready_at=min(at for _, at in batch))
+        outcome.started_at = time.monotonic() - self._start
+        try:
+            log.info(f"Starting batch of {len(hosts)} host(s): {', '.join(hosts)}")
+            with span(f"batch {', '.join(hosts)}", cat="batch", hosts=hosts):
+                self.run_batch(hosts)
+        except Exception as e:
+            outcome.error = str(e)
+            log.error(f"Batch {', '.join(hosts)} failed: {e}")
+        finally:
+            outcome.finished_at = time.monotonic() - self._start
+            self._slots.release()
+        return outcome
@@ -0,0 +1,283 @@
+"""Shared OpenTofu provider plugin cache."""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from harness.core.logger import log
+
+DEFAULT_REGISTRY = "registry.opentofu.org"
+
+_PROVIDER_BLOCK = re.compile(r"(\w+)\s*=\s*\{([^{}]*)\}", re.DOTALL)
+_SOURCE = re.compile(r'source\s*=\s*"([^"]+)"')
+_VERSION = re.compile(r'version\s*=\s*"\s*=?\s*([0-9][^",\s]*)\s*"')
+
+
+def current_platform() -> str:
+    """Get the OpenTofu platform string for this machine (e.g. 'linux_amd64')."""
+    machine = platform.machine().lower()
+    arch = {"x86_64": "amd64", "amd64": "amd64", "aarch64": "arm64", "arm64": "arm64"}.get(
+        machine, machine
+    )
+    return f"{sys.platform}_{arch}"
+
+
+@dataclass(frozen=True)
+class ProviderRequirement:
+    """A provider pinned to an exact version in ``required_providers``."""
+
+    hostname: str
+    namespace: str
+    type: str
+    version: str
+
+    @property
+    def address(self) -> str:
+        """Fully-qualified provider address (e.g. 'registry.opentofu.org/bpg/proxmox')."""
+        return f"{self.hostname}/{self.namespace}/{self.type}"
+
+    @property
+    def key(self) -> str:
+        """Cache key including the version."""
+        return f"{self.address}/{self.version}"
+
+    def package_path(self, platform_name: str) -> Path:
+        """Relative path of the unpacked package in cache/mirror layout."""
+        return Path(self.hostname, self.namespace, self.type, self.version, platform_name)
+
+
+def parse_required_providers(provision_dir: Path) -> list[ProviderRequirement]:
+    """Find exactly-pinned providers in a provision directory's *.tf files.
+
+    Providers with range constraints are skipped; they are resolved by
+    ``tofu init`` as usual.
+
+    Args:
+        provision_dir: Directory containing OpenTofu files.
+
+    Returns:
+        Pinned provider requirements.
+    """
+    requirements: set[ProviderRequirement] = set()
+    for tf_file in sorted(provision_dir.glob("*.tf")):
+        text = tf_file.read_text()
+        if "required_providers" not in text:
+            continue
+        block = text[text.index("required_providers") :]
+        for _name, body in _PROVIDER_BLOCK.findall(block):
+            source = _SOURCE.search(body)
+            version = _VERSION.search(body)
+            if not source or not version:
+                continue
+            parts = source.group(1).split("/")
+            if len(parts) == 2:
+                parts.insert(0, DEFAULT_REGISTRY)
+            if len(parts) != 3:
+                continue
+            hostname, namespace, type_ = parts
+            requirements.add(ProviderRequirement(hostname, namespace, type_, version.group(1)))
+    return sorted(requirements, key=lambda r: r.key)
+
+
+def _tree_digest(path: Path) -> str:
+    """Hash the file names and contents below a directory."""
+    digest = hashlib.sha256()
+    for file in sorted(p for p in path.rglob("*") if p.is_file()):
+        digest.update(str(file.relative_to(path)).encode() + b"\0")
+        with open(file, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _link_tree(src: Path, dest: Path) -> None:
+    """Populate ``dest`` from ``src`` using hard links, then reflinks, then copies."""
+    for file in src.rglob("*"):
+        target = dest / file.relative_to(src)
+        if file.is_dir():
+            target.mkdir(parents=True, exist_ok=True)
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists() or target.is_symlink():
+            target.unlink()
+        try:
+            os.link(file, target)
+        except OSError:
+            result = subprocess.run(
+                ["cp", "--reflink=auto", "--preserve=mode", str(file), str(target)],
+                capture_output=True,
+            )
+            if result.returncode != 0:
+                shutil.copy2(file, target)
+
+
+class ProviderCache:
+    """Content-verified provider cache shared by all provision directories.
+
+    The cache uses OpenTofu's unpacked plugin-cache layout, so it doubles as
+    ``TF_PLUGIN_CACHE_DIR`` (tofu fills it on download) and as a filesystem
+    mirror (tofu installs from it without contacting the registry). Each
+    entry's tree digest is recorded in ``index.json`` and verified before
+    use, so a partial or corrupted entry counts as a miss.
+    """
+
+    def __init__(self, root: Path, platform_name: str | None = None):
+        """Initialize the provider cache.
+
+        Args:
+            root: Cache root directory.
+            platform_name: OpenTofu platform string. Defaults to this machine.
+        """
+        self.root = root
+        self.platform = platform_name or current_platform()
+        self.index_file = root / "index.json"
+
+    def env(self) -> dict[str, str]:
+        """Environment variables that point tofu at the cache."""
+        return {"TF_PLUGIN_CACHE_DIR": str(self.root)}
+
+    def lookup(
+        self, requirements: list[ProviderRequirement]
+    ) -> tuple[list[ProviderRequirement], list[ProviderRequirement]]:
+        """Split requirements into verified cache hits and misses.
+
+        Args:
+            requirements: Providers to look up.
+
+        Returns:
+            Tuple of (hits, misses).
+        """
+        index = self._load_index()
+        hits, misses = [], []
+        for req in requirements:
+            package = self.root / req.package_path(self.platform)
+            expected = index.get(f"{req.key}/{self.platform}")
+            if expected and package.is_dir() and _tree_digest(package) == expected:
+                hits.append(req)
+            else:
+                misses.append(req)
+        return hits, misses
+
+    def prepare(self, provision_dir: Path, config_file: Path) -> dict[str, str]:
+        """Populate a provision directory from the cache before ``tofu init``.
+
+        Cached providers are hard-linked into ``.terraform/providers`` and a
+        CLI configuration is written that installs them from the cache as a
+        filesystem mirror, so init needs no network access for them.
+
+        Args:
+            provision_dir: Directory containing OpenTofu files.
+            config_file: Where to write the generated tofu CLI configuration.
+
+        Returns:
+            Environment variables for tofu commands in this directory.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        requirements = parse_required_providers(provision_dir)
+        hits, misses = self.lookup(requirements)
+
+        for req in hits:
+            installed = provision_dir / ".terraform" / "providers" / req.package_path(self.platform)
+            if installed.exists() or installed.is_symlink():
+                continue
+            _link_tree(self.root / req.package_path(self.platform), installed)
+
+        log.info(
+            f"Provider cache: {len(hits)} hit(s), {len(misses)} miss(es)",
+            cache_hits=[r.key for r in hits],
+            cache_misses=[r.key for r in misses],
+        )
+        for req in misses:
+            log.bullet(f"{req.key} will be downloaded")
+
+        self._write_cli_config(config_file, hits)
+        return {**self.env(), "TF_CLI_CONFIG_FILE": str(config_file)}
+
+    def record(self, provision_dir: Path) -> None:
+        """Add the providers installed in a provision directory to the cache.
+
+        Tofu normally writes downloads to the cache itself; packages that were
+        installed some other way are linked in here. Digests are refreshed for
+        every pinned provider that is now present.
+
+        Args:
+            provision_dir: Directory where ``tofu init`` has just run.
+        """
+        index = self._load_index()
+        changed = False
+        for req in parse_required_providers(provision_dir):
+            rel = req.package_path(self.platform)
+            cached = self.root / rel
+            installed = provision_dir / ".terraform" / "providers" / rel
+            if not cached.is_dir() and installed.is_dir() and not installed.is_symlink():
+                _link_tree(installed, cached)
+            if cached.is_dir():
+                digest = _tree_digest(cached)
+                key = f"{req.key}/{self.platform}"
+                if index.get(key) != digest:
+                    index[key] = digest
+                    changed = True
+        if changed:
+            self._save_index(index)
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold an exclusive lock on the cache.
+
+        OpenTofu does not support concurrent writers to a plugin cache, so
+        ``prepare``, ``tofu init`` and ``record`` run under this lock when
+        several provision directories initialize at once.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _write_cli_config(self, config_file: Path, cached: list[ProviderRequirement]) -> None:
+        """Write a tofu CLI config using the cache as plugin cache and mirror."""
+        lines = [f'plugin_cache_dir = "{self.root}"', ""]
+        if cached:
+            addresses = ", ".join(f'"{req.address}"' for req in cached)
+            lines += [
+                "provider_installation {",
+                "  filesystem_mirror {",
+                f'    path    = "{self.root}"',
+                f"    include = [{addresses}]",
+                "  }",
+                "  direct {",
+                f"    exclude = [{addresses}]",
+                "  }",
+                "}",
+            ]
+        config_file.parent.mkdir(parents=True, exist_ok=True)
+        config_file.write_text("\n".join(lines) + "\n")
+
+    def _load_index(self) -> dict[str, str]:
+        """Load the digest index."""
+        if not self.index_file.exists():
+            return {}
+        with open(self.index_file) as f:
+            return json.load(f)
+
+    def _save_index(self, index: dict[str, str]) -> None:
+        """Atomically write the digest index."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.index_file)
@@ -0,0 +1,106 @@
+"""On-disk state of the warm Claude VM pool."""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from harness.core.config import Config
+
+# Pool VM states
+FILLING = "filling"
+READY = "ready"
+CLAIMED = "claimed"
+
+
+@dataclass
+class PoolVM:
+    """A VM in the warm pool."""
+
+    name: str
+    vm_id: int
+    state: str
+    ip: str | None = None
+    template_id: int | None = None
+    # Process that is filling the VM, so a crashed fill can be detected
+    pid: int | None = None
+    updated_at: float = 0.0
+    claimed_by: str | None = None
+
+    @property
+    def abandoned(self) -> bool:
+        """Whether the VM was left half-built by a fill that is no longer running."""
+        return self.state == FILLING and not _pid_alive(self.pid)
+
+
+class PoolState:
+    """Pool VMs by name, shared between foreground commands and background fills.
+
+    Every read-modify-write happens under an exclusive file lock, so a claim
+    never hands out a VM twice and concurrent fills never build the same slot.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize the state.
+
+        Args:
+            path: JSON file holding the pool.
+        """
+        self.path = path
+
+    @classmethod
+    def from_config(cls, config: Config) -> PoolState:
+        """Get the pool state for a configuration."""
+        return cls(config.state_dir / "pool.json")
+
+    def vms(self) -> dict[str, PoolVM]:
+        """Get a snapshot of the pool."""
+        return self._load()
+
+    @contextmanager
+    def transaction(self) -> Iterator[dict[str, PoolVM]]:
+        """Lock the pool and yield its VMs; changes are saved on exit."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                vms = self._load()
+                yield vms
+                self._save(vms)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _load(self) -> dict[str, PoolVM]:
+        """Load the pool."""
+        try:
+            with open(self.path) as f:
+                return {name: PoolVM(**vm) for name, vm in json.load(f).items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def _save(self, vms: dict[str, PoolVM]) -> None:
+        """Atomically write the pool."""
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({name: asdict(vms[name]) for name in sorted(vms)}, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+def _pid_alive(pid: int | None) -> bool:
+    """Whether a process with this ID is running."""
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,482 @@
+"""Lightweight Proxmox VE API client."""
+
+from __future__ import annotations
+
+import http.client
+import ipaddress
+import json
+import os
+import queue
+import re
+import ssl
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote, urlencode, urlsplit
+
+# Seconds between task status polls
+TASK_POLL_INTERVAL = 2.0
+
+# Statuses meaning "try again": 500 until the guest agent runs, 502/503 from
+# a restarting pveproxy or a proxy in front of it
+RETRYABLE_STATUSES = frozenset({500, 502, 503})
+
+
+class ProxmoxAPIError(Exception):
+    """Raised when the Proxmox API returns an error response."""
+
+    def __init__(self, method: str, path: str, status: int, reason: str):
+        self.method = method
+        self.path = path
+        self.status = status
+        self.reason = reason
+        super().__init__(f"Proxmox API {method} {path} failed ({status}): {reason}")
+
+
+class ProxmoxTaskError(Exception):
+    """Raised when a Proxmox task fails or does not finish in time."""
+
+    def __init__(self, upid: str, status: str):
+        self.upid = upid
+        self.status = status
+        super().__init__(f"Proxmox task {upid} failed: {status}")
+
+
+def _read_tfvars_endpoint(provision_dir: Path) -> str | None:
+    """Read proxmox_endpoint from a provision directory's terraform.tfvars."""
+    tfvars = provision_dir / "terraform.tfvars"
+    if not tfvars.exists():
+        return None
+    match = re.search(r'^\s*proxmox_endpoint\s*=\s*"([^"]+)"', tfvars.read_text(), re.MULTILINE)
+    return match.group(1) if match else None
+
+
+class ProxmoxClient:
+    """Minimal Proxmox API client with keep-alive connection pooling.
+
+    Connections are HTTP/1.1 keep-alive and reused across requests, so
+    polling many VMs costs one TLS handshake per pooled connection rather than
+    one per request. The client authenticates with the same API token that
+    OpenTofu uses (``TF_VAR_proxmox_api_token``).
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        api_token: str,
+        verify_ssl: bool = False,
+        pool_size: int = 8,
+        timeout: float = 10.0,
+    ):
+        """Initialize the client.
+
+        Args:
+            endpoint: API endpoint URL (e.g. 'https://10.0.70.2:8006/').
+            api_token: Token in the form 'user@realm!token-name=token-secret'.
+            verify_ssl: Verify the server certificate (Proxmox is usually self-signed).
+            pool_size: Maximum number of idle connections kept open.
+            timeout: Socket timeout in seconds per request.
+        """
+        parts = urlsplit(endpoint)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Invalid Proxmox endpoint: {endpoint}")
+
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (8006 if parts.scheme == "https" else 80)
+        self.base_path = parts.path.rstrip("/") + "/api2/json"
+        self.timeout = timeout
+        self.pool_size = max(1, pool_size)
+        self._headers = {
+            "Authorization": f"PVEAPIToken={api_token}",
+            "Accept": "application/json",
+        }
+        self._ssl_context = ssl.create_default_context()
+        if not verify_ssl:
+            self._ssl_context.check_hostname = False
+            self._ssl_context.verify_mode = ssl.CERT_NONE
+        self._pool: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue(
+            maxsize=self.pool_size
+        )
+
+    @classmethod
+    def from_config(cls, config: Any, provision_dir: Path | None = None) -> ProxmoxClient | None:
+        """Build a client from configuration and the environment.
+
+        The endpoint is taken from ``proxmox.endpoint`` in config.yaml, then
+        ``TF_VAR_proxmox_endpoint``, then ``proxmox_endpoint`` in the
+        provision directory's terraform.tfvars.
+
+        Args:
+            config: Application configuration.
+            provision_dir: Provision directory to read terraform.tfvars from.
+
+        Returns:
+            ProxmoxClient, or None if the endpoint or token is not available.
+        """
+        token = os.environ.get("TF_VAR_proxmox_api_token")  # noqa: SIM112
+        endpoint = config.proxmox.endpoint or os.environ.get("TF_VAR_proxmox_endpoint")  # noqa: SIM112
+        if not endpoint and provision_dir is not None:
+            endpoint = _read_tfvars_endpoint(provision_dir)
+        if not endpoint or not token:
+            return None
+        return cls(endpoint=endpoint, api_token=token)
+
+    def __enter__(self) -> ProxmoxClient:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        """Send an API request and return the response ``data`` field.
+
+        Args:
+            method: HTTP method.
+            path: API path relative to /api2/json (e.g. '/nodes/pve1/qemu').
+            params: Query parameters (GET/DELETE) or form body (POST/PUT).
+
+        Returns:
+            Decoded ``data`` value from the response.
+
+        Raises:
+            ProxmoxAPIError: If the API returns a non-2xx status.
+            OSError: If the connection fails.
+        """
+        url = self.base_path + path
+        body = None
+        headers = dict(self._headers)
+        if params and method in ("GET", "DELETE"):
+            url += "?" + urlencode(params)
+        elif params:
+            body = urlencode(params)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+        conn = self._acquire()
+        try:
+            conn.request(method, url, body=body, headers=headers)
+            response = conn.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            raise
+        self._release(conn, response)
+
+        if not 200 <= response.status < 300:
+            raise ProxmoxAPIError(method, path, response.status, response.reason)
+        return json.loads(payload or b"{}").get("data")
+
+    def get(self, path: str, params: dict[str, Any] | None = None) -> Any:
+        """Send a GET request."""
+        return self.request("GET", path, params)
+
+    def post(self, path: str, params: dict[str, Any] | None = None) -> Any:
+        """Send a POST request."""
+        return self.request("POST", path, params)
+
+    def wait_task(self, node: str, upid: str | None, timeout: float = 600.0) -> None:
+        """Wait for an asynchronous task (clone, start, shutdown, ...) to finish.
+
+        Args:
+            node: Proxmox node name.
+            upid: Task ID returned by the call that started it. None (returned
+                by some calls that finish synchronously) is a no-op.
+            timeout: Maximum seconds to wait.
+
+        Raises:
+            ProxmoxTaskError: If the task fails or is still running at the timeout.
+        """
+        if not upid:
+            return
+        path = f"/nodes/{node}/tasks/{quote(upid, safe='')}/status"
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.get(path) or {}
+            if status.get("status") == "stopped":
+                exit_status = status.get("exitstatus", "")
+                if exit_status != "OK":
+                    raise ProxmoxTaskError(upid, exit_status or "unknown error")
+                return
+            if time.monotonic() >= deadline:
+                raise ProxmoxTaskError(upid, f"still running after {timeout:.0f}s")
+            time.sleep(TASK_POLL_INTERVAL)
+
+    def vm_ids(self) -> set[int]:
+        """Get the IDs of all VMs and templates in the cluster."""
+        resources = self.get("/cluster/resources", {"type": "vm"}) or []
+        return {int(r["vmid"]) for r in resources if "vmid" in r}
+
+    def clone_vm(
+        self,
+        node: str,
+        source_id: int,
+        new_id: int,
+        name: str,
+        storage: str | None = None,
+        timeout: float = 1800.0,
+    ) -> None:
+        """Full-clone a VM or template and wait for the copy to finish.
+
+        Args:
+            node: Proxmox node name.
+            source_id: VM ID to clone.
+            new_id: VM ID of the clone.
+            name: Name of the clone.
+            storage: Target datastore for the disks. Defaults to the source's.
+            timeout: Maximum seconds to wait for the disk copy.
+        """
+        params: dict[str, Any] = {"newid": new_id, "name": name, "full": 1}
+        if storage:
+            params["storage"] = storage
+        upid = self.post(f"/nodes/{node}/qemu/{source_id}/clone", params)
+        self.wait_task(node, upid, timeout)
+
+    def set_vm_config(self, node: str, vm_id: int, options: dict[str, Any]) -> None:
+        """Update VM options (cloud-init user, network, tags, description, ...).
+
+        Args:
+            node: Proxmox node name.
+            vm_id: VM ID.
+            options: Options as accepted by ``qm set``.
+        """
+        self.request("PUT", f"/nodes/{node}/qemu/{vm_id}/config", options)
+
+    def start_vm(self, node: str, vm_id: int) -> None:
+        """Start a VM and wait until it is running."""
+        self.wait_task(node, self.post(f"/nodes/{node}/qemu/{vm_id}/status/start"))
+
+    def shutdown_vm(self, node: str, vm_id: int, timeout: int = 300) -> None:
+        """Shut a VM down cleanly via ACPI or the guest agent, stopping it after the timeout.
+
+        Args:
+            node: Proxmox node name.
+            vm_id: VM ID.
+            timeout: Seconds to wait for a clean shutdown.
+        """
+        upid = self.post(
+            f"/nodes/{node}/qemu/{vm_id}/status/shutdown",
+            {"timeout": timeout, "forceStop": 1},
+        )
+        self.wait_task(node, upid, timeout + 60)
+
+    def convert_to_template(self, node: str, vm_id: int) -> None:
+        """Convert a stopped VM into a template."""
+        self.wait_task(node, self.post(f"/nodes/{node}/qemu/{vm_id}/template"))
+
+    def delete_vm(self, node: str, vm_id: int) -> None:
+        """Stop (if running) and delete a VM with its disks."""
+        status = self.get(f"/nodes/{node}/qemu/{vm_id}/status/current") or {}
+        if status.get("status") == "running":
+            self.wait_task(node, self.post(f"/nodes/{node}/qemu/{vm_id}/status/stop"))
+        upid = self.request(
+            "DELETE", f"/nodes/{node}/qemu/{vm_id}", {"purge": 1, "destroy-unreferenced-disks": 1}
+        )
+        self.wait_task(node, upid)
+
+    def snapshot_names(self, node: str, vm_id: int) -> set[str]:
+        """Get the names of a VM's snapshots."""
+        snapshots = self.get(f"/nodes/{node}/qemu/{vm_id}/snapshot") or []
+        # The listing always includes the pseudo-snapshot 'current'
+        return {s["name"] for s in snapshots if s.get("name") != "current"}
+
+    def create_snapshot(
+        self, node: str, vm_id: int, name: str, description: str | None = None
+    ) -> None:
+        """Take a disk snapshot of a VM, replacing an existing one of the same name.
+
+        The VM keeps running; the guest agent freezes its filesystems while
+        the snapshot is taken. No RAM state is saved, so a rollback leaves
+        the VM stopped.
+
+        Args:
+            node: Proxmox node name.
+            vm_id: VM ID.
+            name: Snapshot name (letters, digits, '-' and '_').
+            description: Snapshot description.
+        """
+        if name in self.snapshot_names(node, vm_id):
+            self.delete_snapshot(node, vm_id, name)
+        params: dict[str, Any] = {"snapname": name, "vmstate": 0}
+        if description:
+            params["description"] = description
+        self.wait_task(node, self.post(f"/nodes/{node}/qemu/{vm_id}/snapshot", params))
+
+    def delete_snapshot(self, node: str, vm_id: int, name: str) -> None:
+        """Delete a VM snapshot."""
+        upid = self.request("DELETE", f"/nodes/{node}/qemu/{vm_id}/snapshot/{name}")
+        self.wait_task(node, upid)
+
+    def rollback_snapshot(self, node: str, vm_id: int, name: str, timeout: float = 600.0) -> None:
+        """Roll a VM back to a snapshot, stopping it first if it is running.
+
+        Args:
+            node: Proxmox node name.
+            vm_id: VM ID.
+            name: Snapshot name.
+            timeout: Maximum seconds to wait for the rollback.
+        """
+        upid = self.post(f"/nodes/{node}/qemu/{vm_id}/snapshot/{name}/rollback")
+        self.wait_task(node, upid, timeout)
+
+    def get_interfaces(self, node: str, vm_id: int) -> list[dict[str, Any]]:
+        """Get network interfaces reported by a VM's QEMU guest agent.
+
+        Args:
+            node: Proxmox node name.
+            vm_id: VM ID.
+
+        Returns:
+            List of interface dictionaries from ``network-get-interfaces``.
+        """
+        data = self.get(f"/nodes/{node}/qemu/{vm_id}/agent/network-get-interfaces")
+        return (data or {}).get("result", [])
+
+    def get_vm_ipv4(self, node: str, vm_id: int, subnet: str | None = None) -> str | None:
+        """Get the primary IPv4 address of a VM from its guest agent.
+
+        Args:
+            node: Proxmox node name.
+            vm_id: VM ID.
+            subnet: Prefer addresses inside this CIDR network.
+
+        Returns:
+            IPv4 address, or None if the agent is not up, reports no address
+            yet, or the API could not be reached (so polling callers retry).
+        """
+        try:
+            interfaces = self.get_interfaces(node, vm_id)
+        except ProxmoxAPIError as e:
+            if e.status in RETRYABLE_STATUSES:
+                return None
+            raise
+        except (OSError, http.client.HTTPException):
+            return None
+        return select_ipv4(interfaces, subnet)
+
+    def wait_for_vm_ipv4(
+        self,
+        node: str,
+        vm_id: int,
+        subnet: str | None = None,
+        timeout: float = 120.0,
+        interval: float = 2.0,
+    ) -> str:
+        """Poll a VM's guest agent until it reports an IPv4 address.
+
+        Args:
+            node: Proxmox node name.
+            vm_id: VM ID.
+            subnet: Prefer addresses inside this CIDR network.
+            timeout: Maximum seconds to wait.
+            interval: Seconds between polls.
+
+        Returns:
+            IPv4 address.
+
+        Raises:
+            RuntimeError: If no address is reported within the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            ip = self.get_vm_ipv4(node, vm_id, subnet)
+            if ip is not None:
+                return ip
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"VM {vm_id} did not report an IP within {timeout:.0f} seconds")
+            time.sleep(interval)
+
+    def get_vm_ips(
+        self,
+        node: str,
+        vm_ids: Iterable[int],
+        subnet: str | None = None,
+    ) -> dict[int, str | None]:
+        """Query the guest agent of many VMs concurrently.
+
+        Args:
+            node: Proxmox node name.
+            vm_ids: VM IDs to query.
+            subnet: Prefer addresses inside this CIDR network.
+
+        Returns:
+            Mapping of VM ID to IPv4 address (None if not yet known).
+        """
+        ids = list(vm_ids)
+        if not ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(ids))) as executor:
+            results = executor.map(lambda vm_id: self.get_vm_ipv4(node, vm_id, subnet), ids)
+            return dict(zip(ids, results, strict=True))
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        """Take an idle pooled connection or open a new one."""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(
+                self.host, self.port, timeout=self.timeout, context=self._ssl_context
+            )
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(
+        self, conn: http.client.HTTPConnection, response: http.client.HTTPResponse
+    ) -> None:
+        """Return a connection to the pool unless the server closed it."""
+        if response.will_close:
+            conn.close()
+            return
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+def select_ipv4(interfaces: list[dict[str, Any]], subnet: str | None = None) -> str | None:
+    """Pick the primary IPv4 address from guest-agent interface data.
+
+    Loopback and link-local addresses are ignored. When ``subnet`` is given,
+    an address inside it is preferred over any other.
+
+    Args:
+        interfaces: Interfaces as returned by ``network-get-interfaces``.
+        subnet: Preferred CIDR network.
+
+    Returns:
+        IPv4 address, or None if none is usable.
+    """
+    network = ipaddress.IPv4Network(subnet, strict=False) if subnet else None
+    candidates: list[ipaddress.IPv4Address] = []
+
+    for interface in interfaces:
+        if interface.get("name") == "lo":
+            continue
+        for address in interface.get("ip-addresses", []):
+            if address.get("ip-address-type") != "ipv4":
+                continue
+            ip = ipaddress.IPv4Address(address["ip-address"])
+            if ip.is_loopback or ip.is_link_local:
+                continue
+            candidates.append(ip)
+
+    if network is not None:
+        for ip in candidates:
+            if ip in network:
+                return str(ip)
+    return str(candidates[0]) if candidates else None
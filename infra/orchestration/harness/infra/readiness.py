@@ -0,0 +1,125 @@
+"""Readiness polling primitives: adaptive backoff and per-host timing reports."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import Any
+
+from harness.core.logger import log
+
+
+@dataclass
+class BackoffPolicy:
+    """Exponential backoff between readiness attempts.
+
+    Polling starts immediately and the delay grows from ``initial`` by
+    ``factor`` up to ``maximum``. Callers reset the policy when a host makes
+    progress (e.g. its SSH port starts answering) so the final step is
+    detected quickly.
+    """
+
+    initial: float = 1.0
+    factor: float = 1.5
+    maximum: float = 10.0
+    jitter: float = 0.1
+
+    def delay(self, attempt: int) -> float:
+        """Get the delay to sleep after a failed attempt.
+
+        Args:
+            attempt: Zero-based attempt number since the last reset.
+
+        Returns:
+            Delay in seconds, capped at ``maximum``.
+        """
+        base = min(self.initial * (self.factor**attempt), self.maximum)
+        if self.jitter:
+            base *= 1 + random.uniform(-self.jitter, self.jitter)
+        return round(min(base, self.maximum), 3)
+
+    def describe(self) -> str:
+        """Get a short human-readable description of the curve."""
+        return f"{self.initial:g}s x{self.factor:g} up to {self.maximum:g}s"
+
+
+@dataclass
+class HostReadiness:
+    """Timing record for a single host."""
+
+    host: str
+    ready: bool = False
+    attempts: int = 0
+    time_to_ready: float | None = None
+    port_open_after: float | None = None
+    delays: list[float] = field(default_factory=list)
+
+    @property
+    def waited(self) -> float:
+        """Total seconds spent sleeping between attempts."""
+        return round(sum(self.delays), 3)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "host": self.host,
+            "ready": self.ready,
+            "attempts": self.attempts,
+            "time_to_ready": self.time_to_ready,
+            "port_open_after": self.port_open_after,
+            "delays": self.delays,
+        }
+
+
+@dataclass
+class ReadinessReport:
+    """Aggregated readiness timings for one wait operation."""
+
+    policy: BackoffPolicy
+    hosts: list[HostReadiness] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def slowest(self) -> HostReadiness | None:
+        """The ready host that took longest, if any."""
+        ready = [h for h in self.hosts if h.time_to_ready is not None]
+        return max(ready, key=lambda h: h.time_to_ready or 0.0, default=None)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "elapsed": self.elapsed,
+            "backoff": {
+                "initial": self.policy.initial,
+                "factor": self.policy.factor,
+                "maximum": self.policy.maximum,
+            },
+            "slowest": self.slowest.host if self.slowest is not None else None,
+            "hosts": [h.to_dict() for h in self.hosts],
+        }
+
+    def log_summary(self) -> None:
+        """Log the per-host time-to-ready breakdown."""
+        log.info(
+            f"SSH readiness finished in {self.elapsed:.1f}s (backoff {self.policy.describe()})",
+            readiness=self.to_dict(),
+        )
+        for record in self.hosts:
+            if record.ready:
+                port = (
+                    f", port open at {record.port_open_after:.1f}s"
+                    if record.port_open_after is not None
+                    else ""
+                )
+                log.bullet(
+                    f"{record.host}: ready in {record.time_to_ready:.1f}s "
+                    f"({record.attempts} attempt(s){port}, slept {record.waited:.1f}s)"
+                )
+            else:
+                log.bullet(
+                    f"{record.host}: not ready after {record.attempts} attempt(s), "
+                    f"slept {record.waited:.1f}s"
+                )
+        slowest = self.slowest
+        if slowest is not None and len(self.hosts) > 1:
+            log.info(f"Slowest host: {slowest.host} ({slowest.time_to_ready:.1f}s)")
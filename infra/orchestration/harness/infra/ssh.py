@@ -2,33 +2,82 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
 import subprocess
 import time
+from collections.abc import Callable, Iterable
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from harness.core.logger import log
+from harness.core.runner import AsyncCommandRunner
+from harness.core.trace import span
+from harness.infra.readiness import BackoffPolicy, HostReadiness, ReadinessReport
+
+if TYPE_CHECKING:
+    from harness.core.config import Config
+
+# Seconds allowed for the cheap TCP connect + banner read before the full SSH check
+PROBE_TIMEOUT = 3.0
+
+# Seconds allowed for a full ssh login before the attempt is killed
+CONNECT_TIMEOUT = 30.0
 
 
 class SSHWaiter:
-    """Handles waiting for SSH connectivity on hosts."""
+    """Handles waiting for SSH connectivity on hosts.
+
+    All hosts are probed concurrently on a single asyncio event loop. Each
+    attempt first opens a TCP connection to the SSH port and reads the server
+    banner; the full ``ssh ... exit`` check only runs once the banner answers.
+    Polling starts immediately with adaptive backoff, so hosts that are already
+    up are reported ready on the first attempt.
+    """
 
     def __init__(
         self,
         user: str,
         timeout: int = 300,
         retry_interval: int = 10,
+        port: int = 22,
+        max_concurrency: int = 20,
+        backoff: BackoffPolicy | None = None,
     ):
         """Initialize the SSH waiter.
 
         Args:
             user: SSH username.
-            timeout: Maximum time to wait for SSH in seconds.
-            retry_interval: Time between SSH connection attempts.
+            timeout: Maximum time to wait for SSH in seconds (per host).
+            retry_interval: Upper bound on the time between SSH connection attempts.
+            port: SSH port to probe.
+            max_concurrency: Maximum number of in-flight connection attempts.
+            backoff: Backoff policy between attempts. Defaults to 1s growing to retry_interval.
         """
         self.user = user
         self.timeout = timeout
         self.retry_interval = retry_interval
+        self.port = port
+        self.max_concurrency = max(1, max_concurrency)
+        self.backoff = backoff or BackoffPolicy(maximum=float(retry_interval))
+        self.last_report: ReadinessReport | None = None
+        self.runner = AsyncCommandRunner()
+
+    @classmethod
+    def from_config(cls, config: Config) -> SSHWaiter:
+        """Build a waiter from the ``ssh`` configuration section."""
+        return cls(
+            user=config.ssh.user,
+            timeout=config.ssh.timeout,
+            retry_interval=config.ssh.retry_interval,
+            max_concurrency=config.ssh.max_concurrency,
+            backoff=BackoffPolicy(
+                initial=config.ssh.initial_interval,
+                factor=config.ssh.backoff_factor,
+                maximum=float(config.ssh.retry_interval),
+            ),
+        )
 
     def wait_for_host(self, host: str) -> bool:
         """Wait for SSH to become available on a host.
@@ -39,47 +88,53 @@ class SSHWaiter:
         Returns:
             True if SSH becomes available, False on timeout.
         """
-        log.info(f"Waiting for SSH on {host}...")
-        elapsed = 0
-
-        while elapsed < self.timeout:
-            if self._try_connect(host):
-                log.success(f"SSH available on {host}")
-                return True
+        successful, _ = self.wait_for_hosts([host])
+        return bool(successful)
 
-            time.sleep(self.retry_interval)
-            elapsed += self.retry_interval
-
-        log.error(f"Timeout waiting for SSH on {host}")
-        return False
-
-    def wait_for_hosts(self, hosts: list[str]) -> tuple[list[str], list[str]]:
-        """Wait for SSH on multiple hosts.
+    def wait_for_hosts(
+        self,
+        hosts: list[str],
+        on_ready: Callable[[str], None] | None = None,
+    ) -> tuple[list[str], list[str]]:
+        """Wait for SSH on multiple hosts concurrently.
 
         Args:
             hosts: List of IP addresses or hostnames.
+            on_ready: Called with each host as soon as it accepts SSH, so
+                later stages can start before the slowest host is up.
 
         Returns:
-            Tuple of (successful_hosts, failed_hosts).
+            Tuple of (successful_hosts, failed_hosts), each in input order.
         """
         log.info(f"Waiting for SSH on {len(hosts)} host(s)...")
 
-        successful = []
-        failed = []
-
-        for host in hosts:
-            if self.wait_for_host(host):
-                successful.append(host)
-            else:
-                failed.append(host)
+        start = time.monotonic()
+        records = asyncio.run(self._wait_all(hosts, on_ready))
+        report = ReadinessReport(
+            policy=self.backoff,
+            hosts=[records[host] for host in dict.fromkeys(hosts)],
+            elapsed=round(time.monotonic() - start, 3),
+        )
+        self.last_report = report
+        report.log_summary()
 
+        successful = [host for host in hosts if records[host].ready]
+        failed = [host for host in hosts if not records[host].ready]
         return successful, failed
 
-    def wait_for_inventory(self, inventory_file: Path) -> tuple[list[str], list[str]]:
+    def wait_for_inventory(
+        self,
+        inventory_file: Path,
+        names: Iterable[str] | None = None,
+        on_ready: Callable[[str], None] | None = None,
+    ) -> tuple[list[str], list[str]]:
         """Wait for all hosts in an Ansible inventory file.
 
         Args:
             inventory_file: Path to Ansible inventory JSON file.
+            names: Only wait for these inventory hosts. Defaults to all.
+            on_ready: Called with the inventory name of each host as soon as
+                it accepts SSH.
 
         Returns:
             Tuple of (successful_hosts, failed_hosts).
@@ -95,21 +150,144 @@ class SSHWaiter:
             inventory = json.load(f)
 
         hosts_data = inventory.get("all", {}).get("hosts", {})
+        if names is not None:
+            wanted = set(names)
+            hosts_data = {name: info for name, info in hosts_data.items() if name in wanted}
         if not hosts_data:
             raise ValueError("No hosts found in inventory")
 
         hosts = []
+        names_by_host: dict[str, list[str]] = {}
         for name, info in hosts_data.items():
             host = info.get("ansible_host")
             if host and host not in ("null", "None", ""):
                 hosts.append(host)
+                names_by_host.setdefault(host, []).append(name)
 
         if not hosts:
             raise ValueError("No valid host IPs found in inventory")
 
-        return self.wait_for_hosts(hosts)
+        if on_ready is None:
+            return self.wait_for_hosts(hosts)
+
+        def ready(host: str) -> None:
+            for name in names_by_host[host]:
+                on_ready(name)
+
+        return self.wait_for_hosts(hosts, on_ready=ready)
+
+    async def _wait_all(
+        self,
+        hosts: list[str],
+        on_ready: Callable[[str], None] | None = None,
+    ) -> dict[str, HostReadiness]:
+        """Wait for every host at once, bounding in-flight attempts.
+
+        Args:
+            hosts: List of IP addresses or hostnames.
+            on_ready: Called with each host as soon as it is ready.
+
+        Returns:
+            Mapping of host to its readiness record.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        unique_hosts = list(dict.fromkeys(hosts))
+        records = await asyncio.gather(
+            *(self._wait_one(host, semaphore, on_ready) for host in unique_hosts)
+        )
+        return dict(zip(unique_hosts, records, strict=True))
 
-    def _try_connect(self, host: str) -> bool:
+    async def _wait_one(
+        self,
+        host: str,
+        semaphore: asyncio.Semaphore,
+        on_ready: Callable[[str], None] | None = None,
+    ) -> HostReadiness:
+        """Poll a single host until SSH answers or the timeout expires.
+
+        The backoff restarts from its initial delay once the SSH port starts
+        answering, since login usually follows within seconds.
+
+        Args:
+            host: IP address or hostname.
+            semaphore: Shared limit on concurrent connection attempts.
+            on_ready: Called with the host once it is ready.
+
+        Returns:
+            Readiness record for the host.
+        """
+        with span(f"ssh wait {host}", cat="ssh", track=f"ssh {host}", host=host) as attrs:
+            record = await self._poll(host, semaphore, on_ready)
+            attrs.update(ready=record.ready, attempts=record.attempts)
+            return record
+
+    async def _poll(
+        self,
+        host: str,
+        semaphore: asyncio.Semaphore,
+        on_ready: Callable[[str], None] | None = None,
+    ) -> HostReadiness:
+        """Poll a host with backoff (see _wait_one)."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.timeout
+        record = HostReadiness(host=host)
+        step = 0
+
+        while True:
+            record.attempts += 1
+            async with semaphore:
+                port_open = await self._probe_port(host)
+                if port_open and record.port_open_after is None:
+                    record.port_open_after = round(loop.time() - started, 3)
+                    step = 0
+                if port_open and await self._try_connect(host):
+                    record.ready = True
+                    record.time_to_ready = round(loop.time() - started, 3)
+                    log.success(f"SSH available on {host}")
+                    if on_ready is not None:
+                        on_ready(host)
+                    return record
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                log.error(f"Timeout waiting for SSH on {host}")
+                return record
+
+            delay = min(self.backoff.delay(step), remaining)
+            record.delays.append(round(delay, 3))
+            step += 1
+            await asyncio.sleep(delay)
+
+    async def _probe_port(self, host: str) -> bool:
+        """Check that the SSH port accepts connections and sends a banner.
+
+        Args:
+            host: IP address or hostname.
+
+        Returns:
+            True if the port answered with an SSH protocol banner.
+        """
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, self.port),
+                timeout=PROBE_TIMEOUT,
+            )
+        except (OSError, TimeoutError):
+            return False
+
+        try:
+            banner = await asyncio.wait_for(reader.readline(), timeout=PROBE_TIMEOUT)
+        except (OSError, TimeoutError):
+            banner = b""
+        finally:
+            writer.close()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+
+        return banner.startswith(b"SSH-")
+
+    async def _try_connect(self, host: str) -> bool:
         """Attempt a single SSH connection.
 
         Args:
@@ -118,20 +296,25 @@ class SSHWaiter:
         Returns:
             True if connection succeeded.
         """
-        result = subprocess.run(
-            [
-                "ssh",
-                "-o",
-                "BatchMode=yes",
-                "-o",
-                "ConnectTimeout=5",
-                "-o",
-                "StrictHostKeyChecking=no",
-                "-o",
-                "UserKnownHostsFile=/dev/null",
-                f"{self.user}@{host}",
-                "exit",
-            ],
-            capture_output=True,
-        )
+        cmd = [
+            "ssh",
+            "-o",
+            "BatchMode=yes",
+            "-o",
+            "ConnectTimeout=5",
+            "-o",
+            "StrictHostKeyChecking=no",
+            "-o",
+            "UserKnownHostsFile=/dev/null",
+            "-p",
+            str(self.port),
+            f"{self.user}@{host}",
+            "exit",
+        ]
+        try:
+            result = await self.runner.run(
+                cmd, check=False, capture_output=True, timeout=CONNECT_TIMEOUT
+            )
+        except subprocess.TimeoutExpired:
+            return False
         return result.returncode == 0
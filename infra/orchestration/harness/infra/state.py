@@ -0,0 +1,160 @@
+"""In-process view of OpenTofu state."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+VM_RESOURCE_TYPE = "proxmox_virtual_environment_vm"
+
+
+@dataclass
+class StateSnapshot:
+    """A single read of OpenTofu state.
+
+    Outputs, the Ansible inventory and VM addresses are all derived from one
+    parse of ``terraform.tfstate`` (or ``tofu show -json`` for non-local
+    backends) instead of one ``tofu output`` process per value. A snapshot is
+    identified by the state lineage and serial, which change on every write.
+    """
+
+    lineage: str = ""
+    serial: int = 0
+    outputs: dict[str, Any] = field(default_factory=dict)
+    resources: list[dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_state(cls, state: dict[str, Any]) -> StateSnapshot:
+        """Build a snapshot from a parsed local state file (format version 4).
+
+        Args:
+            state: Decoded terraform.tfstate contents.
+
+        Returns:
+            StateSnapshot.
+        """
+        resources = []
+        for resource in state.get("resources", []):
+            if resource.get("mode") != "managed":
+                continue
+            for instance in resource.get("instances", []):
+                resources.append(
+                    {
+                        "type": resource.get("type"),
+                        "name": resource.get("name"),
+                        "index": instance.get("index_key"),
+                        "values": instance.get("attributes", {}),
+                    }
+                )
+        return cls(
+            lineage=state.get("lineage", ""),
+            serial=state.get("serial", 0),
+            outputs={name: out.get("value") for name, out in state.get("outputs", {}).items()},
+            resources=resources,
+        )
+
+    @classmethod
+    def from_show_json(cls, data: dict[str, Any]) -> StateSnapshot:
+        """Build a snapshot from ``tofu show -json`` output.
+
+        The JSON state representation carries no lineage or serial.
+
+        Args:
+            data: Decoded ``tofu show -json`` output.
+
+        Returns:
+            StateSnapshot.
+        """
+        values = data.get("values") or {}
+        resources = [
+            {
+                "type": resource.get("type"),
+                "name": resource.get("name"),
+                "index": resource.get("index"),
+                "values": resource.get("values", {}),
+            }
+            for resource in (values.get("root_module") or {}).get("resources", [])
+            if resource.get("mode") == "managed"
+        ]
+        return cls(
+            outputs={name: out.get("value") for name, out in values.get("outputs", {}).items()},
+            resources=resources,
+        )
+
+    @classmethod
+    def load(cls, state_file: Path) -> StateSnapshot | None:
+        """Read a local state file.
+
+        Args:
+            state_file: Path to terraform.tfstate.
+
+        Returns:
+            StateSnapshot, or None if the file is missing or unreadable.
+        """
+        try:
+            with open(state_file) as f:
+                return cls.from_state(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    @property
+    def identity(self) -> str:
+        """State identity as 'lineage:serial'."""
+        return f"{self.lineage}:{self.serial}"
+
+    def output(self, name: str) -> Any:
+        """Get an output value.
+
+        Args:
+            name: Output name.
+
+        Returns:
+            Output value.
+
+        Raises:
+            KeyError: If the output is not in state.
+        """
+        return self.outputs[name]
+
+    def inventory(self) -> dict[str, Any]:
+        """Get the Ansible inventory from the ``ansible_inventory`` output.
+
+        Returns:
+            Ansible inventory dictionary.
+
+        Raises:
+            KeyError: If the output is not in state.
+        """
+        value = self.output("ansible_inventory")
+        return json.loads(value) if isinstance(value, str) else value
+
+    def vm_ips(self) -> dict[str, str | None]:
+        """Get VM addresses by inventory name.
+
+        Uses the ``vm_ips`` output when present, otherwise the ``ansible_host``
+        of each inventory host.
+
+        Returns:
+            Mapping of VM name to IPv4 address (None if not yet known).
+        """
+        if isinstance(self.outputs.get("vm_ips"), dict):
+            return dict(self.outputs["vm_ips"])
+        try:
+            hosts = self.inventory().get("all", {}).get("hosts", {})
+        except KeyError:
+            return {}
+        return {name: info.get("ansible_host") for name, info in hosts.items()}
+
+    def vms(self) -> dict[str, dict[str, Any]]:
+        """Get the attributes of managed Proxmox VMs keyed by instance index.
+
+        Returns:
+            Mapping of index key (or resource name for single VMs) to attributes.
+        """
+        return {
+            str(r["index"] if r["index"] is not None else r["name"]): r["values"]
+            for r in self.resources
+            if r["type"] == VM_RESOURCE_TYPE
+        }
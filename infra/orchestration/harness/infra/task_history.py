@@ -0,0 +1,218 @@
+"""Cross-run Ansible task timings from the saved harness_events logs."""
+
+from __future__ import annotations
+
+import math
+import statistics
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from harness.infra.ansible_events import TaskRecord, load_records
+
+if TYPE_CHECKING:
+    from harness.core.config import Config
+
+# (component, role or play, task name)
+TaskKey = tuple[str, str, str]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Get a percentile with linear interpolation between the closest ranks.
+
+    Args:
+        values: Samples (need not be sorted).
+        pct: Percentile between 0 and 100.
+
+    Returns:
+        Percentile value, or 0.0 for no samples.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass
+class PlaybookRun:
+    """One saved ansible-playbook run."""
+
+    path: Path
+    component: str
+    records: list[TaskRecord]
+
+    @property
+    def started(self) -> float:
+        """Start time of the first task, or 0.0 for a run without results."""
+        return min((r.start for r in self.records), default=0.0)
+
+
+@dataclass
+class TaskStats:
+    """Duration of one task across hosts and runs."""
+
+    component: str
+    role: str
+    task: str
+    runs: int
+    samples: int
+    p50: float
+    p95: float
+    max: float
+    total: float
+
+
+@dataclass
+class Regression:
+    """A task that got slower in the most recent runs."""
+
+    component: str
+    role: str
+    task: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative slowdown (0.5 means 50% slower)."""
+        return self.current / self.baseline - 1 if self.baseline else math.inf
+
+
+class TaskHistory:
+    """The per-run event logs in ``.harness/ansible-runs``.
+
+    Run files are named ``<YYYYmmdd-HHMMSS>-<component>-<id>.jsonl`` by
+    AnsibleManager.run_playbook, so they sort chronologically by name.
+    """
+
+    def __init__(self, runs_dir: Path):
+        """Initialize the history.
+
+        Args:
+            runs_dir: Directory holding the run files.
+        """
+        self.runs_dir = runs_dir
+
+    @classmethod
+    def from_config(cls, config: Config) -> TaskHistory:
+        """Get the task history for a configuration."""
+        return cls(config.state_dir / "ansible-runs")
+
+    def runs(self, component: str | None = None, limit: int | None = None) -> list[PlaybookRun]:
+        """Load runs, oldest first.
+
+        Args:
+            component: Only runs of this component (e.g. 'claude-vms').
+            limit: Only the most recent runs per component.
+
+        Returns:
+            Runs that have at least one task result.
+        """
+        by_component: dict[str, list[Path]] = defaultdict(list)
+        for path in sorted(self.runs_dir.glob("*.jsonl")):
+            name = _component(path)
+            if component is None or name == component:
+                by_component[name].append(path)
+
+        runs = []
+        for name, paths in by_component.items():
+            for path in paths[-limit:] if limit else paths:
+                records = load_records(path)
+                if records:
+                    runs.append(PlaybookRun(path=path, component=name, records=records))
+        return sorted(runs, key=lambda run: (run.started, run.path.name))
+
+
+def _component(path: Path) -> str:
+    """Get the component from a run file name."""
+    parts = path.stem.split("-")
+    return "-".join(parts[2:-1]) if len(parts) > 3 else path.stem
+
+
+def _timed(run: PlaybookRun) -> dict[TaskKey, list[float]]:
+    """Group a run's durations by task, leaving out skipped results."""
+    durations: dict[TaskKey, list[float]] = defaultdict(list)
+    for record in run.records:
+        if record.status != "skipped":
+            durations[(run.component, record.group, record.task)].append(record.duration)
+    return durations
+
+
+def task_stats(runs: list[PlaybookRun]) -> list[TaskStats]:
+    """Aggregate task durations across hosts and runs, most host-seconds first."""
+    durations: dict[TaskKey, list[float]] = defaultdict(list)
+    run_counts: dict[TaskKey, int] = defaultdict(int)
+    for run in runs:
+        for key, values in _timed(run).items():
+            durations[key].extend(values)
+            run_counts[key] += 1
+
+    stats = [
+        TaskStats(
+            component=component,
+            role=role,
+            task=task,
+            runs=run_counts[(component, role, task)],
+            samples=len(values),
+            p50=round(percentile(values, 50), 3),
+            p95=round(percentile(values, 95), 3),
+            max=round(max(values), 3),
+            total=round(sum(values), 3),
+        )
+        for (component, role, task), values in durations.items()
+    ]
+    return sorted(stats, key=lambda s: s.total, reverse=True)
+
+
+def find_regressions(
+    runs: list[PlaybookRun],
+    recent: int = 1,
+    threshold: float = 0.5,
+    min_delta: float = 5.0,
+) -> list[Regression]:
+    """Find tasks whose median duration grew compared with earlier runs.
+
+    For each component, the median across hosts in its ``recent`` latest
+    runs is compared with the median of the per-run medians of all its
+    earlier runs.
+
+    Args:
+        runs: Runs, oldest first.
+        recent: Number of latest runs per component to check.
+        threshold: Minimum relative slowdown (0.5 = 50% slower).
+        min_delta: Minimum slowdown in seconds, so short tasks don't flap.
+
+    Returns:
+        Regressions, largest absolute slowdown first.
+    """
+    by_component: dict[str, list[PlaybookRun]] = defaultdict(list)
+    for run in runs:
+        by_component[run.component].append(run)
+
+    regressions = []
+    for component_runs in by_component.values():
+        if len(component_runs) <= recent:
+            continue
+        current: dict[TaskKey, list[float]] = defaultdict(list)
+        for run in component_runs[-recent:]:
+            for key, values in _timed(run).items():
+                current[key].extend(values)
+        history: dict[TaskKey, list[float]] = defaultdict(list)
+        for run in component_runs[:-recent]:
+            for key, values in _timed(run).items():
+                history[key].append(statistics.median(values))
+
+        for key, values in current.items():
+            if key not in history:
+                continue
+            baseline = statistics.median(history[key])
+            now = statistics.median(values)
+            if now - baseline >= min_delta and now >= baseline * (1 + threshold):
+                regressions.append(
+                    Regression(*key, baseline=round(baseline, 3), current=round(now, 3))
+                )
+
+    return sorted(regressions, key=lambda r: r.current - r.baseline, reverse=True)
@@ -2,15 +2,38 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from harness.core.logger import log
-from harness.core.runner import CommandRunner
+from harness.core.runner import CommandError, CommandRunner
+from harness.infra.parallelism import OperationStats
+from harness.infra.state import StateSnapshot
 
 if TYPE_CHECKING:
-    pass
+    from harness.infra.parallelism import ParallelismScheduler
+    from harness.infra.plugin_cache import ProviderCache
+
+# Per-provision-directory harness metadata (init fingerprint, plan cache, etc.)
+HARNESS_DIR_NAME = ".harness"
+
+# Seconds a cached plan, or state written by the harness itself, is trusted
+# without asking the provider for the current infrastructure state
+STATE_FRESH_TTL = 900
+
+# Generated tfvars.json files kept per provision directory
+VAR_FILES_KEPT = 5
+
+# Retries of an apply/destroy that failed on Proxmox lock/timeout errors
+MAX_CONTENTION_RETRIES = 2
+
+# tofu plan -detailed-exitcode results
+PLAN_NO_CHANGES = 0
+PLAN_HAS_CHANGES = 2
 
 
 class OpenTofuManager:
@@ -21,6 +44,9 @@ class OpenTofuManager:
         provision_dir: Path,
         inventory_file: Path,
         verbose: bool = False,
+        upgrade: bool = False,
+        plugin_cache: ProviderCache | None = None,
+        scheduler: ParallelismScheduler | None = None,
     ):
         """Initialize the OpenTofu manager.
 
@@ -28,73 +54,330 @@ class OpenTofuManager:
             provision_dir: Directory containing Terraform/OpenTofu files.
             inventory_file: Path where Ansible inventory will be written.
             verbose: Enable verbose logging (TF_LOG=INFO).
+            upgrade: Upgrade providers on init (tofu init -upgrade).
+            plugin_cache: Shared provider cache used by every tofu invocation.
+            scheduler: Chooses apply/destroy parallelism. Defaults to 1 without one.
         """
         self.provision_dir = provision_dir
         self.inventory_file = inventory_file
         self.verbose = verbose
+        self.upgrade = upgrade
+        self.plugin_cache = plugin_cache
+        self.scheduler = scheduler
+        self.last_stats: OperationStats | None = None
+        self._snapshot: StateSnapshot | None = None
+        self._snapshot_stamp: tuple[int, int] | None = None
 
         env = {"TF_LOG": "INFO"} if verbose else {}
+        if plugin_cache is not None:
+            env.update(plugin_cache.env())
+            if self.cli_config_file.exists():
+                env["TF_CLI_CONFIG_FILE"] = str(self.cli_config_file)
         self.runner = CommandRunner(cwd=provision_dir, env=env)
 
-    def init(self, upgrade: bool = True) -> None:
-        """Initialize OpenTofu.
+    @property
+    def harness_dir(self) -> Path:
+        """Directory for harness metadata inside the provision directory."""
+        return self.provision_dir / HARNESS_DIR_NAME
+
+    @property
+    def state_file(self) -> Path:
+        """Local state file."""
+        return self.provision_dir / "terraform.tfstate"
+
+    @property
+    def cli_config_file(self) -> Path:
+        """Generated tofu CLI configuration pointing at the provider cache."""
+        return self.harness_dir / "tofurc"
+
+    def init(self, upgrade: bool | None = None, force: bool = False) -> None:
+        """Initialize OpenTofu, skipping the run if nothing changed since the last init.
+
+        The cache key covers the *.tf files, .terraform.lock.hcl and the
+        installed provider tree, so editing configuration, deleting
+        .terraform/ or changing pinned versions triggers a real init.
 
         Args:
-            upgrade: Whether to upgrade providers.
+            upgrade: Whether to upgrade providers. Defaults to the manager setting.
+            force: Run init even if the fingerprint is unchanged.
         """
-        log.info("Initializing OpenTofu...")
-        cmd = ["tofu", "init"]
+        upgrade = self.upgrade if upgrade is None else upgrade
+        fingerprint_file = self.harness_dir / "init.sha256"
+
+        if (
+            not (upgrade or force)
+            and fingerprint_file.exists()
+            and fingerprint_file.read_text().strip() == self.init_fingerprint()
+        ):
+            log.info("OpenTofu already initialized (configuration unchanged), skipping init")
+            return
+
+        cmd = ["tofu", "init", "-input=false"]
         if upgrade:
             cmd.append("-upgrade")
-        self.runner.run(cmd)
 
-    def plan(self, variables: dict[str, Any] | None = None) -> None:
-        """Create an execution plan.
+        if self.plugin_cache is None:
+            log.info("Initializing OpenTofu..." + (" (upgrading providers)" if upgrade else ""))
+            self.runner.run(cmd)
+        else:
+            with self.plugin_cache.locked():
+                self.runner.base_env.update(
+                    self.plugin_cache.prepare(self.provision_dir, self.cli_config_file)
+                )
+                log.info("Initializing OpenTofu..." + (" (upgrading providers)" if upgrade else ""))
+                self.runner.run(cmd)
+                self.plugin_cache.record(self.provision_dir)
+
+        self.harness_dir.mkdir(parents=True, exist_ok=True)
+        fingerprint_file.write_text(self.init_fingerprint() + "\n")
+
+    def init_fingerprint(self) -> str:
+        """Hash the inputs that determine the result of ``tofu init``.
+
+        Returns:
+            Hex digest over *.tf files, the dependency lock file and the
+            provider directory listing.
+        """
+        digest = hashlib.sha256()
+
+        for tf_file in sorted(self.provision_dir.glob("*.tf")):
+            digest.update(f"tf:{tf_file.name}\0".encode())
+            digest.update(tf_file.read_bytes())
+
+        lock_file = self.provision_dir / ".terraform.lock.hcl"
+        digest.update(b"lock\0")
+        digest.update(lock_file.read_bytes() if lock_file.exists() else b"<missing>")
+
+        terraform_dir = self.provision_dir / ".terraform"
+        providers_dir = terraform_dir / "providers"
+        digest.update(b"providers\0")
+        if providers_dir.exists():
+            for path in sorted(providers_dir.rglob("*")):
+                rel = path.relative_to(providers_dir)
+                if path.is_symlink():
+                    entry = f"{rel}->{path.readlink()}"
+                elif path.is_file():
+                    stat = path.stat()
+                    entry = f"{rel}:{stat.st_size}:{stat.st_mtime_ns}"
+                else:
+                    continue
+                digest.update(entry.encode() + b"\0")
+        else:
+            digest.update(b"<missing>")
+
+        # Backend/module state written by init
+        for name in ("terraform.tfstate", "modules/modules.json"):
+            path = terraform_dir / name
+            digest.update(f"{name}\0".encode())
+            digest.update(path.read_bytes() if path.exists() else b"<missing>")
+
+        return digest.hexdigest()
+
+    def plan(
+        self,
+        variables: dict[str, Any] | None = None,
+        refresh: bool | None = None,
+        reuse: bool = True,
+        targets: list[str] | None = None,
+    ) -> bool:
+        """Create an execution plan and report whether it changes anything.
+
+        The result is cached under a key covering the variables, the state
+        lineage/serial and the configuration, so an identical request within
+        ``STATE_FRESH_TTL`` reuses the saved plan instead of planning again.
 
         Args:
             variables: Variables to pass to OpenTofu.
+            refresh: Refresh state while planning. Defaults to skipping the
+                refresh when the state was written by this harness within
+                ``STATE_FRESH_TTL``.
+            reuse: Reuse a cached plan with the same key.
+            targets: Resource addresses to limit the plan to (-target).
+
+        Returns:
+            True if the plan contains changes to apply.
+
+        Raises:
+            CommandError: If planning fails.
         """
-        log.info("Planning infrastructure...")
-        cmd = ["tofu", "plan"]
+        key = self.plan_key(variables, targets)
+        cache_file = self.harness_dir / "plan.json"
+        plan_file = self.provision_dir / "tfplan"
+
+        if reuse:
+            cached = self._read_json(cache_file)
+            if (
+                cached.get("key") == key
+                and time.time() - cached.get("created_at", 0) < STATE_FRESH_TTL
+                and (not cached["has_changes"] or plan_file.exists())
+            ):
+                log.info("Configuration and state unchanged since last plan, reusing it")
+                return cached["has_changes"]
+
+        if refresh is None:
+            refresh = not self.state_is_fresh()
+
+        log.info(
+            "Planning infrastructure..." + ("" if refresh else " (state is fresh, no refresh)")
+        )
+        cmd = ["tofu", "plan", "-input=false", "-detailed-exitcode"]
+        if not refresh:
+            cmd.append("-refresh=false")
+        cmd.extend(f"-target={target}" for target in targets or [])
         cmd.extend(self._build_var_args(variables))
         cmd.extend(["-out=tfplan"])
-        self.runner.run(cmd)
+        result = self.runner.run(cmd, check=False)
+
+        if result.returncode not in (PLAN_NO_CHANGES, PLAN_HAS_CHANGES):
+            raise CommandError(command=" ".join(cmd), returncode=result.returncode)
+
+        has_changes = result.returncode == PLAN_HAS_CHANGES
+        if not has_changes:
+            log.success("No infrastructure changes")
+            if refresh and not targets:
+                # A refreshed plan with no diff proves state matches reality
+                self._mark_state_fresh()
+        self._write_json(
+            cache_file, {"key": key, "has_changes": has_changes, "created_at": time.time()}
+        )
+        return has_changes
+
+    def plan_key(
+        self,
+        variables: dict[str, Any] | None = None,
+        targets: list[str] | None = None,
+    ) -> str:
+        """Hash the inputs that determine the result of ``tofu plan``.
+
+        Args:
+            variables: Variables that will be passed to OpenTofu.
+            targets: Resource addresses the plan is limited to.
+
+        Returns:
+            Hex digest over the variables file hash, targets, state
+            lineage/serial and the configuration fingerprint.
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps(sorted(targets or [])).encode() + b"\0")
+        var_file = self.var_file(variables)
+        digest.update((var_file.name if var_file else "<none>").encode() + b"\0")
+        digest.update(self.state_identity().encode() + b"\0")
+        digest.update(self.init_fingerprint().encode())
+        return digest.hexdigest()
+
+    def state_identity(self) -> str:
+        """Get the local state's lineage and serial as 'lineage:serial'.
+
+        Returns:
+            Identity string, or 'none' if there is no state yet.
+        """
+        if not self.state_file.exists():
+            return "none"
+        snapshot = self.snapshot()
+        return snapshot.identity if snapshot.lineage else "none"
+
+    def snapshot(self) -> StateSnapshot:
+        """Get a parsed view of the current state.
+
+        The local state file is parsed once and re-read only when it changes
+        on disk; a new serial therefore always yields a new snapshot. Without
+        a local state file (e.g. a remote backend) ``tofu show -json`` runs
+        once per manager until the next apply, refresh or destroy.
+
+        Returns:
+            StateSnapshot for the current state.
+        """
+        if self.state_file.exists():
+            stat = self.state_file.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if self._snapshot is None or stamp != self._snapshot_stamp:
+                self._snapshot = StateSnapshot.load(self.state_file) or StateSnapshot()
+                self._snapshot_stamp = stamp
+            return self._snapshot
+
+        if self._snapshot is None:
+            result = self.runner.run(["tofu", "show", "-json"], capture_output=True)
+            self._snapshot = StateSnapshot.from_show_json(json.loads(result.stdout or "{}"))
+            self._snapshot_stamp = None
+        return self._snapshot
+
+    def state_is_fresh(self) -> bool:
+        """Whether the state was verified by this harness within ``STATE_FRESH_TTL``.
+
+        Returns:
+            True if the state is unchanged since the harness last applied,
+            refreshed or planned against it.
+        """
+        marker = self._read_json(self.harness_dir / "state-fresh.json")
+        return (
+            marker.get("state") == self.state_identity()
+            and time.time() - marker.get("verified_at", 0) < STATE_FRESH_TTL
+        )
 
     def apply(
         self,
         variables: dict[str, Any] | None = None,
-        parallelism: int = 1,
+        parallelism: int | None = None,
+        targets: list[str] | None = None,
     ) -> None:
         """Apply the planned changes.
 
+        With an adaptive scheduler, an apply that fails on Proxmox lock or
+        timeout errors is re-planned and retried at a lower parallelism.
+
         Args:
             variables: Variables to pass to OpenTofu.
-            parallelism: Number of parallel operations (default 1 for Proxmox).
+            parallelism: Number of parallel operations. Defaults to the
+                scheduler's level, or 1 without a scheduler.
+            targets: Resource addresses the saved plan was limited to, used
+                when re-planning after contention.
         """
-        log.info(f"Applying infrastructure changes (parallelism={parallelism})...")
-        cmd = ["tofu", "apply", f"-parallelism={parallelism}"]
-        cmd.extend(self._build_var_args(variables))
-        cmd.append("tfplan")
-        self.runner.run(cmd)
+        for attempt in range(MAX_CONTENTION_RETRIES + 1):
+            level = self._parallelism(parallelism)
+            log.info(f"Applying infrastructure changes (parallelism={level})...")
+            cmd = ["tofu", "apply", f"-parallelism={level}"]
+            cmd.extend(self._build_var_args(variables))
+            cmd.append("tfplan")
+            try:
+                self._run_scheduled("apply", cmd, level)
+                break
+            except CommandError:
+                if not self._should_retry(parallelism, attempt):
+                    raise
+            # The saved plan is stale once part of it has been applied
+            self._cleanup_plan_file()
+            if not self.plan(variables, refresh=True, reuse=False, targets=targets):
+                break
 
         log.success("Infrastructure apply completed")
         self._cleanup_plan_file()
+        if not targets:
+            self._mark_state_fresh()
 
     def destroy(
         self,
         variables: dict[str, Any] | None = None,
-        parallelism: int = 1,
+        parallelism: int | None = None,
     ) -> None:
         """Destroy infrastructure.
 
         Args:
             variables: Variables to pass to OpenTofu.
-            parallelism: Number of parallel operations.
+            parallelism: Number of parallel operations. Defaults to the
+                scheduler's level, or 1 without a scheduler.
         """
         log.warn("Destroying infrastructure...")
-        cmd = ["tofu", "destroy", "-auto-approve", f"-parallelism={parallelism}"]
-        cmd.extend(self._build_var_args(variables))
-        self.runner.run(cmd)
+        for attempt in range(MAX_CONTENTION_RETRIES + 1):
+            level = self._parallelism(parallelism)
+            cmd = ["tofu", "destroy", "-auto-approve", f"-parallelism={level}"]
+            cmd.extend(self._build_var_args(variables))
+            try:
+                self._run_scheduled("destroy", cmd, level)
+                break
+            except CommandError:
+                if not self._should_retry(parallelism, attempt):
+                    raise
+        self._cleanup_plan_file()
         log.success("Infrastructure destroyed")
 
     def refresh(self, variables: dict[str, Any] | None = None) -> None:
@@ -107,6 +390,8 @@ class OpenTofuManager:
         cmd = ["tofu", "refresh"]
         cmd.extend(self._build_var_args(variables))
         self.runner.run(cmd)
+        self._invalidate_snapshot()
+        self._mark_state_fresh()
 
     def get_output(self, name: str) -> str:
         """Get a specific output value.
@@ -115,25 +400,26 @@ class OpenTofuManager:
             name: Output name.
 
         Returns:
-            Output value as string.
+            Output value as string (JSON for non-string values).
         """
-        result = self.runner.run(
-            ["tofu", "output", "-raw", name],
-            capture_output=True,
-        )
-        return result.stdout.strip()
+        try:
+            value = self.snapshot().output(name)
+        except KeyError:
+            # Let tofu report the missing output
+            result = self.runner.run(
+                ["tofu", "output", "-raw", name],
+                capture_output=True,
+            )
+            return result.stdout.strip()
+        return value if isinstance(value, str) else json.dumps(value)
 
     def get_outputs(self) -> dict[str, Any]:
         """Get all outputs as a dictionary.
 
         Returns:
-            Dictionary of all outputs.
+            Dictionary of all outputs, shaped like ``tofu output -json``.
         """
-        result = self.runner.run(
-            ["tofu", "output", "-json"],
-            capture_output=True,
-        )
-        return json.loads(result.stdout)
+        return {name: {"value": value} for name, value in self.snapshot().outputs.items()}
 
     def get_inventory(self) -> dict[str, Any]:
         """Get Ansible inventory from OpenTofu output.
@@ -141,8 +427,18 @@ class OpenTofuManager:
         Returns:
             Ansible inventory dictionary.
         """
-        inventory_json = self.get_output("ansible_inventory")
-        return json.loads(inventory_json)
+        try:
+            return self.snapshot().inventory()
+        except KeyError:
+            return json.loads(self.get_output("ansible_inventory"))
+
+    def get_vm_ips(self) -> dict[str, str | None]:
+        """Get VM addresses from state.
+
+        Returns:
+            Mapping of VM name to IPv4 address (None if not yet known).
+        """
+        return self.snapshot().vm_ips()
 
     def export_inventory(self) -> None:
         """Export inventory to JSON file for Ansible."""
@@ -157,28 +453,139 @@ class OpenTofuManager:
         log.success(f"Inventory written to {self.inventory_file}")
 
     def _build_var_args(self, variables: dict[str, Any] | None) -> list[str]:
-        """Build -var arguments from a dictionary.
+        """Build the variable arguments for a tofu command.
+
+        Args:
+            variables: Variables dictionary.
+
+        Returns:
+            A single -var-file argument pointing at the generated tfvars file,
+            or an empty list without variables.
+        """
+        var_file = self.var_file(variables)
+        return [f"-var-file={var_file}"] if var_file is not None else []
+
+    def var_file(self, variables: dict[str, Any] | None) -> Path | None:
+        """Write variables to a content-addressed tfvars.json file.
+
+        The file name carries the hash of its contents, so repeated calls with
+        the same variables reuse one file and the hash doubles as the variable
+        part of the plan cache key. Only the most recent VAR_FILES_KEPT files
+        are kept.
 
         Args:
             variables: Variables dictionary.
 
         Returns:
-            List of -var=key=value arguments.
+            Path to the tfvars.json file, or None without variables.
         """
         if not variables:
-            return []
+            return None
+
+        content = json.dumps(variables, indent=2, sort_keys=True) + "\n"
+        digest = hashlib.sha256(content.encode()).hexdigest()[:16]
+        path = self.harness_dir / f"vars-{digest}.tfvars.json"
+
+        if path.exists():
+            path.touch()
+        else:
+            self.harness_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(content)
+            os.replace(tmp, path)
+            stale = sorted(
+                self.harness_dir.glob("vars-*.tfvars.json"),
+                key=lambda p: p.stat().st_mtime_ns,
+                reverse=True,
+            )[VAR_FILES_KEPT:]
+            for old in stale:
+                old.unlink(missing_ok=True)
+        return path
+
+    def _parallelism(self, requested: int | None) -> int:
+        """Resolve the parallelism for the next apply/destroy."""
+        if requested is not None:
+            return requested
+        return self.scheduler.level() if self.scheduler is not None else 1
+
+    def _run_scheduled(self, operation: str, cmd: list[str], level: int) -> OperationStats:
+        """Run apply/destroy, recording throughput and contention with the scheduler.
 
-        args = []
-        for key, value in variables.items():
-            if isinstance(value, (dict, list)):
-                json_value = json.dumps(value)
-                args.append(f"-var={key}={json_value}")
-            else:
-                args.append(f"-var={key}={value}")
-        return args
+        Args:
+            operation: 'apply' or 'destroy'.
+            cmd: Command to run.
+            level: Parallelism passed in the command.
+
+        Returns:
+            Statistics collected from the tofu output.
+        """
+        stats = OperationStats(operation=operation, parallelism=level)
+        self.last_stats = stats
+        started = time.monotonic()
+        try:
+            self.runner.run(
+                cmd, on_line=stats.observe, log_file=self.harness_dir / f"{operation}.log"
+            )
+            stats.success = True
+        finally:
+            self._invalidate_snapshot()
+            stats.elapsed = time.monotonic() - started
+            if self.scheduler is not None:
+                next_level = self.scheduler.record(stats)
+                if stats.contention and self.scheduler.adaptive:
+                    log.warn(
+                        f"Proxmox contention at parallelism={level} "
+                        f"({len(stats.contention)} lock/timeout error(s)), "
+                        f"backing off to {next_level}"
+                    )
+            if stats.vms_per_minute is not None:
+                log.info(
+                    f"{operation.capitalize()}: {stats.vms} VM(s) in {stats.elapsed:.0f}s "
+                    f"({stats.vms_per_minute:.1f}/min at parallelism={level})",
+                    throughput=stats.to_dict(),
+                )
+        return stats
+
+    def _should_retry(self, requested: int | None, attempt: int) -> bool:
+        """Whether a failed apply/destroy should be retried at a lower level."""
+        return (
+            requested is None
+            and self.scheduler is not None
+            and self.scheduler.adaptive
+            and self.last_stats is not None
+            and bool(self.last_stats.contention)
+            and attempt < MAX_CONTENTION_RETRIES
+        )
 
     def _cleanup_plan_file(self) -> None:
-        """Remove the plan file after apply."""
-        plan_file = self.provision_dir / "tfplan"
-        if plan_file.exists():
-            plan_file.unlink()
+        """Remove the plan file and its cache entry after apply."""
+        for path in (self.provision_dir / "tfplan", self.harness_dir / "plan.json"):
+            if path.exists():
+                path.unlink()
+
+    def _invalidate_snapshot(self) -> None:
+        """Forget the cached state after a command that may have written it."""
+        self._snapshot = None
+        self._snapshot_stamp = None
+
+    def _mark_state_fresh(self) -> None:
+        """Record that the current state reflects the real infrastructure."""
+        self._write_json(
+            self.harness_dir / "state-fresh.json",
+            {"state": self.state_identity(), "verified_at": time.time()},
+        )
+
+    def _read_json(self, path: Path) -> dict[str, Any]:
+        """Read a JSON object, returning {} if it is missing or unreadable."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write_json(self, path: Path, data: dict[str, Any]) -> None:
+        """Write a JSON object to the harness metadata directory."""
+        self.harness_dir.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
@@ -3,11 +3,21 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
 import pytest
 
+from harness.core.logger import log
+
+
+@pytest.fixture(autouse=True)
+def reset_logger() -> Iterator[None]:
+    """Leave the shared logger in console mode after CLI tests that pass --json."""
+    yield
+    log.reset()
+
 
 @pytest.fixture
 def sample_config() -> dict[str, Any]:
@@ -21,6 +31,15 @@ def sample_config() -> dict[str, Any]:
             "vm_id": 150,
             "vm_name": "neo4j-db",
         },
+        "core_services": {
+            "ip": "10.0.70.70",
+            "http_port": 80,
+            "https_port": 443,
+            "rewind_api_port": 8443,
+            "rewind_web_port": 8444,
+            "vm_id": 160,
+            "vm_name": "core-services",
+        },
         "claude_vms": {
             "start_id": 200,
             "default_count": 1,
@@ -0,0 +1,153 @@
+"""Tests for the structured Ansible event stream."""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from harness.core.logger import log
+from harness.infra.ansible import AnsibleManager
+from harness.infra.ansible_events import (
+    EventTail,
+    PlaybookProgress,
+    load_records,
+    role_durations,
+)
+
+
+def task_result(host: str, task: str, role: str | None, duration: float, **extra: Any) -> dict:
+    """Build a task_result event."""
+    return {
+        "event": "task_result",
+        "host": host,
+        "task": task,
+        "play": "Configure Claude VMs",
+        "role": role,
+        "action": "apt",
+        "status": "ok",
+        "changed": False,
+        "failed": False,
+        "start": 1700000000.0,
+        "duration": duration,
+        **extra,
+    }
+
+
+EVENTS = [
+    {"event": "play_start", "play": "Configure Claude VMs", "hosts": ["vm-1", "vm-2"]},
+    {"event": "task_start", "task": "Install Docker", "role": "geerlingguy.docker"},
+    task_result("vm-1", "Install Docker", "geerlingguy.docker", 30.0, status="changed"),
+    task_result("vm-2", "Install Docker", "geerlingguy.docker", 40.0, status="changed"),
+    {"event": "task_start", "task": "Configure git", "role": None},
+    task_result("vm-1", "Configure git", None, 1.0),
+    task_result("vm-2", "Configure git", None, 2.0, status="failed", failed=True),
+]
+
+
+@pytest.fixture
+def json_log() -> Iterator[None]:
+    """Switch the global logger to JSON mode for the test."""
+    log.json_mode = True
+    try:
+        yield
+    finally:
+        log.json_mode = False
+
+
+class TestPlaybookProgress:
+    """Tests for turning events into records and progress."""
+
+    @pytest.mark.usefixtures("json_log")
+    def test_records_and_counter(self) -> None:
+        """Test that results become logger events and the hosts × tasks count grows."""
+        progress = PlaybookProgress("claude-vms")
+        for event in EVENTS:
+            progress.handle(event)
+
+        assert (progress.done, progress.expected, progress.failed) == (4, 4, 1)
+        events = [e for e in log.get_buffer().events if e["message"] == "ansible_task"]
+        assert len(events) == 4
+        assert events[0]["host"] == "vm-1"
+        assert events[0]["duration"] == 30.0
+        assert events[0]["run"] == "claude-vms"
+
+    def test_role_durations(self) -> None:
+        """Test that host-seconds are summed per role, slowest first."""
+        progress = PlaybookProgress("claude-vms")
+        for event in EVENTS:
+            progress.handle(event)
+
+        assert role_durations(progress.records) == {
+            "geerlingguy.docker": 70.0,
+            "play: Configure Claude VMs": 3.0,
+        }
+
+
+class TestEventTail:
+    """Tests for following the events file while Ansible writes it."""
+
+    def test_follows_partial_writes(self, tmp_path: Path) -> None:
+        """Test that lines split across writes are delivered whole and in order."""
+        path = tmp_path / "run.jsonl"
+        received: list[dict] = []
+        lines = [json.dumps(e) + "\n" for e in EVENTS]
+
+        with EventTail(path, received.append, interval=0.01), open(path, "a") as f:
+            for line in lines:
+                half = len(line) // 2
+                f.write(line[:half])
+                f.flush()
+                f.write(line[half:])
+                f.flush()
+            f.write("not json\n")
+
+        assert received == EVENTS
+        assert len(load_records(path)) == 4
+
+
+class TestRunPlaybookEvents:
+    """Tests for AnsibleManager.run_playbook with a runs directory."""
+
+    def test_events_are_recorded(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the callback environment and the saved run."""
+        config_dir = tmp_path / "claude-vms" / "configuration"
+        config_dir.mkdir(parents=True)
+        (config_dir / "ansible.cfg").write_text("[defaults]\ncallbacks_enabled = profile_tasks\n")
+        monkeypatch.delenv("ANSIBLE_CALLBACKS_ENABLED", raising=False)
+        ansible = AnsibleManager(config_dir, runs_dir=tmp_path / "runs")
+        seen: dict[str, str] = {}
+
+        def run(_cmd: Sequence[str], env: dict[str, str], **_kwargs: Any) -> None:
+            seen.update(env)
+            # The callback writes from another process while the tail is running
+            writer = threading.Thread(
+                target=lambda: Path(env["HARNESS_ANSIBLE_EVENTS"]).write_text(
+                    "".join(json.dumps(e) + "\n" for e in EVENTS)
+                )
+            )
+            writer.start()
+            writer.join()
+
+        monkeypatch.setattr(ansible.runner, "run", run)
+        events_file = ansible.run_playbook(limit=["vm-1", "vm-2"])
+
+        assert events_file is not None
+        assert events_file.parent == tmp_path / "runs"
+        assert "claude-vms" in events_file.name
+        assert seen["ANSIBLE_CALLBACKS_ENABLED"] == "harness_events,profile_tasks"
+        assert seen["ANSIBLE_CALLBACK_PLUGINS"].split(":")[0].endswith("ansible_plugins/callback")
+        assert len(load_records(events_file)) == 4
+
+    def test_without_runs_dir(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that without a runs directory the callback is not enabled."""
+        ansible = AnsibleManager(tmp_path)
+        calls: list[dict[str, Any]] = []
+        monkeypatch.setattr(ansible.runner, "run", lambda _cmd, **kwargs: calls.append(kwargs))
+
+        assert ansible.run_playbook() is None
+        assert "env" not in calls[0]
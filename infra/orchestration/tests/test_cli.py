@@ -12,6 +12,9 @@ from typer.testing import CliRunner
 
 from harness.cli.app import app
 from harness.core.exitcodes import ExitCode
+from harness.core.runner import run_command
+from harness.deployers.base import DeploymentResult
+from harness.infra.ansible_events import PlaybookProgress
 
 runner = CliRunner()
 
@@ -55,6 +58,37 @@ class TestCLIHelp:
 class TestNeo4jCommand:
     """Tests for neo4j command."""
 
+    def test_json_includes_ansible_task_events(self, config_file: Path) -> None:
+        """Test that per-host task results logged during a deploy reach --json output."""
+
+        def deploy(**kwargs: Any) -> DeploymentResult:
+            progress = PlaybookProgress("neo4j")
+            progress.handle({"event": "play_start", "play": "Neo4j", "hosts": ["neo4j-db"]})
+            progress.handle(
+                {
+                    "event": "task_result",
+                    "host": "neo4j-db",
+                    "task": "Install Docker",
+                    "role": "geerlingguy.docker",
+                    "status": "ok",
+                    "duration": 12.5,
+                }
+            )
+            return DeploymentResult(success=True, message="Neo4j deployed")
+
+        with (
+            patch("harness.core.config.get_orchestration_dir", return_value=config_file.parent),
+            patch("harness.cli.commands.neo4j.Neo4jDeployer") as deployer,
+        ):
+            deployer.return_value.deploy.side_effect = deploy
+            result = runner.invoke(app, ["--json", "neo4j"])
+
+        assert result.exit_code == 0, result.output
+        events = [e for e in json.loads(result.stdout)["events"] if e["message"] == "ansible_task"]
+        assert [(e["host"], e["task"], e["duration"]) for e in events] == [
+            ("neo4j-db", "Install Docker", 12.5)
+        ]
+
     def test_neo4j_help(self) -> None:
         """Test neo4j --help shows options and examples."""
         result = runner.invoke(app, ["neo4j", "--help"])
@@ -90,6 +124,35 @@ class TestVmsCommand:
         assert "NEO4J_PASSWORD" in result.output
         assert "ANSIBLE_GH_TOKEN" in result.output
 
+    def test_vms_scale_help(self) -> None:
+        """Test vms scale --help shows its options."""
+        result = runner.invoke(app, ["vms", "scale", "--help"])
+
+        assert result.exit_code == 0
+        assert "--to" in result.output
+        assert "--remove" in result.output
+
+    def test_vms_scale_requires_target(self, config_file: Path) -> None:
+        """Test that scale without --to or --remove fails."""
+        with patch("harness.core.config.get_orchestration_dir", return_value=config_file.parent):
+            result = runner.invoke(app, ["vms", "scale"])
+
+        assert result.exit_code == ExitCode.FAILURE
+
+    @patch("harness.cli.commands.vms.ClaudeVMsDeployer")
+    def test_vms_without_subcommand_deploys(
+        self, mock_deployer: MagicMock, config_file: Path
+    ) -> None:
+        """Test that plain `harness vms` still runs a deployment."""
+        mock_deployer.return_value.deploy.return_value = MagicMock(success=True)
+        with patch("harness.core.config.get_orchestration_dir", return_value=config_file.parent):
+            result = runner.invoke(app, ["vms", "-c", "2"])
+
+        assert result.exit_code == 0
+        assert mock_deployer.call_args.kwargs["count"] == 2
+        mock_deployer.return_value.deploy.assert_called_once()
+        mock_deployer.return_value.scale.assert_not_called()
+
 
 class TestAllCommand:
     """Tests for all command."""
@@ -101,8 +164,98 @@ class TestAllCommand:
         assert result.exit_code == 0
         assert "--count" in result.output
         assert "--destroy" in result.output
+        assert "--sequential" in result.output
         assert "Deploy order" in result.output or "Neo4j" in result.output
 
+    def test_all_failed_phase_skips_dependents(self, config_file: Path) -> None:
+        """Test that a Neo4j failure skips only the phases waiting on Neo4j."""
+        phases = {
+            name: {p: MagicMock() for p in ("provision", "wait", "configure")}
+            for name in ("Neo4jDeployer", "CoreServicesDeployer", "ClaudeVMsDeployer")
+        }
+        phases["Neo4jDeployer"]["configure"].side_effect = RuntimeError("neo4j down")
+
+        with (
+            patch("harness.core.config.get_orchestration_dir", return_value=config_file.parent),
+            patch("harness.cli.commands.all_cmd.Neo4jDeployer") as neo4j,
+            patch("harness.cli.commands.all_cmd.CoreServicesDeployer") as core_services,
+            patch("harness.cli.commands.all_cmd.ClaudeVMsDeployer") as vms,
+        ):
+            for name, mock in (
+                ("Neo4jDeployer", neo4j),
+                ("CoreServicesDeployer", core_services),
+                ("ClaudeVMsDeployer", vms),
+            ):
+                mock.return_value.phases.return_value = phases[name]
+            result = runner.invoke(app, ["all"])
+
+        assert result.exit_code == ExitCode.FAILURE
+        phases["CoreServicesDeployer"]["wait"].assert_called_once()
+        phases["ClaudeVMsDeployer"]["provision"].assert_called_once()
+        phases["ClaudeVMsDeployer"]["wait"].assert_called_once()
+        phases["ClaudeVMsDeployer"]["configure"].assert_not_called()
+        phases["CoreServicesDeployer"]["configure"].assert_not_called()
+
+    def test_all_logs_component_summaries(self, config_file: Path) -> None:
+        """Test that a successful run logs each component's own summary."""
+        with (
+            patch("harness.core.config.get_orchestration_dir", return_value=config_file.parent),
+            patch("harness.cli.commands.all_cmd.Neo4jDeployer") as neo4j,
+            patch("harness.cli.commands.all_cmd.CoreServicesDeployer") as core_services,
+            patch("harness.cli.commands.all_cmd.ClaudeVMsDeployer") as vms,
+        ):
+            for mock in (neo4j, core_services, vms):
+                mock.return_value.phases.return_value = {"provision": MagicMock()}
+            result = runner.invoke(app, ["all", "--skip-hardening"])
+
+        assert result.exit_code == 0, result.output
+        neo4j.return_value.log_summary.assert_called_once_with()
+        core_services.return_value.log_summary.assert_called_once_with()
+        vms.return_value.log_summary.assert_called_once_with(skip_hardening=True)
+
+    def test_all_destroy_isolates_failures(self, config_file: Path) -> None:
+        """Test that one failed destroy does not stop the other components."""
+        with (
+            patch("harness.core.config.get_orchestration_dir", return_value=config_file.parent),
+            patch("harness.cli.commands.all_cmd.Neo4jDeployer") as neo4j,
+            patch("harness.cli.commands.all_cmd.CoreServicesDeployer") as core_services,
+            patch("harness.cli.commands.all_cmd.ClaudeVMsDeployer") as vms,
+        ):
+            vms.return_value.destroy.return_value = MagicMock(success=False, message="locked")
+            core_services.return_value.destroy.return_value = MagicMock(success=True)
+            neo4j.return_value.destroy.return_value = MagicMock(success=True)
+            result = runner.invoke(app, ["--json", "all", "--destroy"])
+
+        assert result.exit_code == ExitCode.FAILURE
+        core_services.return_value.destroy.assert_called_once()
+        neo4j.return_value.destroy.assert_called_once()
+        output = json.loads(result.stdout)
+        nodes = output["result"]["phases"]["nodes"]
+        assert output["result"]["success"] is False
+        assert nodes["claude-vms.destroy"]["status"] == "failed"
+        assert nodes["neo4j.destroy"]["status"] == "ok"
+
+    def test_all_json_resources(self, config_file: Path) -> None:
+        """Test that the JSON result and events include each command's resource usage."""
+        phases = {"provision": lambda: run_command(["true"])}
+        with (
+            patch("harness.core.config.get_orchestration_dir", return_value=config_file.parent),
+            patch("harness.cli.commands.all_cmd.Neo4jDeployer") as neo4j,
+            patch("harness.cli.commands.all_cmd.CoreServicesDeployer") as core_services,
+            patch("harness.cli.commands.all_cmd.ClaudeVMsDeployer") as vms,
+        ):
+            for mock in (neo4j, core_services, vms):
+                mock.return_value.phases.return_value = phases
+            result = runner.invoke(app, ["--json", "all", "--skip-configure"])
+
+        assert result.exit_code == 0, result.output
+        output = json.loads(result.stdout)
+        resources = output["result"]["resources"]
+        assert resources["commands"] == 3
+        assert resources["max_rss_kb"] > 0
+        commands = [e for e in output["events"] if e["message"] == "command"]
+        assert [e["command"] for e in commands] == ["true"] * 3
+
 
 class TestStatusCommand:
     """Tests for status command."""
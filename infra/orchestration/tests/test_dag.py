@@ -0,0 +1,96 @@
+"""Tests for the dependency-graph executor."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from harness.core.dag import FAILED, SKIPPED, DagExecutor
+
+
+def sleeper(seconds: float, order: list[str] | None = None, name: str = ""):
+    """Build a node function that sleeps and records when it ran."""
+
+    def fn() -> None:
+        if order is not None:
+            order.append(name)
+        time.sleep(seconds)
+
+    return fn
+
+
+def fail() -> None:
+    """Node function that raises."""
+    raise RuntimeError("boom")
+
+
+class TestDagExecutor:
+    """Tests for DagExecutor."""
+
+    def test_independent_nodes_overlap(self) -> None:
+        """Test that nodes without dependencies run concurrently."""
+        barrier = threading.Barrier(3, timeout=5)
+        executor = DagExecutor()
+        for name in ("a", "b", "c"):
+            executor.add(name, barrier.wait)
+
+        result = executor.run()
+
+        assert result.success
+
+    def test_dependencies_are_respected(self) -> None:
+        """Test that a node starts only after its dependencies finish."""
+        executor = DagExecutor()
+        executor.add("provision", sleeper(0.05))
+        executor.add("configure", sleeper(0), deps=["provision"])
+
+        result = executor.run()
+
+        assert result.nodes["configure"].started >= result.nodes["provision"].finished
+
+    def test_failure_skips_dependents_only(self) -> None:
+        """Test that a failure skips its dependents but not other branches."""
+        executor = DagExecutor()
+        executor.add("neo4j.provision", fail)
+        executor.add("neo4j.configure", sleeper(0), deps=["neo4j.provision"])
+        executor.add("vms.provision", sleeper(0))
+
+        result = executor.run()
+
+        assert not result.success
+        assert result.nodes["neo4j.provision"].status == FAILED
+        assert result.nodes["neo4j.provision"].error == "boom"
+        assert result.nodes["neo4j.configure"].status == SKIPPED
+        assert result.nodes["vms.provision"].ok
+
+    def test_single_worker_runs_in_insertion_order(self) -> None:
+        """Test that max_workers=1 runs ready nodes in the order they were added."""
+        order: list[str] = []
+        executor = DagExecutor(max_workers=1)
+        executor.add("a.provision", sleeper(0, order, "a.provision"))
+        executor.add("a.configure", sleeper(0, order, "a.configure"), deps=["a.provision"])
+        executor.add("b.provision", sleeper(0, order, "b.provision"))
+
+        executor.run()
+
+        assert order == ["a.provision", "a.configure", "b.provision"]
+
+    def test_critical_path_follows_slowest_dependency(self) -> None:
+        """Test that the critical path steps to the dependency finished last."""
+        executor = DagExecutor()
+        executor.add("fast", sleeper(0))
+        executor.add("slow", sleeper(0.1))
+        executor.add("configure", sleeper(0), deps=["fast", "slow"])
+
+        result = executor.run()
+
+        assert [r.name for r in result.critical_path()] == ["slow", "configure"]
+        assert result.to_dict()["critical_path"] == ["slow", "configure"]
+
+    def test_unknown_dependency_raises(self) -> None:
+        """Test that dependencies must be added first."""
+        executor = DagExecutor()
+        with pytest.raises(ValueError, match="unknown node"):
+            executor.add("configure", fail, deps=["provision"])
@@ -0,0 +1,129 @@
+"""Tests for the shared Ansible Galaxy install cache."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from harness.core.runner import CommandError
+from harness.infra.ansible import AnsibleManager
+from harness.infra.galaxy_cache import GalaxyCache
+
+REQUIREMENTS = """---
+collections:
+  - name: community.general
+    version: "10.2.0"
+roles:
+  - name: geerlingguy.docker
+    version: "7.4.1"
+"""
+
+
+class FakeRunner:
+    """Runner that fakes ansible-galaxy by creating a file in the install path."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.commands: list[list[str]] = []
+        self._lock = threading.Lock()
+
+    def run(self, cmd: Sequence[str], **_kwargs: Any) -> None:
+        with self._lock:
+            self.commands.append(list(cmd))
+        if self.fail:
+            raise CommandError(" ".join(cmd), 1)
+        path = Path(cmd[cmd.index("-p") + 1])
+        path.mkdir(parents=True, exist_ok=True)
+        (path / cmd[1]).write_text("installed")
+
+
+def write_requirements(directory: Path, text: str = REQUIREMENTS) -> Path:
+    """Write a requirements.yml into a configuration directory."""
+    directory.mkdir(parents=True, exist_ok=True)
+    requirements = directory / "requirements.yml"
+    requirements.write_text(text)
+    return requirements
+
+
+class TestGalaxyCache:
+    """Tests for GalaxyCache.install."""
+
+    def test_miss_then_hit(self, tmp_path: Path) -> None:
+        """Test that the first install fills the entry and the second is skipped."""
+        cache = GalaxyCache(tmp_path / "cache")
+        requirements = write_requirements(tmp_path / "neo4j")
+        runner = FakeRunner()
+
+        assert cache.install(requirements, runner)  # type: ignore[arg-type]
+        assert not cache.install(requirements, runner)  # type: ignore[arg-type]
+
+        assert len(runner.commands) == 2
+        assert {cmd[1] for cmd in runner.commands} == {"collection", "role"}
+        assert all("--force" in cmd for cmd in runner.commands)
+        entry = cache.entry(requirements)
+        assert (entry / "collections" / "collection").exists()
+        assert (entry / "roles" / "role").exists()
+        assert (entry / "requirements.yml").read_text() == REQUIREMENTS
+
+    def test_entries_are_keyed_by_content(self, tmp_path: Path) -> None:
+        """Test that identical requirements share an entry and others don't."""
+        cache = GalaxyCache(tmp_path / "cache")
+        neo4j = write_requirements(tmp_path / "neo4j")
+        core = write_requirements(tmp_path / "core-services")
+        claude = write_requirements(tmp_path / "claude-vms", REQUIREMENTS + "# hardening\n")
+        runner = FakeRunner()
+
+        cache.install(neo4j, runner)  # type: ignore[arg-type]
+        assert not cache.install(core, runner)  # type: ignore[arg-type]
+        assert cache.install(claude, runner)  # type: ignore[arg-type]
+
+        assert cache.entry(neo4j) == cache.entry(core) != cache.entry(claude)
+        assert cache.env(neo4j) == {
+            "ANSIBLE_COLLECTIONS_PATH": str(cache.entry(neo4j) / "collections"),
+            "ANSIBLE_ROLES_PATH": str(cache.entry(neo4j) / "roles"),
+        }
+
+    def test_failed_install_leaves_no_entry(self, tmp_path: Path) -> None:
+        """Test that a failed install is retried next time instead of cached."""
+        cache = GalaxyCache(tmp_path / "cache")
+        requirements = write_requirements(tmp_path / "neo4j")
+
+        with pytest.raises(CommandError):
+            cache.install(requirements, FakeRunner(fail=True))  # type: ignore[arg-type]
+
+        assert not cache.entry(requirements).exists()
+        assert not list(cache.root.glob("*.tmp"))
+        assert cache.install(requirements, FakeRunner())  # type: ignore[arg-type]
+
+    def test_force_reinstalls(self, tmp_path: Path) -> None:
+        """Test that force rebuilds an existing entry."""
+        cache = GalaxyCache(tmp_path / "cache")
+        requirements = write_requirements(tmp_path / "neo4j")
+        runner = FakeRunner()
+
+        cache.install(requirements, runner)  # type: ignore[arg-type]
+        assert cache.install(requirements, runner, force=True)  # type: ignore[arg-type]
+        assert len(runner.commands) == 4
+
+
+class TestAnsibleManagerCache:
+    """Tests for AnsibleManager with a Galaxy cache."""
+
+    def test_playbooks_use_cache_entry(self, tmp_path: Path) -> None:
+        """Test that ansible commands get the entry's collection and role paths."""
+        cache = GalaxyCache(tmp_path / "cache")
+        requirements = write_requirements(tmp_path / "neo4j")
+
+        ansible = AnsibleManager(tmp_path / "neo4j", galaxy_cache=cache)
+
+        assert ansible.runner.base_env == cache.env(requirements)
+
+    def test_without_cache(self, tmp_path: Path) -> None:
+        """Test that without a cache Ansible's default paths are used."""
+        write_requirements(tmp_path / "neo4j")
+
+        assert AnsibleManager(tmp_path / "neo4j").runner.base_env == {}
@@ -0,0 +1,199 @@
+"""Tests for golden image baking and deploying from baked images."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from harness.core.config import Config
+from harness.deployers.claude_vms import ClaudeVMsDeployer
+from harness.deployers.image import BAKE_TAGS, ImageBaker
+from harness.infra.image import BakedImage, ImageCatalog, playbook_fingerprint
+from harness.infra.proxmox import ProxmoxTaskError
+
+
+@pytest.fixture
+def config(config_file: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Config:
+    """Configuration over a temporary tree with a Claude VMs playbook."""
+    monkeypatch.setattr("harness.core.config.get_project_root", lambda: tmp_path)
+    monkeypatch.setattr("harness.core.config.get_orchestration_dir", lambda: tmp_path)
+    config_dir = tmp_path / "claude-vms" / "configuration"
+    (config_dir / "group_vars").mkdir(parents=True)
+    (config_dir / "playbook.yml").write_text("- hosts: all")
+    (config_dir / "group_vars" / "all.yml").write_text("dev_user: dmg")
+    return Config.from_yaml(config_file)
+
+
+def make_image(config: Config, version: int = 1, **overrides: Any) -> BakedImage:
+    """Build an image baked from the current playbook."""
+    fields: dict[str, Any] = {
+        "version": version,
+        "template_id": 9000 + version - 1,
+        "name": f"claude-golden-v{version}",
+        "source_template_id": 100,
+        "cloud_init_user": "dmg",
+        "playbook": playbook_fingerprint(config.claude_vms_dir / "configuration"),
+    }
+    fields.update(overrides)
+    return BakedImage(**fields)
+
+
+class TestImageCatalog:
+    """Tests for the baked image record."""
+
+    def test_empty_catalog(self, tmp_path: Path) -> None:
+        """Test that a missing file means no images and version 1 next."""
+        catalog = ImageCatalog(tmp_path / "images.json")
+
+        assert catalog.latest() is None
+        assert catalog.next_version() == 1
+
+    def test_record_and_find(self, config: Config) -> None:
+        """Test that recorded images persist in bake order."""
+        catalog = ImageCatalog.from_config(config)
+        catalog.record(make_image(config, 1))
+        catalog.record(make_image(config, 2))
+
+        reloaded = ImageCatalog.from_config(config)
+        assert reloaded.latest() == make_image(config, 2)
+        assert reloaded.find(9000) == make_image(config, 1)
+        assert reloaded.find(1234) is None
+        assert reloaded.next_version() == 3
+
+
+class TestImageBaker:
+    """Tests for ImageBaker.bake with the Proxmox API, SSH and Ansible mocked."""
+
+    @pytest.fixture
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+        """Mocked Proxmox client returned by ProxmoxClient.from_config."""
+        client = MagicMock()
+        client.__enter__.return_value = client
+        client.vm_ids.return_value = {100, 200, 9000}
+        client.wait_for_vm_ipv4.return_value = "10.0.70.99"
+        monkeypatch.setattr(
+            "harness.deployers.image.ProxmoxClient.from_config", lambda *_args: client
+        )
+        return client
+
+    @pytest.fixture
+    def baker(self, config: Config, monkeypatch: pytest.MonkeyPatch) -> ImageBaker:
+        """Baker with SSH and Ansible mocked."""
+        monkeypatch.setattr("harness.deployers.image.check_dependencies", lambda _deps: None)
+        ssh = MagicMock()
+        ssh.wait_for_host.return_value = True
+        monkeypatch.setattr("harness.deployers.image.SSHWaiter.from_config", lambda _c: ssh)
+        self.ansible = MagicMock()
+        monkeypatch.setattr("harness.deployers.image.AnsibleManager", lambda **_kw: self.ansible)
+        return ImageBaker(config)
+
+    def test_bake_creates_versioned_template(self, baker: ImageBaker, client: MagicMock) -> None:
+        """Test the clone, configure, seal and convert sequence."""
+        result = baker.bake()
+
+        assert result.success
+        assert result.details is not None
+        assert result.details["name"] == "claude-golden-v1"
+        # 9000 is taken, so the first free ID is used
+        assert result.details["template_id"] == 9001
+        client.clone_vm.assert_called_once_with(
+            "pve1", 100, 9001, "claude-golden-v1", storage="local-lvm"
+        )
+        assert client.set_vm_config.call_args.args[2]["ipconfig0"] == "ip=dhcp"
+        assert self.ansible.run_playbook.call_args.kwargs["tags"] == BAKE_TAGS
+        client.shutdown_vm.assert_called_once_with("pve1", 9001)
+        client.convert_to_template.assert_called_once_with("pve1", 9001)
+        assert baker.catalog.latest() is not None
+        assert baker.catalog.latest().template_id == 9001
+
+    @pytest.mark.usefixtures("client")
+    def test_next_bake_gets_new_version_and_id(self, baker: ImageBaker) -> None:
+        """Test that each bake produces a new template after the last one."""
+        baker.catalog.record(make_image(baker.config, 1, template_id=9001))
+
+        result = baker.bake()
+
+        assert result.details is not None
+        assert result.details["version"] == 2
+        assert result.details["template_id"] == 9002
+
+    def test_failed_bake_removes_vm(self, baker: ImageBaker, client: MagicMock) -> None:
+        """Test that a failed playbook deletes the half-baked VM and records nothing."""
+        self.ansible.run_playbook.side_effect = RuntimeError("playbook failed")
+
+        result = baker.bake()
+
+        assert not result.success
+        client.delete_vm.assert_called_once_with("pve1", 9001)
+        client.convert_to_template.assert_not_called()
+        assert baker.catalog.latest() is None
+
+    def test_keep_on_failure(self, baker: ImageBaker, client: MagicMock) -> None:
+        """Test that --keep-on-failure leaves the VM for inspection."""
+        client.start_vm.side_effect = ProxmoxTaskError("UPID:pve1:1", "start failed")
+
+        assert not baker.bake(keep_on_failure=True).success
+        client.delete_vm.assert_not_called()
+
+    def test_missing_api_fails(self, baker: ImageBaker, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that baking without API credentials fails with a clear message."""
+        monkeypatch.setattr(
+            "harness.deployers.image.ProxmoxClient.from_config", lambda *_args: None
+        )
+
+        result = baker.bake()
+
+        assert not result.success
+        assert "TF_VAR_proxmox_api_token" in result.message
+
+
+class TestDeployFromImage:
+    """Tests for Claude VM deployments cloning a baked image."""
+
+    @pytest.fixture
+    def deployer_for(self, config: Config, monkeypatch: pytest.MonkeyPatch):
+        """Build a deployer after images have been recorded."""
+        monkeypatch.setattr("harness.deployers.base.check_dependencies", lambda _deps: None)
+        return lambda: ClaudeVMsDeployer(config)
+
+    def test_no_image_runs_full_playbook(self, deployer_for) -> None:
+        """Test that without a baked image the template comes from terraform.tfvars."""
+        deployer = deployer_for()
+
+        assert "template_id" not in deployer._tofu_variables
+        assert deployer._playbook_options(skip_hardening=False)[1] is None
+
+    def test_latest_image_skips_bake_tasks(self, config: Config, deployer_for) -> None:
+        """Test that VMs clone the latest image and run host-specific tasks only."""
+        ImageCatalog.from_config(config).record(make_image(config, 1))
+        ImageCatalog.from_config(config).record(make_image(config, 2))
+
+        deployer = deployer_for()
+
+        assert deployer._tofu_variables["template_id"] == 9001
+        assert deployer._playbook_options(skip_hardening=True)[1] == ["hardening", "bake"]
+
+    def test_stale_image_runs_full_playbook(self, config: Config, deployer_for) -> None:
+        """Test that an image baked from an older playbook still gets every task."""
+        ImageCatalog.from_config(config).record(make_image(config, 1))
+        (config.claude_vms_dir / "configuration" / "playbook.yml").write_text("- hosts: new")
+
+        deployer = deployer_for()
+
+        assert deployer._tofu_variables["template_id"] == 9000
+        assert deployer._playbook_options(skip_hardening=False)[1] is None
+
+    def test_pinned_template(self, config: Config, deployer_for) -> None:
+        """Test that claude_vms.template_id overrides the latest image."""
+        ImageCatalog.from_config(config).record(make_image(config, 1))
+        ImageCatalog.from_config(config).record(make_image(config, 2))
+        config.claude_vms.template_id = 9000
+
+        deployer = deployer_for()
+
+        assert deployer.image is not None
+        assert deployer.image.version == 1
+        assert deployer._tofu_variables["template_id"] == 9000
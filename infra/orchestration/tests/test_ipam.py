@@ -0,0 +1,271 @@
+"""Tests for static IP allocation."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from harness.core.config import ClaudeVMsConfig, Config
+from harness.core.ipam import IPAllocator
+from harness.deployers.claude_vms import ClaudeVMsDeployer
+
+
+@pytest.fixture
+def lease_file(tmp_path: Path) -> Path:
+    """Path for a temporary lease file."""
+    return tmp_path / "state" / "ipam-leases.json"
+
+
+def make_allocator(
+    lease_file: Path,
+    address_range: str = "10.0.70.48-10.0.70.55",
+    namespace: str = "claude-vms",
+) -> IPAllocator:
+    """Create an allocator that must skip the gateway and core IPs."""
+    return IPAllocator(
+        subnet="10.0.70.0/24",
+        address_range=address_range,
+        lease_file=lease_file,
+        reserved=["10.0.70.1", "10.0.70.50"],
+        namespace=namespace,
+    )
+
+
+class TestIPAllocator:
+    """Tests for IPAllocator class."""
+
+    def test_allocates_in_order_skipping_reserved(self, lease_file: Path) -> None:
+        """Test that addresses are assigned in order around reserved IPs."""
+        allocator = make_allocator(lease_file)
+
+        result = allocator.allocate(["vm-1", "vm-2", "vm-3"])
+
+        assert result == {
+            "vm-1": "10.0.70.48/24",
+            "vm-2": "10.0.70.49/24",
+            "vm-3": "10.0.70.51/24",
+        }
+
+    def test_leases_are_stable_across_runs(self, lease_file: Path) -> None:
+        """Test that a VM keeps its address when others come and go."""
+        make_allocator(lease_file).allocate(["vm-1", "vm-2", "vm-3"])
+
+        result = make_allocator(lease_file).allocate(["vm-3", "vm-4"])
+
+        assert result["vm-3"] == "10.0.70.51/24"
+        assert result["vm-4"] == "10.0.70.52/24"
+
+    def test_leases_persisted_to_disk(self, lease_file: Path) -> None:
+        """Test that leases are written to the lease file."""
+        make_allocator(lease_file).allocate(["vm-1"])
+
+        data = json.loads(lease_file.read_text())
+        assert data["subnet"] == "10.0.70.0/24"
+        assert data["leases"] == {"claude-vms": {"vm-1": "10.0.70.48"}}
+
+    def test_stale_leases_reclaimed_when_exhausted(self, lease_file: Path) -> None:
+        """Test that leases of absent VMs are reused only when the range is full."""
+        allocator = make_allocator(lease_file, "10.0.70.48-10.0.70.49")
+        allocator.allocate(["old-1", "old-2"])
+
+        result = allocator.allocate(["new-1"])
+
+        assert result == {"new-1": "10.0.70.48/24"}
+        assert "old-1" not in allocator.leases()
+        assert allocator.leases()["old-2"] == "10.0.70.49"
+
+    def test_exhausted_range_raises(self, lease_file: Path) -> None:
+        """Test error when more VMs are requested than the range holds."""
+        allocator = make_allocator(lease_file, "10.0.70.48-10.0.70.49")
+
+        with pytest.raises(ValueError, match="exhausted"):
+            allocator.allocate(["vm-1", "vm-2", "vm-3"])
+
+    def test_release_frees_address(self, lease_file: Path) -> None:
+        """Test that released addresses are handed out again."""
+        allocator = make_allocator(lease_file)
+        allocator.allocate(["vm-1", "vm-2"])
+
+        allocator.release(["vm-1"])
+        result = allocator.allocate(["vm-2", "vm-3"])
+
+        assert result["vm-3"] == "10.0.70.48/24"
+
+    def test_preview_writes_no_lease(self, lease_file: Path) -> None:
+        """Test that allocate(reserve=False) reports addresses without leasing them."""
+        allocator = make_allocator(lease_file)
+
+        assert allocator.allocate(["vm-1"], reserve=False) == {"vm-1": "10.0.70.48/24"}
+        assert allocator.leases() == {}
+
+    def test_namespaces_never_reclaim_each_other(self, lease_file: Path) -> None:
+        """Test that the fleet and the pool sharing a full range keep each other's leases."""
+        fleet = make_allocator(lease_file, "10.0.70.48-10.0.70.49")
+        pool = make_allocator(lease_file, "10.0.70.48-10.0.70.49", namespace="pool")
+        fleet.allocate(["claude-dev-1"])
+        pool.allocate(["claude-pool-1"])
+
+        with pytest.raises(ValueError, match="exhausted"):
+            fleet.allocate(["claude-dev-1", "claude-dev-2"])
+        with pytest.raises(ValueError, match="exhausted"):
+            pool.allocate(["claude-pool-1", "claude-pool-2"])
+
+        assert fleet.leases() == {"claude-dev-1": "10.0.70.48"}
+        assert pool.leases() == {"claude-pool-1": "10.0.70.49"}
+
+    def test_reclaims_only_own_stale_leases(self, lease_file: Path) -> None:
+        """Test that a full range reuses a stale lease of the same namespace only."""
+        fleet = make_allocator(lease_file, "10.0.70.48-10.0.70.49")
+        pool = make_allocator(lease_file, "10.0.70.48-10.0.70.49", namespace="pool")
+        fleet.allocate(["claude-dev-1"])
+        pool.allocate(["claude-pool-1"])
+
+        result = fleet.allocate(["claude-dev-2"])
+
+        assert result == {"claude-dev-2": "10.0.70.48/24"}
+        assert fleet.leases() == {"claude-dev-2": "10.0.70.48"}
+        assert pool.leases() == {"claude-pool-1": "10.0.70.49"}
+
+    def test_flat_lease_file_belongs_to_fleet(self, lease_file: Path) -> None:
+        """Test that leases written before namespaces are the fleet's and can be adopted."""
+        lease_file.parent.mkdir(parents=True)
+        lease_file.write_text(
+            json.dumps(
+                {
+                    "subnet": "10.0.70.0/24",
+                    "leases": {"claude-dev-1": "10.0.70.48", "claude-pool-1": "10.0.70.49"},
+                }
+            )
+        )
+        fleet = make_allocator(lease_file)
+        pool = make_allocator(lease_file, namespace="pool")
+
+        pool.adopt(["claude-pool-1"])
+
+        assert fleet.leases() == {"claude-dev-1": "10.0.70.48"}
+        assert pool.leases() == {"claude-pool-1": "10.0.70.49"}
+
+    def test_range_outside_subnet_rejected(self, lease_file: Path) -> None:
+        """Test that a range outside the subnet is rejected."""
+        with pytest.raises(ValueError, match="outside"):
+            make_allocator(lease_file, "10.0.71.10-10.0.71.20")
+
+    def test_leases_from_other_subnet_ignored(self, lease_file: Path) -> None:
+        """Test that leases are discarded when the subnet changes."""
+        lease_file.parent.mkdir(parents=True)
+        lease_file.write_text(
+            json.dumps({"subnet": "192.168.1.0/24", "leases": {"vm-1": "192.168.1.5"}})
+        )
+
+        result = make_allocator(lease_file).allocate(["vm-1"])
+
+        assert result == {"vm-1": "10.0.70.48/24"}
+
+
+class TestFromConfig:
+    """Tests for building an allocator from configuration."""
+
+    def test_dhcp_when_no_range(self, config_file: Path) -> None:
+        """Test that no allocator is created without a static range."""
+        config = Config.from_yaml(config_file)
+
+        assert IPAllocator.from_config(config) is None
+
+    def test_reserves_core_addresses(self, config_file: Path) -> None:
+        """Test that gateway, Neo4j and Core Services IPs are reserved."""
+        config = Config.from_yaml(config_file)
+        config.network.static_range = "10.0.70.1-10.0.70.100"
+
+        allocator = IPAllocator.from_config(config)
+
+        assert allocator is not None
+        assert {str(ip) for ip in allocator.reserved} == {
+            "10.0.70.1",
+            "10.0.70.50",
+            "10.0.70.70",
+        }
+        assert allocator.lease_file == config.state_dir / "ipam-leases.json"
+
+
+class TestGenerateVmsWithAllocator:
+    """Tests for ClaudeVMsConfig.generate_vms with static addressing."""
+
+    def test_adds_ip_address(self, lease_file: Path) -> None:
+        """Test that each VM gets an ip_address override."""
+        config = ClaudeVMsConfig(start_id=200, default_count=1, prefix="claude-dev")
+
+        vms = config.generate_vms(count=2, allocator=make_allocator(lease_file))
+
+        assert vms["claude-dev-1"] == {"vm_id": 200, "ip_address": "10.0.70.48/24"}
+        assert vms["claude-dev-2"] == {"vm_id": 201, "ip_address": "10.0.70.49/24"}
+
+
+class TestDeployerLeases:
+    """Tests for when ClaudeVMsDeployer leases and releases addresses."""
+
+    @pytest.fixture
+    def deployer(
+        self, config_file: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> ClaudeVMsDeployer:
+        """Deployer with a static range, a temporary state directory and tofu mocked."""
+        monkeypatch.setattr("harness.deployers.base.check_dependencies", lambda _deps: None)
+        monkeypatch.setattr("harness.core.config.get_project_root", lambda: tmp_path)
+        monkeypatch.setattr("harness.core.config.get_orchestration_dir", lambda: tmp_path)
+        config = Config.from_yaml(config_file)
+        config.network.static_range = "10.0.70.100-10.0.70.109"
+        deployer = ClaudeVMsDeployer(config, count=2)
+        tofu = MagicMock()
+        tofu.snapshot.return_value.vms.return_value = {"claude-dev-1": {}, "claude-dev-2": {}}
+        deployer.get_tofu_manager = MagicMock(return_value=tofu)  # type: ignore[method-assign]
+        return deployer
+
+    def test_plan_does_not_lease(self, deployer: ClaudeVMsDeployer) -> None:
+        """Test that planning and logging the configuration only preview addresses."""
+        deployer.log_configuration()
+        deployer._plan()
+
+        variables = deployer.get_tofu_manager().plan.call_args.kwargs["variables"]
+        assert variables["vms"]["claude-dev-1"]["ip_address"] == "10.0.70.100/24"
+        assert deployer.ip_allocator is not None
+        assert deployer.ip_allocator.leases() == {}
+
+    def test_provision_leases_and_destroy_releases(self, deployer: ClaudeVMsDeployer) -> None:
+        """Test that applying leases the addresses and destroying releases them."""
+        assert deployer.ip_allocator is not None
+        deployer._provision()
+        assert deployer.ip_allocator.leases() == {
+            "claude-dev-1": "10.0.70.100",
+            "claude-dev-2": "10.0.70.101",
+        }
+
+        deployer._destroy(deployer.get_tofu_manager())
+
+        assert deployer.ip_allocator.leases() == {}
+
+    def test_warns_about_dhcp_vms(
+        self, deployer: ClaudeVMsDeployer, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Test that a VM still on its old DHCP address is reported."""
+        deployer._provision()
+        deployer.inventory_file.parent.mkdir(parents=True)
+        deployer.inventory_file.write_text(
+            json.dumps(
+                {
+                    "all": {
+                        "hosts": {
+                            "claude-dev-1": {"ansible_host": "10.0.70.100"},
+                            "claude-dev-2": {"ansible_host": "10.0.70.23"},
+                        }
+                    }
+                }
+            )
+        )
+
+        deployer._warn_unmigrated()
+
+        output = capsys.readouterr()
+        assert "claude-dev-2 still uses 10.0.70.23" in output.out + output.err
+        assert "claude-dev-1" not in output.out + output.err
@@ -0,0 +1,146 @@
+"""Tests for the deployment journal and --resume."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from harness.core.config import Config
+from harness.core.journal import Journal, fingerprint
+from harness.deployers.base import BaseDeployer
+from harness.deployers.claude_vms import ClaudeVMsDeployer
+from harness.deployers.neo4j import Neo4jDeployer
+
+
+class TestFingerprint:
+    """Tests for input fingerprints."""
+
+    def test_directory_content_changes_fingerprint(self, tmp_path: Path) -> None:
+        """Test that editing a file changes the fingerprint."""
+        (tmp_path / "main.tf").write_text("a")
+        before = fingerprint(tmp_path, {"count": 1})
+        (tmp_path / "main.tf").write_text("b")
+
+        assert fingerprint(tmp_path, {"count": 1}) != before
+
+    def test_generated_files_are_ignored(self, tmp_path: Path) -> None:
+        """Test that state and .terraform/ do not affect the fingerprint."""
+        (tmp_path / "main.tf").write_text("a")
+        before = fingerprint(tmp_path)
+        (tmp_path / "terraform.tfstate").write_text("{}")
+        (tmp_path / ".terraform").mkdir()
+        (tmp_path / ".terraform" / "x").write_text("x")
+
+        assert fingerprint(tmp_path) == before
+
+
+class TestJournal:
+    """Tests for Journal."""
+
+    def test_completed_requires_matching_fingerprint(self, tmp_path: Path) -> None:
+        """Test that a phase is done only for the inputs it ran with."""
+        journal = Journal(tmp_path / "neo4j.json")
+        journal.complete("provision", "abc")
+
+        assert journal.completed("provision", "abc")
+        assert not journal.completed("provision", "def")
+        assert not journal.completed("configure", "abc")
+
+    def test_begin_forgets_later_phases(self, tmp_path: Path) -> None:
+        """Test that re-running a phase invalidates what came after it."""
+        journal = Journal(tmp_path / "neo4j.json")
+        for phase in ("provision", "wait", "configure"):
+            journal.complete(phase, "x")
+
+        journal.begin("wait")
+
+        assert list(journal.entries()) == ["provision"]
+
+    @pytest.mark.parametrize("shared", [True, False])
+    def test_concurrent_writers(self, tmp_path: Path, shared: bool) -> None:
+        """Test that concurrent completions are all kept, with one or many Journal objects."""
+        path = tmp_path / "claude-vms.json"
+        journal = Journal(path)
+
+        def complete(worker: int) -> None:
+            writer = journal if shared else Journal(path)
+            for i in range(50):
+                writer.complete(f"configure:vm-{worker}-{i}", "x")
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(complete, range(4)))
+
+        assert len(journal.entries()) == 200
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+class TestResume:
+    """Tests for BaseDeployer --resume."""
+
+    @pytest.fixture
+    def deployer(
+        self, config_file: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> Neo4jDeployer:
+        """Neo4j deployer over a temporary tree with all phases mocked."""
+        monkeypatch.setattr("harness.deployers.base.check_dependencies", lambda _deps: None)
+        monkeypatch.setattr("harness.core.config.get_project_root", lambda: tmp_path)
+        monkeypatch.setattr("harness.core.config.get_orchestration_dir", lambda: tmp_path)
+        deployer = Neo4jDeployer(Config.from_yaml(config_file))
+        deployer.provision_dir.mkdir(parents=True)
+        (deployer.provision_dir / "main.tf").write_text("resource {}")
+        deployer.config_dir.mkdir(parents=True)
+        (deployer.config_dir / "playbook.yml").write_text("- hosts: all")
+        deployer._provision = MagicMock()  # type: ignore[method-assign]
+        deployer._wait_for_vms = MagicMock()  # type: ignore[method-assign]
+        deployer._configure = MagicMock(side_effect=RuntimeError("playbook failed"))  # type: ignore[method-assign]
+        return deployer
+
+    def test_resume_runs_only_the_failed_phase(self, deployer: Neo4jDeployer) -> None:
+        """Test that a resumed run skips phases that completed."""
+        assert not deployer.deploy().success
+
+        deployer._configure.side_effect = None
+        assert deployer.deploy(resume=True).success
+
+        deployer._provision.assert_called_once()
+        deployer._wait_for_vms.assert_called_once()
+        assert deployer._configure.call_count == 2
+
+    def test_changed_inputs_rerun_phase(self, deployer: Neo4jDeployer) -> None:
+        """Test that editing the provision files re-runs provisioning and what follows."""
+        deployer._configure.side_effect = None
+        deployer.deploy()
+        (deployer.provision_dir / "main.tf").write_text("resource { changed }")
+
+        deployer.deploy(resume=True)
+
+        assert deployer._provision.call_count == 2
+        assert deployer._wait_for_vms.call_count == 2
+
+    def test_journal_is_shared(self, deployer: Neo4jDeployer) -> None:
+        """Test that a deployer hands every caller the same journal."""
+        assert deployer.journal is deployer.journal
+
+    def test_full_run_ignores_journal(self, deployer: Neo4jDeployer) -> None:
+        """Test that without --resume every phase runs."""
+        deployer._configure.side_effect = None
+        deployer.deploy()
+        deployer.deploy()
+
+        assert deployer._provision.call_count == 2
+
+    def test_claude_vms_resume_keeps_base_position(
+        self, config_file: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the Claude VM deploy takes resume where BaseDeployer.deploy does."""
+        monkeypatch.setattr("harness.deployers.base.check_dependencies", lambda _deps: None)
+        deployer = ClaudeVMsDeployer(Config.from_yaml(config_file))
+
+        with patch.object(BaseDeployer, "deploy") as deploy:
+            deployer.deploy(False, False, True)
+
+        assert deploy.call_args.kwargs["resume"] is True
+        assert deploy.call_args.kwargs["skip_hardening"] is False
@@ -129,6 +129,45 @@ class TestLogger:
         buffer = logger.get_buffer()
         assert buffer.events[0]["level"] == "error"
 
+    def test_event_is_buffered_in_json_mode(self) -> None:
+        """Test that structured events carry their fields in JSON mode."""
+        logger = Logger(json_mode=True)
+        logger.event("ansible_task", host="claude-dev-1", duration=1.5)
+
+        event = logger.get_buffer().events[0]
+        assert event == {
+            "level": "event",
+            "message": "ansible_task",
+            "host": "claude-dev-1",
+            "duration": 1.5,
+        }
+
+    def test_event_is_silent_on_console(self, capsys: pytest.CaptureFixture) -> None:
+        """Test that structured events are not printed in console mode."""
+        Logger().event("ansible_task", host="claude-dev-1")
+
+        assert capsys.readouterr().out == ""
+
+    def test_output_keeps_streams(self, capsys: pytest.CaptureFixture) -> None:
+        """Test that command output goes to the matching stream on the console."""
+        logger = Logger()
+        logger.output("[bold]plan[/bold]")
+        logger.output("warning", stderr=True)
+
+        captured = capsys.readouterr()
+        assert captured.out == "[bold]plan[/bold]\n"
+        assert captured.err == "warning\n"
+
+    def test_output_uses_stderr_in_json_mode(self, capsys: pytest.CaptureFixture) -> None:
+        """Test that command output can't corrupt JSON on stdout."""
+        logger = Logger(json_mode=True)
+        logger.output("Apply complete!")
+
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert captured.err == "Apply complete!\n"
+        assert logger.get_buffer().events == []
+
     def test_json_mode_buffers_header(self) -> None:
         """Test that headers are buffered in JSON mode."""
         logger = Logger(json_mode=True)
@@ -179,6 +218,16 @@ class TestLogger:
         # Buffer should be cleared
         assert len(logger.get_buffer().events) == 0
 
+    def test_reset(self) -> None:
+        """Test that reset returns to console mode with an empty buffer."""
+        logger = Logger(json_mode=True)
+        logger.info("Test message")
+
+        logger.reset()
+
+        assert not logger.json_mode
+        assert logger.get_buffer().events == []
+
     def test_info_with_extra_data(self) -> None:
         """Test passing extra data to info."""
         logger = Logger(json_mode=True)
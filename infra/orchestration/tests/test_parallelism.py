@@ -0,0 +1,150 @@
+"""Tests for adaptive tofu parallelism."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from harness.core.runner import CommandError
+from harness.infra.parallelism import OperationStats, ParallelismScheduler
+from harness.infra.tofu import OpenTofuManager
+
+CREATED = (
+    'proxmox_virtual_environment_vm.vm["claude-dev-{}"]: Creation complete after 41s [id=20{}]'
+)
+LOCK_ERROR = (
+    "Error: error cloning VM: can't lock file '/var/lock/qemu-server/lock-100.conf' - got timeout"
+)
+
+
+@pytest.fixture
+def scheduler(tmp_path: Path) -> ParallelismScheduler:
+    """Adaptive scheduler between 1 and 8."""
+    return ParallelismScheduler(tmp_path / "parallelism.json", minimum=1, maximum=8)
+
+
+def stats(parallelism: int, created: int = 0, contention: int = 0) -> OperationStats:
+    """Build a finished apply with the given counts."""
+    result = OperationStats("apply", parallelism, created=created, elapsed=60.0)
+    result.contention = [LOCK_ERROR] * contention
+    result.success = not contention
+    return result
+
+
+class TestOperationStats:
+    """Tests for OperationStats output parsing."""
+
+    def test_counts_vm_creations_and_contention(self) -> None:
+        """Test that VM completions and lock errors are recognised."""
+        result = OperationStats("apply", 2)
+        result.observe("\x1b[1m" + CREATED.format(1, 1) + "\x1b[0m")
+        result.observe("proxmox_virtual_environment_file.x: Creation complete after 1s [id=a]")
+        result.observe(LOCK_ERROR)
+        result.elapsed = 30.0
+
+        assert result.created == 1
+        assert len(result.contention) == 1
+        assert result.vms_per_minute == 2.0
+
+
+class TestParallelismScheduler:
+    """Tests for ParallelismScheduler."""
+
+    def test_starts_at_safe_level(self, scheduler: ParallelismScheduler) -> None:
+        """Test that an empty history starts at two."""
+        assert scheduler.level() == 2
+
+    def test_saturated_success_raises_level(self, scheduler: ParallelismScheduler) -> None:
+        """Test that a run that used every slot allows one more."""
+        assert scheduler.record(stats(2, created=5)) == 3
+        assert scheduler.level() == 3
+
+    def test_small_run_keeps_level(self, scheduler: ParallelismScheduler) -> None:
+        """Test that a run with fewer VMs than slots proves nothing."""
+        assert scheduler.record(stats(2, created=1)) == 2
+
+    def test_contention_halves_level(self, scheduler: ParallelismScheduler) -> None:
+        """Test multiplicative decrease on lock errors."""
+        assert scheduler.record(stats(6, contention=1)) == 3
+        assert scheduler.record(stats(1, contention=1)) == 1
+
+    def test_level_is_capped(self, tmp_path: Path) -> None:
+        """Test that the level never exceeds the maximum."""
+        scheduler = ParallelismScheduler(tmp_path / "p.json", maximum=3)
+        for _ in range(5):
+            scheduler.record(stats(scheduler.level(), created=10))
+
+        assert scheduler.level() == 3
+
+    def test_fixed_level_records_history(self, tmp_path: Path) -> None:
+        """Test that a fixed level is used as-is but throughput is still kept."""
+        scheduler = ParallelismScheduler(tmp_path / "p.json", fixed=4)
+        scheduler.record(stats(4, created=8))
+
+        assert scheduler.level() == 4
+        assert scheduler.history()[0]["vms_per_minute"] == 8.0
+
+
+class FakeRunner:
+    """Command runner that replays canned tofu output."""
+
+    def __init__(self, outputs: list[tuple[list[str], int]]):
+        self.outputs = outputs
+        self.commands: list[list[str]] = []
+        self.base_env: dict[str, str] = {}
+
+    def run(self, cmd: list[str], on_line: Any = None, **_kwargs: Any) -> Any:
+        self.commands.append(cmd)
+        if cmd[1] == "plan":
+            return type("Result", (), {"returncode": 2})()
+        lines, returncode = self.outputs.pop(0)
+        for line in lines:
+            on_line(line)
+        if returncode:
+            raise CommandError(" ".join(cmd), returncode)
+        return None
+
+
+class TestManagerScheduling:
+    """Tests for OpenTofuManager apply/destroy with a scheduler."""
+
+    @pytest.fixture
+    def tofu(self, tmp_path: Path, scheduler: ParallelismScheduler) -> OpenTofuManager:
+        """OpenTofu manager with an adaptive scheduler."""
+        provision = tmp_path / "provision"
+        provision.mkdir()
+        return OpenTofuManager(provision, tmp_path / "hosts.json", scheduler=scheduler)
+
+    def test_apply_uses_scheduler_level(self, tofu: OpenTofuManager) -> None:
+        """Test that apply passes the learned parallelism."""
+        tofu.runner = FakeRunner([([CREATED.format(1, 1), CREATED.format(2, 2)], 0)])
+        tofu.apply()
+
+        assert "-parallelism=2" in tofu.runner.commands[0]
+        assert tofu.scheduler is not None and tofu.scheduler.level() == 3
+
+    def test_contention_replans_and_retries_lower(self, tofu: OpenTofuManager) -> None:
+        """Test that lock errors back off, re-plan and apply again."""
+        tofu.runner = FakeRunner([([CREATED.format(1, 1), LOCK_ERROR], 1), ([], 0)])
+        tofu.apply()
+
+        applies = [c for c in tofu.runner.commands if c[1] == "apply"]
+        assert [a[2] for a in applies] == ["-parallelism=2", "-parallelism=1"]
+        assert any(c[1] == "plan" for c in tofu.runner.commands)
+
+    def test_other_failures_are_not_retried(self, tofu: OpenTofuManager) -> None:
+        """Test that errors without contention are raised immediately."""
+        tofu.runner = FakeRunner([(["Error: invalid template"], 1)])
+        with pytest.raises(CommandError):
+            tofu.apply()
+
+        assert len(tofu.runner.commands) == 1
+
+    def test_explicit_parallelism_wins(self, tofu: OpenTofuManager) -> None:
+        """Test that a caller-supplied level bypasses the scheduler."""
+        tofu.runner = FakeRunner([([], 0)])
+        tofu.destroy(parallelism=5)
+
+        assert "-parallelism=5" in tofu.runner.commands[0]
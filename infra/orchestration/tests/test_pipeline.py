@@ -0,0 +1,116 @@
+"""Tests for the streaming host pipeline."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from harness.infra.pipeline import HostPipeline
+
+
+class TestHostPipeline:
+    """Tests for HostPipeline."""
+
+    def test_early_host_does_not_wait_for_late_one(self) -> None:
+        """Test that a ready host is processed before the stream ends."""
+        started = threading.Event()
+        pipeline = HostPipeline(lambda _hosts: started.set(), batch_window=0)
+
+        pipeline.submit("vm-1")
+        assert started.wait(timeout=5)
+        pipeline.submit("vm-2")
+        result = pipeline.close()
+
+        assert [b.hosts for b in result.batches] == [["vm-1"], ["vm-2"]]
+        assert result.succeeded == ["vm-1", "vm-2"]
+
+    def test_idle_pool_does_not_wait_for_window(self) -> None:
+        """Test that a host finding a free slot starts without waiting out the window."""
+        started = threading.Event()
+        pipeline = HostPipeline(lambda _hosts: started.set(), batch_window=30)
+
+        pipeline.submit("vm-1")
+        assert started.wait(timeout=5)
+        result = pipeline.close()
+
+        assert result.batches[0].started_at - result.batches[0].ready_at < 5
+
+    def test_hosts_queued_behind_busy_slot_share_a_batch(self) -> None:
+        """Test that hosts arriving while all slots are busy form one batch."""
+        release = threading.Event()
+        batches: list[list[str]] = []
+
+        def run(hosts: list[str]) -> None:
+            batches.append(hosts)
+            if len(batches) == 1:
+                release.wait(timeout=5)
+
+        pipeline = HostPipeline(run, max_concurrency=1, batch_window=0)
+        pipeline.submit("vm-1")
+        while not batches:
+            time.sleep(0.01)
+        pipeline.submit("vm-2")
+        pipeline.submit("vm-3")
+        release.set()
+        pipeline.close()
+
+        assert batches == [["vm-1"], ["vm-2", "vm-3"]]
+
+    def test_failed_batch_is_reported(self) -> None:
+        """Test that a failing batch does not stop the others."""
+
+        def run(hosts: list[str]) -> None:
+            if "vm-bad" in hosts:
+                raise RuntimeError("playbook failed")
+
+        pipeline = HostPipeline(run, batch_window=0)
+        pipeline.submit("vm-bad")
+        time.sleep(0.05)
+        pipeline.submit("vm-good")
+        result = pipeline.close()
+
+        assert result.failed == ["vm-bad"]
+        assert result.succeeded == ["vm-good"]
+        assert result.batches[0].error == "playbook failed"
+
+    def test_batch_size_is_capped(self) -> None:
+        """Test that max_batch splits a burst of hosts queued behind a busy slot."""
+        release = threading.Event()
+        batches: list[list[str]] = []
+
+        def run(hosts: list[str]) -> None:
+            batches.append(hosts)
+            if len(batches) == 1:
+                release.wait(timeout=5)
+
+        pipeline = HostPipeline(run, max_concurrency=1, batch_window=0.2, max_batch=2)
+        pipeline.submit("vm-0")
+        while not batches:
+            time.sleep(0.01)
+        for i in range(1, 4):
+            pipeline.submit(f"vm-{i}")
+        release.set()
+        pipeline.close()
+
+        assert batches == [["vm-0"], ["vm-1", "vm-2"], ["vm-3"]]
+
+    def test_cancel_drops_queued_hosts(self) -> None:
+        """Test that cancel waits for the running batch but starts no new ones."""
+        release = threading.Event()
+        batches: list[list[str]] = []
+
+        def run(hosts: list[str]) -> None:
+            batches.append(hosts)
+            release.wait(timeout=5)
+
+        pipeline = HostPipeline(run, max_concurrency=1, batch_window=0)
+        pipeline.submit("vm-1")
+        while not batches:
+            time.sleep(0.01)
+        pipeline.submit("vm-2")
+        pipeline.submit("vm-3")
+        threading.Timer(0.1, release.set).start()
+        pipeline.cancel()
+        time.sleep(0.1)
+
+        assert batches == [["vm-1"]]
@@ -0,0 +1,134 @@
+"""Tests for the shared provider plugin cache."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from harness.infra.plugin_cache import (
+    ProviderCache,
+    ProviderRequirement,
+    parse_required_providers,
+)
+from harness.infra.tofu import OpenTofuManager
+
+PLATFORM = "linux_amd64"
+PROXMOX = ProviderRequirement("registry.opentofu.org", "bpg", "proxmox", "0.93.0")
+
+VERSIONS_TF = """
+terraform {
+  required_version = ">= 1.6.0"
+
+  required_providers {
+    proxmox = {
+      source  = "bpg/proxmox"
+      version = "= 0.93.0"
+    }
+    random = {
+      source  = "hashicorp/random"
+      version = "~> 3.0"
+    }
+  }
+}
+"""
+
+
+@pytest.fixture
+def provision_dir(tmp_path: Path) -> Path:
+    """Create a provision directory with a pinned provider."""
+    provision = tmp_path / "provision"
+    provision.mkdir()
+    (provision / "versions.tf").write_text(VERSIONS_TF)
+    return provision
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ProviderCache:
+    """Empty provider cache."""
+    return ProviderCache(tmp_path / "cache", platform_name=PLATFORM)
+
+
+def install_provider(base: Path, content: bytes = b"binary") -> Path:
+    """Write a fake unpacked provider package below ``base``."""
+    package = base / PROXMOX.package_path(PLATFORM)
+    package.mkdir(parents=True)
+    (package / "terraform-provider-proxmox_v0.93.0").write_bytes(content)
+    return package
+
+
+class TestParseRequiredProviders:
+    """Tests for parse_required_providers."""
+
+    def test_only_exact_pins_are_returned(self, provision_dir: Path) -> None:
+        """Test that range constraints are skipped and the registry is filled in."""
+        assert parse_required_providers(provision_dir) == [PROXMOX]
+
+    def test_repo_provision_dirs_pin_proxmox(self) -> None:
+        """Test that every component provision dir pins the same provider."""
+        infra = Path(__file__).parent.parent.parent
+        for component in ("neo4j", "core-services", "claude-vms"):
+            assert parse_required_providers(infra / component / "provision") == [PROXMOX]
+
+
+class TestProviderCache:
+    """Tests for ProviderCache."""
+
+    def test_cold_cache_misses(self, cache: ProviderCache, provision_dir: Path) -> None:
+        """Test that an empty cache reports a miss and writes a plain config."""
+        config_file = provision_dir / ".harness" / "tofurc"
+        env = cache.prepare(provision_dir, config_file)
+
+        assert env["TF_PLUGIN_CACHE_DIR"] == str(cache.root)
+        assert env["TF_CLI_CONFIG_FILE"] == str(config_file)
+        assert cache.lookup([PROXMOX]) == ([], [PROXMOX])
+        assert "filesystem_mirror" not in config_file.read_text()
+
+    def test_record_then_hit(
+        self, cache: ProviderCache, provision_dir: Path, tmp_path: Path
+    ) -> None:
+        """Test that a recorded provider is linked into a fresh provision dir."""
+        install_provider(provision_dir / ".terraform" / "providers")
+        cache.record(provision_dir)
+        assert cache.lookup([PROXMOX]) == ([PROXMOX], [])
+
+        other = tmp_path / "other"
+        other.mkdir()
+        (other / "versions.tf").write_text(VERSIONS_TF)
+        config_file = other / ".harness" / "tofurc"
+        cache.prepare(other, config_file)
+
+        linked = other / ".terraform" / "providers" / PROXMOX.package_path(PLATFORM)
+        cached = cache.root / PROXMOX.package_path(PLATFORM)
+        binary = "terraform-provider-proxmox_v0.93.0"
+        assert (linked / binary).read_bytes() == b"binary"
+        assert (linked / binary).stat().st_ino == (cached / binary).stat().st_ino
+
+        config = config_file.read_text()
+        assert "filesystem_mirror" in config
+        assert '"registry.opentofu.org/bpg/proxmox"' in config
+
+    def test_corrupted_entry_is_a_miss(self, cache: ProviderCache, provision_dir: Path) -> None:
+        """Test that an entry whose content changed is not trusted."""
+        package = install_provider(cache.root)
+        cache.record(provision_dir)
+        (package / "terraform-provider-proxmox_v0.93.0").write_bytes(b"truncated")
+
+        assert cache.lookup([PROXMOX]) == ([], [PROXMOX])
+
+
+class TestManagerIntegration:
+    """Tests for OpenTofuManager with a provider cache."""
+
+    def test_init_injects_cache_env(self, cache: ProviderCache, provision_dir: Path) -> None:
+        """Test that tofu runs with the cache environment."""
+        manager = OpenTofuManager(provision_dir, provision_dir / "hosts.json", plugin_cache=cache)
+        assert manager.runner.base_env["TF_PLUGIN_CACHE_DIR"] == str(cache.root)
+
+        manager.runner = MagicMock()
+        manager.runner.base_env = {}
+        manager.init()
+
+        assert manager.runner.base_env["TF_CLI_CONFIG_FILE"] == str(manager.cli_config_file)
+        assert manager.cli_config_file.exists()
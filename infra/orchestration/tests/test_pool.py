@@ -0,0 +1,205 @@
+"""Tests for the warm Claude VM pool."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from harness.core.config import Config
+from harness.deployers.pool import PoolManager
+from harness.infra.pool import CLAIMED, FILLING, READY, PoolState, PoolVM
+
+
+@pytest.fixture
+def config(config_file: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Config:
+    """Configuration with state kept under a temporary directory."""
+    monkeypatch.setattr("harness.core.config.get_project_root", lambda: tmp_path)
+    monkeypatch.setattr("harness.core.config.get_orchestration_dir", lambda: tmp_path)
+    return Config.from_yaml(config_file)
+
+
+def dead_pid() -> int:
+    """Get a process ID that is not running."""
+    pid = 999_999
+    while True:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return pid
+        except PermissionError:
+            pass
+        pid -= 1
+
+
+class TestPoolState:
+    """Tests for the locked pool state file."""
+
+    def test_transaction_persists(self, tmp_path: Path) -> None:
+        """Test that changes made in a transaction are saved."""
+        state = PoolState(tmp_path / "pool.json")
+        with state.transaction() as vms:
+            vms["claude-pool-1"] = PoolVM(name="claude-pool-1", vm_id=500, state=READY)
+
+        assert state.vms() == {
+            "claude-pool-1": PoolVM(name="claude-pool-1", vm_id=500, state=READY)
+        }
+
+    def test_missing_or_corrupt_file_is_empty(self, tmp_path: Path) -> None:
+        """Test that an unreadable pool file means an empty pool."""
+        assert PoolState(tmp_path / "pool.json").vms() == {}
+        (tmp_path / "pool.json").write_text("{not json")
+        assert PoolState(tmp_path / "pool.json").vms() == {}
+
+    def test_abandoned(self) -> None:
+        """Test that only FILLING VMs whose filler has exited are abandoned."""
+        assert PoolVM(name="a", vm_id=500, state=FILLING, pid=dead_pid()).abandoned
+        assert not PoolVM(name="b", vm_id=501, state=FILLING, pid=os.getpid()).abandoned
+        assert not PoolVM(name="c", vm_id=502, state=READY, pid=dead_pid()).abandoned
+
+
+class TestPoolManager:
+    """Tests for PoolManager with the Proxmox API, SSH and Ansible mocked."""
+
+    @pytest.fixture
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+        """Mocked Proxmox client returned by ProxmoxClient.from_config."""
+        client = MagicMock()
+        client.__enter__.return_value = client
+        client.pool_size = 8
+        client.wait_for_vm_ipv4.side_effect = lambda _node, vm_id, **_kw: f"10.0.70.{vm_id - 400}"
+        monkeypatch.setattr(
+            "harness.deployers.pool.ProxmoxClient.from_config", lambda *_args: client
+        )
+        return client
+
+    @pytest.fixture
+    def manager(self, config: Config, monkeypatch: pytest.MonkeyPatch) -> PoolManager:
+        """Pool manager with SSH, Ansible and background refills mocked."""
+        monkeypatch.setattr("harness.deployers.base.check_dependencies", lambda _deps: None)
+        manager = PoolManager(config)
+        self.ansible = MagicMock()
+        ssh = MagicMock()
+        ssh.wait_for_host.return_value = True
+        monkeypatch.setattr(manager.vms, "get_ansible_manager", lambda: self.ansible)
+        monkeypatch.setattr(manager.vms, "get_ssh_waiter", lambda: ssh)
+        self.refills = MagicMock()
+        monkeypatch.setattr(manager, "refill_in_background", self.refills)
+        return manager
+
+    def add(self, manager: PoolManager, name: str, vm_id: int, state: str) -> None:
+        """Record a VM in the pool."""
+        with manager.state.transaction() as vms:
+            vms[name] = PoolVM(name=name, vm_id=vm_id, state=state, template_id=100)
+
+    def test_fill_builds_missing_vms(self, manager: PoolManager, client: MagicMock) -> None:
+        """Test that fill clones, configures without host tasks, and stops each VM."""
+        result = manager.fill(size=2)
+
+        assert result.success
+        assert result.details == {"built": ["claude-pool-1", "claude-pool-2"], "failed": []}
+        assert {c.args[2] for c in client.clone_vm.call_args_list} == {500, 501}
+        assert {c.args[1] for c in client.shutdown_vm.call_args_list} == {500, 501}
+        for call in self.ansible.run_playbook.call_args_list:
+            assert call.kwargs["skip_tags"] == ["host"]
+        assert [vm.state for vm in manager.status()] == [READY, READY]
+        assert manager.status()[0].ip == "10.0.70.100"
+
+    def test_fill_only_tops_up(self, manager: PoolManager, client: MagicMock) -> None:
+        """Test that claimed VMs don't count towards the pool size."""
+        self.add(manager, "claude-pool-1", 500, READY)
+        self.add(manager, "claude-pool-2", 501, CLAIMED)
+
+        result = manager.fill(size=2)
+
+        assert result.details is not None
+        assert result.details["built"] == ["claude-pool-3"]
+        client.clone_vm.assert_called_once()
+
+    def test_fill_replaces_abandoned_vm(self, manager: PoolManager, client: MagicMock) -> None:
+        """Test that a VM left by a crashed fill is deleted and rebuilt."""
+        with manager.state.transaction() as vms:
+            vms["claude-pool-1"] = PoolVM(
+                name="claude-pool-1", vm_id=500, state=FILLING, pid=dead_pid()
+            )
+
+        assert manager.fill(size=1).success
+        client.delete_vm.assert_called_once_with("pve1", 500)
+        client.clone_vm.assert_called_once()
+        assert [vm.state for vm in manager.status()] == [READY]
+
+    def test_failed_vm_is_discarded(self, manager: PoolManager, client: MagicMock) -> None:
+        """Test that a VM that fails to boot is deleted and dropped from the pool."""
+        client.start_vm.side_effect = [None, RuntimeError("start failed")]
+
+        result = manager.fill(size=2)
+
+        assert not result.success
+        assert result.details is not None
+        assert len(result.details["failed"]) == 1
+        client.delete_vm.assert_called_once()
+        assert len(manager.status()) == 1
+
+    def test_claim_lowest_ready_vm(self, manager: PoolManager, client: MagicMock) -> None:
+        """Test that claim starts a ready VM and runs only the host tasks."""
+        self.add(manager, "claude-pool-2", 501, READY)
+        self.add(manager, "claude-pool-1", 500, READY)
+
+        result = manager.claim(claimed_by="alice")
+
+        assert result.success
+        assert result.details is not None
+        assert result.details["name"] == "claude-pool-1"
+        assert result.details["ip"] == "10.0.70.100"
+        client.start_vm.assert_called_once_with("pve1", 500)
+        assert self.ansible.run_playbook.call_args.kwargs["tags"] == ["host"]
+        assert "neo4j_ip" in self.ansible.run_playbook.call_args.kwargs["extra_vars"]
+        claimed = manager.state.vms()["claude-pool-1"]
+        assert (claimed.state, claimed.claimed_by) == (CLAIMED, "alice")
+        self.refills.assert_called_once()
+
+    @pytest.mark.usefixtures("client")
+    def test_claim_inventory_sets_user(self, manager: PoolManager, config: Config) -> None:
+        """Test that the private inventory names the cloud-init user like the fleet's."""
+        self.add(manager, "claude-pool-1", 500, READY)
+        inventories: list[dict] = []
+        self.ansible.run_playbook.side_effect = lambda inventory, **_kw: inventories.append(
+            json.loads(Path(inventory).read_text())
+        )
+
+        assert manager.claim().success
+
+        assert inventories[0]["all"]["hosts"]["claude-pool-1"] == {
+            "ansible_host": "10.0.70.100",
+            "ansible_user": config.ssh.cloud_init_user,
+        }
+
+    @pytest.mark.usefixtures("client")
+    def test_claim_empty_pool(self, manager: PoolManager) -> None:
+        """Test that claiming from an empty pool fails but still starts a refill."""
+        result = manager.claim()
+
+        assert not result.success
+        assert "harness pool fill" in result.message
+        self.refills.assert_called_once()
+
+    def test_failed_claim_discards_vm(self, manager: PoolManager, client: MagicMock) -> None:
+        """Test that a VM whose host configuration fails is not handed out."""
+        self.add(manager, "claude-pool-1", 500, READY)
+        self.ansible.run_playbook.side_effect = RuntimeError("playbook failed")
+
+        assert not manager.claim().success
+        client.delete_vm.assert_called_once_with("pve1", 500)
+        assert manager.status() == []
+
+    def test_release(self, manager: PoolManager, client: MagicMock) -> None:
+        """Test that release deletes the VM and rejects unknown names."""
+        self.add(manager, "claude-pool-1", 500, CLAIMED)
+
+        assert not manager.release(["claude-pool-9"]).success
+        assert manager.release(["claude-pool-1"]).success
+        client.delete_vm.assert_called_once_with("pve1", 500)
+        assert manager.status() == []
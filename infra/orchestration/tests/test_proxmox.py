@@ -0,0 +1,261 @@
+"""Tests for the Proxmox API client against a local mock server."""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+from harness.infra.proxmox import ProxmoxAPIError, ProxmoxClient, ProxmoxTaskError, select_ipv4
+
+
+def agent_interfaces(ip: str) -> list[dict[str, Any]]:
+    """Build a guest-agent interface list with loopback and one NIC."""
+    return [
+        {
+            "name": "lo",
+            "ip-addresses": [{"ip-address-type": "ipv4", "ip-address": "127.0.0.1", "prefix": 8}],
+        },
+        {
+            "name": "eth0",
+            "ip-addresses": [
+                {"ip-address-type": "ipv6", "ip-address": "fe80::1", "prefix": 64},
+                {"ip-address-type": "ipv4", "ip-address": ip, "prefix": 24},
+            ],
+        },
+    ]
+
+
+class MockProxmox:
+    """State shared with the mock request handler."""
+
+    def __init__(self) -> None:
+        self.vm_ips: dict[int, str] = {}
+        self.requests: list[tuple[str, str, str]] = []
+        self.connections: set[tuple[str, int]] = set()
+        # Statuses to answer the next requests with, or None to drop the connection
+        self.failures: list[int | None] = []
+        self.lock = threading.Lock()
+
+
+@pytest.fixture
+def mock_proxmox() -> Iterator[tuple[MockProxmox, str]]:
+    """Run a mock Proxmox API on localhost."""
+    state = MockProxmox()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:  # noqa: N802
+            with state.lock:
+                state.requests.append(("GET", self.path, self.headers["Authorization"]))
+                state.connections.add(self.client_address)
+                failure = state.failures.pop(0) if state.failures else 0
+
+            if failure is None:
+                self.close_connection = True
+                return
+            if failure:
+                self._send(failure, {"data": None})
+                return
+
+            parts = self.path.split("/")
+            # /api2/json/nodes/<node>/qemu/<vmid>/agent/network-get-interfaces
+            if parts[-2:] != ["agent", "network-get-interfaces"]:
+                self._send(404, {"data": None})
+                return
+            vm_id = int(parts[-3])
+            if vm_id not in state.vm_ips:
+                self._send(500, {"data": None})
+                return
+            self._send(200, {"data": {"result": agent_interfaces(state.vm_ips[vm_id])}})
+
+        def _send(self, status: int, body: dict[str, Any]) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield state, f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+class TestProxmoxClient:
+    """Tests for ProxmoxClient class."""
+
+    def test_get_vm_ipv4(self, mock_proxmox: tuple[MockProxmox, str]) -> None:
+        """Test reading the VM address from the guest agent."""
+        state, endpoint = mock_proxmox
+        state.vm_ips[200] = "10.0.70.101"
+
+        with ProxmoxClient(endpoint, "root@pam!tofu=secret") as client:
+            ip = client.get_vm_ipv4("pve1", 200)
+
+        assert ip == "10.0.70.101"
+        method, path, auth = state.requests[0]
+        assert path == "/api2/json/nodes/pve1/qemu/200/agent/network-get-interfaces"
+        assert auth == "PVEAPIToken=root@pam!tofu=secret"
+
+    def test_agent_not_running_returns_none(self, mock_proxmox: tuple[MockProxmox, str]) -> None:
+        """Test that a 500 from a starting guest agent means 'no address yet'."""
+        _, endpoint = mock_proxmox
+
+        with ProxmoxClient(endpoint, "token") as client:
+            assert client.get_vm_ipv4("pve1", 999) is None
+
+    @pytest.mark.parametrize("failure", [502, 503, None])
+    def test_unreachable_api_returns_none(
+        self, mock_proxmox: tuple[MockProxmox, str], failure: int | None
+    ) -> None:
+        """Test that a proxy error or dropped connection means 'try again'."""
+        state, endpoint = mock_proxmox
+        state.vm_ips[200] = "10.0.70.101"
+        state.failures.append(failure)
+
+        with ProxmoxClient(endpoint, "token") as client:
+            assert client.get_vm_ipv4("pve1", 200) is None
+            assert client.get_vm_ipv4("pve1", 200) == "10.0.70.101"
+
+    def test_wait_retries_transient_errors(self, mock_proxmox: tuple[MockProxmox, str]) -> None:
+        """Test that waiting for an address polls through API errors until the agent answers."""
+        state, endpoint = mock_proxmox
+        state.vm_ips[200] = "10.0.70.101"
+        state.failures.extend([None, 503, 500])
+
+        with ProxmoxClient(endpoint, "token") as client:
+            ip = client.wait_for_vm_ipv4("pve1", 200, timeout=10, interval=0)
+
+        assert ip == "10.0.70.101"
+        assert len(state.requests) == 4
+
+    def test_other_errors_raise(self, mock_proxmox: tuple[MockProxmox, str]) -> None:
+        """Test that non-agent API errors are raised."""
+        _, endpoint = mock_proxmox
+
+        with ProxmoxClient(endpoint, "token") as client, pytest.raises(ProxmoxAPIError) as exc:
+            client.get("/nodes/pve1/qemu")
+
+        assert exc.value.status == 404
+
+    def test_get_vm_ips_queries_all(self, mock_proxmox: tuple[MockProxmox, str]) -> None:
+        """Test that many VMs are polled in one call."""
+        state, endpoint = mock_proxmox
+        state.vm_ips.update({200: "10.0.70.101", 201: "10.0.70.102"})
+
+        with ProxmoxClient(endpoint, "token", pool_size=4) as client:
+            ips = client.get_vm_ips("pve1", [200, 201, 202])
+
+        assert ips == {200: "10.0.70.101", 201: "10.0.70.102", 202: None}
+
+    def test_connections_are_reused(self, mock_proxmox: tuple[MockProxmox, str]) -> None:
+        """Test that sequential requests share a keep-alive connection."""
+        state, endpoint = mock_proxmox
+        state.vm_ips[200] = "10.0.70.101"
+
+        with ProxmoxClient(endpoint, "token") as client:
+            for _ in range(5):
+                client.get_vm_ipv4("pve1", 200)
+
+        assert len(state.requests) == 5
+        assert len(state.connections) == 1
+
+    def test_invalid_endpoint(self) -> None:
+        """Test that a malformed endpoint is rejected."""
+        with pytest.raises(ValueError):
+            ProxmoxClient("pve1:8006", "token")
+
+
+class TestWaitTask:
+    """Tests for ProxmoxClient.wait_task."""
+
+    @pytest.fixture
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> ProxmoxClient:
+        """Client without polling delay."""
+        monkeypatch.setattr("harness.infra.proxmox.TASK_POLL_INTERVAL", 0)
+        return ProxmoxClient("https://pve1:8006/", "token")
+
+    def test_polls_until_stopped(
+        self, client: ProxmoxClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the task ID is escaped and polled until the task stops."""
+        statuses = iter([{"status": "running"}, {"status": "stopped", "exitstatus": "OK"}])
+        paths: list[str] = []
+
+        def get(path: str, _params: dict[str, Any] | None = None) -> dict[str, Any]:
+            paths.append(path)
+            return next(statuses)
+
+        monkeypatch.setattr(client, "get", get)
+        client.wait_task("pve1", "UPID:pve1:0001:qmclone:100:root@pam:")
+
+        assert len(paths) == 2
+        assert (
+            paths[0]
+            == "/nodes/pve1/tasks/UPID%3Apve1%3A0001%3Aqmclone%3A100%3Aroot%40pam%3A/status"
+        )
+
+    def test_failed_task_raises(
+        self, client: ProxmoxClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a non-OK exit status is an error."""
+        monkeypatch.setattr(
+            client, "get", lambda *_args: {"status": "stopped", "exitstatus": "clone failed"}
+        )
+
+        with pytest.raises(ProxmoxTaskError, match="clone failed"):
+            client.wait_task("pve1", "UPID:pve1:1")
+
+
+class TestSelectIpv4:
+    """Tests for select_ipv4 function."""
+
+    def test_skips_loopback_and_ipv6(self) -> None:
+        """Test that the first real IPv4 address is chosen."""
+        assert select_ipv4(agent_interfaces("10.0.70.101")) == "10.0.70.101"
+
+    def test_prefers_subnet(self) -> None:
+        """Test that an address in the preferred subnet wins."""
+        interfaces = agent_interfaces("172.17.0.1") + agent_interfaces("10.0.70.101")[1:]
+
+        assert select_ipv4(interfaces, "10.0.70.0/24") == "10.0.70.101"
+
+    def test_no_address(self) -> None:
+        """Test that None is returned without usable addresses."""
+        assert select_ipv4(agent_interfaces("169.254.3.4")) is None
+
+
+class TestSnapshots:
+    """Tests for ProxmoxClient snapshot calls."""
+
+    def test_create_replaces_existing(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that an existing snapshot of the same name is deleted first."""
+        client = ProxmoxClient("https://pve1:8006/", "token")
+        calls: list[tuple[str, str]] = []
+
+        def request(method: str, path: str, _params: dict[str, Any] | None = None) -> Any:
+            calls.append((method, path))
+            if method == "GET":
+                return [{"name": "harness-configured"}, {"name": "current"}]
+            return None
+
+        monkeypatch.setattr(client, "request", request)
+        client.create_snapshot("pve1", 200, "harness-configured")
+
+        assert calls == [
+            ("GET", "/nodes/pve1/qemu/200/snapshot"),
+            ("DELETE", "/nodes/pve1/qemu/200/snapshot/harness-configured"),
+            ("POST", "/nodes/pve1/qemu/200/snapshot"),
+        ]
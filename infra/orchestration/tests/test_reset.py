@@ -0,0 +1,194 @@
+"""Tests for post-configuration snapshots and snapshot-based Claude VM reset."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from harness.core.config import Config
+from harness.deployers.claude_vms import ClaudeVMsDeployer
+from harness.infra.proxmox import ProxmoxTaskError
+
+TRANSPORT_ERRORS = [
+    ProxmoxTaskError("UPID:pve1:1", "no space"),
+    ConnectionResetError("connection reset by peer"),
+    http.client.BadStatusLine("HTTP/1.1 ???"),
+]
+
+HOSTS = {
+    "claude-dev-1": {"ansible_host": "10.0.70.101", "vm_id": 200},
+    "claude-dev-2": {"ansible_host": "10.0.70.102", "vm_id": 201},
+}
+
+
+@pytest.fixture
+def deployer(
+    config_file: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> ClaudeVMsDeployer:
+    """Deployer over a temporary tree with a two-VM inventory and Ansible mocked."""
+    monkeypatch.setattr("harness.core.config.get_project_root", lambda: tmp_path)
+    monkeypatch.setattr("harness.core.config.get_orchestration_dir", lambda: tmp_path)
+    monkeypatch.setattr("harness.deployers.base.check_dependencies", lambda _deps: None)
+    deployer = ClaudeVMsDeployer(Config.from_yaml(config_file))
+    deployer.inventory_file.parent.mkdir(parents=True)
+    deployer.inventory_file.write_text(json.dumps({"all": {"hosts": HOSTS}}))
+
+    def wait_for_inventory(_inventory, names=None, on_ready=None):
+        for name in names:
+            if on_ready is not None:
+                on_ready(name)
+        return list(names), []
+
+    ssh = MagicMock()
+    ssh.wait_for_inventory.side_effect = wait_for_inventory
+    deployer.get_ssh_waiter = MagicMock(return_value=ssh)  # type: ignore[method-assign]
+    deployer.get_ansible_manager = MagicMock()  # type: ignore[method-assign]
+    return deployer
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Mocked Proxmox client returned by ProxmoxClient.from_config."""
+    client = MagicMock()
+    client.__enter__.return_value = client
+    client.pool_size = 8
+    monkeypatch.setattr(
+        "harness.deployers.claude_vms.ProxmoxClient.from_config", lambda *_args: client
+    )
+    return client
+
+
+class TestSnapshotAfterConfigure:
+    """Tests for the snapshot taken once a VM is configured."""
+
+    def test_configured_vms_are_snapshotted(
+        self, deployer: ClaudeVMsDeployer, client: MagicMock
+    ) -> None:
+        """Test that each configured VM gets the configured snapshot."""
+        deployer._configure_as_ready()
+
+        snapshotted = {c.args[1:3] for c in client.create_snapshot.call_args_list}
+        assert snapshotted == {(200, "harness-configured"), (201, "harness-configured")}
+
+    @pytest.mark.parametrize("error", TRANSPORT_ERRORS, ids=lambda e: type(e).__name__)
+    def test_failed_snapshot_does_not_fail_configure(
+        self, deployer: ClaudeVMsDeployer, client: MagicMock, error: Exception
+    ) -> None:
+        """Test that a snapshot error, including a dropped connection, is only a warning."""
+        client.create_snapshot.side_effect = error
+
+        deployer._configure_as_ready()
+
+        assert client.create_snapshot.call_count == 2
+
+    def test_snapshots_disabled(self, deployer: ClaudeVMsDeployer, client: MagicMock) -> None:
+        """Test that claude_vms.snapshot: null skips snapshots."""
+        deployer.config.claude_vms.snapshot = None
+
+        deployer._configure_as_ready()
+
+        client.create_snapshot.assert_not_called()
+
+
+class TestConfigureInterrupted:
+    """Tests for stopping batched configuration when waiting for hosts fails."""
+
+    @pytest.mark.usefixtures("client")
+    def test_interrupt_starts_no_queued_batches(self, deployer: ClaudeVMsDeployer) -> None:
+        """Test that Ctrl-C while hosts are queued leaves them unconfigured."""
+        deployer.config.claude_vms.configure_concurrency = 1
+        started, release = threading.Event(), threading.Event()
+        ansible = deployer.get_ansible_manager()
+
+        def run_playbook(**_kwargs) -> None:
+            started.set()
+            release.wait(timeout=5)
+
+        ansible.run_playbook.side_effect = run_playbook
+
+        def wait_for_inventory(_inventory, names=None, on_ready=None):
+            on_ready(names[0])
+            started.wait(timeout=5)
+            on_ready(names[1])
+            threading.Timer(0.1, release.set).start()
+            raise KeyboardInterrupt
+
+        deployer.get_ssh_waiter().wait_for_inventory.side_effect = wait_for_inventory
+
+        with pytest.raises(KeyboardInterrupt):
+            deployer._configure_as_ready()
+
+        ansible.run_playbook.assert_called_once()
+
+
+class TestReset:
+    """Tests for ClaudeVMsDeployer.reset."""
+
+    def test_reset_all(self, deployer: ClaudeVMsDeployer, client: MagicMock) -> None:
+        """Test that every VM is rolled back, started and waited for."""
+        result = deployer.reset()
+
+        assert result.success
+        assert result.details is not None
+        assert sorted(result.details["reset"]) == ["claude-dev-1", "claude-dev-2"]
+        rolled_back = {c.args for c in client.rollback_snapshot.call_args_list}
+        assert rolled_back == {
+            ("pve1", 200, "harness-configured"),
+            ("pve1", 201, "harness-configured"),
+        }
+        assert client.start_vm.call_count == 2
+        ssh = deployer.get_ssh_waiter()
+        assert sorted(ssh.wait_for_inventory.call_args.kwargs["names"]) == [
+            "claude-dev-1",
+            "claude-dev-2",
+        ]
+
+    def test_reset_named_without_wait(self, deployer: ClaudeVMsDeployer, client: MagicMock) -> None:
+        """Test resetting one VM without waiting for SSH."""
+        assert deployer.reset(["claude-dev-2"], wait=False).success
+
+        client.rollback_snapshot.assert_called_once_with("pve1", 201, "harness-configured")
+        deployer.get_ssh_waiter().wait_for_inventory.assert_not_called()
+
+    def test_empty_inventory(self, deployer: ClaudeVMsDeployer, client: MagicMock) -> None:
+        """Test that resetting an empty fleet is a no-op, not a thread pool error."""
+        deployer.inventory_file.write_text(json.dumps({"all": {"hosts": {}}}))
+
+        result = deployer.reset()
+
+        assert result.success
+        assert result.message == "No VMs to reset"
+        client.rollback_snapshot.assert_not_called()
+
+    @pytest.mark.usefixtures("client")
+    def test_unknown_vm(self, deployer: ClaudeVMsDeployer) -> None:
+        """Test that a name missing from the inventory is an error."""
+        result = deployer.reset(["claude-dev-9"])
+
+        assert not result.success
+        assert "claude-dev-9" in result.message
+
+    @pytest.mark.parametrize("error", TRANSPORT_ERRORS, ids=lambda e: type(e).__name__)
+    def test_failed_rollback_is_reported(
+        self, deployer: ClaudeVMsDeployer, client: MagicMock, error: Exception
+    ) -> None:
+        """Test that one VM failing to roll back doesn't stop the others."""
+
+        def rollback(_node: str, vm_id: int, _name: str) -> None:
+            if vm_id == 200:
+                raise error
+
+        client.rollback_snapshot.side_effect = rollback
+
+        result = deployer.reset()
+
+        assert not result.success
+        assert result.details is not None
+        assert result.details["failed"] == ["claude-dev-1"]
+        assert result.details["reset"] == ["claude-dev-2"]
+        client.start_vm.assert_called_once_with("pve1", 201)
@@ -2,18 +2,33 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
+import signal
 import subprocess
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from harness.core.logger import log
 from harness.core.runner import (
+    _HOOK_TRY_WAIT,
+    AsyncCommandRunner,
     CommandError,
     CommandRunner,
+    CommandUsage,
     MissingDependencyError,
+    OutputTail,
+    ResourceUsage,
+    UsageLog,
+    _Process,
     check_dependencies,
+    forward_interrupts,
     run_command,
+    usage_log,
 )
 
 
@@ -103,6 +118,383 @@ class TestRunCommand:
         with pytest.raises(CommandError):
             run_command(["false"], capture_output=True, quiet=True)
 
+    def test_on_line_receives_each_line(self) -> None:
+        """Test that streamed output is passed to the callback line by line."""
+        lines: list[str] = []
+        result = run_command(["printf", "one\\ntwo\\n"], on_line=lines.append)
+
+        assert result.returncode == 0
+        assert lines == ["one", "two"]
+
+    def test_on_line_failure_raises_error(self) -> None:
+        """Test that a failing streamed command raises CommandError."""
+        lines: list[str] = []
+        with pytest.raises(CommandError) as exc_info:
+            run_command(["sh", "-c", "echo oops >&2; exit 3"], on_line=lines.append, quiet=True)
+
+        assert exc_info.value.returncode == 3
+        assert lines == ["oops"]
+
+
+class TestStreaming:
+    """Tests for streamed commands."""
+
+    def test_streams_stay_separate(self, capsys: pytest.CaptureFixture) -> None:
+        """Test that stdout and stderr are echoed and kept separately."""
+        result = run_command(["sh", "-c", "echo out; echo err >&2"], stream=True)
+
+        assert (result.stdout, result.stderr) == ("out\n", "err\n")
+        captured = capsys.readouterr()
+        assert "out\n" in captured.out
+        assert "err\n" in captured.err
+
+    def test_log_file_has_full_output(self, tmp_path: Path) -> None:
+        """Test that the log file gets every line while memory keeps a bounded tail."""
+        log_file = tmp_path / "logs" / "apply.log"
+        script = "for i in $(seq 1 2000); do echo line-$i; done; echo done >&2; exit 2"
+
+        with pytest.raises(CommandError) as exc_info:
+            run_command(["sh", "-c", script], log_file=log_file, tail_bytes=1024, quiet=True)
+
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == 2001
+        assert lines[0] == "line-1"
+        error = exc_info.value
+        assert error.returncode == 2
+        assert error.stdout is not None
+        assert len(error.stdout.encode()) <= 1024
+        assert error.stdout.endswith("line-2000\n")
+        assert error.stdout.startswith("line-")
+        assert error.stderr == "done\n"
+
+    def test_timeout_kills_command(self) -> None:
+        """Test that a streamed command past its timeout is killed."""
+        with pytest.raises(subprocess.TimeoutExpired) as exc_info:
+            run_command(["sh", "-c", "echo started; exec sleep 30"], stream=True, timeout=1)
+
+        assert exc_info.value.output == "started\n"
+
+    def test_signal_is_not_timeout(self) -> None:
+        """Test that a child killed by a signal is reported as a failure, not a timeout."""
+        with pytest.raises(CommandError) as exc_info:
+            run_command(["sh", "-c", "echo hi; kill -TERM $$"], stream=True, timeout=600)
+
+        assert exc_info.value.returncode == -15
+        assert exc_info.value.stdout == "hi\n"
+
+    def test_timeout_kills_grandchild_holding_pipe(self, tmp_path: Path) -> None:
+        """Test that a timeout stops forked children that keep the output pipes open."""
+        pid_file = tmp_path / "pid"
+        script = f"sleep 30 & echo $! > {pid_file}; echo started"
+        started = time.monotonic()
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_command(["sh", "-c", script], stream=True, timeout=1)
+
+        assert time.monotonic() - started < 10
+        assert is_stopped(int(pid_file.read_text()))
+
+    def test_interrupt_reaches_command_in_worker_thread(self) -> None:
+        """Test that Ctrl-C stops a streamed command another thread is waiting on."""
+        started = threading.Event()
+        errors: list[CommandError] = []
+
+        def work() -> None:
+            try:
+                run_command(
+                    ["sh", "-c", "echo started; exec sleep 30"],
+                    on_line=lambda _line: started.set(),
+                    quiet=True,
+                )
+            except CommandError as e:
+                errors.append(e)
+
+        previous = signal.getsignal(signal.SIGINT)
+        worker = threading.Thread(target=work)
+        worker.start()
+        try:
+            assert started.wait(timeout=5)
+            forward_interrupts()
+            with pytest.raises(KeyboardInterrupt):
+                os.kill(os.getpid(), signal.SIGINT)
+                time.sleep(5)
+        finally:
+            signal.signal(signal.SIGINT, previous)
+        worker.join(timeout=5)
+
+        assert not worker.is_alive()
+        assert errors[0].returncode == -signal.SIGINT
+
+    def test_handler_error_does_not_stop_reading(self) -> None:
+        """Test that a failing on_line callback doesn't block the command."""
+
+        def handler(line: str) -> None:
+            raise ValueError(line)
+
+        result = run_command(["printf", "a\\nb\\n"], on_line=handler)
+
+        assert result.stdout == "a\nb\n"
+
+
+def is_stopped(pid: int, wait: float = 2.0) -> bool:
+    """Whether a process is gone (or a zombie) within a short wait."""
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        try:
+            if Path(f"/proc/{pid}/stat").read_text().split()[2] == "Z":
+                return True
+        except FileNotFoundError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def wait_for_pid(pid_file: Path) -> int:
+    """Wait until a test command has written a background process ID."""
+    for _ in range(100):
+        if pid_file.exists() and pid_file.read_text().strip():
+            return int(pid_file.read_text())
+        time.sleep(0.05)
+    raise AssertionError(f"{pid_file} was not written")
+
+
+class TestAsyncCommandRunner:
+    """Tests for AsyncCommandRunner."""
+
+    def test_capture_output(self, tmp_path: Path) -> None:
+        """Test captured output with the default cwd and merged environment."""
+        runner = AsyncCommandRunner(cwd=tmp_path, env={"BASE": "base"})
+        result = asyncio.run(
+            runner.run(
+                ["sh", "-c", "pwd; echo $BASE $EXTRA"], env={"EXTRA": "extra"}, capture_output=True
+            )
+        )
+
+        assert result.stdout == f"{tmp_path}\nbase extra\n"
+
+    def test_failure_raises_command_error(self) -> None:
+        """Test that failures raise CommandError like run_command."""
+        runner = AsyncCommandRunner()
+
+        with pytest.raises(CommandError) as exc_info:
+            asyncio.run(
+                runner.run(["sh", "-c", "echo bad >&2; exit 4"], capture_output=True, quiet=True)
+            )
+        assert (exc_info.value.returncode, exc_info.value.stderr) == (4, "bad\n")
+
+        result = asyncio.run(runner.run(["false"], check=False))
+        assert result.returncode == 1
+
+    def test_streaming(self, tmp_path: Path) -> None:
+        """Test that streamed lines reach the callback, the log file and the tails."""
+        lines: list[str] = []
+        log_file = tmp_path / "run.log"
+        result = asyncio.run(
+            AsyncCommandRunner().run(
+                ["sh", "-c", "echo one; echo two >&2; printf three"],
+                on_line=lines.append,
+                log_file=log_file,
+            )
+        )
+
+        assert sorted(lines) == ["one", "three", "two"]
+        assert (result.stdout, result.stderr) == ("one\nthree\n", "two\n")
+        assert sorted(log_file.read_text().splitlines()) == ["one", "three", "two"]
+
+    def test_timeout_kills_process_group(self, tmp_path: Path) -> None:
+        """Test that a timeout also stops the command's children."""
+        pid_file = tmp_path / "child.pid"
+        runner = AsyncCommandRunner(kill_grace=0.5)
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            asyncio.run(
+                runner.run(["sh", "-c", f"sleep 30 & echo $! > {pid_file}; wait"], timeout=0.5)
+            )
+
+        assert is_stopped(wait_for_pid(pid_file))
+
+    def test_cancel_kills_process_group(self, tmp_path: Path) -> None:
+        """Test that cancelling the task stops the command and its children."""
+        pid_file = tmp_path / "child.pid"
+        runner = AsyncCommandRunner(kill_grace=0.5)
+
+        async def cancel_run() -> None:
+            task = asyncio.ensure_future(
+                runner.run(["sh", "-c", f"sleep 30 & echo $! > {pid_file}; wait"])
+            )
+            while not pid_file.exists():
+                await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_run())
+
+        assert is_stopped(wait_for_pid(pid_file))
+
+
+class TestRunMany:
+    """Tests for AsyncCommandRunner.run_many."""
+
+    def collect(self, runner: AsyncCommandRunner, cmds: list[list[str]], **kwargs: object) -> list:
+        """Run commands with run_many and collect the results."""
+
+        async def gather() -> list:
+            return [result async for result in runner.run_many(cmds, **kwargs)]  # type: ignore[arg-type]
+
+        return asyncio.run(gather())
+
+    def test_results_in_completion_order(self) -> None:
+        """Test that results arrive as commands finish."""
+        results = self.collect(AsyncCommandRunner(), [["sleep", "0.5"], ["true"]], limit=2)
+
+        assert [r.args for r in results] == [["true"], ["sleep", "0.5"]]
+
+    def test_limit_bounds_concurrency(self) -> None:
+        """Test that no more than limit commands run at once."""
+        started = time.monotonic()
+        self.collect(AsyncCommandRunner(), [["sleep", "0.3"]] * 3, limit=1)
+
+        assert time.monotonic() - started >= 0.9
+
+    def test_failure_stops_the_rest(self) -> None:
+        """Test that with check=True the first failure raises and stops running commands."""
+        started = time.monotonic()
+        with pytest.raises(CommandError) as exc_info:
+            self.collect(
+                AsyncCommandRunner(kill_grace=0.5),
+                [["sleep", "30"], ["sh", "-c", "exit 3"]],
+                limit=2,
+                quiet=True,
+            )
+
+        assert exc_info.value.returncode == 3
+        assert time.monotonic() - started < 10
+
+    def test_check_false_yields_failures(self) -> None:
+        """Test that with check=False every result is yielded."""
+        results = self.collect(AsyncCommandRunner(), [["true"], ["false"]], check=False)
+
+        assert sorted(r.returncode for r in results) == [0, 1]
+
+    def test_invalid_limit(self) -> None:
+        """Test that a limit below one is rejected."""
+        with pytest.raises(ValueError, match="limit"):
+            self.collect(AsyncCommandRunner(), [["true"]], limit=0)
+
+
+class TestResourceUsage:
+    """Tests for per-command resource accounting."""
+
+    BURN = ["python3", "-c", "sum(range(3 * 10**6))"]
+
+    @pytest.mark.parametrize("kwargs", [{}, {"capture_output": True}, {"stream": True}])
+    def test_result_has_usage(self, kwargs: dict[str, bool]) -> None:
+        """Test that every output mode reports the child's CPU and memory."""
+        result = run_command(self.BURN, **kwargs)
+
+        assert result.usage is not None
+        assert result.usage.cpu > 0
+        assert result.usage.max_rss_kb > 1024
+
+    @pytest.mark.parametrize("kwargs", [{"capture_output": True}, {"stream": True}])
+    def test_reaped_through_try_wait(
+        self, monkeypatch: pytest.MonkeyPatch, kwargs: dict[str, bool]
+    ) -> None:
+        """Test that Popen still reaps children through the private hook _Process overrides.
+
+        Fails if a Python release renames _try_wait or stops calling it.
+        """
+        assert _HOOK_TRY_WAIT
+        calls: list[int] = []
+        try_wait = _Process._try_wait
+
+        def spy(process: _Process, wait_flags: int) -> tuple[int, int]:
+            calls.append(wait_flags)
+            return try_wait(process, wait_flags)
+
+        monkeypatch.setattr(_Process, "_try_wait", spy)
+        result = run_command(["true"], **kwargs)
+
+        assert calls
+        assert result.usage is not None
+
+    def test_failure_has_usage(self) -> None:
+        """Test that CommandError carries the failed command's usage."""
+        with pytest.raises(CommandError) as exc_info:
+            run_command(["sh", "-c", "exit 3"], capture_output=True)
+
+        assert exc_info.value.usage is not None
+        assert exc_info.value.stderr == ""
+
+    def test_timeout(self) -> None:
+        """Test that a command past its timeout is killed."""
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_command(["sleep", "30"], timeout=0.2)
+
+    def test_logged_as_event(self) -> None:
+        """Test that each command is logged with its usage in JSON mode."""
+        usage_log.clear()
+        log.json_mode = True
+
+        run_command(["true"])
+
+        event = log.get_buffer().events[-1]
+        assert (event["message"], event["command"], event["returncode"]) == ("command", "true", 0)
+        assert {"elapsed", "user", "system", "max_rss_kb", "block_in", "block_out"} <= set(event)
+        assert usage_log.summary()["commands"] == 1
+
+    def test_async_has_no_usage(self) -> None:
+        """Test that async commands are counted without rusage."""
+        usage_log.clear()
+
+        result = asyncio.run(AsyncCommandRunner().run(["true"], capture_output=True))
+
+        assert getattr(result, "usage", None) is None
+        assert usage_log.summary()["commands"] == 1
+        assert usage_log.summary()["unmeasured"] == 1
+
+    def test_summary(self) -> None:
+        """Test totals, peak RSS and the heaviest commands."""
+        usages = UsageLog()
+        for command, cpu, rss in [
+            ("tofu apply", 2.0, 300),
+            ("ssh", 0.1, 900),
+            ("ansible", 5.0, 500),
+        ]:
+            usages.record(CommandUsage(command, 0, 10.0, ResourceUsage(cpu, 0.5, rss, 8, 16)))
+        usages.record(CommandUsage("ssh", 0, 1.0, None))
+
+        summary = usages.summary(top=2)
+
+        assert summary["commands"] == 4
+        assert summary["unmeasured"] == 1
+        assert summary["elapsed"] == 31.0
+        assert (summary["user"], summary["system"]) == (7.1, 1.5)
+        assert summary["max_rss_kb"] == 900
+        assert (summary["block_in"], summary["block_out"]) == (24, 48)
+        assert [c["command"] for c in summary["top_cpu"]] == ["ansible", "tofu apply"]
+
+
+class TestOutputTail:
+    """Tests for OutputTail."""
+
+    def test_drops_oldest_lines(self) -> None:
+        """Test that the tail keeps the newest lines within its size."""
+        tail = OutputTail(max_bytes=10)
+        for line in ["aaaa\n", "bbbb\n", "cccc\n"]:
+            tail.append(line)
+
+        assert tail.text() == "bbbb\ncccc\n"
+        assert (tail.size, tail.dropped) == (10, 1)
+
+    def test_truncates_long_line(self) -> None:
+        """Test that a single line larger than the tail keeps its end."""
+        tail = OutputTail(max_bytes=4)
+        tail.append("0123456789\n")
+
+        assert tail.text() == "789\n"
+
 
 class TestCommandError:
     """Tests for CommandError exception."""
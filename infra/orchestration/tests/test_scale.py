@@ -0,0 +1,107 @@
+"""Tests for incremental Claude VM fleet scaling."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from harness.core.config import Config
+from harness.deployers.claude_vms import ClaudeVMsDeployer, vm_address
+
+
+@pytest.fixture
+def deployer(config_file: Path, monkeypatch: pytest.MonkeyPatch) -> ClaudeVMsDeployer:
+    """Deployer with tofu and the configuration phases mocked out."""
+    monkeypatch.setattr("harness.deployers.base.check_dependencies", lambda _deps: None)
+    deployer = ClaudeVMsDeployer(Config.from_yaml(config_file))
+    deployer._wait_and_configure = MagicMock()  # type: ignore[method-assign]
+    return deployer
+
+
+def with_fleet(deployer: ClaudeVMsDeployer, names: list[str]) -> MagicMock:
+    """Give the deployer a mocked tofu manager whose state holds ``names``."""
+    tofu = MagicMock()
+    tofu.snapshot.return_value.vms.return_value = {name: {} for name in names}
+    tofu.plan.return_value = True
+    deployer.get_tofu_manager = MagicMock(return_value=tofu)  # type: ignore[method-assign]
+    return tofu
+
+
+class TestDesiredIndices:
+    """Tests for the scale delta computation."""
+
+    def test_grow_fills_gaps_first(self, deployer: ClaudeVMsDeployer) -> None:
+        """Test that missing numbers are reused before new ones."""
+        assert deployer._desired_indices({1, 2, 4}, 5, []) == {1, 2, 3, 4, 5}
+
+    def test_shrink_removes_highest(self, deployer: ClaudeVMsDeployer) -> None:
+        """Test that shrinking drops the highest numbers."""
+        assert deployer._desired_indices({1, 2, 3, 4}, 2, []) == {1, 2}
+
+    def test_remove_named_vm(self, deployer: ClaudeVMsDeployer) -> None:
+        """Test removing a VM from the middle of the fleet."""
+        assert deployer._desired_indices({1, 2, 3}, None, ["claude-dev-2"]) == {1, 3}
+
+    def test_removed_vm_is_not_refilled(self, deployer: ClaudeVMsDeployer) -> None:
+        """Test that --remove with --to does not recreate the removed VM."""
+        assert deployer._desired_indices({1, 2, 3}, 3, ["claude-dev-2"]) == {1, 3, 4}
+
+    def test_unknown_vm_raises(self, deployer: ClaudeVMsDeployer) -> None:
+        """Test that removing a VM that is not deployed is an error."""
+        with pytest.raises(ValueError, match="not a deployed VM"):
+            deployer._desired_indices({1}, None, ["claude-dev-9"])
+
+
+class TestScale:
+    """Tests for ClaudeVMsDeployer.scale."""
+
+    def test_grow_targets_only_new_vms(self, deployer: ClaudeVMsDeployer) -> None:
+        """Test that growing plans, waits for and configures only the delta."""
+        tofu = with_fleet(deployer, ["claude-dev-1", "claude-dev-2"])
+
+        result = deployer.scale(to=3)
+
+        assert result.success
+        assert result.details == {"added": ["claude-dev-3"], "removed": [], "count": 3}
+        targets = [vm_address("claude-dev-3")]
+        assert tofu.plan.call_args.kwargs["targets"] == targets
+        assert tofu.apply.call_args.kwargs["targets"] == targets
+        assert set(tofu.plan.call_args.kwargs["variables"]["vms"]) == {
+            "claude-dev-1",
+            "claude-dev-2",
+            "claude-dev-3",
+        }
+        deployer._wait_and_configure.assert_called_once_with(
+            skip_hardening=False, hosts=["claude-dev-3"]
+        )
+
+    def test_remove_skips_configuration(self, deployer: ClaudeVMsDeployer) -> None:
+        """Test that removing a VM destroys just that resource."""
+        tofu = with_fleet(deployer, ["claude-dev-1", "claude-dev-2", "claude-dev-3"])
+
+        result = deployer.scale(remove=["claude-dev-2"])
+
+        assert result.success
+        assert tofu.plan.call_args.kwargs["targets"] == [vm_address("claude-dev-2")]
+        assert "claude-dev-2" not in tofu.plan.call_args.kwargs["variables"]["vms"]
+        deployer._wait_and_configure.assert_not_called()
+
+    def test_no_change_is_a_noop(self, deployer: ClaudeVMsDeployer) -> None:
+        """Test that scaling to the current size runs nothing."""
+        tofu = with_fleet(deployer, ["claude-dev-1"])
+
+        result = deployer.scale(to=1)
+
+        assert result.success
+        tofu.plan.assert_not_called()
+
+    def test_other_prefixes_are_ignored(self, deployer: ClaudeVMsDeployer) -> None:
+        """Test that VMs with a different prefix do not count."""
+        with_fleet(deployer, ["claude-dev-1", "other-1"])
+
+        result = deployer.scale(to=2)
+
+        assert result.details is not None
+        assert result.details["added"] == ["claude-dev-2"]
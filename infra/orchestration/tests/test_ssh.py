@@ -0,0 +1,225 @@
+"""Tests for SSH readiness waiting."""
+
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from harness.core.logger import log
+from harness.infra.readiness import BackoffPolicy, HostReadiness, ReadinessReport
+from harness.infra.ssh import SSHWaiter
+
+
+@pytest.fixture
+def banner_server() -> Iterator[int]:
+    """Start a local TCP server that answers with an SSH banner."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("", 0))
+    server.listen()
+    server.settimeout(0.2)
+    stop = threading.Event()
+
+    def serve() -> None:
+        while not stop.is_set():
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                continue
+            with conn:
+                conn.sendall(b"SSH-2.0-OpenSSH_9.6\r\n")
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield server.getsockname()[1]
+    stop.set()
+    thread.join()
+    server.close()
+
+
+@pytest.fixture
+def closed_port() -> int:
+    """Return a local port with nothing listening on it."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestBackoffPolicy:
+    """Tests for BackoffPolicy dataclass."""
+
+    def test_delay_grows_until_maximum(self) -> None:
+        """Test that delays grow geometrically and are capped."""
+        policy = BackoffPolicy(initial=1.0, factor=2.0, maximum=5.0, jitter=0)
+
+        assert [policy.delay(i) for i in range(5)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+    def test_jitter_stays_within_bounds(self) -> None:
+        """Test that jittered delays never exceed the maximum."""
+        policy = BackoffPolicy(initial=4.0, factor=2.0, maximum=5.0, jitter=0.5)
+
+        assert all(0 < policy.delay(i) <= 5.0 for i in range(20))
+
+
+class TestReadinessReport:
+    """Tests for ReadinessReport."""
+
+    def test_summary_names_slowest_host(self) -> None:
+        """Test that the summary points out the ready host that took longest."""
+        report = ReadinessReport(
+            policy=BackoffPolicy(),
+            hosts=[
+                HostReadiness("vm-1", ready=True, attempts=2, time_to_ready=3.0),
+                HostReadiness("vm-2", ready=True, attempts=5, time_to_ready=12.5),
+                HostReadiness("vm-3", attempts=9),
+            ],
+            elapsed=30.0,
+        )
+        log.json_mode = True
+
+        report.log_summary()
+
+        events = log.get_buffer().events
+        assert events[0]["readiness"]["slowest"] == "vm-2"
+        assert events[-1]["message"] == "Slowest host: vm-2 (12.5s)"
+
+    def test_no_slowest_without_ready_hosts(self) -> None:
+        """Test that a wait where no host came up has no slowest host."""
+        report = ReadinessReport(policy=BackoffPolicy(), hosts=[HostReadiness("vm-1")])
+
+        assert report.slowest is None
+        assert report.to_dict()["slowest"] is None
+
+
+class TestSSHWaiter:
+    """Tests for SSHWaiter class."""
+
+    def test_ready_host_succeeds(self, banner_server: int) -> None:
+        """Test that a host with an SSH banner and working login is ready."""
+        waiter = SSHWaiter(user="dmg", timeout=5, retry_interval=1, port=banner_server)
+
+        with patch.object(SSHWaiter, "_try_connect", AsyncMock(return_value=True)):
+            successful, failed = waiter.wait_for_hosts(["127.0.0.1"])
+
+        assert successful == ["127.0.0.1"]
+        assert failed == []
+
+    def test_ready_host_needs_no_delay(self, banner_server: int) -> None:
+        """Test that an already-running host is ready on the first attempt."""
+        waiter = SSHWaiter(user="dmg", timeout=5, retry_interval=1, port=banner_server)
+
+        with patch.object(SSHWaiter, "_try_connect", AsyncMock(return_value=True)):
+            waiter.wait_for_hosts(["127.0.0.1"])
+
+        assert waiter.last_report is not None
+        record = waiter.last_report.hosts[0]
+        assert record.ready is True
+        assert record.attempts == 1
+        assert record.delays == []
+        assert record.port_open_after is not None
+
+    def test_report_records_backoff_curve(self, closed_port: int) -> None:
+        """Test that failed hosts report their attempts and delays."""
+        backoff = BackoffPolicy(initial=0.1, factor=2.0, maximum=0.4, jitter=0)
+        waiter = SSHWaiter(user="dmg", timeout=1, port=closed_port, backoff=backoff)
+
+        waiter.wait_for_hosts(["127.0.0.1"])
+
+        assert waiter.last_report is not None
+        record = waiter.last_report.hosts[0]
+        assert record.ready is False
+        assert record.time_to_ready is None
+        assert record.delays[:3] == [0.1, 0.2, 0.4]
+        assert record.attempts == len(record.delays) + 1
+
+    def test_full_check_skipped_until_port_answers(self, closed_port: int) -> None:
+        """Test that ssh is not spawned while the port is closed."""
+        waiter = SSHWaiter(user="dmg", timeout=1, retry_interval=1, port=closed_port)
+        try_connect = AsyncMock(return_value=True)
+
+        with patch.object(SSHWaiter, "_try_connect", try_connect):
+            successful, failed = waiter.wait_for_hosts(["127.0.0.1"])
+
+        assert successful == []
+        assert failed == ["127.0.0.1"]
+        try_connect.assert_not_called()
+
+    def test_hosts_are_waited_concurrently(self, closed_port: int) -> None:
+        """Test that timeouts overlap rather than adding up."""
+        waiter = SSHWaiter(
+            user="dmg", timeout=1, retry_interval=1, port=closed_port, max_concurrency=2
+        )
+        hosts = ["127.0.0.1", "127.0.0.2", "127.0.0.3", "127.0.0.4"]
+
+        start = time.monotonic()
+        successful, failed = waiter.wait_for_hosts(hosts)
+        elapsed = time.monotonic() - start
+
+        assert successful == []
+        assert failed == hosts
+        assert elapsed < 3
+
+    def test_results_keep_input_order(self, banner_server: int) -> None:
+        """Test that the (successful, failed) lists follow the input order."""
+        waiter = SSHWaiter(user="dmg", timeout=1, retry_interval=1, port=banner_server)
+
+        async def fake_connect(_self: SSHWaiter, host: str) -> bool:
+            return host != "127.0.0.2"
+
+        with patch.object(SSHWaiter, "_try_connect", fake_connect):
+            successful, failed = waiter.wait_for_hosts(["127.0.0.3", "127.0.0.2", "127.0.0.1"])
+
+        assert successful == ["127.0.0.3", "127.0.0.1"]
+        assert failed == ["127.0.0.2"]
+
+    def test_wait_for_inventory_skips_null_hosts(self, tmp_path: Path, banner_server: int) -> None:
+        """Test that hosts without an address are ignored."""
+        inventory_file = tmp_path / "hosts.json"
+        inventory_file.write_text(
+            json.dumps(
+                {
+                    "all": {
+                        "hosts": {
+                            "vm-1": {"ansible_host": "127.0.0.1"},
+                            "vm-2": {"ansible_host": None},
+                        }
+                    }
+                }
+            )
+        )
+        waiter = SSHWaiter(user="dmg", timeout=5, retry_interval=1, port=banner_server)
+
+        with patch.object(SSHWaiter, "_try_connect", AsyncMock(return_value=True)):
+            successful, failed = waiter.wait_for_inventory(inventory_file)
+
+        assert successful == ["127.0.0.1"]
+        assert failed == []
+
+    def test_wait_for_inventory_reports_ready_names(
+        self, tmp_path: Path, banner_server: int
+    ) -> None:
+        """Test that on_ready receives inventory names as hosts come up."""
+        inventory_file = tmp_path / "hosts.json"
+        inventory_file.write_text(
+            json.dumps({"all": {"hosts": {"vm-1": {"ansible_host": "127.0.0.1"}}}})
+        )
+        waiter = SSHWaiter(user="dmg", timeout=5, retry_interval=1, port=banner_server)
+        ready: list[str] = []
+
+        with patch.object(SSHWaiter, "_try_connect", AsyncMock(return_value=True)):
+            waiter.wait_for_inventory(inventory_file, on_ready=ready.append)
+
+        assert ready == ["vm-1"]
+
+    def test_wait_for_inventory_missing_file(self, tmp_path: Path) -> None:
+        """Test error when the inventory file doesn't exist."""
+        waiter = SSHWaiter(user="dmg")
+
+        with pytest.raises(FileNotFoundError):
+            waiter.wait_for_inventory(tmp_path / "missing.json")
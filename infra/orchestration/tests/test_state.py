@@ -0,0 +1,147 @@
+"""Tests for the OpenTofu state snapshot."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from harness.infra.state import StateSnapshot
+from harness.infra.tofu import OpenTofuManager
+
+
+def make_state(serial: int, ips: dict[str, str | None]) -> dict[str, Any]:
+    """Build a minimal version 4 state for the claude-vms component."""
+    inventory = {
+        "all": {"hosts": {name: {"ansible_host": ip, "vm_id": 200} for name, ip in ips.items()}}
+    }
+    return {
+        "version": 4,
+        "lineage": "lineage-1",
+        "serial": serial,
+        "outputs": {
+            "vm_ips": {"value": ips, "type": ["map", "string"]},
+            "ansible_inventory": {"value": json.dumps(inventory), "type": "string"},
+            "cloud_init_user": {"value": "dmg", "type": "string"},
+        },
+        "resources": [
+            {
+                "mode": "managed",
+                "type": "proxmox_virtual_environment_vm",
+                "name": "vm",
+                "instances": [
+                    {"index_key": name, "attributes": {"vm_id": 200 + i, "name": name}}
+                    for i, name in enumerate(ips)
+                ],
+            },
+            {"mode": "data", "type": "x", "name": "y", "instances": [{"attributes": {}}]},
+        ],
+    }
+
+
+@pytest.fixture
+def tofu(tmp_path: Path) -> OpenTofuManager:
+    """OpenTofu manager whose runner must not be used for reads."""
+    provision = tmp_path / "provision"
+    provision.mkdir()
+    manager = OpenTofuManager(provision, tmp_path / "inventory" / "hosts.json")
+    manager.runner = MagicMock()
+    return manager
+
+
+def write_state(tofu: OpenTofuManager, state: dict[str, Any]) -> None:
+    """Write a state file for the manager."""
+    tofu.state_file.write_text(json.dumps(state))
+
+
+class TestStateSnapshot:
+    """Tests for StateSnapshot parsing."""
+
+    def test_from_state(self) -> None:
+        """Test that outputs, inventory, IPs and VMs come from one parse."""
+        snapshot = StateSnapshot.from_state(make_state(3, {"claude-dev-1": "10.0.70.100"}))
+
+        assert snapshot.identity == "lineage-1:3"
+        assert snapshot.output("cloud_init_user") == "dmg"
+        assert snapshot.inventory()["all"]["hosts"]["claude-dev-1"]["ansible_host"] == "10.0.70.100"
+        assert snapshot.vm_ips() == {"claude-dev-1": "10.0.70.100"}
+        assert snapshot.vms() == {"claude-dev-1": {"vm_id": 200, "name": "claude-dev-1"}}
+
+    def test_vm_ips_fall_back_to_inventory(self) -> None:
+        """Test components without a vm_ips output."""
+        state = make_state(1, {"neo4j-db": "10.0.70.50"})
+        del state["outputs"]["vm_ips"]
+
+        assert StateSnapshot.from_state(state).vm_ips() == {"neo4j-db": "10.0.70.50"}
+
+    def test_from_show_json(self) -> None:
+        """Test parsing of the tofu show -json representation."""
+        data = {
+            "values": {
+                "outputs": {"neo4j_ip": {"value": "10.0.70.50", "sensitive": False}},
+                "root_module": {
+                    "resources": [
+                        {
+                            "mode": "managed",
+                            "type": "proxmox_virtual_environment_vm",
+                            "name": "neo4j",
+                            "index": None,
+                            "values": {"vm_id": 150},
+                        }
+                    ]
+                },
+            }
+        }
+        snapshot = StateSnapshot.from_show_json(data)
+
+        assert snapshot.output("neo4j_ip") == "10.0.70.50"
+        assert snapshot.vms() == {"neo4j": {"vm_id": 150}}
+
+
+class TestManagerReads:
+    """Tests for OpenTofuManager reads served from the snapshot."""
+
+    def test_outputs_read_state_without_tofu(self, tofu: OpenTofuManager) -> None:
+        """Test that output reads do not spawn tofu."""
+        write_state(tofu, make_state(1, {"claude-dev-1": "10.0.70.100"}))
+
+        assert tofu.get_output("cloud_init_user") == "dmg"
+        assert tofu.get_output("vm_ips") == '{"claude-dev-1": "10.0.70.100"}'
+        assert tofu.get_outputs()["cloud_init_user"] == {"value": "dmg"}
+        tofu.export_inventory()
+
+        hosts = json.loads(tofu.inventory_file.read_text())["all"]["hosts"]
+        assert hosts["claude-dev-1"]["ansible_host"] == "10.0.70.100"
+        tofu.runner.run.assert_not_called()
+
+    def test_new_serial_invalidates_snapshot(self, tofu: OpenTofuManager) -> None:
+        """Test that a rewritten state file is re-read."""
+        write_state(tofu, make_state(1, {"claude-dev-1": None}))
+        first = tofu.snapshot()
+        assert tofu.snapshot() is first
+
+        write_state(tofu, make_state(2, {"claude-dev-1": "10.0.70.100", "claude-dev-2": None}))
+
+        assert tofu.snapshot().serial == 2
+        assert tofu.get_vm_ips() == {"claude-dev-1": "10.0.70.100", "claude-dev-2": None}
+        assert tofu.state_identity() == "lineage-1:2"
+
+    def test_missing_output_asks_tofu(self, tofu: OpenTofuManager) -> None:
+        """Test that an unknown output falls back to tofu output."""
+        write_state(tofu, make_state(1, {}))
+        tofu.runner.run.return_value = MagicMock(stdout="value\n")
+
+        assert tofu.get_output("other") == "value"
+        assert tofu.runner.run.call_args.args[0] == ["tofu", "output", "-raw", "other"]
+
+    def test_remote_state_uses_show_json_once(self, tofu: OpenTofuManager) -> None:
+        """Test that without a local state file tofu show runs once."""
+        show = {"values": {"outputs": {"neo4j_ip": {"value": "10.0.70.50"}}}}
+        tofu.runner.run.return_value = MagicMock(stdout=json.dumps(show))
+
+        assert tofu.get_output("neo4j_ip") == "10.0.70.50"
+        assert tofu.get_outputs() == {"neo4j_ip": {"value": "10.0.70.50"}}
+        assert tofu.runner.run.call_count == 1
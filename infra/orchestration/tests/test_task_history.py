@@ -0,0 +1,150 @@
+"""Tests for cross-run Ansible task timings."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from harness.infra.task_history import (
+    TaskHistory,
+    find_regressions,
+    percentile,
+    task_stats,
+)
+
+
+def write_run(
+    runs_dir: Path,
+    name: str,
+    durations: dict[str, list[float]],
+    start: float,
+    role: str = "claude_vm",
+    status: str = "ok",
+) -> Path:
+    """Write a run file with one result per host for each task."""
+    runs_dir.mkdir(parents=True, exist_ok=True)
+    path = runs_dir / f"{name}.jsonl"
+    with open(path, "w") as f:
+        for task, values in durations.items():
+            for i, duration in enumerate(values):
+                event = {
+                    "event": "task_result",
+                    "host": f"claude-dev-{i + 1}",
+                    "task": task,
+                    "play": "Configure Claude VMs",
+                    "role": role,
+                    "status": status,
+                    "start": start,
+                    "duration": duration,
+                }
+                f.write(json.dumps(event) + "\n")
+    return path
+
+
+class TestPercentile:
+    """Tests for percentile."""
+
+    def test_interpolates(self) -> None:
+        """Test linear interpolation between ranks."""
+        values = [4.0, 1.0, 3.0, 2.0]
+        assert percentile(values, 0) == 1.0
+        assert percentile(values, 50) == 2.5
+        assert percentile(values, 100) == 4.0
+
+    def test_empty(self) -> None:
+        """Test that no samples give zero."""
+        assert percentile([], 95) == 0.0
+
+
+class TestTaskHistory:
+    """Tests for loading runs."""
+
+    def test_runs_by_component(self, tmp_path: Path) -> None:
+        """Test that components come from file names and limit applies per component."""
+        for i in range(3):
+            write_run(tmp_path, f"20260101-12000{i}-claude-vms-abcd000{i}", {"apt": [1.0]}, i)
+        write_run(tmp_path, "20260101-130000-neo4j-ffff0000", {"apt": [1.0]}, 10)
+        write_run(tmp_path, "20260101-140000-neo4j-ffff0001", {}, 20)
+
+        history = TaskHistory(tmp_path)
+
+        assert [r.component for r in history.runs()] == [
+            "claude-vms",
+            "claude-vms",
+            "claude-vms",
+            "neo4j",
+        ]
+        limited = history.runs(component="claude-vms", limit=2)
+        assert [r.path.stem for r in limited] == [
+            "20260101-120001-claude-vms-abcd0001",
+            "20260101-120002-claude-vms-abcd0002",
+        ]
+
+    def test_missing_directory(self, tmp_path: Path) -> None:
+        """Test that a fresh checkout has no runs."""
+        assert TaskHistory(tmp_path / "ansible-runs").runs() == []
+
+
+class TestTaskStats:
+    """Tests for task_stats."""
+
+    def test_aggregates_across_hosts_and_runs(self, tmp_path: Path) -> None:
+        """Test percentiles and totals, slowest task first."""
+        write_run(tmp_path, "20260101-120000-claude-vms-a", {"apt": [10.0, 20.0]}, 1)
+        write_run(tmp_path, "20260101-130000-claude-vms-b", {"apt": [30.0], "git": [1.0]}, 2)
+
+        stats = task_stats(TaskHistory(tmp_path).runs())
+
+        assert [s.task for s in stats] == ["apt", "git"]
+        apt = stats[0]
+        assert (apt.component, apt.role) == ("claude-vms", "claude_vm")
+        assert (apt.runs, apt.samples) == (2, 3)
+        assert apt.p50 == 20.0
+        assert apt.p95 == pytest.approx(29.0)
+        assert (apt.max, apt.total) == (30.0, 60.0)
+
+    def test_skipped_results_excluded(self, tmp_path: Path) -> None:
+        """Test that skipped results don't pull timings down."""
+        write_run(tmp_path, "20260101-120000-claude-vms-a", {"apt": [0.01]}, 1, status="skipped")
+
+        assert task_stats(TaskHistory(tmp_path).runs()) == []
+
+
+class TestFindRegressions:
+    """Tests for find_regressions."""
+
+    def write_history(self, runs_dir: Path, latest: list[float]) -> None:
+        """Write three baseline runs of ~10s per host and a latest run."""
+        for i, values in enumerate([[10.0, 10.0], [9.0, 11.0], [10.0, 12.0], latest]):
+            write_run(runs_dir, f"20260101-12000{i}-claude-vms-{i:08x}", {"apt": values}, i)
+
+    def test_flags_slowdown(self, tmp_path: Path) -> None:
+        """Test that a large slowdown in the latest run is flagged."""
+        self.write_history(tmp_path, [25.0, 30.0])
+
+        regressions = find_regressions(TaskHistory(tmp_path).runs())
+
+        assert len(regressions) == 1
+        regression = regressions[0]
+        assert (regression.task, regression.baseline, regression.current) == ("apt", 10.0, 27.5)
+        assert regression.change == pytest.approx(1.75)
+
+    def test_threshold_and_min_delta(self, tmp_path: Path) -> None:
+        """Test that small relative or absolute slowdowns are ignored."""
+        self.write_history(tmp_path, [14.0, 14.0])
+        runs = TaskHistory(tmp_path).runs()
+
+        assert find_regressions(runs) == []
+        assert find_regressions(runs, threshold=0.25, min_delta=5.0) == []
+        assert len(find_regressions(runs, threshold=0.25, min_delta=1.0)) == 1
+
+    def test_needs_baseline(self, tmp_path: Path) -> None:
+        """Test that a single run or a new task is never a regression."""
+        write_run(tmp_path, "20260101-120000-claude-vms-a", {"apt": [1.0]}, 1)
+        write_run(tmp_path, "20260101-130000-claude-vms-b", {"new": [100.0]}, 2)
+        runs = TaskHistory(tmp_path).runs()
+
+        assert find_regressions(runs[:1]) == []
+        assert find_regressions(runs) == []
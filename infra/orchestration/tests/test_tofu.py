@@ -0,0 +1,231 @@
+"""Tests for OpenTofu manager caching."""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from harness.core.runner import CommandError
+from harness.infra.tofu import STATE_FRESH_TTL, VAR_FILES_KEPT, OpenTofuManager
+
+
+@pytest.fixture
+def provision_dir(tmp_path: Path) -> Path:
+    """Create a provision directory with minimal OpenTofu files."""
+    provision = tmp_path / "provision"
+    provision.mkdir()
+    (provision / "main.tf").write_text('resource "null_resource" "a" {}\n')
+    (provision / "versions.tf").write_text("terraform {}\n")
+    return provision
+
+
+@pytest.fixture
+def tofu(provision_dir: Path, tmp_path: Path) -> OpenTofuManager:
+    """OpenTofu manager with the command runner mocked out."""
+    manager = OpenTofuManager(provision_dir, tmp_path / "inventory" / "hosts.json")
+    manager.runner = MagicMock()
+    return manager
+
+
+def init_calls(tofu: OpenTofuManager) -> list[list[str]]:
+    """Get the tofu init commands that were run."""
+    return [c.args[0] for c in tofu.runner.run.call_args_list if c.args[0][:2] == ["tofu", "init"]]
+
+
+class TestInitCache:
+    """Tests for OpenTofuManager.init fingerprint caching."""
+
+    def test_first_init_runs_without_upgrade(self, tofu: OpenTofuManager) -> None:
+        """Test that init runs and does not upgrade by default."""
+        tofu.init()
+
+        assert init_calls(tofu) == [["tofu", "init", "-input=false"]]
+        assert (tofu.harness_dir / "init.sha256").exists()
+
+    def test_repeat_init_is_skipped(self, tofu: OpenTofuManager) -> None:
+        """Test that an unchanged directory is not re-initialized."""
+        tofu.init()
+        tofu.init()
+
+        assert len(init_calls(tofu)) == 1
+
+    def test_tf_change_triggers_init(self, tofu: OpenTofuManager, provision_dir: Path) -> None:
+        """Test that editing a .tf file invalidates the cache."""
+        tofu.init()
+        (provision_dir / "main.tf").write_text('resource "null_resource" "b" {}\n')
+        tofu.init()
+
+        assert len(init_calls(tofu)) == 2
+
+    def test_lock_file_change_triggers_init(
+        self, tofu: OpenTofuManager, provision_dir: Path
+    ) -> None:
+        """Test that a new dependency lock file invalidates the cache."""
+        tofu.init()
+        (provision_dir / ".terraform.lock.hcl").write_text('provider "x" {}\n')
+        tofu.init()
+
+        assert len(init_calls(tofu)) == 2
+
+    def test_removed_providers_trigger_init(
+        self, tofu: OpenTofuManager, provision_dir: Path
+    ) -> None:
+        """Test that deleting installed providers invalidates the cache."""
+        plugin = provision_dir / ".terraform" / "providers" / "registry" / "provider"
+        plugin.parent.mkdir(parents=True)
+        plugin.write_text("binary")
+        tofu.init()
+        plugin.unlink()
+        tofu.init()
+
+        assert len(init_calls(tofu)) == 2
+
+    def test_upgrade_always_runs(self, tofu: OpenTofuManager) -> None:
+        """Test that an explicit upgrade bypasses the cache."""
+        tofu.init()
+        tofu.init(upgrade=True)
+
+        assert init_calls(tofu)[-1] == ["tofu", "init", "-input=false", "-upgrade"]
+
+    def test_manager_upgrade_default(self, provision_dir: Path, tmp_path: Path) -> None:
+        """Test that the manager-level upgrade flag is used by default."""
+        manager = OpenTofuManager(provision_dir, tmp_path / "hosts.json", upgrade=True)
+        manager.runner = MagicMock()
+
+        manager.init()
+        manager.init()
+
+        assert len(init_calls(manager)) == 2
+
+
+def plan_calls(tofu: OpenTofuManager) -> list[list[str]]:
+    """Get the tofu plan commands that were run."""
+    return [c.args[0] for c in tofu.runner.run.call_args_list if c.args[0][:2] == ["tofu", "plan"]]
+
+
+def write_state(provision_dir: Path, serial: int) -> None:
+    """Write a minimal local state file."""
+    state = {"lineage": "abc", "serial": serial}
+    (provision_dir / "terraform.tfstate").write_text(json.dumps(state))
+
+
+class TestPlan:
+    """Tests for OpenTofuManager.plan change detection and caching."""
+
+    @pytest.fixture(autouse=True)
+    def _plan_exit_code(self, tofu: OpenTofuManager) -> None:
+        """Make tofu plan report changes by default."""
+        tofu.runner.run.return_value = MagicMock(returncode=2)
+
+    def test_detailed_exitcode(self, tofu: OpenTofuManager) -> None:
+        """Test that exit codes 0 and 2 map to no-op and changes."""
+        assert tofu.plan() is True
+        assert "-detailed-exitcode" in plan_calls(tofu)[0]
+
+        tofu.runner.run.return_value = MagicMock(returncode=0)
+        assert tofu.plan(reuse=False) is False
+
+    def test_plan_error_raises(self, tofu: OpenTofuManager) -> None:
+        """Test that exit code 1 is a failure."""
+        tofu.runner.run.return_value = MagicMock(returncode=1)
+        with pytest.raises(CommandError):
+            tofu.plan()
+
+    def test_unchanged_plan_is_reused(self, tofu: OpenTofuManager, provision_dir: Path) -> None:
+        """Test that an identical request reuses the saved plan."""
+        (provision_dir / "tfplan").write_text("plan")
+        assert tofu.plan({"count": 1}) is True
+        assert tofu.plan({"count": 1}) is True
+
+        assert len(plan_calls(tofu)) == 1
+
+    def test_missing_plan_file_replans(self, tofu: OpenTofuManager) -> None:
+        """Test that a cached diff without its plan file is not reused."""
+        tofu.plan()
+        tofu.plan()
+
+        assert len(plan_calls(tofu)) == 2
+
+    def test_variable_and_state_changes_replan(
+        self, tofu: OpenTofuManager, provision_dir: Path
+    ) -> None:
+        """Test that new variables or a new state serial invalidate the cache."""
+        tofu.runner.run.return_value = MagicMock(returncode=0)
+        write_state(provision_dir, 1)
+        tofu.plan({"count": 1})
+        tofu.plan({"count": 2})
+        write_state(provision_dir, 2)
+        tofu.plan({"count": 2})
+
+        assert len(plan_calls(tofu)) == 3
+
+    def test_expired_cache_replans(
+        self, tofu: OpenTofuManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a cached plan older than the TTL is not reused."""
+        tofu.runner.run.return_value = MagicMock(returncode=0)
+        tofu.plan()
+        later = time.time() + STATE_FRESH_TTL + 1
+        monkeypatch.setattr("harness.infra.tofu.time.time", lambda: later)
+        tofu.plan()
+
+        assert len(plan_calls(tofu)) == 2
+
+    def test_refresh_skipped_after_apply(self, tofu: OpenTofuManager, provision_dir: Path) -> None:
+        """Test that state written by our own apply is planned without refresh."""
+        write_state(provision_dir, 1)
+        tofu.plan()
+        assert "-refresh=false" not in plan_calls(tofu)[0]
+
+        tofu.apply()
+        tofu.plan()
+        assert "-refresh=false" in plan_calls(tofu)[1]
+
+    def test_external_state_change_refreshes(
+        self, tofu: OpenTofuManager, provision_dir: Path
+    ) -> None:
+        """Test that a state serial we did not write forces a refresh."""
+        write_state(provision_dir, 1)
+        tofu.apply()
+        write_state(provision_dir, 5)
+        tofu.plan()
+
+        assert "-refresh=false" not in plan_calls(tofu)[0]
+
+
+class TestVarFile:
+    """Tests for the generated tfvars.json file."""
+
+    def test_variables_are_passed_as_one_file(self, tofu: OpenTofuManager) -> None:
+        """Test that variables are written to JSON instead of -var arguments."""
+        variables = {"vms": {"claude-dev-1": {"vm_id": 200}}, "enabled": True}
+        args = tofu._build_var_args(variables)
+
+        assert len(args) == 1 and args[0].startswith("-var-file=")
+        path = Path(args[0].split("=", 1)[1])
+        assert json.loads(path.read_text()) == variables
+
+    def test_same_variables_reuse_file(self, tofu: OpenTofuManager) -> None:
+        """Test that the file name depends only on the content."""
+        first = tofu.var_file({"a": 1, "b": 2})
+        second = tofu.var_file({"b": 2, "a": 1})
+        third = tofu.var_file({"a": 2, "b": 2})
+
+        assert first == second
+        assert third != first
+
+    def test_no_variables(self, tofu: OpenTofuManager) -> None:
+        """Test that no file is written without variables."""
+        assert tofu._build_var_args(None) == []
+        assert not list(tofu.harness_dir.glob("vars-*"))
+
+    def test_old_files_are_pruned(self, tofu: OpenTofuManager) -> None:
+        """Test that only the most recent files are kept."""
+        for count in range(VAR_FILES_KEPT + 3):
+            tofu.var_file({"count": count})
+
+        assert len(list(tofu.harness_dir.glob("vars-*.tfvars.json"))) == VAR_FILES_KEPT
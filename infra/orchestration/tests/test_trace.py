@@ -0,0 +1,148 @@
+"""Tests for the command timeline tracer."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from harness.cli.app import app
+from harness.core import trace
+from harness.core.dag import DagExecutor
+from harness.core.runner import AsyncCommandRunner, CommandError, run_command
+from harness.core.trace import Tracer, command_name, span
+
+
+@pytest.fixture
+def tracer() -> Iterator[Tracer]:
+    """Record spans for the duration of a test."""
+    active = trace.start_tracing()
+    yield active
+    trace._active = None
+
+
+def spans(tracer: Tracer) -> dict[str, dict[str, Any]]:
+    """Get the recorded complete events by name."""
+    return {e["name"]: e for e in tracer.events if e["ph"] == "X"}
+
+
+def track_names(tracer: Tracer) -> dict[int, str]:
+    """Get the track names by trace thread ID."""
+    return {e["tid"]: e["args"]["name"] for e in tracer.events if e["ph"] == "M"}
+
+
+class TestSpans:
+    """Tests for spans and their attributes."""
+
+    def test_command_inherits_phase(self, tracer: Tracer) -> None:
+        """Test that a command span is nested in its phase and carries its scope."""
+        with span("configure", cat="phase", component="neo4j", phase="configure"):
+            run_command(["true"])
+
+        events = spans(tracer)
+        phase, command = events["configure"], events["true"]
+        assert command["cat"] == "command"
+        assert command["args"]["component"] == "neo4j"
+        assert command["args"]["phase"] == "configure"
+        assert command["args"]["exit_code"] == 0
+        assert command["args"]["command"] == "true"
+        assert command["tid"] == phase["tid"]
+        assert phase["ts"] <= command["ts"]
+        assert command["ts"] + command["dur"] <= phase["ts"] + phase["dur"]
+
+    def test_failed_command(self, tracer: Tracer) -> None:
+        """Test that a failing command records its exit code and error."""
+        with pytest.raises(CommandError):
+            run_command(["sh", "-c", "exit 5"], quiet=True)
+
+        args = spans(tracer)["sh"]["args"]
+        assert args["exit_code"] == 5
+        assert "exit code 5" in args["error"]
+
+    def test_without_tracer(self) -> None:
+        """Test that spans are no-ops when tracing is off."""
+        with span("phase", component="neo4j") as attrs:
+            attrs["skipped"] = True
+        assert run_command(["true"]).returncode == 0
+
+    def test_command_name(self) -> None:
+        """Test short span names."""
+        assert command_name(["tofu", "apply", "-parallelism=4"]) == "tofu apply"
+        assert command_name(["/usr/bin/ssh", "-o", "BatchMode=yes"]) == "ssh"
+
+
+class TestTracks:
+    """Tests for trace thread IDs."""
+
+    def test_async_tracks(self, tracer: Tracer) -> None:
+        """Test that concurrent async spans get their own named tracks."""
+        runner = AsyncCommandRunner()
+
+        async def wait(host: str) -> None:
+            with span(f"ssh wait {host}", track=f"ssh {host}"):
+                await runner.run(["sleep", "0.1"], capture_output=True)
+
+        async def main() -> None:
+            await asyncio.gather(wait("10.0.70.100"), wait("10.0.70.101"))
+
+        asyncio.run(main())
+
+        names = track_names(tracer)
+        commands = [e for e in tracer.events if e["name"] == "sleep 0.1"]
+        assert sorted(names[e["tid"]] for e in commands) == ["ssh 10.0.70.100", "ssh 10.0.70.101"]
+
+    def test_dag_nodes_keep_scope(self, tracer: Tracer) -> None:
+        """Test that DAG nodes run with the caller's scope on their own thread track."""
+        executor = DagExecutor()
+        executor.add("neo4j.provision", lambda: run_command(["true"]))
+
+        with span("all", component="all"):
+            executor.run()
+
+        events = spans(tracer)
+        assert events["true"]["args"]["component"] == "all"
+        assert events["true"]["tid"] != events["all"]["tid"]
+
+
+class TestTraceFile:
+    """Tests for writing the trace file."""
+
+    @pytest.mark.usefixtures("tracer")
+    def test_write(self, tmp_path: Path) -> None:
+        """Test the Chrome trace-event file format."""
+        with span("provision", cat="phase"):
+            pass
+        path = tmp_path / "trace.json"
+
+        trace.finish_tracing(path)
+
+        data = json.loads(path.read_text())
+        assert data["displayTimeUnit"] == "ms"
+        phases = {e["ph"] for e in data["traceEvents"]}
+        assert phases == {"M", "X"}
+        assert trace._active is None
+
+    def test_cli_trace_option(self, config_file: Path, tmp_path: Path) -> None:
+        """Test that --trace writes the phases and commands of harness all."""
+        out = tmp_path / "all.json"
+        phases = {"provision": lambda: run_command(["true"])}
+
+        with (
+            patch("harness.core.config.get_orchestration_dir", return_value=config_file.parent),
+            patch("harness.cli.commands.all_cmd.Neo4jDeployer") as neo4j,
+            patch("harness.cli.commands.all_cmd.CoreServicesDeployer") as core_services,
+            patch("harness.cli.commands.all_cmd.ClaudeVMsDeployer") as vms,
+        ):
+            for mock in (neo4j, core_services, vms):
+                mock.return_value.phases.return_value = phases
+            result = CliRunner().invoke(app, ["--trace", str(out), "all", "--skip-configure"])
+
+        assert result.exit_code == 0, result.output
+        events = json.loads(out.read_text())["traceEvents"]
+        assert len([e for e in events if e["name"] == "true"]) == 3